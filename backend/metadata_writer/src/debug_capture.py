@@ -0,0 +1,68 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import copy
+import datetime
+import random
+import threading
+
+import yaml
+
+
+class PodEventRecorder:
+    """Bounded in-memory buffer of recently seen pod events, for debugging.
+
+    Recording an event keeps a copy of the pod object, since the pod is
+    processed (and its labels updated) by worker threads while it is in the
+    buffer. Pods are only serialized when the buffer is dumped. When more
+    than size events are recorded, the oldest events are dropped. A size of
+    0 disables recording.
+    """
+
+    def __init__(self, size: int, sample_rate: float = 1.0):
+        self.size = size
+        self.sample_rate = sample_rate
+        self._events = collections.deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0 and self.sample_rate > 0
+
+    def record(self, event_type: str, pod):
+        if not self.enabled:
+            return
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        pod = copy.deepcopy(pod)
+        with self._lock:
+            self._events.append((datetime.datetime.utcnow(), event_type, pod))
+
+    def dump(self) -> str:
+        """Serializes the recorded events as a YAML stream, oldest first."""
+        with self._lock:
+            events = list(self._events)
+        return yaml.safe_dump_all(
+            ({
+                'time': event_time.isoformat() + 'Z',
+                'type': event_type,
+                'pod': pod.to_dict(),
+            } for event_time, event_type, pod in events),
+            default_flow_style=False,
+        )
+
+    def dump_to_file(self, path: str):
+        with open(path, 'w') as f:
+            f.write(self.dump())
@@ -15,12 +15,58 @@
 import json
 import os
 import sys
+import threading
+import time
+import lru
 import ml_metadata
 from time import sleep
+from ml_metadata import errors
 from ml_metadata.proto import metadata_store_pb2
 from ml_metadata.metadata_store import metadata_store
 from ipaddress import ip_address, IPv4Address 
 
+metadata_cache_size = int(os.environ.get('METADATA_CACHE_SIZE', 5000))
+metadata_cache_ttl_seconds = float(os.environ.get('METADATA_CACHE_TTL_SECONDS', 3600))
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire ttl_seconds after they were added.
+
+    Safe to use from multiple threads.
+    """
+
+    def __init__(self, size: int, ttl_seconds: float):
+        self._entries = lru.LRU(size)
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expiration_time = entry
+                if time.monotonic() < expiration_time:
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self._ttl_seconds)
+
+
+# Caches of MLMD types and contexts by name. Types and contexts are never
+# modified by the writer, so the cached copies only go stale if they are
+# deleted from MLMD, which the TTL bounds.
+artifact_type_cache = TTLCache(metadata_cache_size, metadata_cache_ttl_seconds)
+execution_type_cache = TTLCache(metadata_cache_size, metadata_cache_ttl_seconds)
+context_type_cache = TTLCache(metadata_cache_size, metadata_cache_ttl_seconds)
+context_cache = TTLCache(metadata_cache_size, metadata_cache_ttl_seconds)
+
 def value_to_mlmd_value(value) -> metadata_store_pb2.Value:
     if value is None:
         return metadata_store_pb2.Value()
@@ -63,86 +109,51 @@ def connect_to_mlmd() -> metadata_store.MetadataStore:
 
 
 def get_or_create_artifact_type(store, type_name, properties: dict = None) -> metadata_store_pb2.ArtifactType:
+    artifact_type = artifact_type_cache.get(type_name)
+    if artifact_type is not None:
+        return artifact_type
     try:
         artifact_type = store.get_artifact_type(type_name=type_name)
-        return artifact_type
     except:
         artifact_type = metadata_store_pb2.ArtifactType(
             name=type_name,
             properties=properties,
         )
         artifact_type.id = store.put_artifact_type(artifact_type) # Returns ID
-        return artifact_type
+    artifact_type_cache.put(type_name, artifact_type)
+    return artifact_type
 
 
 def get_or_create_execution_type(store, type_name, properties: dict = None) -> metadata_store_pb2.ExecutionType:
+    execution_type = execution_type_cache.get(type_name)
+    if execution_type is not None:
+        return execution_type
     try:
         execution_type = store.get_execution_type(type_name=type_name)
-        return execution_type
     except:
         execution_type = metadata_store_pb2.ExecutionType(
             name=type_name,
             properties=properties,
         )
         execution_type.id = store.put_execution_type(execution_type) # Returns ID
-        return execution_type
+    execution_type_cache.put(type_name, execution_type)
+    return execution_type
 
 
 def get_or_create_context_type(store, type_name, properties: dict = None) -> metadata_store_pb2.ContextType:
+    context_type = context_type_cache.get(type_name)
+    if context_type is not None:
+        return context_type
     try:
         context_type = store.get_context_type(type_name=type_name)
-        return context_type
     except:
         context_type = metadata_store_pb2.ContextType(
             name=type_name,
             properties=properties,
         )
         context_type.id = store.put_context_type(context_type) # Returns ID
-        return context_type
-
-
-def create_artifact_with_type(
-    store,
-    uri: str,
-    type_name: str,
-    properties: dict = None,
-    type_properties: dict = None,
-    custom_properties: dict = None,
-) -> metadata_store_pb2.Artifact:
-    artifact_type = get_or_create_artifact_type(
-        store=store,
-        type_name=type_name,
-        properties=type_properties,
-    )
-    artifact = metadata_store_pb2.Artifact(
-        uri=uri,
-        type_id=artifact_type.id,
-        properties=properties,
-        custom_properties=custom_properties,
-    )
-    artifact.id = store.put_artifacts([artifact])[0]
-    return artifact
-
-
-def create_execution_with_type(
-    store,
-    type_name: str,
-    properties: dict = None,
-    type_properties: dict = None,
-    custom_properties: dict = None,
-) -> metadata_store_pb2.Execution:
-    execution_type = get_or_create_execution_type(
-        store=store,
-        type_name=type_name,
-        properties=type_properties,
-    )
-    execution = metadata_store_pb2.Execution(
-        type_id=execution_type.id,
-        properties=properties,
-        custom_properties=custom_properties,
-    )
-    execution.id = store.put_executions([execution])[0]
-    return execution
+    context_type_cache.put(type_name, context_type)
+    return context_type
 
 
 def create_context_with_type(
@@ -166,20 +177,27 @@ def create_context_with_type(
         custom_properties=custom_properties,
     )
     context.id = store.put_contexts([context])[0]
+    context_cache.put((type_name, context_name), context)
     return context
 
 
-import functools
-@functools.lru_cache(maxsize=128)
-def get_context_by_name(
+def get_context_by_type_and_name(
     store,
+    type_name: str,
     context_name: str,
 ) -> metadata_store_pb2.Context:
-    matching_contexts = [context for context in store.get_contexts() if context.name == context_name]
-    assert len(matching_contexts) <= 1
-    if len(matching_contexts) == 0:
-        raise ValueError('Context with name "{}" was not found'.format(context_name))
-    return matching_contexts[0]
+    context = context_cache.get((type_name, context_name))
+    if context is not None:
+        return context
+    # Uses the index on the type and name of contexts
+    try:
+        context = store.get_context_by_type_and_name(type_name, context_name)
+    except errors.NotFoundError: # The context type does not exist yet
+        context = None
+    if context is None:
+        raise ValueError('Context with type "{}" and name "{}" was not found'.format(type_name, context_name))
+    context_cache.put((type_name, context_name), context)
+    return context
 
 
 def get_or_create_context_with_type(
@@ -191,9 +209,9 @@ def get_or_create_context_with_type(
     custom_properties: dict = None,
 ) -> metadata_store_pb2.Context:
     try:
-        context = get_context_by_name(store, context_name)
-    except:
-        context = create_context_with_type(
+        return get_context_by_type_and_name(store, type_name, context_name)
+    except ValueError:
+        return create_context_with_type(
             store=store,
             context_name=context_name,
             type_name=type_name,
@@ -201,37 +219,32 @@ def get_or_create_context_with_type(
             type_properties=type_properties,
             custom_properties=custom_properties,
         )
-        return context
-
-    # Verifying that the context has the expected type name
-    context_types = store.get_context_types_by_id([context.type_id])
-    assert len(context_types) == 1
-    if context_types[0].name != type_name:
-        raise RuntimeError('Context "{}" was found, but it has type "{}" instead of "{}"'.format(context_name, context_types[0].name, type_name))
-    return context
 
 
 def create_new_execution_in_existing_context(
     store,
     execution_type_name: str,
-    context_id: int,
+    context: metadata_store_pb2.Context,
     properties: dict = None,
     execution_type_properties: dict = None,
     custom_properties: dict = None,
+    artifacts_and_events: list = None,
 ) -> metadata_store_pb2.Execution:
-    execution = create_execution_with_type(
+    """Creates an execution in the context, with the (artifact, event) pairs
+    of its existing input artifacts, in one transaction.
+    """
+    execution_type = get_or_create_execution_type(
         store=store,
-        properties=properties,
-        custom_properties=custom_properties,
         type_name=execution_type_name,
-        type_properties=execution_type_properties,
+        properties=execution_type_properties,
     )
-    association = metadata_store_pb2.Association(
-        execution_id=execution.id,
-        context_id=context_id,
+    execution = metadata_store_pb2.Execution(
+        type_id=execution_type.id,
+        properties=properties,
+        custom_properties=custom_properties,
     )
-
-    store.put_attributions_and_associations([], [association])
+    execution.id, _, _ = store.put_execution(
+        execution, artifacts_and_events or [], [context])
     return execution
 
 
@@ -277,16 +290,20 @@ def get_or_create_run_context(
 def create_new_execution_in_existing_run_context(
     store,
     execution_type_name: str,
-    context_id: int,
+    context: metadata_store_pb2.Context,
     pod_name: str,
     # TODO: Remove when UX stops relying on thsese properties
     pipeline_name: str = None,
     run_id: str = None,
     instance_id: str = None,
     custom_properties = None,
+    input_artifacts_and_names: list = None,
 ) -> metadata_store_pb2.Execution:
-    pipeline_name = pipeline_name or 'Context_' + str(context_id) + '_pipeline'
-    run_id = run_id or 'Context_' + str(context_id) + '_run'
+    """Creates an execution in the run context, linked to the (artifact,
+    input name) pairs returned by get_input_artifacts.
+    """
+    pipeline_name = pipeline_name or 'Context_' + str(context.id) + '_pipeline'
+    run_id = run_id or 'Context_' + str(context.id) + '_run'
     instance_id = instance_id or execution_type_name
     mlmd_custom_properties = {}
     for property_name, property_value in (custom_properties or {}).items():
@@ -295,7 +312,7 @@ def create_new_execution_in_existing_run_context(
     return create_new_execution_in_existing_context(
         store=store,
         execution_type_name=execution_type_name,
-        context_id=context_id,
+        context=context,
         execution_type_properties={
             EXECUTION_PIPELINE_NAME_PROPERTY_NAME: metadata_store_pb2.STRING,
             EXECUTION_RUN_ID_PROPERTY_NAME: metadata_store_pb2.STRING,
@@ -308,115 +325,94 @@ def create_new_execution_in_existing_run_context(
             EXECUTION_COMPONENT_ID_PROPERTY_NAME: metadata_store_pb2.Value(string_value=instance_id), # should set to task ID, not component ID
         },
         custom_properties=mlmd_custom_properties,
+        artifacts_and_events=[
+            (artifact, _new_event(metadata_store_pb2.Event.INPUT, input_name))
+            for artifact, input_name in input_artifacts_and_names or []
+        ],
     )
 
 
-def create_new_artifact_event_and_attribution(
-    store,
-    execution_id: int,
-    context_id: int,
-    uri: str,
-    type_name: str,
-    event_type: metadata_store_pb2.Event.Type,
-    properties: dict = None,
-    artifact_type_properties: dict = None,
-    custom_properties: dict = None,
-    artifact_name_path: metadata_store_pb2.Event.Path = None,
-    milliseconds_since_epoch: int = None,
-) -> metadata_store_pb2.Artifact:
-    artifact = create_artifact_with_type(
-        store=store,
-        uri=uri,
-        type_name=type_name,
-        type_properties=artifact_type_properties,
-        properties=properties,
-        custom_properties=custom_properties,
-    )
-    event = metadata_store_pb2.Event(
-        execution_id=execution_id,
-        artifact_id=artifact.id,
+def _new_event(event_type, name: str) -> metadata_store_pb2.Event:
+    # The execution and artifact IDs are set by put_execution.
+    return metadata_store_pb2.Event(
         type=event_type,
-        path=artifact_name_path,
-        milliseconds_since_epoch=milliseconds_since_epoch,
-    )
-    store.put_events([event])
-
-    attribution = metadata_store_pb2.Attribution(
-        context_id=context_id,
-        artifact_id=artifact.id,
-    )
-    store.put_attributions_and_associations([attribution], [])
-
-    return artifact
-
-
-def link_execution_to_input_artifact(
-    store,
-    execution_id: int,
-    uri: str,
-    input_name: str,
-) -> metadata_store_pb2.Artifact:
-    artifacts = store.get_artifacts_by_uri(uri)
-    if len(artifacts) == 0:
-        print('Error: Not found upstream artifact with URI={}.'.format(uri), file=sys.stderr)
-        return None
-    if len(artifacts) > 1:
-        print('Error: Found multiple artifacts with the same URI. {} Using the last one..'.format(artifacts), file=sys.stderr)
-
-    artifact = artifacts[-1]
-
-    event = metadata_store_pb2.Event(
-        execution_id=execution_id,
-        artifact_id=artifact.id,
-        type=metadata_store_pb2.Event.INPUT,
         path=metadata_store_pb2.Event.Path(
             steps=[
                 metadata_store_pb2.Event.Path.Step(
-                    key=input_name,
+                    key=name,
                 ),
             ]
         ),
     )
-    store.put_events([event])
-    return artifact
 
 
-def create_new_output_artifact(
+def get_input_artifacts(
+    store,
+    uris_and_input_names: list,
+) -> list:
+    """Gets the upstream artifacts with the given URIs.
+
+    Returns the (artifact, input name) pairs of the artifacts that were found.
+    """
+    artifacts_and_input_names = []
+    for uri, input_name in uris_and_input_names:
+        artifacts = store.get_artifacts_by_uri(uri)
+        if len(artifacts) == 0:
+            print('Error: Not found upstream artifact with URI={}.'.format(uri), file=sys.stderr)
+            continue
+        if len(artifacts) > 1:
+            print('Error: Found multiple artifacts with the same URI. {} Using the last one..'.format(artifacts), file=sys.stderr)
+        artifacts_and_input_names.append((artifacts[-1], input_name))
+    return artifacts_and_input_names
+
+
+def create_new_output_artifacts(
     store,
     execution_id: int,
     context_id: int,
-    uri: str,
-    type_name: str,
-    output_name: str,
+    outputs: list,
     run_id: str = None,
-    argo_artifact: dict = None,
-) -> metadata_store_pb2.Artifact:
-    custom_properties = {
-        ARTIFACT_IO_NAME_PROPERTY_NAME: metadata_store_pb2.Value(string_value=output_name),
-    }
-    if run_id:
-        custom_properties[ARTIFACT_PIPELINE_NAME_PROPERTY_NAME] = metadata_store_pb2.Value(string_value=str(run_id))
-        custom_properties[ARTIFACT_RUN_ID_PROPERTY_NAME] = metadata_store_pb2.Value(string_value=str(run_id))
-    if argo_artifact:
-        custom_properties[ARTIFACT_ARGO_ARTIFACT_PROPERTY_NAME] = metadata_store_pb2.Value(string_value=json.dumps(argo_artifact, sort_keys=True))
-    return create_new_artifact_event_and_attribution(
-        store=store,
-        execution_id=execution_id,
-        context_id=context_id,
-        uri=uri,
-        type_name=type_name,
-        event_type=metadata_store_pb2.Event.OUTPUT,
-        artifact_name_path=metadata_store_pb2.Event.Path(
-            steps=[
-                metadata_store_pb2.Event.Path.Step(
-                    key=output_name,
-                    #index=0,
-                ),
-            ]
-        ),
-        custom_properties=custom_properties,
-        #milliseconds_since_epoch=int(datetime.now(timezone.utc).timestamp() * 1000), # Happens automatically
-    )
+) -> list:
+    """Creates the output artifacts of an execution, with their events and
+    attributions, in one transaction.
+
+    Each output is a dict with the uri, type_name, output_name and
+    argo_artifact of the artifact. Returns the created artifacts.
+    """
+    artifacts_and_events = []
+    for output in outputs:
+        custom_properties = {
+            ARTIFACT_IO_NAME_PROPERTY_NAME: metadata_store_pb2.Value(string_value=output['output_name']),
+        }
+        if run_id:
+            custom_properties[ARTIFACT_PIPELINE_NAME_PROPERTY_NAME] = metadata_store_pb2.Value(string_value=str(run_id))
+            custom_properties[ARTIFACT_RUN_ID_PROPERTY_NAME] = metadata_store_pb2.Value(string_value=str(run_id))
+        if output.get('argo_artifact'):
+            custom_properties[ARTIFACT_ARGO_ARTIFACT_PROPERTY_NAME] = metadata_store_pb2.Value(string_value=json.dumps(output['argo_artifact'], sort_keys=True))
+        artifact_type = get_or_create_artifact_type(
+            store=store,
+            type_name=output['type_name'],
+        )
+        artifact = metadata_store_pb2.Artifact(
+            uri=output['uri'],
+            type_id=artifact_type.id,
+            custom_properties=custom_properties,
+        )
+        artifacts_and_events.append(
+            (artifact, _new_event(metadata_store_pb2.Event.OUTPUT, output['output_name'])))
+    if not artifacts_and_events:
+        return []
+
+    # put_execution updates the execution and the context that it is given,
+    # so it needs their current state.
+    [execution] = store.get_executions_by_id([execution_id])
+    [context] = store.get_contexts_by_id([context_id])
+    _, artifact_ids, _ = store.put_execution(execution, artifacts_and_events, [context])
+    artifacts = [artifact for artifact, _ in artifacts_and_events]
+    for artifact, artifact_id in zip(artifacts, artifact_ids):
+        artifact.id = artifact_id
+    return artifacts
+
 
 def isIPv6(ip: str) -> bool: 
     try: 
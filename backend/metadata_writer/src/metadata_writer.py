@@ -17,11 +17,18 @@ import hashlib
 import os
 import re
 import collections
+import signal
+import threading
+import time
 import kubernetes
-import yaml
 from time import sleep
 import lru
 
+import debug_capture
+import metrics
+import sharding
+from pod_informer import PodInformer
+from pod_queue import PodQueue
 from metadata_helpers import *
 
 
@@ -29,12 +36,33 @@ namespace_to_watch = os.environ.get('NAMESPACE_TO_WATCH', 'default')
 pod_name_to_execution_id_size = os.environ.get('POD_NAME_TO_EXECUTION_ID_SIZE', 5000)
 workflow_name_to_context_id_size = os.environ.get('WORKFLOW_NAME_TO_CONTEXT_ID_SIZE', 5000)
 pods_with_written_metadata_size = os.environ.get('PODS_WITH_WRITTEN_METADATA_SIZE', 5000)
-debug_files_size = os.environ.get('DEBUG_FILES_SIZE', 5000)
+# Recent pod events are kept in memory for debugging only when
+# DEBUG_CAPTURE_SIZE > 0. A sample of the events can be kept with
+# DEBUG_CAPTURE_SAMPLE_RATE < 1.
+debug_capture_size = int(os.environ.get('DEBUG_CAPTURE_SIZE', 0))
+debug_capture_sample_rate = float(os.environ.get('DEBUG_CAPTURE_SAMPLE_RATE', 1.0))
+debug_capture_dump_path = os.environ.get('DEBUG_CAPTURE_DUMP_PATH', '/tmp/metadata_writer_pod_events.yaml')
+metrics_port = int(os.environ.get('METRICS_PORT', 8080))
+# The recent pod events are served at /debug/pod_events on localhost only
+# (e.g. for kubectl port-forward), when DEBUG_PORT is set.
+debug_port = int(os.environ.get('DEBUG_PORT', 0))
+pod_list_page_size = int(os.environ.get('POD_LIST_PAGE_SIZE', 500))
+# Pods are sharded by workflow across METADATA_WRITER_SHARD_COUNT replicas.
+# The shard of a replica is METADATA_WRITER_SHARD_INDEX, or the ordinal of its
+# pod when the replicas are run as a StatefulSet.
+shard_count = int(os.environ.get('METADATA_WRITER_SHARD_COUNT', 1))
+shard_index = sharding.get_shard_index(
+    shard_index=os.environ.get('METADATA_WRITER_SHARD_INDEX'),
+    hostname=os.environ.get('HOSTNAME'),
+    shard_count=shard_count,
+)
+worker_count = int(os.environ.get('METADATA_WRITER_WORKERS', 4))
+worker_queue_size = int(os.environ.get('METADATA_WRITER_WORKER_QUEUE_SIZE', 1000))
+metrics_log_interval_seconds = int(os.environ.get('METRICS_LOG_INTERVAL_SECONDS', 60))
 
 
 kubernetes.config.load_incluster_config()
 k8s_api = kubernetes.client.CoreV1Api()
-k8s_watch = kubernetes.watch.Watch()
 
 
 patch_retries = 20
@@ -141,258 +169,308 @@ def is_kfp_v2_pod(pod) -> bool:
 pod_name_to_execution_id = lru.LRU(pod_name_to_execution_id_size)
 workflow_name_to_context_id = lru.LRU(workflow_name_to_context_id_size)
 pods_with_written_metadata = lru.LRU(pods_with_written_metadata_size)
-debug_paths = collections.deque()
-
-while True:
-    print("Start watching Kubernetes Pods created by Argo")
-    if namespace_to_watch:
-        pod_stream = k8s_watch.stream(
-            k8s_api.list_namespaced_pod,
-            namespace=namespace_to_watch,
-            label_selector=ARGO_WORKFLOW_LABEL_KEY,
-            timeout_seconds=1800,  # Sometimes watch gets stuck
-            _request_timeout=2000,  # Sometimes HTTP GET gets stuck
-        )
+pod_event_recorder = debug_capture.PodEventRecorder(debug_capture_size, debug_capture_sample_rate)
+
+
+def process_pod(obj):
+    print('Kubernetes Pod: ', obj.metadata.name, obj.metadata.resource_version)
+    pod_name = obj.metadata.name
+
+    assert obj.kind == 'Pod'
+
+    if METADATA_WRITTEN_LABEL_KEY in obj.metadata.labels:
+        return
+
+    # Skip TFX pods - they have their own metadata writers
+    if is_tfx_pod(obj):
+        return
+
+    # Skip KFP v2 pods - they have their own metadat writers
+    if is_kfp_v2_pod(obj):
+        return
+
+    argo_workflow_name = obj.metadata.labels[ARGO_WORKFLOW_LABEL_KEY] # Should exist due to initial filtering
+    argo_template = {}
+    for env in obj.spec.containers[0].env:
+        if env.name == ARGO_TEMPLATE_ENV_KEY:
+            argo_template = json.loads(env.value)
+            break
+
+    # Should we throw error instead if argo template not found?
+    argo_template_name = argo_template.get('name', '')
+
+    component_name = argo_template_name
+    component_version = component_name
+    argo_output_name_to_type = {}
+    if KFP_COMPONENT_SPEC_ANNOTATION_KEY in obj.metadata.annotations:
+        component_spec_text = obj.metadata.annotations[KFP_COMPONENT_SPEC_ANNOTATION_KEY]
+        component_spec = json.loads(component_spec_text)
+        component_spec_digest = hashlib.sha256(component_spec_text.encode()).hexdigest()
+        component_name = component_spec.get('name', component_name)
+        component_version = component_name + '@sha256=' + component_spec_digest
+        output_name_to_type = {output['name']: output.get('type', None) for output in component_spec.get('outputs', [])}
+        argo_output_name_to_type = {output_name_to_argo(k): v for k, v in output_name_to_type.items() if v}
+
+    pod_name_to_execution_id_hit = obj.metadata.name in pod_name_to_execution_id
+    metrics.pod_name_to_execution_id_stats.record(pod_name_to_execution_id_hit)
+    if pod_name_to_execution_id_hit:
+        execution_id = pod_name_to_execution_id[obj.metadata.name]
+        metrics.workflow_name_to_context_id_stats.record(argo_workflow_name in workflow_name_to_context_id)
+        context_id = workflow_name_to_context_id[argo_workflow_name]
+    elif METADATA_EXECUTION_ID_LABEL_KEY in obj.metadata.labels:
+        execution_id = int(obj.metadata.labels[METADATA_EXECUTION_ID_LABEL_KEY])
+        context_id = int(obj.metadata.labels[METADATA_CONTEXT_ID_LABEL_KEY])
+        print('Found execution id: {}, context id: {} for pod {}.'.format(execution_id, context_id, obj.metadata.name))
     else:
-        pod_stream = k8s_watch.stream(
-            k8s_api.list_pod_for_all_namespaces,
-            label_selector=ARGO_WORKFLOW_LABEL_KEY,
-            timeout_seconds=1800,  # Sometimes watch gets stuck
-            _request_timeout=2000,  # Sometimes HTTP GET gets stuck
-        )
-    for event in pod_stream:
-        try:
-            obj = event['object']
-            print('Kubernetes Pod event: ', event['type'], obj.metadata.name, obj.metadata.resource_version)
-            if event['type'] == 'ERROR':
-                print(event)
-
-            pod_name = obj.metadata.name
-
-            # Logging pod changes for debugging
-            debug_path = '/tmp/pod_' + obj.metadata.name + '_' + obj.metadata.resource_version
-            with open(debug_path, 'w') as f:
-                f.write(yaml.dump(obj.to_dict()))
-            debug_paths.append(debug_path)
-
-            # Do some housekeeping, ensure we only keep a fixed size buffer of debug files so we don't
-            # grow the disk size indefinitely for long running pods.
-            if len(debug_paths) > debug_files_size:
-                os.remove(debug_paths.popleft())
-
-            assert obj.kind == 'Pod'
-
-            if METADATA_WRITTEN_LABEL_KEY in obj.metadata.labels:
+        # Saving input paramater arguments
+        execution_custom_properties = {}
+        if KFP_PARAMETER_ARGUMENTS_ANNOTATION_KEY in obj.metadata.annotations:
+            parameter_arguments_json = obj.metadata.annotations[KFP_PARAMETER_ARGUMENTS_ANNOTATION_KEY]
+            try:
+                parameter_arguments = json.loads(parameter_arguments_json)
+                for paramater_name, parameter_value in parameter_arguments.items():
+                    execution_custom_properties['input:' + paramater_name] = parameter_value
+            except Exception:
+                pass
+
+        uris_and_input_names = []
+        for argo_artifact in argo_template.get('inputs', {}).get('artifacts', []):
+            artifact_uri = argo_artifact_to_uri(argo_artifact)
+            if not artifact_uri:
                 continue
 
-            # Skip TFX pods - they have their own metadata writers
-            if is_tfx_pod(obj):
-                continue
+            input_name = argo_artifact.get('path', '') # Every artifact should have a path in Argo
+            input_artifact_path_prefix = '/tmp/inputs/'
+            input_artifact_path_postfix = '/data'
+            if input_name.startswith(input_artifact_path_prefix):
+                input_name = input_name[len(input_artifact_path_prefix):]
+            if input_name.endswith(input_artifact_path_postfix):
+                input_name = input_name[0: -len(input_artifact_path_postfix)]
+            uris_and_input_names.append((artifact_uri, input_name))
+
+        with metrics.mlmd_write_seconds.time():
+            run_context = get_or_create_run_context(
+                store=mlmd_store,
+                run_id=argo_workflow_name, # We can switch to internal run IDs once backend starts adding them
+            )
 
-            # Skip KFP v2 pods - they have their own metadat writers
-            if is_kfp_v2_pod(obj):
-                continue
+            # TODO: Maybe there is a better way to handle missing upstream artifacts
+            artifacts_and_input_names = get_input_artifacts(
+                store=mlmd_store,
+                uris_and_input_names=uris_and_input_names,
+            )
 
-            argo_workflow_name = obj.metadata.labels[ARGO_WORKFLOW_LABEL_KEY] # Should exist due to initial filtering
-            argo_template = {}
-            for env in obj.spec.containers[0].env:
-                if env.name == ARGO_TEMPLATE_ENV_KEY:
-                    argo_template = json.loads(env.value)
-                    break
-
-            # Should we throw error instead if argo template not found?
-            argo_template_name = argo_template.get('name', '')
-
-            component_name = argo_template_name
-            component_version = component_name
-            argo_output_name_to_type = {}
-            if KFP_COMPONENT_SPEC_ANNOTATION_KEY in obj.metadata.annotations:
-                component_spec_text = obj.metadata.annotations[KFP_COMPONENT_SPEC_ANNOTATION_KEY]
-                component_spec = json.loads(component_spec_text)
-                component_spec_digest = hashlib.sha256(component_spec_text.encode()).hexdigest()
-                component_name = component_spec.get('name', component_name)
-                component_version = component_name + '@sha256=' + component_spec_digest
-                output_name_to_type = {output['name']: output.get('type', None) for output in component_spec.get('outputs', [])}
-                argo_output_name_to_type = {output_name_to_argo(k): v for k, v in output_name_to_type.items() if v}
-
-            if obj.metadata.name in pod_name_to_execution_id:
-                execution_id = pod_name_to_execution_id[obj.metadata.name]
-                context_id = workflow_name_to_context_id[argo_workflow_name]
-            elif METADATA_EXECUTION_ID_LABEL_KEY in obj.metadata.labels:
-                execution_id = int(obj.metadata.labels[METADATA_EXECUTION_ID_LABEL_KEY])
-                context_id = int(obj.metadata.labels[METADATA_CONTEXT_ID_LABEL_KEY])
-                print('Found execution id: {}, context id: {} for pod {}.'.format(execution_id, context_id, obj.metadata.name))
-            else:
-                run_context = get_or_create_run_context(
-                    store=mlmd_store,
-                    run_id=argo_workflow_name, # We can switch to internal run IDs once backend starts adding them
-                )
+            # Adding new execution to the database
+            execution = create_new_execution_in_existing_run_context(
+                store=mlmd_store,
+                context=run_context,
+                execution_type_name=KFP_EXECUTION_TYPE_NAME_PREFIX + component_version,
+                pod_name=pod_name,
+                pipeline_name=argo_workflow_name,
+                run_id=argo_workflow_name,
+                instance_id=component_name,
+                custom_properties=execution_custom_properties,
+                input_artifacts_and_names=artifacts_and_input_names,
+            )
 
-                # Saving input paramater arguments
-                execution_custom_properties = {}
-                if KFP_PARAMETER_ARGUMENTS_ANNOTATION_KEY in obj.metadata.annotations:
-                    parameter_arguments_json = obj.metadata.annotations[KFP_PARAMETER_ARGUMENTS_ANNOTATION_KEY]
-                    try:
-                        parameter_arguments = json.loads(parameter_arguments_json)
-                        for paramater_name, parameter_value in parameter_arguments.items():
-                            execution_custom_properties['input:' + paramater_name] = parameter_value
-                    except Exception:
-                        pass
-
-                # Adding new execution to the database
-                execution = create_new_execution_in_existing_run_context(
+        input_artifact_ids = []
+        for artifact, input_name in artifacts_and_input_names:
+            input_artifact_ids.append(dict(
+                id=artifact.id,
+                name=input_name,
+                uri=artifact.uri,
+            ))
+            print('Found Input Artifact: ' + str(dict(
+                input_name=input_name,
+                id=artifact.id,
+                uri=artifact.uri,
+            )))
+
+        execution_id = execution.id
+        context_id = run_context.id
+
+        obj.metadata.labels[METADATA_EXECUTION_ID_LABEL_KEY] = execution_id
+        obj.metadata.labels[METADATA_CONTEXT_ID_LABEL_KEY] = context_id
+
+        metadata_to_add = {
+            'labels': {
+                METADATA_EXECUTION_ID_LABEL_KEY: str(execution_id),
+                METADATA_CONTEXT_ID_LABEL_KEY: str(context_id),
+            },
+            'annotations': {
+                METADATA_INPUT_ARTIFACT_IDS_ANNOTATION_KEY: json.dumps(input_artifact_ids),
+            },
+        }
+
+        with metrics.pod_patch_seconds.time():
+            patch_pod_metadata(
+                namespace=obj.metadata.namespace,
+                pod_name=obj.metadata.name,
+                patch=metadata_to_add,
+            )
+        pod_name_to_execution_id[obj.metadata.name] = execution_id
+        workflow_name_to_context_id[argo_workflow_name] = context_id
+
+        print('New execution id: {}, context id: {} for pod {}.'.format(execution_id, context_id, obj.metadata.name))
+
+        print('Execution: ' + str(dict(
+            context_id=context_id,
+            context_name=argo_workflow_name,
+            execution_id=execution_id,
+            execution_name=obj.metadata.name,
+            component_name=component_name,
+        )))
+
+        # TODO: Log input parameters as execution options.
+        # Unfortunately, DSL compiler loses the information about inputs and their arguments.
+
+    if (
+        obj.metadata.name not in pods_with_written_metadata
+        and (
+            obj.metadata.labels.get(ARGO_COMPLETED_LABEL_KEY, 'false') == 'true'
+            or ARGO_OUTPUTS_ANNOTATION_KEY in obj.metadata.annotations
+        )
+    ):
+        artifact_ids = []
+
+        if ARGO_OUTPUTS_ANNOTATION_KEY in obj.metadata.annotations: # Should be present
+            argo_outputs = json.loads(obj.metadata.annotations[ARGO_OUTPUTS_ANNOTATION_KEY])
+            argo_output_artifacts = {}
+
+            for artifact in argo_outputs.get('artifacts', []):
+                art_name = artifact['name']
+                output_prefix = argo_template_name + '-'
+                if art_name.startswith(output_prefix):
+                    art_name = art_name[len(output_prefix):]
+                argo_output_artifacts[art_name] = artifact
+
+            outputs = []
+            for name, art in argo_output_artifacts.items():
+                artifact_uri = argo_artifact_to_uri(art)
+                if not artifact_uri:
+                    continue
+                artifact_type_name = argo_output_name_to_type.get(name, 'NoType') # Cannot be None or ''
+
+                print('Adding Output Artifact: ' + str(dict(
+                    output_name=name,
+                    uri=artifact_uri,
+                    type=artifact_type_name,
+                )))
+                outputs.append(dict(
+                    uri=artifact_uri,
+                    type_name=artifact_type_name,
+                    output_name=name,
+                    argo_artifact=art,
+                ))
+
+            with metrics.mlmd_write_seconds.time():
+                artifacts = create_new_output_artifacts(
                     store=mlmd_store,
-                    context_id=run_context.id,
-                    execution_type_name=KFP_EXECUTION_TYPE_NAME_PREFIX + component_version,
-                    pod_name=pod_name,
-                    pipeline_name=argo_workflow_name,
+                    execution_id=execution_id,
+                    context_id=context_id,
+                    outputs=outputs,
+                    #run_id='Context_' + str(context_id) + '_run',
                     run_id=argo_workflow_name,
-                    instance_id=component_name,
-                    custom_properties=execution_custom_properties,
-                )
-
-                argo_input_artifacts = argo_template.get('inputs', {}).get('artifacts', [])
-                input_artifact_ids = []
-                for argo_artifact in argo_input_artifacts:
-                    artifact_uri = argo_artifact_to_uri(argo_artifact)
-                    if not artifact_uri:
-                        continue
-
-                    input_name = argo_artifact.get('path', '') # Every artifact should have a path in Argo
-                    input_artifact_path_prefix = '/tmp/inputs/'
-                    input_artifact_path_postfix = '/data'
-                    if input_name.startswith(input_artifact_path_prefix):
-                        input_name = input_name[len(input_artifact_path_prefix):]
-                    if input_name.endswith(input_artifact_path_postfix):
-                        input_name = input_name[0: -len(input_artifact_path_postfix)]
-
-                    artifact = link_execution_to_input_artifact(
-                        store=mlmd_store,
-                        execution_id=execution.id,
-                        uri=artifact_uri,
-                        input_name=input_name,
-                    )
-                    if artifact is None:
-                        # TODO: Maybe there is a better way to handle missing upstream artifacts
-                        continue
-
-                    input_artifact_ids.append(dict(
-                        id=artifact.id,
-                        name=input_name,
-                        uri=artifact.uri,
-                    ))
-                    print('Found Input Artifact: ' + str(dict(
-                        input_name=input_name,
-                        id=artifact.id,
-                        uri=artifact.uri,
-                    )))
-
-                execution_id = execution.id
-                context_id = run_context.id
-
-                obj.metadata.labels[METADATA_EXECUTION_ID_LABEL_KEY] = execution_id
-                obj.metadata.labels[METADATA_CONTEXT_ID_LABEL_KEY] = context_id
-
-                metadata_to_add = {
-                    'labels': {
-                        METADATA_EXECUTION_ID_LABEL_KEY: str(execution_id),
-                        METADATA_CONTEXT_ID_LABEL_KEY: str(context_id),
-                    },
-                    'annotations': {
-                        METADATA_INPUT_ARTIFACT_IDS_ANNOTATION_KEY: json.dumps(input_artifact_ids),
-                    },
-                }
-
-                patch_pod_metadata(
-                    namespace=obj.metadata.namespace,
-                    pod_name=obj.metadata.name,
-                    patch=metadata_to_add,
                 )
-                pod_name_to_execution_id[obj.metadata.name] = execution_id
-                workflow_name_to_context_id[argo_workflow_name] = context_id
-
-                print('New execution id: {}, context id: {} for pod {}.'.format(execution_id, context_id, obj.metadata.name))
-
-                print('Execution: ' + str(dict(
-                    context_id=context_id,
-                    context_name=argo_workflow_name,
-                    execution_id=execution_id,
-                    execution_name=obj.metadata.name,
-                    component_name=component_name,
-                )))
 
-                # TODO: Log input parameters as execution options.
-                # Unfortunately, DSL compiler loses the information about inputs and their arguments.
+            for artifact, output in zip(artifacts, outputs):
+                artifact_ids.append(dict(
+                    id=artifact.id,
+                    name=output['output_name'],
+                    uri=output['uri'],
+                    type=output['type_name'],
+                ))
+
+        metadata_to_add = {
+            'labels': {
+                METADATA_WRITTEN_LABEL_KEY: 'true',
+            },
+            'annotations': {
+                METADATA_OUTPUT_ARTIFACT_IDS_ANNOTATION_KEY: json.dumps(artifact_ids),
+            },
+        }
+
+        with metrics.pod_patch_seconds.time():
+            patch_pod_metadata(
+                namespace=obj.metadata.namespace,
+                pod_name=obj.metadata.name,
+                patch=metadata_to_add,
+            )
 
-            if (
-                obj.metadata.name not in pods_with_written_metadata
-                and (
-                    obj.metadata.labels.get(ARGO_COMPLETED_LABEL_KEY, 'false') == 'true'
-                    or ARGO_OUTPUTS_ANNOTATION_KEY in obj.metadata.annotations
-                )
-            ):
-                artifact_ids = []
-
-                if ARGO_OUTPUTS_ANNOTATION_KEY in obj.metadata.annotations: # Should be present
-                    argo_outputs = json.loads(obj.metadata.annotations[ARGO_OUTPUTS_ANNOTATION_KEY])
-                    argo_output_artifacts = {}
-
-                    for artifact in argo_outputs.get('artifacts', []):
-                        art_name = artifact['name']
-                        output_prefix = argo_template_name + '-'
-                        if art_name.startswith(output_prefix):
-                            art_name = art_name[len(output_prefix):]
-                        argo_output_artifacts[art_name] = artifact
-
-                    output_artifacts = []
-                    for name, art in argo_output_artifacts.items():
-                        artifact_uri = argo_artifact_to_uri(art)
-                        if not artifact_uri:
-                            continue
-                        artifact_type_name = argo_output_name_to_type.get(name, 'NoType') # Cannot be None or ''
-
-                        print('Adding Output Artifact: ' + str(dict(
-                            output_name=name,
-                            uri=artifact_uri,
-                            type=artifact_type_name,
-                        )))
-
-                        artifact = create_new_output_artifact(
-                            store=mlmd_store,
-                            execution_id=execution_id,
-                            context_id=context_id,
-                            uri=artifact_uri,
-                            type_name=artifact_type_name,
-                            output_name=name,
-                            #run_id='Context_' + str(context_id) + '_run',
-                            run_id=argo_workflow_name,
-                            argo_artifact=art,
-                        )
-
-                        artifact_ids.append(dict(
-                            id=artifact.id,
-                            name=name,
-                            uri=artifact_uri,
-                            type=artifact_type_name,
-                        ))
-
-                metadata_to_add = {
-                    'labels': {
-                        METADATA_WRITTEN_LABEL_KEY: 'true',
-                    },
-                    'annotations': {
-                        METADATA_OUTPUT_ARTIFACT_IDS_ANNOTATION_KEY: json.dumps(artifact_ids),
-                    },
-                }
-
-                patch_pod_metadata(
-                    namespace=obj.metadata.namespace,
-                    pod_name=obj.metadata.name,
-                    patch=metadata_to_add,
-                )
+        pods_with_written_metadata[obj.metadata.name] = None
 
-                pods_with_written_metadata[obj.metadata.name] = None
 
+def process_pods(pod_queue: PodQueue):
+    while True:
+        obj = pod_queue.get()
+        try:
+            with metrics.pod_processing_seconds.time():
+                process_pod(obj)
         except Exception as e:
+            metrics.pod_processing_errors_total.inc()
             import traceback
             print(traceback.format_exc())
+
+
+def print_metrics():
+    while True:
+        sleep(metrics_log_interval_seconds)
+        print('Metrics: ' + metrics.format_summary())
+
+
+# Pods are sharded across the workers by workflow, so that the pods of a
+# workflow are processed in order, and the output artifacts of upstream pods
+# are written before the inputs of downstream pods are linked to them.
+pod_queues = [PodQueue(worker_queue_size) for _ in range(worker_count)]
+for pod_queue in pod_queues:
+    threading.Thread(target=process_pods, args=(pod_queue,), daemon=True).start()
+threading.Thread(target=print_metrics, daemon=True).start()
+
+
+def dump_pod_events(signum=None, frame=None):
+    # Serializing the events can take a while, so it is done off the watch
+    # thread, on which signal handlers run.
+    def dump():
+        pod_event_recorder.dump_to_file(debug_capture_dump_path)
+        print('Dumped recent pod events to ' + debug_capture_dump_path)
+    threading.Thread(target=dump, daemon=True).start()
+
+
+if pod_event_recorder.enabled:
+    # kill -USR1 <pid> dumps the recent pod events to DEBUG_CAPTURE_DUMP_PATH.
+    signal.signal(signal.SIGUSR1, dump_pod_events)
+metrics.start_http_server(metrics_port)
+if pod_event_recorder.enabled and debug_port:
+    # Pods can contain secrets, so their events are not served to the network.
+    metrics.start_http_server(debug_port, host='127.0.0.1', routes={
+        '/debug/pod_events': lambda: ('application/yaml', pod_event_recorder.dump()),
+    })
+
+def is_pod_in_shard(pod) -> bool:
+    argo_workflow_name = pod.metadata.labels[ARGO_WORKFLOW_LABEL_KEY] # Should exist due to initial filtering
+    return sharding.get_shard(argo_workflow_name, shard_count) == shard_index
+
+
+print('Processing the pods of shard {} of {}'.format(shard_index, shard_count))
+# Pods with written metadata are filtered out by the API server, so they are
+# neither listed nor watched again. Pods of other shards are skipped before
+# they reach the caches.
+pod_informer = PodInformer(
+    k8s_api=k8s_api,
+    namespace=namespace_to_watch or None,
+    label_selector=ARGO_WORKFLOW_LABEL_KEY + ',!' + METADATA_WRITTEN_LABEL_KEY,
+    page_size=pod_list_page_size,
+    pod_filter=is_pod_in_shard if shard_count > 1 else None,
+)
+for event in pod_informer.events():
+    try:
+        obj = event['object']
+        metrics.pod_events_total.inc()
+        print('Kubernetes Pod event: ', event['type'], obj.metadata.name, obj.metadata.resource_version)
+        pod_event_recorder.record(event['type'], obj)
+
+        argo_workflow_name = obj.metadata.labels[ARGO_WORKFLOW_LABEL_KEY]
+        pod_queues[hash(argo_workflow_name) % len(pod_queues)].put(obj)
+    except Exception as e:
+        import traceback
+        print(traceback.format_exc())
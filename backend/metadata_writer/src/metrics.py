@@ -0,0 +1,225 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import http.server
+import threading
+import time
+
+
+class Counter:
+    """Monotonically increasing count. Safe to use from multiple threads."""
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class LatencySummary:
+    """Count, sum and maximum of observed durations in seconds. Safe to use
+    from multiple threads."""
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._count += 1
+            self._sum += seconds
+            self._max = max(self._max, seconds)
+
+    @contextlib.contextmanager
+    def time(self):
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - start_time)
+
+    def snapshot(self):
+        """Returns the count, sum and maximum of the observed durations."""
+        with self._lock:
+            return self._count, self._sum, self._max
+
+
+class CacheStats:
+    """Hits and misses of lookups in a cache."""
+
+    def __init__(self, cache_name: str):
+        self.cache_name = cache_name
+        self.hits = Counter('metadata_writer_cache_hits_total',
+                            'Cache lookups that hit.')
+        self.misses = Counter('metadata_writer_cache_misses_total',
+                              'Cache lookups that missed.')
+
+    def record(self, hit: bool):
+        (self.hits if hit else self.misses).inc()
+
+    @property
+    def hit_ratio(self) -> float:
+        hits, misses = self.hits.value, self.misses.value
+        return hits / (hits + misses) if hits + misses else 0.0
+
+
+pod_events_total = Counter('metadata_writer_pod_events_total',
+                           'Pod events received from the Kubernetes watch.')
+pod_events_coalesced_total = Counter(
+    'metadata_writer_pod_events_coalesced_total',
+    'Pod events that replaced a queued older version of the same pod.')
+pod_processing_errors_total = Counter(
+    'metadata_writer_pod_processing_errors_total',
+    'Pods whose processing raised an error.')
+
+enqueue_blocked_seconds = LatencySummary(
+    'metadata_writer_enqueue_blocked_seconds',
+    'Time the watch was blocked on full worker queues (backpressure).')
+queue_wait_seconds = LatencySummary('metadata_writer_queue_wait_seconds',
+                                    'Time pods waited in the worker queues.')
+pod_processing_seconds = LatencySummary(
+    'metadata_writer_pod_processing_seconds',
+    'Time to process a pod event, including MLMD writes and pod patches.')
+mlmd_write_seconds = LatencySummary(
+    'metadata_writer_mlmd_write_seconds',
+    'Time of the batched MLMD writes of a pod event.')
+pod_patch_seconds = LatencySummary(
+    'metadata_writer_pod_patch_seconds',
+    'Time to patch the labels and annotations of a pod.')
+
+LATENCY_SUMMARIES = [
+    enqueue_blocked_seconds,
+    queue_wait_seconds,
+    pod_processing_seconds,
+    mlmd_write_seconds,
+    pod_patch_seconds,
+]
+COUNTERS = [
+    pod_events_total,
+    pod_events_coalesced_total,
+    pod_processing_errors_total,
+]
+
+pod_name_to_execution_id_stats = CacheStats('pod_name_to_execution_id')
+workflow_name_to_context_id_stats = CacheStats('workflow_name_to_context_id')
+
+CACHE_STATS = [
+    pod_name_to_execution_id_stats,
+    workflow_name_to_context_id_stats,
+]
+
+
+def format_summary() -> str:
+    """Formats the metrics as a single line for logging."""
+    parts = [
+        '{}={}'.format(counter.name, counter.value) for counter in COUNTERS
+    ]
+    for summary in LATENCY_SUMMARIES:
+        count, total, maximum = summary.snapshot()
+        average = total / count if count else 0.0
+        parts.append('{}(count={}, avg={:.3f}, max={:.3f})'.format(
+            summary.name, count, average, maximum))
+    for stats in CACHE_STATS:
+        parts.append('{}_hit_ratio={:.3f}'.format(stats.cache_name,
+                                                  stats.hit_ratio))
+    return ', '.join(parts)
+
+
+def render_prometheus() -> str:
+    """Renders the metrics in the Prometheus text exposition format."""
+    lines = []
+    for counter in COUNTERS:
+        lines.append('# HELP {} {}'.format(counter.name, counter.help))
+        lines.append('# TYPE {} counter'.format(counter.name))
+        lines.append('{} {}'.format(counter.name, counter.value))
+    for summary in LATENCY_SUMMARIES:
+        count, total, maximum = summary.snapshot()
+        lines.append('# HELP {} {}'.format(summary.name, summary.help))
+        lines.append('# TYPE {} summary'.format(summary.name))
+        lines.append('{}_count {}'.format(summary.name, count))
+        lines.append('{}_sum {}'.format(summary.name, total))
+        lines.append('# HELP {}_max Maximum of {}'.format(
+            summary.name, summary.help[0].lower() + summary.help[1:]))
+        lines.append('# TYPE {}_max gauge'.format(summary.name))
+        lines.append('{}_max {}'.format(summary.name, maximum))
+    for name, attribute, metric_type, help in [
+        ('metadata_writer_cache_hits_total', 'hits', 'counter',
+         'Cache lookups that hit.'),
+        ('metadata_writer_cache_misses_total', 'misses', 'counter',
+         'Cache lookups that missed.'),
+        ('metadata_writer_cache_hit_ratio', None, 'gauge',
+         'Ratio of cache lookups that hit.'),
+    ]:
+        lines.append('# HELP {} {}'.format(name, help))
+        lines.append('# TYPE {} {}'.format(name, metric_type))
+        for stats in CACHE_STATS:
+            value = (
+                getattr(stats, attribute).value
+                if attribute else stats.hit_ratio)
+            lines.append('{}{{cache="{}"}} {}'.format(name, stats.cache_name,
+                                                      value))
+    return '\n'.join(lines) + '\n'
+
+
+def start_http_server(port: int, routes: dict = None, host: str = ''):
+    """Serves routes on host:port in a daemon thread.
+
+    routes maps paths to functions that return the content type and body of
+    the response, or None to respond with 404. By default, only the metrics
+    are served, at /metrics. The server listens on all interfaces unless a
+    host is given.
+    """
+    if routes is None:
+        routes = {
+            '/metrics':
+                lambda: ('text/plain; version=0.0.4', render_prometheus()),
+        }
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            route = routes.get(self.path.split('?', 1)[0])
+            response = route() if route else None
+            if response is None:
+                self.send_error(404)
+                return
+            content_type, body = response
+            body = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Scrapes would otherwise flood the logs.
+            pass
+
+    server = http.server.ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,168 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import kubernetes
+import urllib3
+
+HTTP_GONE = 410
+RECONNECT_DELAY_SECONDS = 1
+
+
+class ResourceVersionExpired(Exception):
+    """The resource version to resume from is too old (410 Gone)."""
+
+
+class PodInformer:
+    """Streams pod events like a Kubernetes shared informer.
+
+    Pods are listed once, and then watched from the resource version of the
+    list. When a watch times out or its connection is dropped, the next
+    watch resumes from the last seen resource version (kept up to date by
+    bookmark events while no pods change), so pods are not listed again.
+    Pods are only listed again when the resource version has expired, in
+    pages of page_size pods. The resource versions of the pods seen so far
+    are cached, so a relist only yields pods that changed in the meantime.
+
+    namespace=None watches the pods of all namespaces. Pods for which
+    pod_filter returns False are neither yielded nor cached.
+    """
+
+    def __init__(
+        self,
+        k8s_api: kubernetes.client.CoreV1Api,
+        namespace: str = None,
+        label_selector: str = None,
+        page_size: int = 500,
+        watch_timeout_seconds: int = 1800,
+        request_timeout_seconds: int = 2000,
+        pod_filter=None,
+    ):
+        self.k8s_api = k8s_api
+        self.namespace = namespace
+        self.label_selector = label_selector
+        self.page_size = page_size
+        self.watch_timeout_seconds = watch_timeout_seconds
+        self.request_timeout_seconds = request_timeout_seconds
+        self.pod_filter = pod_filter
+        self.resource_version = None
+        self._pod_resource_versions = {}
+        self._watch = kubernetes.watch.Watch()
+
+    def _list_function(self):
+        if self.namespace:
+            return self.k8s_api.list_namespaced_pod
+        return self.k8s_api.list_pod_for_all_namespaces
+
+    def events(self):
+        """Yields pod events, as dicts with the event type and the pod, forever."""
+        while True:
+            try:
+                if self.resource_version is None:
+                    yield from self._relist()
+                yield from self._watch_once()
+            except ResourceVersionExpired:
+                print('Resource version {} expired, listing pods again.'.format(
+                    self.resource_version))
+                self.resource_version = None
+            except (urllib3.exceptions.ProtocolError,
+                    urllib3.exceptions.ReadTimeoutError) as e:
+                # The connection was dropped, or stalled for longer than the
+                # request timeout. The next watch resumes from the last seen
+                # resource version (or restarts the list if it did not finish).
+                print('Watch connection lost, watching again: {}'.format(e))
+                time.sleep(RECONNECT_DELAY_SECONDS)
+            except kubernetes.client.rest.ApiException as e:
+                if e.status != HTTP_GONE:
+                    raise
+                print('Resource version {} expired, listing pods again.'.format(
+                    self.resource_version))
+                self.resource_version = None
+
+    def _relist(self):
+        print('Listing Kubernetes Pods created by Argo')
+        listed_keys = set()
+        continue_token = None
+        while True:
+            kwargs = dict(
+                label_selector=self.label_selector,
+                limit=self.page_size,
+                _request_timeout=self.request_timeout_seconds,
+            )
+            if self.namespace:
+                kwargs['namespace'] = self.namespace
+            if continue_token:
+                kwargs['_continue'] = continue_token
+            # A 410 Gone here means that the continue token expired, and the
+            # list is restarted by events().
+            pod_list = self._list_function()(**kwargs)
+            for pod in pod_list.items:
+                if self.pod_filter and not self.pod_filter(pod):
+                    continue
+                # Items of lists do not have their kind set.
+                pod.kind = 'Pod'
+                key = (pod.metadata.namespace, pod.metadata.name)
+                listed_keys.add(key)
+                previous_resource_version = self._pod_resource_versions.get(key)
+                if previous_resource_version == pod.metadata.resource_version:
+                    continue
+                self._pod_resource_versions[key] = pod.metadata.resource_version
+                event_type = 'ADDED'
+                if previous_resource_version is not None:
+                    event_type = 'MODIFIED'
+                yield {'type': event_type, 'object': pod}
+            continue_token = pod_list.metadata._continue
+            if not continue_token:
+                break
+
+        # Pods that are gone were deleted, or no longer match the selector.
+        for key in set(self._pod_resource_versions) - listed_keys:
+            del self._pod_resource_versions[key]
+        self.resource_version = pod_list.metadata.resource_version
+
+    def _watch_once(self):
+        print('Start watching Kubernetes Pods created by Argo from resource '
+              'version {}'.format(self.resource_version))
+        list_function = self._list_function()
+        kwargs = dict(
+            label_selector=self.label_selector,
+            resource_version=self.resource_version,
+            # Sometimes watch gets stuck
+            timeout_seconds=self.watch_timeout_seconds,
+            # Sometimes HTTP GET gets stuck
+            _request_timeout=self.request_timeout_seconds,
+            allow_watch_bookmarks=True,
+        )
+        if self.namespace:
+            kwargs['namespace'] = self.namespace
+        for event in self._watch.stream(list_function, **kwargs):
+            if event['type'] == 'ERROR':
+                raw_object = event.get('raw_object') or {}
+                if raw_object.get('code') == HTTP_GONE:
+                    raise ResourceVersionExpired()
+                print(event)
+                return
+            obj = event['object']
+            self.resource_version = obj.metadata.resource_version
+            if event['type'] == 'BOOKMARK':
+                continue
+            if self.pod_filter and not self.pod_filter(obj):
+                continue
+            key = (obj.metadata.namespace, obj.metadata.name)
+            if event['type'] == 'DELETED':
+                self._pod_resource_versions.pop(key, None)
+            else:
+                self._pod_resource_versions[key] = obj.metadata.resource_version
+            yield event
@@ -0,0 +1,57 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import threading
+import time
+
+import metrics
+
+
+class PodQueue:
+    """FIFO queue of pods to process.
+
+    An event for a pod that is already queued replaces the queued version of
+    the pod instead of being queued again, so bursts of events for the same
+    pod are coalesced into one processing. put blocks while maxsize pods are
+    queued, which applies backpressure to the watch.
+    """
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._pods = collections.OrderedDict()
+        self._condition = threading.Condition()
+
+    def put(self, pod):
+        key = (pod.metadata.namespace, pod.metadata.name)
+        with self._condition:
+            if key in self._pods:
+                enqueue_time, _ = self._pods[key]
+                self._pods[key] = (enqueue_time, pod)
+                metrics.pod_events_coalesced_total.inc()
+                return
+            with metrics.enqueue_blocked_seconds.time():
+                while len(self._pods) >= self._maxsize:
+                    self._condition.wait()
+            self._pods[key] = (time.monotonic(), pod)
+            self._condition.notify_all()
+
+    def get(self):
+        with self._condition:
+            while not self._pods:
+                self._condition.wait()
+            _, (enqueue_time, pod) = self._pods.popitem(last=False)
+            self._condition.notify_all()
+        metrics.queue_wait_seconds.observe(time.monotonic() - enqueue_time)
+        return pod
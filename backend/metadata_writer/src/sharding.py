@@ -0,0 +1,68 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import re
+
+
+def jump_consistent_hash(key: int, num_buckets: int) -> int:
+    """Maps a 64-bit key to one of num_buckets buckets.
+
+    When the number of buckets changes from n to n + 1, only 1 / (n + 1) of
+    the keys move, all to the new bucket. See "A Fast, Minimal Memory,
+    Consistent Hash Algorithm" by Lamping and Veach.
+    """
+    bucket = -1
+    next_bucket = 0
+    while next_bucket < num_buckets:
+        bucket = next_bucket
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        next_bucket = int(
+            (bucket + 1) * (float(1 << 31) / float((key >> 33) + 1)))
+    return bucket
+
+
+def get_shard(workflow_name: str, shard_count: int) -> int:
+    """Returns the shard of the pods of a workflow.
+
+    The hash is stable across processes (unlike hash()), so all replicas
+    agree on the shards.
+    """
+    key = int.from_bytes(
+        hashlib.sha256(workflow_name.encode()).digest()[:8], 'big')
+    return jump_consistent_hash(key, shard_count)
+
+
+def get_shard_index(shard_index: str, hostname: str, shard_count: int) -> int:
+    """Returns the shard of this replica.
+
+    The shard is shard_index if set, or else the ordinal of the pod of a
+    StatefulSet, which ends the hostname (e.g. metadata-writer-2).
+    """
+    if shard_index:
+        index = int(shard_index)
+    elif shard_count == 1:
+        index = 0
+    else:
+        match = re.search(r'-(\d+)$', hostname or '')
+        if not match:
+            raise ValueError(
+                'Cannot determine the shard of this replica: set METADATA_WRITER_SHARD_INDEX, '
+                'or run the replicas as a StatefulSet. Hostname: {}'.format(
+                    hostname))
+        index = int(match.group(1))
+    if not 0 <= index < shard_count:
+        raise ValueError('Shard index {} is not in [0, {}).'.format(
+            index, shard_count))
+    return index
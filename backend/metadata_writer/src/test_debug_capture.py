@@ -0,0 +1,98 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import kubernetes
+import yaml
+
+import debug_capture
+
+
+def make_pod(name, labels=None):
+    return kubernetes.client.V1Pod(
+        kind='Pod',
+        metadata=kubernetes.client.V1ObjectMeta(
+            name=name, namespace='kubeflow', labels=labels or {}))
+
+
+class TestPodEventRecorder(unittest.TestCase):
+
+    def test_dump(self):
+        recorder = debug_capture.PodEventRecorder(size=10)
+        recorder.record('ADDED', make_pod('a'))
+        recorder.record('MODIFIED', make_pod('b'))
+
+        events = list(yaml.safe_load_all(recorder.dump()))
+        self.assertEqual([(event['type'], event['pod']['metadata']['name'])
+                          for event in events], [('ADDED', 'a'),
+                                                 ('MODIFIED', 'b')])
+        self.assertTrue(events[0]['time'].endswith('Z'))
+
+    def test_oldest_events_are_dropped(self):
+        recorder = debug_capture.PodEventRecorder(size=2)
+        for name in ['a', 'b', 'c']:
+            recorder.record('ADDED', make_pod(name))
+
+        self.assertEqual([
+            event['pod']['metadata']['name']
+            for event in yaml.safe_load_all(recorder.dump())
+        ], ['b', 'c'])
+
+    def test_pod_is_copied(self):
+        recorder = debug_capture.PodEventRecorder(size=10)
+        pod = make_pod('a', labels={'written': 'false'})
+        recorder.record('ADDED', pod)
+        pod.metadata.labels['written'] = 'true'
+
+        [event] = yaml.safe_load_all(recorder.dump())
+        self.assertEqual(event['pod']['metadata']['labels'],
+                         {'written': 'false'})
+
+    def test_disabled(self):
+        for recorder in [
+                debug_capture.PodEventRecorder(size=0),
+                debug_capture.PodEventRecorder(size=10, sample_rate=0),
+        ]:
+            self.assertFalse(recorder.enabled)
+            recorder.record('ADDED', make_pod('a'))
+            self.assertEqual(recorder.dump(), '')
+
+    def test_sampling(self):
+        recorder = debug_capture.PodEventRecorder(size=10, sample_rate=0.5)
+        with mock.patch.object(
+                debug_capture.random, 'random', side_effect=[0.2, 0.7, 0.4]):
+            for name in ['a', 'b', 'c']:
+                recorder.record('ADDED', make_pod(name))
+
+        self.assertEqual([
+            event['pod']['metadata']['name']
+            for event in yaml.safe_load_all(recorder.dump())
+        ], ['a', 'c'])
+
+    def test_dump_to_file(self):
+        recorder = debug_capture.PodEventRecorder(size=10)
+        recorder.record('DELETED', make_pod('a'))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'pod_events.yaml')
+            recorder.dump_to_file(path)
+            with open(path) as f:
+                self.assertEqual(f.read(), recorder.dump())
+
+
+if __name__ == '__main__':
+    unittest.main()
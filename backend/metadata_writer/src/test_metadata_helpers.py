@@ -0,0 +1,442 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from unittest import mock
+
+from ml_metadata import errors
+from ml_metadata.proto import metadata_store_pb2
+
+import metadata_helpers
+
+
+class FakeStore:
+    """In-memory stand-in for the MLMD store methods used by the writer.
+
+    It has no methods to write events, attributions or associations on their
+    own, so helpers must write them with put_execution.
+    """
+
+    def __init__(self):
+        self.types = {}
+        self.artifacts = {}
+        self.executions = {}
+        self.contexts = {}
+        self.events = []
+        self.put_execution_calls = []
+        self.context_lookups = 0
+        self._last_id = 0
+
+    def _new_id(self):
+        self._last_id += 1
+        return self._last_id
+
+    def get_artifact_type(self, type_name):
+        return self._get_type(type_name)
+
+    def get_execution_type(self, type_name):
+        return self._get_type(type_name)
+
+    def get_context_type(self, type_name):
+        return self._get_type(type_name)
+
+    def _get_type(self, type_name):
+        if type_name not in self.types:
+            raise errors.NotFoundError('Type {} not found'.format(type_name))
+        return self.types[type_name]
+
+    def put_artifact_type(self, artifact_type):
+        return self._put_type(artifact_type)
+
+    def put_execution_type(self, execution_type):
+        return self._put_type(execution_type)
+
+    def put_context_type(self, context_type):
+        return self._put_type(context_type)
+
+    def _put_type(self, type_proto):
+        type_proto.id = self._new_id()
+        self.types[type_proto.name] = type_proto
+        return type_proto.id
+
+    def get_context_by_type_and_name(self, type_name, context_name):
+        self.context_lookups += 1
+        context_type = self._get_type(type_name)
+        for context in self.contexts.values():
+            if (context.type_id == context_type.id and
+                    context.name == context_name):
+                return context
+        return None
+
+    def put_contexts(self, contexts):
+        for context in contexts:
+            context.id = self._new_id()
+            self.contexts[context.id] = context
+        return [context.id for context in contexts]
+
+    def get_artifacts_by_uri(self, uri):
+        return [
+            artifact for _, artifact in sorted(self.artifacts.items())
+            if artifact.uri == uri
+        ]
+
+    def get_executions_by_id(self, execution_ids):
+        return [self.executions[id] for id in execution_ids]
+
+    def get_contexts_by_id(self, context_ids):
+        return [self.contexts[id] for id in context_ids]
+
+    def put_execution(self, execution, artifact_and_events, contexts):
+        self.put_execution_calls.append(
+            (execution, artifact_and_events, contexts))
+        if not execution.HasField('id'):
+            execution.id = self._new_id()
+        self.executions[execution.id] = execution
+        artifact_ids = []
+        for artifact, event in artifact_and_events:
+            if not artifact.HasField('id'):
+                artifact.id = self._new_id()
+            self.artifacts[artifact.id] = artifact
+            artifact_ids.append(artifact.id)
+            if event is not None:
+                event.execution_id = execution.id
+                event.artifact_id = artifact.id
+                self.events.append(event)
+        return execution.id, artifact_ids, [context.id for context in contexts]
+
+
+def reset_caches():
+    for cache_name in [
+            'artifact_type_cache', 'execution_type_cache', 'context_type_cache',
+            'context_cache'
+    ]:
+        setattr(metadata_helpers, cache_name,
+                metadata_helpers.TTLCache(size=100, ttl_seconds=3600))
+
+
+def make_artifact(store, uri):
+    artifact = metadata_store_pb2.Artifact(uri=uri, id=store._new_id())
+    store.artifacts[artifact.id] = artifact
+    return artifact
+
+
+def make_run_context(store, run_id='my-run'):
+    context = metadata_store_pb2.Context(
+        name=run_id, type_id=store._new_id(), id=store._new_id())
+    store.contexts[context.id] = context
+    return context
+
+
+def event_names(events):
+    return [event.path.steps[0].key for event in events]
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def test_hit_and_miss(self):
+        cache = metadata_helpers.TTLCache(size=10, ttl_seconds=60)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', 1)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_expiry(self):
+        cache = metadata_helpers.TTLCache(size=10, ttl_seconds=60)
+        with mock.patch.object(
+                metadata_helpers.time, 'monotonic', return_value=1000):
+            cache.put('a', 1)
+        with mock.patch.object(
+                metadata_helpers.time, 'monotonic', return_value=1059):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch.object(
+                metadata_helpers.time, 'monotonic', return_value=1060):
+            self.assertIsNone(cache.get('a'))
+        # the expired entry is removed
+        with mock.patch.object(
+                metadata_helpers.time, 'monotonic', return_value=1000):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_put_renews_expiry(self):
+        cache = metadata_helpers.TTLCache(size=10, ttl_seconds=60)
+        with mock.patch.object(
+                metadata_helpers.time, 'monotonic', return_value=1000):
+            cache.put('a', 1)
+        with mock.patch.object(
+                metadata_helpers.time, 'monotonic', return_value=1030):
+            cache.put('a', 2)
+        with mock.patch.object(
+                metadata_helpers.time, 'monotonic', return_value=1080):
+            self.assertEqual(cache.get('a'), 2)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = metadata_helpers.TTLCache(size=2, ttl_seconds=60)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+
+class TestContextLookup(unittest.TestCase):
+
+    def setUp(self):
+        reset_caches()
+        self.store = FakeStore()
+
+    def test_context_type_not_found_creates_context(self):
+        # the store raises NotFoundError while the context type does not
+        # exist
+        with self.assertRaises(ValueError):
+            metadata_helpers.get_context_by_type_and_name(
+                self.store, metadata_helpers.RUN_CONTEXT_TYPE_NAME, 'my-run')
+
+        context = metadata_helpers.get_or_create_run_context(
+            self.store, 'my-run')
+
+        self.assertEqual(context.name, 'my-run')
+        self.assertEqual(
+            context.type_id,
+            self.store.types[metadata_helpers.RUN_CONTEXT_TYPE_NAME].id)
+        self.assertEqual(list(self.store.contexts.values()), [context])
+
+    def test_context_not_found_creates_context(self):
+        first = metadata_helpers.get_or_create_run_context(
+            self.store, 'first-run')
+        # the store returns None for a missing context of an existing type
+        second = metadata_helpers.get_or_create_run_context(
+            self.store, 'second-run')
+
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual(second.type_id, first.type_id)
+        self.assertEqual(len(self.store.contexts), 2)
+
+    def test_created_context_is_cached(self):
+        context = metadata_helpers.get_or_create_run_context(
+            self.store, 'my-run')
+        lookups = self.store.context_lookups
+
+        self.assertEqual(
+            metadata_helpers.get_or_create_run_context(self.store, 'my-run'),
+            context)
+        self.assertEqual(self.store.context_lookups, lookups)
+        self.assertEqual(len(self.store.contexts), 1)
+
+    def test_found_context_is_cached(self):
+        context = make_run_context(self.store)
+        self.store.types[metadata_helpers.RUN_CONTEXT_TYPE_NAME] = (
+            metadata_store_pb2.ContextType(
+                id=context.type_id,
+                name=metadata_helpers.RUN_CONTEXT_TYPE_NAME))
+
+        for _ in range(3):
+            self.assertEqual(
+                metadata_helpers.get_context_by_type_and_name(
+                    self.store, metadata_helpers.RUN_CONTEXT_TYPE_NAME,
+                    'my-run'), context)
+        self.assertEqual(self.store.context_lookups, 1)
+
+    def test_misses_are_not_cached(self):
+        metadata_helpers.get_or_create_run_context(self.store, 'other-run')
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                metadata_helpers.get_context_by_type_and_name(
+                    self.store, metadata_helpers.RUN_CONTEXT_TYPE_NAME,
+                    'my-run')
+        self.assertEqual(self.store.context_lookups, 3)
+
+        # a context created elsewhere is found by the next lookup
+        context = make_run_context(self.store)
+        context.type_id = self.store.types[
+            metadata_helpers.RUN_CONTEXT_TYPE_NAME].id
+        self.assertEqual(
+            metadata_helpers.get_context_by_type_and_name(
+                self.store, metadata_helpers.RUN_CONTEXT_TYPE_NAME, 'my-run'),
+            context)
+
+    def test_expired_context_is_looked_up_again(self):
+        with mock.patch.object(
+                metadata_helpers.time, 'monotonic', return_value=1000):
+            context = metadata_helpers.get_or_create_run_context(
+                self.store, 'my-run')
+        lookups = self.store.context_lookups
+        with mock.patch.object(
+                metadata_helpers.time, 'monotonic', return_value=1000 + 3600):
+            self.assertEqual(
+                metadata_helpers.get_or_create_run_context(
+                    self.store, 'my-run'), context)
+
+        self.assertEqual(self.store.context_lookups, lookups + 1)
+        self.assertEqual(len(self.store.contexts), 1)
+
+
+class TestInputArtifacts(unittest.TestCase):
+
+    def setUp(self):
+        reset_caches()
+        self.store = FakeStore()
+
+    def test_get_input_artifacts(self):
+        first = make_artifact(self.store, 'gs://bucket/first')
+        make_artifact(self.store, 'gs://bucket/second')
+        second = make_artifact(self.store, 'gs://bucket/second')
+
+        artifacts_and_input_names = metadata_helpers.get_input_artifacts(
+            self.store, [
+                ('gs://bucket/first', 'a'),
+                ('gs://bucket/missing', 'b'),
+                ('gs://bucket/second', 'c'),
+            ])
+
+        # missing artifacts are skipped, and the last of several
+        # artifacts with the same URI is used
+        self.assertEqual(artifacts_and_input_names, [(first, 'a'),
+                                                     (second, 'c')])
+
+    def test_execution_is_created_with_its_inputs_in_one_call(self):
+        run_context = make_run_context(self.store)
+        artifact = make_artifact(self.store, 'gs://bucket/first')
+
+        execution = metadata_helpers.create_new_execution_in_existing_run_context(
+            store=self.store,
+            execution_type_name='components.my-component',
+            context=run_context,
+            pod_name='my-pod',
+            run_id='my-run',
+            input_artifacts_and_names=[(artifact, 'a')],
+        )
+
+        self.assertEqual(len(self.store.put_execution_calls), 1)
+        _, artifact_and_events, contexts = self.store.put_execution_calls[0]
+        self.assertEqual(contexts, [run_context])
+        self.assertEqual([artifact for artifact, _ in artifact_and_events],
+                         [artifact])
+        self.assertTrue(execution.id)
+        self.assertEqual(execution.type_id,
+                         self.store.types['components.my-component'].id)
+        self.assertEqual(
+            execution.custom_properties[
+                metadata_helpers.KFP_POD_NAME_EXECUTION_PROPERTY_NAME]
+            .string_value, 'my-pod')
+        [event] = self.store.events
+        self.assertEqual(event.type, metadata_store_pb2.Event.INPUT)
+        self.assertEqual(event.execution_id, execution.id)
+        self.assertEqual(event.artifact_id, artifact.id)
+        self.assertEqual(event_names([event]), ['a'])
+
+    def test_execution_without_inputs(self):
+        run_context = make_run_context(self.store)
+
+        metadata_helpers.create_new_execution_in_existing_run_context(
+            store=self.store,
+            execution_type_name='components.my-component',
+            context=run_context,
+            pod_name='my-pod',
+        )
+
+        self.assertEqual(len(self.store.put_execution_calls), 1)
+        self.assertEqual(self.store.put_execution_calls[0][1], [])
+
+
+class TestOutputArtifacts(unittest.TestCase):
+
+    def setUp(self):
+        reset_caches()
+        self.store = FakeStore()
+        self.run_context = make_run_context(self.store)
+        self.execution = metadata_helpers.create_new_execution_in_existing_run_context(
+            store=self.store,
+            execution_type_name='components.my-component',
+            context=self.run_context,
+            pod_name='my-pod',
+        )
+        self.store.put_execution_calls.clear()
+
+    def test_outputs_are_created_in_one_call(self):
+        argo_artifact = {'name': 'my-component-model', 's3': {'key': 'model'}}
+        artifacts = metadata_helpers.create_new_output_artifacts(
+            store=self.store,
+            execution_id=self.execution.id,
+            context_id=self.run_context.id,
+            outputs=[
+                dict(
+                    uri='gs://bucket/model',
+                    type_name='Model',
+                    output_name='model',
+                    argo_artifact=argo_artifact),
+                dict(
+                    uri='gs://bucket/metrics',
+                    type_name='NoType',
+                    output_name='metrics',
+                    argo_artifact=None),
+            ],
+            run_id='my-run',
+        )
+
+        self.assertEqual(len(self.store.put_execution_calls), 1)
+        execution, artifact_and_events, contexts = (
+            self.store.put_execution_calls[0])
+        # the stored execution and context are passed, so that they are not
+        # overwritten with empty ones
+        self.assertEqual(execution, self.execution)
+        self.assertEqual(contexts, [self.run_context])
+        self.assertEqual([artifact for artifact, _ in artifact_and_events],
+                         artifacts)
+
+        self.assertEqual([artifact.uri for artifact in artifacts],
+                         ['gs://bucket/model', 'gs://bucket/metrics'])
+        self.assertTrue(all(artifact.id for artifact in artifacts))
+        self.assertEqual(artifacts[0].type_id, self.store.types['Model'].id)
+        self.assertEqual(artifacts[1].type_id, self.store.types['NoType'].id)
+        custom_properties = artifacts[0].custom_properties
+        self.assertEqual(
+            custom_properties[
+                metadata_helpers.ARTIFACT_IO_NAME_PROPERTY_NAME].string_value,
+            'model')
+        self.assertEqual(
+            custom_properties[
+                metadata_helpers.ARTIFACT_RUN_ID_PROPERTY_NAME].string_value,
+            'my-run')
+        self.assertEqual(
+            json.loads(custom_properties[
+                metadata_helpers.ARTIFACT_ARGO_ARTIFACT_PROPERTY_NAME]
+                       .string_value), argo_artifact)
+        self.assertNotIn(metadata_helpers.ARTIFACT_ARGO_ARTIFACT_PROPERTY_NAME,
+                         artifacts[1].custom_properties)
+
+        self.assertEqual([event.type for event in self.store.events],
+                         [metadata_store_pb2.Event.OUTPUT] * 2)
+        self.assertEqual(event_names(self.store.events), ['model', 'metrics'])
+        self.assertEqual([event.artifact_id for event in self.store.events],
+                         [artifact.id for artifact in artifacts])
+
+    def test_no_outputs(self):
+        artifacts = metadata_helpers.create_new_output_artifacts(
+            store=self.store,
+            execution_id=self.execution.id,
+            context_id=self.run_context.id,
+            outputs=[],
+        )
+
+        self.assertEqual(artifacts, [])
+        self.assertEqual(self.store.put_execution_calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
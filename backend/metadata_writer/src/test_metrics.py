@@ -0,0 +1,134 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+import urllib.error
+import urllib.request
+
+import metrics
+
+
+class TestRenderPrometheus(unittest.TestCase):
+
+    def setUp(self):
+        self.counter = metrics.Counter('my_events_total', 'My events.')
+        self.summary = metrics.LatencySummary('my_seconds', 'Time of my work.')
+        self.cache_stats = metrics.CacheStats('my_cache')
+        for patch in [
+                mock.patch.object(metrics, 'COUNTERS', [self.counter]),
+                mock.patch.object(metrics, 'LATENCY_SUMMARIES', [self.summary]),
+                mock.patch.object(metrics, 'CACHE_STATS', [self.cache_stats]),
+        ]:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_render(self):
+        self.counter.inc()
+        self.counter.inc(2)
+        self.summary.observe(0.5)
+        self.summary.observe(1.5)
+        for hit in [True, True, True, False]:
+            self.cache_stats.record(hit)
+
+        self.assertEqual(
+            metrics.render_prometheus(), '\n'.join([
+                '# HELP my_events_total My events.',
+                '# TYPE my_events_total counter',
+                'my_events_total 3',
+                '# HELP my_seconds Time of my work.',
+                '# TYPE my_seconds summary',
+                'my_seconds_count 2',
+                'my_seconds_sum 2.0',
+                '# HELP my_seconds_max Maximum of time of my work.',
+                '# TYPE my_seconds_max gauge',
+                'my_seconds_max 1.5',
+                '# HELP metadata_writer_cache_hits_total Cache lookups that hit.',
+                '# TYPE metadata_writer_cache_hits_total counter',
+                'metadata_writer_cache_hits_total{cache="my_cache"} 3',
+                '# HELP metadata_writer_cache_misses_total Cache lookups that missed.',
+                '# TYPE metadata_writer_cache_misses_total counter',
+                'metadata_writer_cache_misses_total{cache="my_cache"} 1',
+                '# HELP metadata_writer_cache_hit_ratio Ratio of cache lookups that hit.',
+                '# TYPE metadata_writer_cache_hit_ratio gauge',
+                'metadata_writer_cache_hit_ratio{cache="my_cache"} 0.75',
+            ]) + '\n')
+
+    def test_render_without_observations(self):
+        rendered = metrics.render_prometheus()
+
+        self.assertIn('my_events_total 0\n', rendered)
+        self.assertIn('my_seconds_count 0\n', rendered)
+        self.assertIn('my_seconds_max 0.0\n', rendered)
+        self.assertIn('metadata_writer_cache_hit_ratio{cache="my_cache"} 0.0\n',
+                      rendered)
+
+    def test_format_summary(self):
+        self.counter.inc()
+        self.summary.observe(1.0)
+        self.summary.observe(3.0)
+
+        self.assertEqual(
+            metrics.format_summary(),
+            'my_events_total=1, my_seconds(count=2, avg=2.000, max=3.000), '
+            'my_cache_hit_ratio=0.000')
+
+
+class TestHttpServer(unittest.TestCase):
+
+    def start_server(self, **kwargs):
+        server = metrics.start_http_server(0, **kwargs)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def get(self, server, path):
+        host, port = server.server_address
+        with urllib.request.urlopen(
+                'http://{}:{}{}'.format(
+                    '127.0.0.1' if host == '0.0.0.0' else host, port, path),
+                timeout=5) as response:
+            return response.headers['Content-Type'], response.read().decode()
+
+    def test_metrics(self):
+        server = self.start_server()
+
+        content_type, body = self.get(server, '/metrics')
+        self.assertEqual(content_type, 'text/plain; version=0.0.4')
+        self.assertIn('# TYPE metadata_writer_pod_events_total counter', body)
+        self.assertEqual(server.server_address[0], '0.0.0.0')
+        with self.assertRaises(urllib.error.HTTPError) as error:
+            self.get(server, '/debug/pod_events')
+        self.assertEqual(error.exception.code, 404)
+
+    def test_routes_on_localhost(self):
+        server = self.start_server(
+            host='127.0.0.1',
+            routes={
+                '/debug/found': lambda: ('application/yaml', 'a: 1\n'),
+                '/debug/not_found': lambda: None,
+            })
+
+        self.assertEqual(server.server_address[0], '127.0.0.1')
+        self.assertEqual(
+            self.get(server, '/debug/found?x=1'),
+            ('application/yaml', 'a: 1\n'))
+        for path in ['/debug/not_found', '/metrics']:
+            with self.assertRaises(urllib.error.HTTPError) as error:
+                self.get(server, path)
+            self.assertEqual(error.exception.code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
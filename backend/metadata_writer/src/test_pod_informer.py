@@ -0,0 +1,256 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+import unittest
+from unittest import mock
+
+import kubernetes
+import urllib3
+
+import pod_informer
+
+
+class EndOfScript(Exception):
+    """Raised once the fake API has nothing left to return."""
+
+
+def make_pod(name, resource_version, namespace='kubeflow'):
+    return SimpleNamespace(
+        kind=None,
+        metadata=SimpleNamespace(
+            name=name, namespace=namespace, resource_version=resource_version))
+
+
+def make_event(event_type, name, resource_version):
+    return {
+        'type': event_type,
+        'object': make_pod(name, resource_version),
+    }
+
+
+def make_list(pods, resource_version, continue_token=None):
+    return SimpleNamespace(
+        items=pods,
+        metadata=SimpleNamespace(
+            resource_version=resource_version, _continue=continue_token))
+
+
+class FakeApi:
+    """Returns scripted pod lists and watch sessions.
+
+    Each watch session is a list of events, or an exception to raise.
+    """
+
+    def __init__(self, lists, watches):
+        self.lists = list(lists)
+        self.watches = list(watches)
+        self.list_calls = []
+        self.watch_calls = []
+
+    def list_pod_for_all_namespaces(self, **kwargs):
+        self.list_calls.append(kwargs)
+        if not self.lists:
+            raise EndOfScript()
+        return self.lists.pop(0)
+
+    def stream(self, list_function, **kwargs):
+        self.watch_calls.append(kwargs)
+        if not self.watches:
+            raise EndOfScript()
+        session = self.watches.pop(0)
+        if isinstance(session, Exception):
+            raise session
+        yield from session
+
+
+def make_informer(api, **kwargs):
+    informer = pod_informer.PodInformer(api, **kwargs)
+    informer._watch = api
+    return informer
+
+
+def collect_events(informer):
+    events = []
+    with mock.patch.object(pod_informer.time, 'sleep'):
+        try:
+            for event in informer.events():
+                events.append((event['type'], event['object'].metadata.name))
+        except EndOfScript:
+            pass
+    return events
+
+
+class TestPodInformer(unittest.TestCase):
+
+    def test_list_then_watch(self):
+        api = FakeApi(
+            lists=[make_list(
+                [make_pod('a', '1'), make_pod('b', '2')], '10')],
+            watches=[[
+                make_event('MODIFIED', 'a', '11'),
+                make_event('DELETED', 'b', '12'),
+            ]])
+        informer = make_informer(
+            api, label_selector='workflows.argoproj.io/workflow')
+
+        self.assertEqual(
+            collect_events(informer), [('ADDED', 'a'), ('ADDED', 'b'),
+                                       ('MODIFIED', 'a'), ('DELETED', 'b')])
+        self.assertEqual(api.watch_calls[0]['resource_version'], '10')
+        self.assertTrue(api.watch_calls[0]['allow_watch_bookmarks'])
+        self.assertEqual(api.watch_calls[0]['label_selector'],
+                         'workflows.argoproj.io/workflow')
+        # the next watch resumes from the last event
+        self.assertEqual(api.watch_calls[1]['resource_version'], '12')
+        self.assertEqual(len(api.list_calls), 1)
+        self.assertEqual(informer._pod_resource_versions,
+                         {('kubeflow', 'a'): '11'})
+
+    def test_list_in_pages(self):
+        api = FakeApi(
+            lists=[
+                make_list([make_pod('a', '1')], '10', continue_token='next'),
+                make_list([make_pod('b', '2')], '10'),
+            ],
+            watches=[])
+        informer = make_informer(api, page_size=1)
+
+        self.assertEqual(
+            collect_events(informer), [('ADDED', 'a'), ('ADDED', 'b')])
+        self.assertEqual(api.list_calls[0]['limit'], 1)
+        self.assertNotIn('_continue', api.list_calls[0])
+        self.assertEqual(api.list_calls[1]['_continue'], 'next')
+        self.assertEqual(informer.resource_version, '10')
+
+    def test_bookmarks_are_not_yielded(self):
+        api = FakeApi(
+            lists=[make_list([], '10')],
+            watches=[[make_event('BOOKMARK', '', '20')]])
+        informer = make_informer(api)
+
+        self.assertEqual(collect_events(informer), [])
+        self.assertEqual(api.watch_calls[1]['resource_version'], '20')
+
+    def test_expired_resource_version_relists_changed_pods(self):
+        expired = {
+            'type': 'ERROR',
+            'object': None,
+            'raw_object': {
+                'code': 410
+            },
+        }
+        api = FakeApi(
+            lists=[
+                make_list([
+                    make_pod('unchanged', '1'),
+                    make_pod('changed', '2'),
+                    make_pod('deleted', '3'),
+                ], '10'),
+                make_list([
+                    make_pod('unchanged', '1'),
+                    make_pod('changed', '15'),
+                    make_pod('new', '16'),
+                ], '20'),
+            ],
+            watches=[[expired]])
+        informer = make_informer(api)
+
+        self.assertEqual(
+            collect_events(informer),
+            [('ADDED', 'unchanged'), ('ADDED', 'changed'), ('ADDED', 'deleted'),
+             ('MODIFIED', 'changed'), ('ADDED', 'new')])
+        self.assertEqual(len(api.list_calls), 2)
+        self.assertEqual(
+            informer._pod_resource_versions, {
+                ('kubeflow', 'unchanged'): '1',
+                ('kubeflow', 'changed'): '15',
+                ('kubeflow', 'new'): '16',
+            })
+        self.assertEqual(api.watch_calls[1]['resource_version'], '20')
+
+    def test_gone_api_exception_relists(self):
+        api = FakeApi(
+            lists=[
+                make_list([make_pod('a', '1')], '10'),
+                make_list([make_pod('a', '1')], '20')
+            ],
+            watches=[kubernetes.client.rest.ApiException(status=410)])
+        informer = make_informer(api)
+
+        self.assertEqual(collect_events(informer), [('ADDED', 'a')])
+        self.assertEqual(len(api.list_calls), 2)
+        self.assertEqual(api.watch_calls[1]['resource_version'], '20')
+
+    def test_other_api_exceptions_are_raised(self):
+        api = FakeApi(
+            lists=[make_list([], '10')],
+            watches=[kubernetes.client.rest.ApiException(status=403)])
+        informer = make_informer(api)
+
+        with self.assertRaises(kubernetes.client.rest.ApiException):
+            collect_events(informer)
+
+    def test_other_error_events_watch_again(self):
+        error = {
+            'type': 'ERROR',
+            'object': None,
+            'raw_object': {
+                'code': 500
+            },
+        }
+        api = FakeApi(
+            lists=[make_list([], '10')],
+            watches=[[error, make_event('ADDED', 'ignored', '11')]])
+        informer = make_informer(api)
+
+        self.assertEqual(collect_events(informer), [])
+        self.assertEqual(len(api.list_calls), 1)
+        self.assertEqual(api.watch_calls[1]['resource_version'], '10')
+
+    def test_lost_connection_watches_again(self):
+        api = FakeApi(
+            lists=[make_list([], '10')],
+            watches=[
+                [make_event('ADDED', 'a', '11')],
+                urllib3.exceptions.ProtocolError('Connection broken'),
+            ])
+        informer = make_informer(api)
+
+        self.assertEqual(collect_events(informer), [('ADDED', 'a')])
+        self.assertEqual(len(api.list_calls), 1)
+        self.assertEqual([call['resource_version'] for call in api.watch_calls],
+                         ['10', '11', '11'])
+
+    def test_pod_filter(self):
+        api = FakeApi(
+            lists=[make_list(
+                [make_pod('a', '1'), make_pod('b', '2')], '10')],
+            watches=[[
+                make_event('MODIFIED', 'b', '11'),
+                make_event('MODIFIED', 'a', '12'),
+            ]])
+        informer = make_informer(
+            api, pod_filter=lambda pod: pod.metadata.name == 'a')
+
+        self.assertEqual(
+            collect_events(informer), [('ADDED', 'a'), ('MODIFIED', 'a')])
+        self.assertEqual(informer._pod_resource_versions,
+                         {('kubeflow', 'a'): '12'})
+        # filtered events still advance the resource version
+        self.assertEqual(api.watch_calls[1]['resource_version'], '12')
+
+
+if __name__ == '__main__':
+    unittest.main()
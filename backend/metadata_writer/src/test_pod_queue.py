@@ -0,0 +1,109 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+import threading
+import unittest
+
+import metrics
+from pod_queue import PodQueue
+
+
+def make_pod(name, resource_version, namespace='kubeflow'):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(
+            name=name, namespace=namespace, resource_version=resource_version))
+
+
+class TestPodQueue(unittest.TestCase):
+
+    def test_fifo(self):
+        queue = PodQueue(maxsize=10)
+        for name in ['a', 'b', 'c']:
+            queue.put(make_pod(name, '1'))
+
+        self.assertEqual([queue.get().metadata.name for _ in range(3)],
+                         ['a', 'b', 'c'])
+
+    def test_events_for_a_queued_pod_are_coalesced(self):
+        queue = PodQueue(maxsize=10)
+        coalesced = metrics.pod_events_coalesced_total.value
+        queue.put(make_pod('a', '1'))
+        queue.put(make_pod('b', '2'))
+        queue.put(make_pod('a', '3'))
+        queue.put(make_pod('a', '4'))
+
+        # the pod keeps its place in the queue, with its latest version
+        first = queue.get()
+        self.assertEqual((first.metadata.name, first.metadata.resource_version),
+                         ('a', '4'))
+        self.assertEqual(queue.get().metadata.name, 'b')
+        self.assertEqual(metrics.pod_events_coalesced_total.value - coalesced,
+                         2)
+
+        # once taken off the queue, the pod is queued again
+        queue.put(make_pod('a', '5'))
+        self.assertEqual(queue.get().metadata.resource_version, '5')
+
+    def test_pods_in_different_namespaces_are_not_coalesced(self):
+        queue = PodQueue(maxsize=10)
+        queue.put(make_pod('a', '1', namespace='first'))
+        queue.put(make_pod('a', '2', namespace='second'))
+
+        self.assertEqual([queue.get().metadata.namespace for _ in range(2)],
+                         ['first', 'second'])
+
+    def test_put_blocks_while_full(self):
+        queue = PodQueue(maxsize=2)
+        queue.put(make_pod('a', '1'))
+        queue.put(make_pod('b', '1'))
+        put_done = threading.Event()
+
+        def put():
+            queue.put(make_pod('c', '1'))
+            put_done.set()
+
+        thread = threading.Thread(target=put, daemon=True)
+        thread.start()
+        self.assertFalse(put_done.wait(0.2))
+
+        self.assertEqual(queue.get().metadata.name, 'a')
+        self.assertTrue(put_done.wait(5))
+        thread.join(5)
+        self.assertEqual([queue.get().metadata.name for _ in range(2)],
+                         ['b', 'c'])
+
+    def test_coalescing_does_not_block_while_full(self):
+        queue = PodQueue(maxsize=1)
+        queue.put(make_pod('a', '1'))
+        queue.put(make_pod('a', '2'))
+
+        self.assertEqual(queue.get().metadata.resource_version, '2')
+
+    def test_get_blocks_while_empty(self):
+        queue = PodQueue(maxsize=1)
+        pods = []
+        thread = threading.Thread(
+            target=lambda: pods.append(queue.get()), daemon=True)
+        thread.start()
+        thread.join(0.2)
+        self.assertEqual(pods, [])
+
+        queue.put(make_pod('a', '1'))
+        thread.join(5)
+        self.assertEqual([pod.metadata.name for pod in pods], ['a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
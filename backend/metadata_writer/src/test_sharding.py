@@ -0,0 +1,97 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import sharding
+
+WORKFLOW_NAMES = ['workflow-{}'.format(i) for i in range(1000)]
+
+
+class TestJumpConsistentHash(unittest.TestCase):
+
+    def test_single_bucket(self):
+        for key in range(100):
+            self.assertEqual(sharding.jump_consistent_hash(key, 1), 0)
+
+    def test_buckets_in_range(self):
+        for key in range(1000):
+            self.assertIn(sharding.jump_consistent_hash(key, 7), range(7))
+
+    def test_adding_a_bucket_only_moves_keys_to_it(self):
+        for key in range(1000):
+            before = sharding.jump_consistent_hash(key, 4)
+            after = sharding.jump_consistent_hash(key, 5)
+            self.assertIn(after, (before, 4))
+
+
+class TestGetShard(unittest.TestCase):
+
+    def test_stable_assignment(self):
+        # The shards must not depend on the process (e.g. on hash
+        # randomization), or replicas would disagree on them.
+        self.assertEqual(
+            [sharding.get_shard(name, 3) for name in WORKFLOW_NAMES[:3]],
+            [1, 0, 0])
+        self.assertEqual(
+            [sharding.get_shard(name, 5) for name in WORKFLOW_NAMES[:3]],
+            [1, 4, 0])
+        self.assertEqual(sharding.get_shard('my-pipeline-x7k2p', 5), 2)
+
+    def test_all_shards_used(self):
+        shards = [sharding.get_shard(name, 4) for name in WORKFLOW_NAMES]
+        for shard in range(4):
+            self.assertGreater(shards.count(shard), 200)
+
+    def test_adding_a_shard_moves_few_workflows(self):
+        moved = [
+            name for name in WORKFLOW_NAMES
+            if sharding.get_shard(name, 4) != sharding.get_shard(name, 5)
+        ]
+        self.assertLess(len(moved), 300)
+
+
+class TestGetShardIndex(unittest.TestCase):
+
+    def test_explicit_index(self):
+        self.assertEqual(
+            sharding.get_shard_index('2', 'metadata-writer-0', 3), 2)
+
+    def test_index_from_stateful_set_hostname(self):
+        self.assertEqual(
+            sharding.get_shard_index('', 'metadata-writer-1', 3), 1)
+        self.assertEqual(
+            sharding.get_shard_index(None, 'metadata-writer-12', 13), 12)
+
+    def test_single_shard(self):
+        self.assertEqual(
+            sharding.get_shard_index(None, 'metadata-writer-7b9f4-x2z', 1), 0)
+
+    def test_invalid_index(self):
+        with self.assertRaisesRegex(ValueError, r'Shard index 3 is not in'):
+            sharding.get_shard_index('3', 'metadata-writer-0', 3)
+        with self.assertRaisesRegex(ValueError, r'Shard index 4 is not in'):
+            sharding.get_shard_index(None, 'metadata-writer-4', 3)
+        with self.assertRaises(ValueError):
+            sharding.get_shard_index('-1', 'metadata-writer-0', 3)
+
+    def test_missing_hostname(self):
+        with self.assertRaisesRegex(ValueError, r'StatefulSet'):
+            sharding.get_shard_index(None, None, 3)
+        with self.assertRaisesRegex(ValueError, r'StatefulSet'):
+            sharding.get_shard_index(None, 'metadata-writer-7b9f4-x2z', 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,5 +20,32 @@ __version__ = '2.0.0-rc.1'
 
 TYPE_CHECK = True
 
-from kfp import dsl
-from kfp.client import Client
+import importlib
+
+# kfp.dsl, kfp.Client and the other submodules that `import kfp` used to
+# import are imported on first access, so that modules that do not need
+# them, such as kfp.components.executor_main in component containers, do not
+# pay for importing the client and its dependencies.
+_LAZY_ATTRIBUTES = {
+    'dsl': ('kfp.dsl', None),
+    'Client': ('kfp.client', 'Client'),
+    'client': ('kfp.client', None),
+    'compiler': ('kfp.compiler', None),
+    'components': ('kfp.components', None),
+    'pipeline_spec': ('kfp.pipeline_spec', None),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module_name, attribute_name = _LAZY_ATTRIBUTES[name]
+    value = importlib.import_module(module_name)
+    if attribute_name is not None:
+        value = getattr(value, attribute_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
@@ -12,11 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
 import functools
 import itertools
 import os
 import re
 import subprocess
+import sys
 import tempfile
 from typing import List
 import unittest
@@ -151,6 +153,13 @@ class TestDslCompile(parameterized.TestCase):
         return runner.invoke(
             cli=cli.cli, args=args, catch_exceptions=False, obj={})
 
+    def invoke_batch(self, args: List[str]) -> testing.Result:
+        starting_args = ['dsl', 'compile-batch']
+        args = starting_args + args
+        runner = testing.CliRunner()
+        return runner.invoke(
+            cli=cli.cli, args=args, catch_exceptions=False, obj={})
+
     def invoke_deprecated(self, args: List[str]) -> testing.Result:
         runner = testing.CliRunner()
         return runner.invoke(
@@ -165,6 +174,180 @@ class TestDslCompile(parameterized.TestCase):
         self.assertIn('Deprecated. Please use `kfp dsl compile` instead.)',
                       res.stdout.decode('utf-8'))
 
+    def test_cache_dir(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            py_file = os.path.join(tmpdir, 'pipeline_for_cache_dir_test.py')
+            with open(py_file, 'w') as f:
+                f.write('from kfp import dsl\n\n'
+                        '@dsl.component\n'
+                        'def comp(x: int) -> int:\n'
+                        '    return x\n\n'
+                        '@dsl.pipeline\n'
+                        'def my_pipeline(x: int):\n'
+                        '    comp(x=comp(x=x).output)\n')
+            cache_dir = os.path.join(tmpdir, 'cache')
+            output = os.path.join(tmpdir, 'pipeline.yaml')
+
+            result = self.invoke(
+                ['--py', py_file, '--output', output, '--cache-dir', cache_dir])
+            self.assertEqual(result.exit_code, 0)
+            self.assertIn('Compilation cache: 0 hit(s), 1 miss(es).',
+                          result.output)
+            self.assertTrue(os.path.exists(output))
+            self.assertTrue(os.listdir(cache_dir))
+
+    def test_compile_batch(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src_dir = os.path.join(tmpdir, 'src')
+            os.makedirs(os.path.join(src_dir, 'nested'))
+            with open(os.path.join(src_dir, 'pipelines.py'), 'w') as f:
+                f.write('from kfp import dsl\n\n'
+                        '@dsl.component\n'
+                        'def comp(x: int) -> int:\n'
+                        '    return x\n\n'
+                        '@dsl.pipeline\n'
+                        'def first(x: int):\n'
+                        '    comp(x=x)\n\n'
+                        '@dsl.pipeline\n'
+                        'def second(x: int):\n'
+                        '    comp(x=x)\n')
+            with open(os.path.join(src_dir, 'nested', 'pipelines.py'),
+                      'w') as f:
+                f.write('from kfp import dsl\n\n'
+                        '@dsl.component\n'
+                        'def comp(x: int) -> int:\n'
+                        '    return x\n\n'
+                        '@dsl.pipeline\n'
+                        'def third(x: int):\n'
+                        '    comp(x=x)\n')
+            with open(os.path.join(src_dir, 'broken.py'), 'w') as f:
+                f.write('raise RuntimeError("broken module")\n')
+            output_dir = os.path.join(tmpdir, 'out')
+
+            result = self.invoke_batch([
+                '--py', src_dir, '--output-dir', output_dir, '--parallelism',
+                '2'
+            ])
+            self.assertEqual(result.exit_code, 1)
+            self.assertIn('RuntimeError: broken module', result.output)
+            self.assertIn(
+                'Compiled 3 pipeline(s) from 3 file(s) with 1 failure(s).',
+                result.output)
+            for path in [
+                    os.path.join('pipelines', 'first.yaml'),
+                    os.path.join('pipelines', 'second.yaml'),
+                    os.path.join('nested', 'pipelines', 'third.yaml'),
+            ]:
+                self.assertTrue(
+                    os.path.exists(os.path.join(output_dir, path)), path)
+
+    def test_compile_python_file_with_same_named_helpers(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            python_files = []
+            for directory in ['first', 'second']:
+                os.makedirs(os.path.join(tmpdir, directory))
+                with open(os.path.join(tmpdir, directory, 'common.py'),
+                          'w') as f:
+                    f.write(f'IMAGE = "{directory}-image"\n')
+                python_file = os.path.join(tmpdir, directory, 'pipelines.py')
+                with open(python_file, 'w') as f:
+                    f.write(
+                        'import common\n'
+                        'from kfp import dsl\n\n'
+                        '@dsl.container_component\n'
+                        'def comp():\n'
+                        '    return dsl.ContainerSpec(image=common.IMAGE)\n\n'
+                        '@dsl.pipeline\n'
+                        'def my_pipeline():\n'
+                        '    comp()\n')
+                python_files.append(python_file)
+            sys_path = list(sys.path)
+
+            for directory, python_file in zip(['first', 'second'],
+                                              python_files):
+                output_dir = os.path.join(tmpdir, 'out', directory)
+                result, = compile_.compile_python_file(python_file, output_dir)
+                self.assertIsNone(result.error)
+                with open(result.package_path) as f:
+                    self.assertIn(f'image: {directory}-image', f.read())
+                self.assertFalse('common' in sys.modules)
+                self.assertEqual(sys.path, sys_path)
+
+    def test_compile_batch_with_glob(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, 'my_pipeline.py'), 'w') as f:
+                f.write('from kfp import dsl\n\n'
+                        '@dsl.component\n'
+                        'def comp():\n'
+                        '    pass\n\n'
+                        '@dsl.pipeline\n'
+                        'def my_pipeline():\n'
+                        '    comp()\n')
+            with open(os.path.join(tmpdir, 'other.txt'), 'w') as f:
+                f.write('not python')
+            output_dir = os.path.join(tmpdir, 'out')
+
+            result = self.invoke_batch([
+                '--py',
+                os.path.join(tmpdir, '*.py'), '--output-dir', output_dir
+            ])
+            self.assertEqual(result.exit_code, 0)
+            self.assertTrue(
+                os.path.exists(
+                    os.path.join(output_dir, 'my_pipeline',
+                                 'my_pipeline.yaml')))
+
+
+class TestRunArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.runner = testing.CliRunner()
+        patcher = mock.patch('kfp.cli.cli.client.Client')
+        self.mock_client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    def invoke(self, *args):
+        return self.runner.invoke(
+            args=['run', 'archive', *args], cli=cli.cli, obj={})
+
+    def test_archive_runs(self):
+        self.mock_client.archive_runs.return_value = [
+            mock.Mock(resource_id='a', succeeded=True),
+            mock.Mock(
+                resource_id='b', succeeded=False, attempts=3, error='gone'),
+        ]
+        self.mock_client.get_run.return_value = mock.Mock(
+            run_id='a',
+            display_name='run-a',
+            state='SUCCEEDED',
+            created_at=datetime.datetime(2023, 1, 1),
+            experiment_id='exp',
+            storage_state='ARCHIVED')
+
+        result = self.invoke('a', 'b', '--parallelism', '2')
+
+        self.mock_client.archive_runs.assert_called_once_with(
+            run_ids=['a', 'b'], filter=None, experiment_id=None, parallelism=2)
+        self.mock_client.get_run.assert_called_once_with(run_id='a')
+        self.assertIn('Failed to archive run b after 3 attempt(s): gone',
+                      result.output)
+        self.assertEqual(result.exit_code, 1)
+
+    def test_archive_runs_of_experiment(self):
+        self.mock_client.archive_runs.return_value = []
+
+        result = self.invoke('--experiment-id', 'exp')
+
+        self.mock_client.archive_runs.assert_called_once_with(
+            run_ids=None, filter=None, experiment_id='exp', parallelism=8)
+        self.assertEqual(result.exit_code, 0)
+
+    def test_archive_requires_runs(self):
+        result = self.invoke()
+
+        self.assertEqual(result.exit_code, 2)
+        self.mock_client.archive_runs.assert_not_called()
+
 
 info_dict = cli.cli.to_info_dict(ctx=click.Context(cli.cli))
 commands_dict = {
@@ -13,17 +13,29 @@
 # limitations under the License.
 """KFP SDK compiler CLI tool."""
 
+from concurrent import futures
+import contextlib
+import dataclasses
+import glob
+import importlib.util
 import json
 import logging
 import os
+import re
 import sys
+import traceback
 import types
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, List, Optional
 
 import click
 from kfp import compiler
+from kfp.compiler import compilation_cache
 from kfp.components import base_component
 from kfp.components import graph_component
+from kfp.components.types import type_utils
+
+# Prefix of the module names under which files are imported by compile-batch.
+_BATCH_MODULE_PREFIX = '_kfp_batch_compile_'
 
 
 def is_pipeline_func(func: Callable) -> bool:
@@ -133,27 +145,299 @@ def parse_parameters(parameters: Optional[str]) -> Dict:
     is_flag=True,
     default=False,
     help='Whether to disable type checking.')
+@click.option(
+    '--cache-dir',
+    type=click.Path(file_okay=False),
+    default=None,
+    help='Directory of a compilation cache. Unchanged components and sub-pipelines are reused from the cache instead of being rebuilt.'
+)
 def compile_(
     py: str,
     output: str,
     function_name: Optional[str] = None,
     pipeline_parameters: Optional[str] = None,
     disable_type_check: bool = False,
+    cache_dir: Optional[str] = None,
 ) -> None:
     """Compiles a pipeline or component written in a .py file."""
-    pipeline_func = collect_pipeline_or_component_func(
-        python_file=py, function_name=function_name)
-    parsed_parameters = parse_parameters(parameters=pipeline_parameters)
-    package_path = os.path.join(os.getcwd(), output)
-    compiler.Compiler().compile(
-        pipeline_func=pipeline_func,
-        pipeline_parameters=parsed_parameters,
-        package_path=package_path,
-        type_check=not disable_type_check)
+    cache = compilation_cache.CompilationCache(
+        cache_dir) if cache_dir is not None else None
+    # Pipelines are built when the module is imported, so the cache must be
+    # active before collecting the pipeline function.
+    with cache or contextlib.nullcontext():
+        pipeline_func = collect_pipeline_or_component_func(
+            python_file=py, function_name=function_name)
+        parsed_parameters = parse_parameters(parameters=pipeline_parameters)
+        package_path = os.path.join(os.getcwd(), output)
+        compiler.Compiler().compile(
+            pipeline_func=pipeline_func,
+            pipeline_parameters=parsed_parameters,
+            package_path=package_path,
+            type_check=not disable_type_check)
 
+    if cache is not None:
+        click.echo(f'Compilation cache: {cache.stats}.', err=True)
     click.echo(package_path)
 
 
+@dataclasses.dataclass
+class BatchCompileResult:
+    """The result of compiling one pipeline in batch mode.
+
+    Attributes:
+        python_file: The .py file in which the pipeline is defined.
+        function_name: The name of the pipeline function. None if the file could not be imported.
+        package_path: The path of the compiled pipeline. None on failure.
+        error: The error message on failure, else None.
+    """
+    python_file: str
+    function_name: Optional[str] = None
+    package_path: Optional[str] = None
+    error: Optional[str] = None
+
+
+def discover_python_files(py: str) -> List[str]:
+    """Finds the .py files in a directory (recursively) or matching a glob
+    pattern.
+
+    Args:
+        py: A directory or a glob pattern, such as ``'pipelines/**/*.py'``.
+
+    Returns:
+        The sorted list of absolute file paths.
+    """
+    if os.path.isdir(py):
+        py = os.path.join(py, '**', '*.py')
+    return sorted(
+        os.path.abspath(path)
+        for path in glob.glob(py, recursive=True)
+        if path.endswith('.py') and os.path.isfile(path))
+
+
+def collect_pipelines_from_module(
+        target_module: types.ModuleType
+) -> Dict[str, base_component.BaseComponent]:
+    """Collects the pipelines defined in a module, excluding pipelines
+    imported from other modules."""
+    return {
+        attr: obj
+        for attr, obj in vars(target_module).items()
+        if is_pipeline_func(obj) and
+        getattr(obj.pipeline_func, '__module__', None) == target_module.__name__
+    }
+
+
+def _init_batch_worker() -> None:
+    # Import the DSL once per worker rather than once per compiled file.
+    import kfp.dsl  # noqa: F401
+
+
+def _is_in_directories(module: types.ModuleType,
+                       directories: List[str]) -> bool:
+    module_file = getattr(module, '__file__', None)
+    if not module_file:
+        return False
+    module_file = os.path.abspath(module_file)
+    return any(
+        module_file.startswith(os.path.join(os.path.abspath(directory), ''))
+        for directory in directories)
+
+
+@contextlib.contextmanager
+def _isolated_imports(directory: str):
+    """Makes ``directory`` importable and undoes the imports made from it.
+
+    Restores ``sys.path`` and ``sys.modules`` on exit, so that helper
+    modules imported by one file (e.g. ``common.py``) are not reused by
+    another file in a different directory that has a helper of the same
+    name. kfp itself and modules imported from outside ``directory`` and
+    the ``sys.path`` entries added in the meantime, such as third-party
+    packages, are kept, since importing them again is slow and would give
+    kfp two copies of its own modules.
+
+    Args:
+        directory: The directory to put first on ``sys.path``.
+    """
+    saved_path = list(sys.path)
+    saved_modules = dict(sys.modules)
+    sys.path.insert(0, directory)
+    try:
+        yield
+    finally:
+        added_directories = [directory] + [
+            path for path in sys.path if path and path not in saved_path
+        ]
+        for name, module in list(sys.modules.items()):
+            if name in saved_modules or name.split('.')[0] == 'kfp':
+                continue
+            if module is None or _is_in_directories(module, added_directories):
+                del sys.modules[name]
+        for name, module in saved_modules.items():
+            if sys.modules.get(name) is not module:
+                sys.modules[name] = module
+        sys.path[:] = saved_path
+
+
+def compile_python_file(
+    python_file: str,
+    output_dir: str,
+    type_check: bool = True,
+    cache_dir: Optional[str] = None,
+) -> List[BatchCompileResult]:
+    """Compiles every pipeline defined in a .py file.
+
+    Errors are captured in the returned results rather than raised so
+    that one faulty pipeline does not abort a batch.
+
+    Args:
+        python_file: The .py file to compile.
+        output_dir: The directory to which to write
+            ``<output_dir>/<function_name>.yaml`` for each pipeline.
+        type_check: Whether to enable type checking.
+        cache_dir: Directory of a compilation cache, if any.
+
+    Returns:
+        One result per pipeline, or a single failed result if the file could not be imported.
+    """
+    cache = compilation_cache.CompilationCache(
+        cache_dir) if cache_dir is not None else None
+    # Give each file a unique module name, since files in different
+    # directories may share a basename.
+    module_name = _BATCH_MODULE_PREFIX + re.sub(
+        r'\W', '_',
+        os.path.splitext(python_file)[0].lstrip(os.sep))
+    with _isolated_imports(os.path.dirname(python_file)):
+        with cache or contextlib.nullcontext(), type_utils.TypeCheckManager(
+                enable=type_check):
+            try:
+                spec = importlib.util.spec_from_file_location(
+                    module_name, python_file)
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
+            except Exception:
+                return [
+                    BatchCompileResult(
+                        python_file=python_file,
+                        error=traceback.format_exc(limit=-1).strip())
+                ]
+
+            results = []
+            for function_name, pipeline_func in collect_pipelines_from_module(
+                    module).items():
+                result = BatchCompileResult(
+                    python_file=python_file, function_name=function_name)
+                package_path = os.path.join(output_dir, f'{function_name}.yaml')
+                try:
+                    os.makedirs(output_dir, exist_ok=True)
+                    compiler.Compiler().compile(
+                        pipeline_func=pipeline_func,
+                        package_path=package_path,
+                        type_check=type_check)
+                    result.package_path = package_path
+                except Exception as e:
+                    result.error = f'{type(e).__name__}: {e}'
+                results.append(result)
+            return results
+
+
+@click.command(name='compile-batch')
+@click.option(
+    '--py',
+    type=str,
+    required=True,
+    help='A directory to search recursively for .py files, or a glob pattern such as "pipelines/**/*.py".'
+)
+@click.option(
+    '--output-dir',
+    type=click.Path(file_okay=False),
+    required=True,
+    help='Directory to write the compiled pipelines to. Each pipeline is written to <output-dir>/<path of .py file without extension>/<function name>.yaml.'
+)
+@click.option(
+    '--parallelism',
+    type=int,
+    default=None,
+    help='Number of worker processes. Defaults to the number of CPUs.')
+@click.option(
+    '--disable-type-check',
+    is_flag=True,
+    default=False,
+    help='Whether to disable type checking.')
+@click.option(
+    '--cache-dir',
+    type=click.Path(file_okay=False),
+    default=None,
+    help='Directory of a compilation cache shared by all workers.')
+def compile_batch(
+    py: str,
+    output_dir: str,
+    parallelism: Optional[int] = None,
+    disable_type_check: bool = False,
+    cache_dir: Optional[str] = None,
+) -> None:
+    """Compiles every pipeline in a directory or glob of .py files.
+
+    Files are compiled in parallel across a process pool. A failing
+    file or pipeline is reported without aborting the rest of the
+    batch; the command exits with a non-zero code if any failed.
+    """
+    python_files = discover_python_files(py)
+    if not python_files:
+        raise click.BadParameter(f'No .py files found for {py!r}.')
+    root_dir = os.path.commonpath(
+        [os.path.dirname(python_file) for python_file in python_files])
+    output_dir = os.path.abspath(output_dir)
+
+    def get_file_output_dir(python_file: str) -> str:
+        return os.path.join(
+            output_dir,
+            os.path.splitext(os.path.relpath(python_file, root_dir))[0])
+
+    parallelism = parallelism or os.cpu_count() or 1
+    results: List[BatchCompileResult] = []
+    with futures.ProcessPoolExecutor(
+            max_workers=min(parallelism, len(python_files)),
+            initializer=_init_batch_worker) as executor:
+        future_to_file = {
+            executor.submit(
+                compile_python_file,
+                python_file=python_file,
+                output_dir=get_file_output_dir(python_file),
+                type_check=not disable_type_check,
+                cache_dir=cache_dir,
+            ): python_file for python_file in python_files
+        }
+        for future in futures.as_completed(future_to_file):
+            try:
+                file_results = future.result()
+            except Exception as e:
+                # e.g., the worker process died
+                file_results = [
+                    BatchCompileResult(
+                        python_file=future_to_file[future],
+                        error=f'{type(e).__name__}: {e}')
+                ]
+            for result in file_results:
+                name = os.path.relpath(result.python_file, root_dir)
+                if result.function_name is not None:
+                    name += f':{result.function_name}'
+                if result.error is None:
+                    click.echo(f'Compiled {name} -> {result.package_path}')
+                else:
+                    click.echo(
+                        f'Failed to compile {name}:\n{result.error}', err=True)
+            results.extend(file_results)
+
+    num_failed = sum(result.error is not None for result in results)
+    num_compiled = len(results) - num_failed
+    click.echo(
+        f'Compiled {num_compiled} pipeline(s) from {len(python_files)} file(s) with {num_failed} failure(s).'
+    )
+    if num_failed:
+        sys.exit(1)
+
+
 def main():
     logging.basicConfig(format='%(message)s', level=logging.INFO)
     try:
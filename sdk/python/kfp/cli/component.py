@@ -13,13 +13,14 @@
 # limitations under the License.
 
 import contextlib
+import hashlib
 import logging
 import pathlib
 import shutil
 import subprocess
 import sys
 import tempfile
-from typing import List, Optional
+from typing import List, Optional, Tuple
 import warnings
 
 import click
@@ -65,6 +66,10 @@ _DOCKERIGNORE_TEMPLATE = f'''
 # in containerized components.
 _COMPONENT_ROOT_DIR = pathlib.Path('/usr/local/src/kfp/components')
 
+# Prefix of the image tag that identifies an image by the content of the
+# build context it was built from.
+_SOURCE_HASH_TAG_PREFIX = 'kfp-src-'
+
 
 @contextlib.contextmanager
 def _registered_modules():
@@ -292,12 +297,63 @@ class ComponentBuilder():
         self._maybe_write_file(_DOCKERFILE, dockerfile_contents,
                                overwrite_dockerfile)
 
-    def build_image(self, platform: str, push_image: bool):
-        logging.info(f'Building image {self._target_image} using Docker...')
+    def compute_source_hash(self, platform: str) -> str:
+        """Computes a hash of the content of the Docker build context.
+
+        Files that are excluded from the build context by the generated
+        .dockerignore file and Python bytecode caches are not included.
+
+        Args:
+            platform: The platform the image is built for.
+
+        Returns:
+            The hex digest of the hash.
+        """
+        source_hash = hashlib.sha256(platform.encode('utf-8'))
+        for path in sorted(self._context_directory.rglob('*')):
+            relative_path = path.relative_to(self._context_directory)
+            if (not path.is_file() or
+                    relative_path.parts[0] == _COMPONENT_METADATA_DIR or
+                    '__pycache__' in relative_path.parts):
+                continue
+            content = path.read_bytes()
+            for part in [relative_path.as_posix().encode('utf-8'), content]:
+                source_hash.update(len(part).to_bytes(8, 'big'))
+                source_hash.update(part)
+        return source_hash.hexdigest()
+
+    def _image_is_up_to_date(self, client: 'docker.DockerClient',
+                             source_hash_image: str, push_image: bool) -> bool:
+        try:
+            if push_image:
+                return client.images.get_registry_data(
+                    source_hash_image).id == client.images.get_registry_data(
+                        self._target_image).id
+            return client.images.get(source_hash_image).id == client.images.get(
+                self._target_image).id
+        except docker.errors.DockerException:
+            return False
+
+    def build_image(self,
+                    platform: str,
+                    push_image: bool,
+                    skip_unchanged: bool = False):
         client = docker.from_env()
 
         docker_log_prefix = 'Docker'
 
+        source_hash_image = None
+        if skip_unchanged:
+            repository, _ = _split_image_tag(self._target_image)
+            source_hash_image = f'{repository}:{_SOURCE_HASH_TAG_PREFIX}{self.compute_source_hash(platform)}'
+            if self._image_is_up_to_date(client, source_hash_image, push_image):
+                logging.info(
+                    f'Image {self._target_image} is already built from the current sources as {source_hash_image}. Skipping the build.'
+                )
+                return
+
+        logging.info(f'Building image {self._target_image} using Docker...')
+
         try:
             context = str(self._context_directory)
             logs = client.api.build(
@@ -320,19 +376,24 @@ class ComponentBuilder():
             logging.error(f'{docker_log_prefix}: {e}')
             raise sys.exit(1)
 
+        images = [self._target_image]
+        if source_hash_image is not None:
+            repository, tag = _split_image_tag(source_hash_image)
+            client.api.tag(self._target_image, repository, tag)
+            images.append(source_hash_image)
+
         if not push_image:
             return
 
-        logging.info(f'Pushing image {self._target_image}...')
-
         try:
-            response = client.images.push(
-                self._target_image, stream=True, decode=True)
-            for log in response:
-                status = log.get('status', '').rstrip('\n')
-                layer = log.get('id', '')
-                if status:
-                    logging.info(f'{docker_log_prefix}: {layer} {status}')
+            for image in images:
+                logging.info(f'Pushing image {image}...')
+                response = client.images.push(image, stream=True, decode=True)
+                for log in response:
+                    status = log.get('status', '').rstrip('\n')
+                    layer = log.get('id', '')
+                    if status:
+                        logging.info(f'{docker_log_prefix}: {layer} {status}')
         except docker.errors.BuildError as e:
             logging.error(f'{docker_log_prefix}: {e}')
             raise e
@@ -341,6 +402,15 @@ class ComponentBuilder():
             f'Built and pushed component container {self._target_image}')
 
 
+def _split_image_tag(image: str) -> Tuple[str, str]:
+    """Splits an image reference into its repository and tag."""
+    name = image.split('@')[0]
+    repository, _, tag = name.rpartition(':')
+    if not repository or '/' in tag:
+        return name, 'latest'
+    return repository, tag
+
+
 @click.group()
 def component():
     """Builds shareable, containerized components."""
@@ -390,9 +460,18 @@ def component():
     is_flag=True,
     default=True,
     help='Push the built image to its remote repository.')
+@click.option(
+    '--skip-unchanged/--no-skip-unchanged',
+    type=bool,
+    is_flag=True,
+    default=False,
+    help='Tag the image with a hash of the build context, and skip the build'
+    ' if the image was already built (and pushed, unless --no-push-image is'
+    ' set) from the same build context.')
 def build(components_directory: str, component_filepattern: str, engine: str,
           kfp_package_path: Optional[str], overwrite_dockerfile: bool,
-          build_image: bool, platform: str, push_image: bool):
+          build_image: bool, platform: str, push_image: bool,
+          skip_unchanged: bool):
     """Builds containers for KFP v2 Python-based components."""
 
     if build_image and engine != 'docker':
@@ -434,4 +513,7 @@ def build(components_directory: str, component_filepattern: str, engine: str,
     builder.maybe_generate_dockerignore()
     builder.maybe_generate_dockerfile(overwrite_dockerfile=overwrite_dockerfile)
     if build_image:
-        builder.build_image(platform=platform, push_image=push_image)
+        builder.build_image(
+            platform=platform,
+            push_image=push_image,
+            skip_unchanged=skip_unchanged)
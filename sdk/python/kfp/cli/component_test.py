@@ -72,6 +72,15 @@ def _write_components(filename: str, component_template: Union[List[str], str]):
     _write_file(filename=filename, file_contents=file_contents)
 
 
+class StartsWith(str):
+    """Matches any string that starts with this string."""
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, str) and other.startswith(self)
+
+    __hash__ = str.__hash__
+
+
 class Test(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -445,6 +454,63 @@ class Test(unittest.TestCase):
         self._docker_client.api.build.assert_called_once()
         self._docker_client.images.push.assert_not_called()
 
+    def test_skip_unchanged_skips_build_of_pushed_image(self):
+        component = _make_component(
+            func_name='train', target_image='gcr.io/project/custom-image:v1')
+        _write_components('components.py', component)
+        self._docker_client.images.get_registry_data.return_value = mock.Mock(
+            id='sha256:abc')
+
+        result = self.runner.invoke(
+            self.cli,
+            ['build', str(self._working_dir), '--skip-unchanged'],
+        )
+        self.assertEqual(result.exit_code, 0)
+
+        self._docker_client.images.get_registry_data.assert_any_call(
+            StartsWith('gcr.io/project/custom-image:kfp-src-'))
+        self._docker_client.api.build.assert_not_called()
+        self._docker_client.images.push.assert_not_called()
+
+    def test_skip_unchanged_builds_and_pushes_source_hash_tag(self):
+        _write_components(
+            'components.py',
+            _make_component(
+                func_name='train',
+                target_image='gcr.io/project/custom-image:v1'))
+        self._docker_client.images.get_registry_data.side_effect = (
+            component.docker.errors.NotFound('not found'))
+
+        result = self.runner.invoke(
+            self.cli,
+            ['build', str(self._working_dir), '--skip-unchanged'],
+        )
+        self.assertEqual(result.exit_code, 0)
+
+        self._docker_client.api.build.assert_called_once()
+        self._docker_client.api.tag.assert_called_once_with(
+            'gcr.io/project/custom-image:v1', 'gcr.io/project/custom-image',
+            StartsWith('kfp-src-'))
+        self.assertEqual(self._docker_client.images.push.call_count, 2)
+
+    def test_source_hash_changes_only_with_build_context(self):
+        _write_components(
+            'components.py',
+            _make_component(func_name='train', target_image='custom-image'))
+        builder = component.ComponentBuilder(
+            context_directory=self._working_dir)
+        source_hash = builder.compute_source_hash('linux/amd64')
+
+        builder.write_component_files()
+        self.assertEqual(
+            builder.compute_source_hash('linux/amd64'), source_hash)
+        self.assertNotEqual(
+            builder.compute_source_hash('linux/arm64'), source_hash)
+
+        _write_file('utils.py', 'x = 1')
+        self.assertNotEqual(
+            builder.compute_source_hash('linux/amd64'), source_hash)
+
     @mock.patch('kfp.__version__', '1.2.3')
     def test_docker_file_is_created_correctly(self):
         component = _make_component(
@@ -16,6 +16,9 @@ import click
 from kfp.cli import compile_
 
 
-@click.group(commands={'compile': compile_.compile_})
+@click.group(commands={
+    'compile': compile_.compile_,
+    'compile-batch': compile_.compile_batch,
+})
 def dsl():
     """Command group for compiling DSL to IR."""
@@ -16,7 +16,7 @@ import dataclasses
 import datetime
 import enum
 import json
-from typing import Any, Dict
+from typing import Any, Dict, List, Union
 
 import click
 import kfp_server_api
@@ -225,20 +225,23 @@ def print_output(resources: list, model_type: ModelType,
         raise NotImplementedError(f'Unknown output format: {output_format}.')
 
 
-def print_deleted_text(resource_type: str, resource_id: str,
+def print_deleted_text(resource_type: str, resource_id: Union[str, List[str]],
                        output_format: str) -> None:
     """Prints a standardized output for deletion actions, using click.echo.
 
     Args:
         resource_type (str): The type of resource (e.g. 'experiment') deleted.
-        resource_id (str): The ID of the resource deleted.
+        resource_id (Union[str, List[str]]): The ID of the resource deleted, or a list of IDs of resources deleted.
         output_format (str): The format for the output (one of 'table' or 'json').
 
     Raises:
         NotImplementedError: If the output format is not one of 'table' or 'json'.
     """
     if output_format == OutputFormat.table.name:
-        click.echo(f'{resource_type.capitalize()} {resource_id} deleted.')
+        resource_ids = resource_id if isinstance(resource_id,
+                                                 list) else [resource_id]
+        for resource_id in resource_ids:
+            click.echo(f'{resource_type.capitalize()} {resource_id} deleted.')
 
     elif output_format == OutputFormat.json.name:
         click.echo(json.dumps(resource_id, indent=2), nl=False)
@@ -89,13 +89,20 @@ either_option_required = 'Either --pipeline-id or --pipeline-name is required.'
     '--description',
     help=parsing.get_param_descr(client.Client.upload_pipeline_version,
                                  'description'))
+@click.option(
+    '--skip-if-unchanged',
+    is_flag=True,
+    default=False,
+    help=parsing.get_param_descr(client.Client.upload_pipeline_version,
+                                 'skip_if_unchanged'))
 @click.pass_context
 def create_version(ctx: click.Context,
                    package_file: str,
                    pipeline_version: str,
                    pipeline_id: Optional[str] = None,
                    pipeline_name: Optional[str] = None,
-                   description: Optional[str] = None):
+                   description: Optional[str] = None,
+                   skip_if_unchanged: bool = False):
     """Upload a version of a pipeline."""
     client_obj: client.Client = ctx.obj['client']
     output_format = ctx.obj['output']
@@ -111,7 +118,8 @@ def create_version(ctx: click.Context,
         pipeline_version_name=pipeline_version,
         pipeline_id=pipeline_id,
         pipeline_name=pipeline_name,
-        description=description)
+        description=description,
+        skip_if_unchanged=skip_if_unchanged)
     output.print_output(
         version,
         output.ModelType.PIPELINE,
@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import sys
-import time
 from typing import List
 
 import click
@@ -42,7 +41,7 @@ def run():
     '-m',
     '--max-size',
     default=100,
-    help=parsing.get_param_descr(client.Client.list_runs, 'page_size'))
+    help=parsing.get_param_descr(client.Client.iter_runs, 'limit'))
 @click.option(
     '--sort-by',
     default='created_at desc',
@@ -55,14 +54,14 @@ def list(ctx: click.Context, experiment_id: str, page_token: str, max_size: int,
     """List pipeline runs."""
     client_obj: client.Client = ctx.obj['client']
     output_format = ctx.obj['output']
-    response = client_obj.list_runs(
+    runs = client_obj.iter_runs(
         experiment_id=experiment_id,
         page_token=page_token,
-        page_size=max_size,
         sort_by=sort_by,
-        filter=filter)
+        filter=filter,
+        limit=max_size)
     output.print_output(
-        response.runs or [],
+        [run for run in runs],
         output.ModelType.RUN,
         output_format,
     )
@@ -176,21 +175,73 @@ def get(ctx: click.Context, watch: bool, detail: bool, run_id: str):
 
 
 @run.command()
-@click.argument('run-id')
+@click.option(
+    '-e',
+    '--experiment-id',
+    help=parsing.get_param_descr(client.Client.archive_runs, 'experiment_id'))
+@click.option(
+    '--filter',
+    help=parsing.get_param_descr(client.Client.archive_runs, 'filter'))
+@click.option(
+    '-p',
+    '--parallelism',
+    type=int,
+    default=8,
+    show_default=True,
+    help=parsing.get_param_descr(client.Client.archive_runs, 'parallelism'))
+@click.argument('run-ids', nargs=-1)
 @click.pass_context
-def archive(ctx: click.Context, run_id: str):
-    """Archive a pipeline run."""
+def archive(ctx: click.Context, run_ids: List[str], experiment_id: str,
+            filter: str, parallelism: int):
+    """Archive pipeline runs, by ID or selected by --filter/--experiment-id."""
+    if run_ids and (filter or experiment_id):
+        raise click.UsageError(
+            'RUN_IDS cannot be used together with --filter or --experiment-id.')
+    if not (run_ids or filter or experiment_id):
+        raise click.UsageError(
+            'Either RUN_IDS, --filter or --experiment-id is required.')
+
     client_obj: client.Client = ctx.obj['client']
     output_format = ctx.obj['output']
 
-    client_obj.archive_run(run_id=run_id)
-    run = client_obj.get_run(run_id=run_id)
+    if len(run_ids) == 1:
+        client_obj.archive_run(run_id=run_ids[0])
+        run = client_obj.get_run(run_id=run_ids[0])
+        output.print_output(
+            run,
+            output.ModelType.RUN,
+            output_format,
+        )
+        return
+
+    results = client_obj.archive_runs(
+        run_ids=[*run_ids] or None,
+        filter=filter,
+        experiment_id=experiment_id,
+        parallelism=parallelism)
+    if not results:
+        click.echo('No runs found.', err=True)
+        return
+    archived_runs = [
+        client_obj.get_run(run_id=result.resource_id)
+        for result in results
+        if result.succeeded
+    ]
     output.print_output(
-        run,
+        archived_runs,
         output.ModelType.RUN,
         output_format,
     )
 
+    failed_results = [result for result in results if not result.succeeded]
+    for result in failed_results:
+        click.echo(
+            f'Failed to archive run {result.resource_id} after '
+            f'{result.attempts} attempt(s): {result.error}',
+            err=True)
+    if failed_results:
+        sys.exit(1)
+
 
 @run.command()
 @click.argument('run-id')
@@ -209,20 +260,69 @@ def unarchive(ctx: click.Context, run_id: str):
 
 
 @run.command()
-@click.argument('run-id')
+@click.option(
+    '-e',
+    '--experiment-id',
+    help=parsing.get_param_descr(client.Client.delete_runs, 'experiment_id'))
+@click.option(
+    '--filter',
+    help=parsing.get_param_descr(client.Client.delete_runs, 'filter'))
+@click.option(
+    '-p',
+    '--parallelism',
+    type=int,
+    default=8,
+    show_default=True,
+    help=parsing.get_param_descr(client.Client.delete_runs, 'parallelism'))
+@click.argument('run-ids', nargs=-1)
 @click.pass_context
-def delete(ctx: click.Context, run_id: str):
-    """Delete a pipeline run."""
+def delete(ctx: click.Context, run_ids: List[str], experiment_id: str,
+           filter: str, parallelism: int):
+    """Delete pipeline runs, by ID or selected by --filter/--experiment-id."""
+    if run_ids and (filter or experiment_id):
+        raise click.UsageError(
+            'RUN_IDS cannot be used together with --filter or --experiment-id.')
+    if not (run_ids or filter or experiment_id):
+        raise click.UsageError(
+            'Either RUN_IDS, --filter or --experiment-id is required.')
+
+    client_obj: client.Client = ctx.obj['client']
+    output_format = ctx.obj['output']
+
+    if not run_ids:
+        run_ids = [
+            run.run_id for run in client_obj.iter_runs(
+                experiment_id=experiment_id, filter=filter)
+        ]
+        if not run_ids:
+            click.echo('No runs found.', err=True)
+            return
 
-    confirmation = f'Are you sure you want to delete run {run_id}?'
+    if len(run_ids) == 1:
+        confirmation = f'Are you sure you want to delete run {run_ids[0]}?'
+    else:
+        confirmation = f'Are you sure you want to delete {len(run_ids)} runs?'
     if not click.confirm(confirmation):
         return
 
-    client_obj: client.Client = ctx.obj['client']
-    output_format = ctx.obj['output']
+    results = client_obj.delete_runs(
+        run_ids=[*run_ids], parallelism=parallelism)
+    deleted_run_ids = [
+        result.resource_id for result in results if result.succeeded
+    ]
+    if len(run_ids) == 1 and deleted_run_ids:
+        output.print_deleted_text('run', deleted_run_ids[0], output_format)
+    elif len(run_ids) > 1:
+        output.print_deleted_text('run', deleted_run_ids, output_format)
 
-    client_obj.delete_run(run_id=run_id)
-    output.print_deleted_text('run', run_id, output_format)
+    failed_results = [result for result in results if not result.succeeded]
+    for result in failed_results:
+        click.echo(
+            f'Failed to delete run {result.resource_id} after '
+            f'{result.attempts} attempt(s): {result.error}',
+            err=True)
+    if failed_results:
+        sys.exit(1)
 
 
 def display_run(client: client.Client, run_id: str, watch: bool,
@@ -236,12 +336,11 @@ def display_run(client: client.Client, run_id: str, watch: bool,
     )
     if not watch:
         return
-    while True:
-        time.sleep(1)
-        run_detail = client.get_run(run_id)
-        run = run_detail
-        if run_detail.state in [
-                'SUCCEEDED', 'SKIPPED', 'FAILED', 'CANCELED', 'PAUSED'
-        ]:
-            click.echo(f'Run is finished with state {run_detail.state}.')
-            return
+    for event in client.watch_run(run_id):
+        if event.task is None:
+            run = event.run
+        else:
+            click.echo(
+                f'Task {event.task.display_name} ({event.task.task_id}) is {event.state}.'
+            )
+    click.echo(f'Run is finished with state {run.state}.')
@@ -14,9 +14,11 @@
 # limitations under the License.
 
 __all__ = [
+    'AsyncClient',
     'Client',
 ]
 
+from kfp.client.async_client import AsyncClient
 from kfp.client.client import Client
 from kfp.client.set_volume_credentials import \
     ServiceAccountTokenVolumeCredentials
@@ -0,0 +1,178 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The asyncio SDK client for Kubeflow Pipelines API."""
+
+import asyncio
+from concurrent import futures
+import datetime
+import functools
+import inspect
+import logging
+from typing import Any, Callable, Optional, Union
+
+from kfp.client import client as sync_client
+import kfp_server_api
+
+_DEFAULT_MAX_WORKERS = 16
+
+
+class AsyncClient:
+    """The asyncio KFP SDK client for the Kubeflow Pipelines backend API.
+
+    Has the same methods as :class:`kfp.Client`, as coroutines. Requests
+    are sent by a bounded pool of worker threads over a single shared,
+    keep-alive connection pool, so any number of concurrent coroutines use
+    at most ``max_workers`` threads and ``connection_pool_maxsize``
+    connections. Waiting for runs does not occupy a worker thread.
+
+    When a request fails with 401 Unauthorized, the access token is
+    refreshed once, without blocking the event loop, and the request is
+    retried.
+
+    Cancelling a coroutine returns control to the caller immediately. A
+    request that is already being sent by a worker thread still runs to
+    completion, but its result is discarded.
+
+    Args:
+        max_workers: Maximum number of requests sent concurrently.
+        connection_pool_maxsize: Maximum number of connections kept alive to
+            the API server. Defaults to ``max_workers``.
+        **kwargs: Arguments for :class:`kfp.Client`.
+
+    Example:
+      ::
+
+        async with AsyncClient(host='http://localhost:8080') as client:
+            runs = await asyncio.gather(*[
+                client.create_run_from_pipeline_package(
+                    'pipeline.yaml', arguments={'lr': lr})
+                for lr in [0.1, 0.01, 0.001]
+            ])
+            await asyncio.gather(*[
+                client.wait_for_run_completion(run.run_id, timeout=3600)
+                for run in runs
+            ])
+    """
+
+    def __init__(
+        self,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+        connection_pool_maxsize: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        """Create a new instance of the async kfp client."""
+        self._client = sync_client.Client(
+            connection_pool_maxsize=connection_pool_maxsize or max_workers,
+            **kwargs)
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='kfp-async-client')
+        # created on first use, to bind it to the running event loop
+        self._token_refresh_lock: Optional[asyncio.Lock] = None
+        # incremented on every token refresh, so that requests that failed
+        # with the same token trigger only one refresh
+        self._token_generation = 0
+
+    @property
+    def client(self) -> sync_client.Client:
+        """The synchronous client used to send requests."""
+        return self._client
+
+    async def __aenter__(self) -> 'AsyncClient':
+        return self
+
+    async def __aexit__(self, *unused_args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Waits for in-flight requests and releases the worker threads and
+        connections."""
+        await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self._executor.shutdown, wait=True))
+        self._client._run_api.api_client.close()
+
+    async def _run_in_executor(self, func: Callable, *args, **kwargs) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs))
+
+    async def _refresh_api_client_token(self, token_generation: int) -> None:
+        if self._token_refresh_lock is None:
+            self._token_refresh_lock = asyncio.Lock()
+        async with self._token_refresh_lock:
+            if token_generation != self._token_generation:
+                # another request already refreshed the token
+                return
+            logging.info('Access token has expired !!! Refreshing ...')
+            await self._run_in_executor(self._client._refresh_api_client_token)
+            self._token_generation += 1
+
+    async def _call(self, method_name: str, *args, **kwargs) -> Any:
+        method = getattr(self._client, method_name)
+        token_generation = self._token_generation
+        try:
+            return await self._run_in_executor(method, *args, **kwargs)
+        except kfp_server_api.ApiException as api_ex:
+            if api_ex.status != 401:
+                raise
+        await self._refresh_api_client_token(token_generation)
+        return await self._run_in_executor(method, *args, **kwargs)
+
+    async def wait_for_run_completion(
+        self,
+        run_id: str,
+        timeout: Union[int, datetime.timedelta],
+        sleep_duration: int = 5,
+    ) -> kfp_server_api.V2beta1Run:
+        """Waits for a run to complete.
+
+        Args:
+            run_id: ID of the run.
+            timeout: Timeout after which the client should stop waiting for run completion (seconds).
+            sleep_duration: Time in seconds between retries.
+
+        Returns:
+            ``V2beta1Run`` object.
+        """
+        if isinstance(timeout, datetime.timedelta):
+            timeout = timeout.total_seconds()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            run = await self.get_run(run_id)
+            logging.info('Waiting for the job to complete...')
+            if run.state is not None and run.state.lower(
+            ) in sync_client._RUN_FINISH_STATES:
+                return run
+            if loop.time() > deadline:
+                raise TimeoutError('Run timeout')
+            await asyncio.sleep(sleep_duration)
+
+
+def _make_async_method(method_name: str) -> Callable:
+    method = getattr(sync_client.Client, method_name)
+
+    @functools.wraps(method)
+    async def async_method(self: AsyncClient, *args, **kwargs) -> Any:
+        return await self._call(method_name, *args, **kwargs)
+
+    return async_method
+
+
+for _method_name, _method in inspect.getmembers(sync_client.Client,
+                                                inspect.isfunction):
+    # generators, which yield results as they become available, are not
+    # wrapped as coroutines
+    if (_method_name.startswith('_') or hasattr(AsyncClient, _method_name) or
+            inspect.isgeneratorfunction(_method)):
+        continue
+    setattr(AsyncClient, _method_name, _make_async_method(_method_name))
@@ -0,0 +1,132 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import Mock
+from unittest.mock import patch
+
+from kfp.client import async_client
+from kfp.client import client
+import kfp_server_api
+
+
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.client = async_client.AsyncClient(
+            namespace='ns1', max_workers=4, connection_pool_maxsize=8)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    def test_has_client_methods(self):
+        for method_name in ['create_run_from_pipeline_package', 'list_runs']:
+            method = getattr(self.client, method_name)
+            self.assertTrue(asyncio.iscoroutinefunction(method))
+            self.assertEqual(method.__doc__,
+                             getattr(client.Client, method_name).__doc__)
+
+    def test_generators_are_not_wrapped(self):
+        self.assertFalse(hasattr(self.client, 'iter_runs'))
+
+    def test_connection_pool_maxsize(self):
+        self.assertEqual(
+            self.client.client._existing_config.connection_pool_maxsize, 8)
+
+    async def test_calls_are_sent_from_worker_threads(self):
+        thread_names = []
+
+        def get_run(run_id):
+            thread_names.append(threading.current_thread().name)
+            return Mock(run_id=run_id)
+
+        with patch.object(
+                self.client.client._run_api, 'get_run', side_effect=get_run):
+            runs = await asyncio.gather(
+                *[self.client.get_run(str(i)) for i in range(10)])
+
+        self.assertEqual([run.run_id for run in runs],
+                         [str(i) for i in range(10)])
+        for thread_name in thread_names:
+            self.assertTrue(thread_name.startswith('kfp-async-client'))
+
+    async def test_expired_access_token_is_refreshed_once(self):
+        barrier = threading.Barrier(3)
+        refreshed = threading.Event()
+
+        def get_run(run_id):
+            if not refreshed.is_set():
+                barrier.wait(timeout=5)
+                raise kfp_server_api.ApiException(status=401)
+            return Mock(run_id=run_id)
+
+        with patch.object(
+                self.client.client._run_api, 'get_run',
+                side_effect=get_run), patch.object(
+                    self.client.client,
+                    '_refresh_api_client_token',
+                    side_effect=refreshed.set) as mock_refresh:
+            runs = await asyncio.gather(
+                *[self.client.get_run(str(i)) for i in range(3)])
+
+        self.assertEqual(len(runs), 3)
+        mock_refresh.assert_called_once()
+
+    async def test_other_api_errors_are_raised(self):
+        with patch.object(
+                self.client.client._run_api,
+                'get_run',
+                side_effect=kfp_server_api.ApiException(status=404)):
+            with self.assertRaises(kfp_server_api.ApiException):
+                await self.client.get_run('foo')
+
+    async def test_wait_for_run_completion(self):
+        with patch.object(self.client.client._run_api,
+                          'get_run') as mock_get_run:
+            mock_get_run.side_effect = [
+                Mock(state='RUNNING'),
+                Mock(state='SUCCEEDED'),
+            ]
+            run = await self.client.wait_for_run_completion(
+                'foo', timeout=10, sleep_duration=0)
+        self.assertEqual(run.state, 'SUCCEEDED')
+        self.assertEqual(mock_get_run.call_count, 2)
+
+    async def test_wait_for_run_completion_timeout(self):
+        with patch.object(
+                self.client.client._run_api,
+                'get_run',
+                return_value=Mock(state='RUNNING')):
+            with self.assertRaises(TimeoutError):
+                await self.client.wait_for_run_completion(
+                    'foo', timeout=0, sleep_duration=0)
+
+    async def test_wait_for_run_completion_can_be_cancelled(self):
+        with patch.object(
+                self.client.client._run_api,
+                'get_run',
+                return_value=Mock(state='RUNNING')):
+            task = asyncio.ensure_future(
+                self.client.wait_for_run_completion(
+                    'foo', timeout=60, sleep_duration=60))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+
+if __name__ == '__main__':
+    unittest.main()
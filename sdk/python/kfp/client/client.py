@@ -13,18 +13,24 @@
 # limitations under the License.
 """The SDK client for Kubeflow Pipelines API."""
 
+from concurrent import futures
+import contextlib
 import copy
 import dataclasses
 import datetime
+import functools
+import hashlib
 import json
 import logging
 import os
+import random
 import re
 import tarfile
 import tempfile
 import time
 from types import ModuleType
-from typing import Any, Dict, List, Optional, TextIO
+from typing import (Any, BinaryIO, Callable, Dict, Iterator, List, Optional,
+                    TextIO, Union)
 import warnings
 import zipfile
 
@@ -32,11 +38,19 @@ from google.protobuf import json_format
 from kfp import compiler
 from kfp.client import auth
 from kfp.client import set_volume_credentials
+from kfp.compiler import pipeline_spec_builder
 from kfp.components import base_component
 from kfp.pipeline_spec import pipeline_spec_pb2
 import kfp_server_api
+import urllib3
 import yaml
 
+# libyaml's parser is several times faster than the pure-Python one.
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Maximum number of parsed pipeline packages cached in memory.
+_MAX_CACHED_PIPELINE_PACKAGES = 8
+
 # Operators on scalar values. Only applies to one of |int_value|,
 # |long_value|, |string_value| or |timestamp_value|.
 _FILTER_OPERATIONS = {
@@ -50,6 +64,34 @@ _FILTER_OPERATIONS = {
     'IS_SUBSTRING': 9,
 }
 
+# States in which wait_for_run_completion considers a run complete.
+_RUN_FINISH_STATES = ['succeeded', 'failed', 'skipped', 'error']
+# States in which a run is complete, or does not change state without user
+# action, at which wait_for_runs_completion and watch_run stop waiting.
+_RUN_TERMINAL_STATES = _RUN_FINISH_STATES + ['canceled', 'paused']
+
+# Maximum number of run IDs to filter on in a single list_runs request.
+_MAX_RUN_IDS_PER_LIST_REQUEST = 100
+
+# Number of results per page requested by the Client.iter_* methods.
+_DEFAULT_ITER_PAGE_SIZE = 100
+
+# Prefix of the hash of the pipeline spec that is stored in the description
+# of pipeline versions uploaded with skip_if_unchanged.
+_PIPELINE_SPEC_HASH_MARKER = 'kfp-pipeline-spec-sha256:'
+
+# HTTP statuses of responses to retry in bulk operations.
+_TRANSIENT_ERROR_STATUSES = frozenset([429, 500, 502, 503, 504])
+# Errors of requests that did not get a response, which are retried in bulk
+# operations.
+_TRANSIENT_CONNECTION_ERRORS = (urllib3.exceptions.HTTPError, ConnectionError,
+                                TimeoutError)
+
+_DEFAULT_BULK_PARALLELISM = 8
+_DEFAULT_BULK_MAX_ATTEMPTS = 5
+# Delay before the first retry in bulk operations, in seconds.
+_BULK_RETRY_INITIAL_DELAY = 1.0
+
 KF_PIPELINES_ENDPOINT_ENV = 'KF_PIPELINES_ENDPOINT'
 KF_PIPELINES_UI_ENDPOINT_ENV = 'KF_PIPELINES_UI_ENDPOINT'
 KF_PIPELINES_DEFAULT_EXPERIMENT_NAME = 'KF_PIPELINES_DEFAULT_EXPERIMENT_NAME'
@@ -81,6 +123,41 @@ class _JobConfig:
     runtime_config: kfp_server_api.V2beta1RuntimeConfig
 
 
+@dataclasses.dataclass
+class BulkOperationResult:
+    """The outcome of a bulk operation for a single resource.
+
+    Attributes:
+        resource_id: ID of the resource.
+        error: The exception raised by the last attempt, or ``None`` if the operation succeeded.
+        attempts: Number of attempts made.
+    """
+    resource_id: str
+    error: Optional[Exception] = None
+    attempts: int = 1
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+@dataclasses.dataclass
+class RunWatchEvent:
+    """A change of the state of a run, or of one of its tasks, observed by
+    ``Client.watch_run``.
+
+    Attributes:
+        run: The run, as of the check in which the change was observed.
+        task: The task whose state changed, or ``None`` if the state of the run changed.
+        previous_state: The state before the change, or ``None`` if the run or task was observed for the first time.
+        state: The state after the change.
+    """
+    run: kfp_server_api.V2beta1Run
+    task: Optional[kfp_server_api.V2beta1PipelineTaskDetail]
+    previous_state: Optional[str]
+    state: Optional[str]
+
+
 class RunPipelineResult:
 
     def __init__(self, client: 'Client',
@@ -124,6 +201,10 @@ class Client:
         ui_host: Base URL to use to open the Kubeflow Pipelines UI. This is used
             when running the client from a notebook to generate and print links.
         verify_ssl: Whether to verify the server's TLS certificate.
+        connection_pool_maxsize: Maximum number of connections to the API
+            server that are kept alive for reuse, which bounds the number of
+            concurrent requests from multiple threads. Defaults to the
+            ``kfp_server_api`` default.
     """
 
     # in-cluster DNS name of the pipeline service
@@ -153,6 +234,7 @@ class Client:
         credentials: Optional[str] = None,
         ui_host: Optional[str] = None,
         verify_ssl: Optional[bool] = None,
+        connection_pool_maxsize: Optional[int] = None,
     ) -> None:
         """Create a new instance of kfp client."""
         warnings.warn(
@@ -173,6 +255,8 @@ class Client:
                                    other_client_secret, existing_token, proxy,
                                    ssl_ca_cert, kube_context, credentials,
                                    verify_ssl)
+        if connection_pool_maxsize is not None:
+            config.connection_pool_maxsize = connection_pool_maxsize
         # Save the loaded API client configuration, as a reference if update is
         # needed.
         self._load_context_setting_or_default()
@@ -564,6 +648,42 @@ class Client:
             namespace=namespace,
         )
 
+    def iter_experiments(
+        self,
+        sort_by: str = '',
+        namespace: Optional[str] = None,
+        filter: Optional[str] = None,
+        page_token: str = '',
+        page_size: int = _DEFAULT_ITER_PAGE_SIZE,
+        limit: Optional[int] = None,
+    ) -> Iterator[kfp_server_api.V2beta1Experiment]:
+        """Iterates over experiments, requesting further pages as needed.
+
+        The next page is requested in the background while the experiments of the
+        current page are being processed.
+
+        Args:
+            sort_by: Sort string of format ``'[field_name]', '[field_name] desc'``. For example, ``'display_name desc'``.
+            namespace: Kubernetes namespace to use. Used for multi-user deployments. For single-user deployments, this should be left as ``None``.
+            filter: A url-encoded, JSON-serialized Filter protocol buffer. See ``list_experiments``.
+            page_token: Page token of the page from which to start.
+            page_size: Number of experiments requested per page.
+            limit: Maximum number of experiments to return. If not set, returns all experiments.
+
+        Returns:
+            An iterator of ``V2beta1Experiment`` objects.
+        """
+        yield from _iter_list_results(
+            self.list_experiments,
+            'experiments',
+            page_token=page_token,
+            page_size=page_size,
+            limit=limit,
+            sort_by=sort_by,
+            namespace=namespace,
+            filter=filter,
+        )
+
     def get_experiment(
         self,
         experiment_id: Optional[str] = None,
@@ -684,6 +804,42 @@ class Client:
             sort_by=sort_by,
             filter=filter)
 
+    def iter_pipelines(
+        self,
+        sort_by: str = '',
+        namespace: Optional[str] = None,
+        filter: Optional[str] = None,
+        page_token: str = '',
+        page_size: int = _DEFAULT_ITER_PAGE_SIZE,
+        limit: Optional[int] = None,
+    ) -> Iterator[kfp_server_api.V2beta1Pipeline]:
+        """Iterates over pipelines, requesting further pages as needed.
+
+        The next page is requested in the background while the pipelines of the
+        current page are being processed.
+
+        Args:
+            sort_by: Sort string of format ``'[field_name]', '[field_name] desc'``. For example, ``'display_name desc'``.
+            namespace: Kubernetes namespace to use. Used for multi-user deployments. For single-user deployments, this should be left as ``None``.
+            filter: A url-encoded, JSON-serialized Filter protocol buffer. See ``list_pipelines``.
+            page_token: Page token of the page from which to start.
+            page_size: Number of pipelines requested per page.
+            limit: Maximum number of pipelines to return. If not set, returns all pipelines.
+
+        Returns:
+            An iterator of ``V2beta1Pipeline`` objects.
+        """
+        yield from _iter_list_results(
+            self.list_pipelines,
+            'pipelines',
+            page_token=page_token,
+            page_size=page_size,
+            limit=limit,
+            sort_by=sort_by,
+            namespace=namespace,
+            filter=filter,
+        )
+
     # TODO: provide default namespace, similar to kubectl default namespaces.
     def run_pipeline(
         self,
@@ -732,7 +888,19 @@ class Client:
             enable_caching=enable_caching,
             pipeline_root=pipeline_root,
         )
+        return self._create_run(
+            experiment_id=experiment_id,
+            job_name=job_name,
+            job_config=job_config,
+            service_account=service_account)
 
+    def _create_run(
+        self,
+        experiment_id: str,
+        job_name: str,
+        job_config: _JobConfig,
+        service_account: Optional[str],
+    ) -> kfp_server_api.V2beta1Run:
         run_body = kfp_server_api.V2beta1Run(
             experiment_id=experiment_id,
             display_name=job_name,
@@ -797,6 +965,168 @@ class Client:
         """
         return self._run_api.terminate_run(run_id=run_id)
 
+    def archive_runs(
+        self,
+        run_ids: Optional[List[str]] = None,
+        filter: Optional[str] = None,
+        experiment_id: Optional[str] = None,
+        namespace: Optional[str] = None,
+        parallelism: int = _DEFAULT_BULK_PARALLELISM,
+        max_attempts: int = _DEFAULT_BULK_MAX_ATTEMPTS,
+    ) -> List[BulkOperationResult]:
+        """Archives many runs concurrently.
+
+        Args:
+            run_ids: IDs of the runs.
+            filter: A url-encoded, JSON-serialized Filter protocol buffer
+                selecting the runs, if ``run_ids`` is not specified. See ``list_runs``.
+            experiment_id: ID of an experiment to select the runs from, if ``run_ids`` is not specified.
+            namespace: Kubernetes namespace to select the runs from, if ``run_ids`` is not specified. Used for multi-user deployments.
+            parallelism: Maximum number of concurrent requests.
+            max_attempts: Maximum number of attempts per run. Requests that fail with status 429 or 5xx are retried with exponential backoff.
+
+        Returns:
+            A list of ``BulkOperationResult`` objects, one per run, in the order of ``run_ids`` or of the listed runs.
+        """
+        return self._run_bulk_operation(
+            self._run_api.archive_run,
+            run_ids=run_ids,
+            filter=filter,
+            experiment_id=experiment_id,
+            namespace=namespace,
+            parallelism=parallelism,
+            max_attempts=max_attempts)
+
+    def delete_runs(
+        self,
+        run_ids: Optional[List[str]] = None,
+        filter: Optional[str] = None,
+        experiment_id: Optional[str] = None,
+        namespace: Optional[str] = None,
+        parallelism: int = _DEFAULT_BULK_PARALLELISM,
+        max_attempts: int = _DEFAULT_BULK_MAX_ATTEMPTS,
+    ) -> List[BulkOperationResult]:
+        """Deletes many runs concurrently.
+
+        Args:
+            run_ids: IDs of the runs.
+            filter: A url-encoded, JSON-serialized Filter protocol buffer
+                selecting the runs, if ``run_ids`` is not specified. See ``list_runs``.
+            experiment_id: ID of an experiment to select the runs from, if ``run_ids`` is not specified.
+            namespace: Kubernetes namespace to select the runs from, if ``run_ids`` is not specified. Used for multi-user deployments.
+            parallelism: Maximum number of concurrent requests.
+            max_attempts: Maximum number of attempts per run. Requests that fail with status 429 or 5xx are retried with exponential backoff.
+
+        Returns:
+            A list of ``BulkOperationResult`` objects, one per run, in the order of ``run_ids`` or of the listed runs.
+        """
+        return self._run_bulk_operation(
+            self._run_api.delete_run,
+            run_ids=run_ids,
+            filter=filter,
+            experiment_id=experiment_id,
+            namespace=namespace,
+            parallelism=parallelism,
+            max_attempts=max_attempts)
+
+    def terminate_runs(
+        self,
+        run_ids: Optional[List[str]] = None,
+        filter: Optional[str] = None,
+        experiment_id: Optional[str] = None,
+        namespace: Optional[str] = None,
+        parallelism: int = _DEFAULT_BULK_PARALLELISM,
+        max_attempts: int = _DEFAULT_BULK_MAX_ATTEMPTS,
+    ) -> List[BulkOperationResult]:
+        """Terminates many runs concurrently.
+
+        Args:
+            run_ids: IDs of the runs.
+            filter: A url-encoded, JSON-serialized Filter protocol buffer
+                selecting the runs, if ``run_ids`` is not specified. See ``list_runs``.
+            experiment_id: ID of an experiment to select the runs from, if ``run_ids`` is not specified.
+            namespace: Kubernetes namespace to select the runs from, if ``run_ids`` is not specified. Used for multi-user deployments.
+            parallelism: Maximum number of concurrent requests.
+            max_attempts: Maximum number of attempts per run. Requests that fail with status 429 or 5xx are retried with exponential backoff.
+
+        Returns:
+            A list of ``BulkOperationResult`` objects, one per run, in the order of ``run_ids`` or of the listed runs.
+        """
+        return self._run_bulk_operation(
+            self._run_api.terminate_run,
+            run_ids=run_ids,
+            filter=filter,
+            experiment_id=experiment_id,
+            namespace=namespace,
+            parallelism=parallelism,
+            max_attempts=max_attempts)
+
+    def _run_bulk_operation(
+        self,
+        operation: Callable[..., Any],
+        run_ids: Optional[List[str]],
+        filter: Optional[str],
+        experiment_id: Optional[str],
+        namespace: Optional[str],
+        parallelism: int,
+        max_attempts: int,
+    ) -> List[BulkOperationResult]:
+        if run_ids is None:
+            if filter is None and experiment_id is None:
+                raise ValueError(
+                    'Either run_ids, filter or experiment_id is required.')
+            # all runs are listed before any is modified, so that the
+            # operation does not change the pages being listed
+            run_ids = [
+                run.run_id for run in self.iter_runs(
+                    experiment_id=experiment_id,
+                    namespace=namespace,
+                    filter=filter)
+            ]
+
+        def run_with_retries(run_id: str) -> BulkOperationResult:
+            result = BulkOperationResult(resource_id=run_id, attempts=0)
+            delay = _BULK_RETRY_INITIAL_DELAY
+            while result.attempts < max_attempts:
+                result.attempts += 1
+                try:
+                    operation(run_id=run_id)
+                    result.error = None
+                    return result
+                except kfp_server_api.ApiException as api_ex:
+                    result.error = api_ex
+                    if api_ex.status not in _TRANSIENT_ERROR_STATUSES:
+                        return result
+                    retry_after = (api_ex.headers or {}).get('Retry-After')
+                except _TRANSIENT_CONNECTION_ERRORS as e:
+                    result.error = e
+                    retry_after = None
+                if result.attempts >= max_attempts:
+                    break
+                if retry_after is not None and retry_after.isdigit():
+                    time.sleep(int(retry_after))
+                else:
+                    time.sleep(delay * random.uniform(0.5, 1.0))
+                delay *= 2
+            return result
+
+        self._ensure_connection_pool_size(parallelism)
+        with futures.ThreadPoolExecutor(max_workers=parallelism) as executor:
+            return list(executor.map(run_with_retries, run_ids))
+
+    def _ensure_connection_pool_size(self, size: int) -> None:
+        """Grows the connection pool of the API client to at least size
+        connections, so that concurrent requests do not discard and reopen
+        connections."""
+        maxsize = self._existing_config.connection_pool_maxsize
+        if maxsize is not None and maxsize >= size:
+            return
+        self._existing_config.connection_pool_maxsize = size
+        pool_manager = self._run_api.api_client.rest_client.pool_manager
+        pool_manager.connection_pool_kw['maxsize'] = size
+        # pools already opened keep their size, so they are reopened
+        pool_manager.clear()
+
     def create_recurring_run(
         self,
         experiment_id: str,
@@ -923,7 +1253,7 @@ class Client:
         Args:
             pipeline_package_path: Local path of the pipeline package (the
                 filename should end with one of the following .tar.gz, .tgz,
-                .zip, .yaml, .yml).
+                .zip, .yaml, .yml, .pb).
             params: A dictionary with key as param name and value as param value.
             pipeline_id: ID of a pipeline.
             version_id: ID of a pipeline version.
@@ -1054,6 +1384,7 @@ class Client:
         enable_caching: Optional[bool] = None,
         service_account: Optional[str] = None,
         experiment_id: Optional[str] = None,
+        pipeline_name: Optional[str] = None,
     ) -> RunPipelineResult:
         """Runs pipeline on KFP-enabled Kubernetes cluster.
 
@@ -1076,46 +1407,146 @@ class Client:
             service_account: Specifies which Kubernetes service
                 account to use for this run.
             experiment_id: ID of the experiment to add the run to. You cannot specify both experiment_id and experiment_name.
+            pipeline_name: Name of a pipeline to run the package as a version of. If specified, the run is created from the version of the pipeline with an identical pipeline spec,
+                which is uploaded only if no such version exists (see the ``skip_if_unchanged`` argument of ``upload_pipeline_version``).
 
         Returns:
             ``RunPipelineResult`` object containing information about the pipeline run.
         """
 
         #TODO: Check arguments against the pipeline function
-        pipeline_name = os.path.basename(pipeline_file)
+        return self.create_runs_from_pipeline_package(
+            pipeline_file=pipeline_file,
+            arguments_list=[arguments],
+            run_name=run_name,
+            experiment_name=experiment_name,
+            namespace=namespace,
+            pipeline_root=pipeline_root,
+            enable_caching=enable_caching,
+            service_account=service_account,
+            experiment_id=experiment_id,
+            pipeline_name=pipeline_name,
+        )[0]
 
-        if (experiment_name is not None) and (experiment_id is not None):
-            raise ValueError(
-                'You cannot specify both experiment_name and experiment_id.')
+    def create_runs_from_pipeline_package(
+        self,
+        pipeline_file: str,
+        arguments_list: List[Optional[Dict[str, Any]]],
+        run_name: Optional[str] = None,
+        experiment_name: Optional[str] = None,
+        namespace: Optional[str] = None,
+        pipeline_root: Optional[str] = None,
+        enable_caching: Optional[bool] = None,
+        service_account: Optional[str] = None,
+        experiment_id: Optional[str] = None,
+        pipeline_name: Optional[str] = None,
+        parallelism: int = _DEFAULT_BULK_PARALLELISM,
+    ) -> List[RunPipelineResult]:
+        """Runs a pipeline package with many sets of arguments.
 
-        if not experiment_id:
-            experiment_name = experiment_name or os.environ.get(
-                KF_PIPELINES_DEFAULT_EXPERIMENT_NAME, None)
-            overridden_experiment_name = os.environ.get(
-                KF_PIPELINES_OVERRIDE_EXPERIMENT_NAME, experiment_name)
-            if overridden_experiment_name != experiment_name:
-                warnings.warn(
-                    f'Changing experiment name from "{experiment_name}" to "{overridden_experiment_name}".'
-                )
-            experiment_name = overridden_experiment_name or 'Default'
-            experiment = self.create_experiment(
-                name=experiment_name, namespace=namespace)
-            experiment_id = experiment.experiment_id
+        The package is loaded, and the experiment created or got, only
+        once, and the runs are submitted concurrently.
+
+        Args:
+            pipeline_file: A compiled pipeline package file.
+            arguments_list: Arguments to the pipeline function of each run, as dicts.
+            run_name: Name of the runs to be shown in the UI. If more than one run is created, the index of each run is appended to the name.
+            experiment_name: Name of the experiment to add the runs to. You cannot specify both experiment_name and experiment_id.
+            namespace: Kubernetes namespace to use. Used for multi-user deployments. For single-user deployments, this should be left as ``None``.
+            pipeline_root: Root path of the pipeline outputs.
+            enable_caching: Whether or not to enable caching for the
+                runs. If not set, defaults to the compile time settings, which
+                is ``True`` for all tasks by default, while users may specify
+                different caching options for individual tasks. If set, the
+                setting applies to all tasks in the pipeline (overrides the
+                compile time settings).
+            service_account: Specifies which Kubernetes service
+                account to use for the runs.
+            experiment_id: ID of the experiment to add the runs to. You cannot specify both experiment_id and experiment_name.
+            pipeline_name: Name of a pipeline to run the package as a version of (see ``create_run_from_pipeline_package``).
+            parallelism: Maximum number of runs submitted concurrently.
+
+        Returns:
+            ``RunPipelineResult`` objects of the runs, in the order of ``arguments_list``.
+
+        Raises:
+            kfp_server_api.ApiException: The first error of the runs that failed to be submitted, after all runs were submitted. Runs that were created are not deleted.
+        """
+        experiment_id = self._resolve_experiment_id(
+            experiment_name=experiment_name,
+            experiment_id=experiment_id,
+            namespace=namespace)
 
         run_name = run_name or (
-            pipeline_name + ' ' +
+            os.path.basename(pipeline_file) + ' ' +
             datetime.datetime.now().strftime('%Y-%m-%d %H-%M-%S'))
 
-        run_info = self.run_pipeline(
-            experiment_id=experiment_id,
-            job_name=run_name,
-            pipeline_package_path=pipeline_file,
-            params=arguments,
-            pipeline_root=pipeline_root,
-            enable_caching=enable_caching,
-            service_account=service_account,
-        )
-        return RunPipelineResult(self, run_info)
+        if pipeline_name is not None:
+            pipeline_version = self._get_or_upload_pipeline_version(
+                pipeline_package_path=pipeline_file,
+                pipeline_name=pipeline_name,
+                enable_caching=enable_caching)
+            job_config = self._create_job_config(
+                params=None,
+                pipeline_package_path=None,
+                pipeline_id=pipeline_version.pipeline_id,
+                version_id=pipeline_version.pipeline_version_id,
+                enable_caching=None,
+                pipeline_root=pipeline_root)
+        else:
+            job_config = self._create_job_config(
+                params=None,
+                pipeline_package_path=pipeline_file,
+                pipeline_id=None,
+                version_id=None,
+                enable_caching=enable_caching,
+                pipeline_root=pipeline_root)
+
+        def create_run(index: int) -> RunPipelineResult:
+            run_info = self._create_run(
+                experiment_id=experiment_id,
+                job_name=run_name
+                if len(arguments_list) == 1 else f'{run_name} {index}',
+                job_config=dataclasses.replace(
+                    job_config,
+                    runtime_config=kfp_server_api.V2beta1RuntimeConfig(
+                        pipeline_root=pipeline_root,
+                        parameters=arguments_list[index] or {},
+                    )),
+                service_account=service_account,
+            )
+            return RunPipelineResult(self, run_info)
+
+        self._ensure_connection_pool_size(parallelism)
+        with futures.ThreadPoolExecutor(max_workers=parallelism) as executor:
+            return list(executor.map(create_run, range(len(arguments_list))))
+
+    def _resolve_experiment_id(
+        self,
+        experiment_name: Optional[str],
+        experiment_id: Optional[str],
+        namespace: Optional[str],
+    ) -> str:
+        """Gets the ID of the experiment to create runs in, creating the
+        experiment if it does not exist."""
+        if (experiment_name is not None) and (experiment_id is not None):
+            raise ValueError(
+                'You cannot specify both experiment_name and experiment_id.')
+
+        if experiment_id:
+            return experiment_id
+        experiment_name = experiment_name or os.environ.get(
+            KF_PIPELINES_DEFAULT_EXPERIMENT_NAME, None)
+        overridden_experiment_name = os.environ.get(
+            KF_PIPELINES_OVERRIDE_EXPERIMENT_NAME, experiment_name)
+        if overridden_experiment_name != experiment_name:
+            warnings.warn(
+                f'Changing experiment name from "{experiment_name}" to "{overridden_experiment_name}".'
+            )
+        experiment_name = overridden_experiment_name or 'Default'
+        experiment = self.create_experiment(
+            name=experiment_name, namespace=namespace)
+        return experiment.experiment_id
 
     def delete_job(self, job_id: str) -> dict:
         """Deletes a job (recurring run).
@@ -1258,6 +1689,45 @@ class Client:
                 sort_by=sort_by,
                 filter=filter)
 
+    def iter_runs(
+        self,
+        sort_by: str = '',
+        experiment_id: Optional[str] = None,
+        namespace: Optional[str] = None,
+        filter: Optional[str] = None,
+        page_token: str = '',
+        page_size: int = _DEFAULT_ITER_PAGE_SIZE,
+        limit: Optional[int] = None,
+    ) -> Iterator[kfp_server_api.V2beta1Run]:
+        """Iterates over runs, requesting further pages as needed.
+
+        The next page is requested in the background while the runs of the
+        current page are being processed.
+
+        Args:
+            sort_by: Sort string of format ``'[field_name]', '[field_name] desc'``. For example, ``'display_name desc'``.
+            experiment_id: Experiment ID to filter upon.
+            namespace: Kubernetes namespace to use. Used for multi-user deployments. For single-user deployments, this should be left as ``None``.
+            filter: A url-encoded, JSON-serialized Filter protocol buffer. See ``list_runs``.
+            page_token: Page token of the page from which to start.
+            page_size: Number of runs requested per page.
+            limit: Maximum number of runs to return. If not set, returns all runs.
+
+        Returns:
+            An iterator of ``V2beta1Run`` objects.
+        """
+        yield from _iter_list_results(
+            self.list_runs,
+            'runs',
+            page_token=page_token,
+            page_size=page_size,
+            limit=limit,
+            sort_by=sort_by,
+            experiment_id=experiment_id,
+            namespace=namespace,
+            filter=filter,
+        )
+
     def list_recurring_runs(
         self,
         page_token: str = '',
@@ -1314,6 +1784,45 @@ class Client:
                 sort_by=sort_by,
                 filter=filter)
 
+    def iter_recurring_runs(
+        self,
+        sort_by: str = '',
+        experiment_id: Optional[str] = None,
+        namespace: Optional[str] = None,
+        filter: Optional[str] = None,
+        page_token: str = '',
+        page_size: int = _DEFAULT_ITER_PAGE_SIZE,
+        limit: Optional[int] = None,
+    ) -> Iterator[kfp_server_api.V2beta1RecurringRun]:
+        """Iterates over recurring runs, requesting further pages as needed.
+
+        The next page is requested in the background while the recurring runs of the
+        current page are being processed.
+
+        Args:
+            sort_by: Sort string of format ``'[field_name]', '[field_name] desc'``. For example, ``'display_name desc'``.
+            experiment_id: Experiment ID to filter upon.
+            namespace: Kubernetes namespace to use. Used for multi-user deployments. For single-user deployments, this should be left as ``None``.
+            filter: A url-encoded, JSON-serialized Filter protocol buffer. See ``list_recurring_runs``.
+            page_token: Page token of the page from which to start.
+            page_size: Number of recurring runs requested per page.
+            limit: Maximum number of recurring runs to return. If not set, returns all recurring runs.
+
+        Returns:
+            An iterator of ``V2beta1RecurringRun`` objects.
+        """
+        yield from _iter_list_results(
+            self.list_recurring_runs,
+            'recurring_runs',
+            page_token=page_token,
+            page_size=page_size,
+            limit=limit,
+            sort_by=sort_by,
+            experiment_id=experiment_id,
+            namespace=namespace,
+            filter=filter,
+        )
+
     def get_recurring_run(
         self,
         recurring_run_id: str,
@@ -1370,17 +1879,12 @@ class Client:
         if isinstance(timeout, datetime.timedelta):
             timeout = timeout.total_seconds()
         is_valid_token = False
-        finish_states = ['succeeded', 'failed', 'skipped', 'error']
         while True:
             try:
                 get_run_response = self._run_api.get_run(run_id=run_id)
                 is_valid_token = True
             except kfp_server_api.ApiException as api_ex:
-                # if the token is valid but receiving 401 Unauthorized error
-                # then refresh the token
-                if is_valid_token and api_ex.status == 401:
-                    logging.info('Access token has expired !!! Refreshing ...')
-                    self._refresh_api_client_token()
+                if self._maybe_refresh_expired_token(api_ex, is_valid_token):
                     continue
                 else:
                     raise api_ex
@@ -1390,10 +1894,236 @@ class Client:
             logging.info('Waiting for the job to complete...')
             if elapsed_time > timeout:
                 raise TimeoutError('Run timeout')
-            if state is not None and state.lower() in finish_states:
+            if state is not None and state.lower() in _RUN_FINISH_STATES:
                 return get_run_response
             time.sleep(sleep_duration)
 
+    def wait_for_runs_completion(
+        self,
+        run_ids: Optional[List[str]] = None,
+        experiment_id: Optional[str] = None,
+        timeout: Optional[Union[int, datetime.timedelta]] = None,
+        sleep_duration: float = 5,
+        max_sleep_duration: float = 60,
+    ) -> Iterator[kfp_server_api.V2beta1Run]:
+        """Waits for many runs to complete, and yields them as they complete.
+
+        All runs that are still running are checked with a single
+        ``list_runs`` request per 100 runs, rather than one ``get_run``
+        request per run. The time between checks starts at
+        ``sleep_duration``, doubles, with random jitter, after each check in
+        which no run completed, up to ``max_sleep_duration``, and is reset
+        when a run completes.
+
+        Args:
+            run_ids: IDs of the runs to wait for.
+            experiment_id: ID of an experiment. If ``run_ids`` is not
+                specified, waits for all runs in the experiment at the time
+                of the first check.
+            timeout: Timeout after which the client should stop waiting for run completion (seconds). If not set, waits indefinitely.
+            sleep_duration: Initial time in seconds between checks.
+            max_sleep_duration: Maximum time in seconds between checks.
+
+        Returns:
+            An iterator of ``V2beta1Run`` objects, in the order in which the runs were found to be complete.
+
+        Raises:
+            kfp_server_api.ApiException: With status 404, if some of ``run_ids`` do not exist (or were deleted while waiting).
+
+        Example:
+          ::
+
+            for run in client.wait_for_runs_completion(run_ids, timeout=3600):
+                print(run.run_id, run.state)
+        """
+        if run_ids is None and experiment_id is None:
+            raise ValueError('Either run_ids or experiment_id is required.')
+        if isinstance(timeout, datetime.timedelta):
+            timeout = timeout.total_seconds()
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        pending_run_ids = None if run_ids is None else list(
+            dict.fromkeys(run_ids))
+        delay = sleep_duration
+        is_valid_token = False
+        while pending_run_ids is None or pending_run_ids:
+            try:
+                runs = self._list_runs_by_id(pending_run_ids, experiment_id)
+                is_valid_token = True
+            except kfp_server_api.ApiException as api_ex:
+                if self._maybe_refresh_expired_token(api_ex, is_valid_token):
+                    continue
+                raise
+
+            if pending_run_ids is not None:
+                found_run_ids = {run.run_id for run in runs}
+                missing_run_ids = [
+                    run_id for run_id in pending_run_ids
+                    if run_id not in found_run_ids
+                ]
+                if missing_run_ids:
+                    raise kfp_server_api.ApiException(
+                        status=404, reason=f'Runs not found: {missing_run_ids}')
+
+            completed_run_ids = set()
+            for run in runs:
+                if run.state is not None and run.state.lower(
+                ) in _RUN_TERMINAL_STATES:
+                    completed_run_ids.add(run.run_id)
+                    yield run
+            if pending_run_ids is None:
+                pending_run_ids = [run.run_id for run in runs]
+            pending_run_ids = [
+                run_id for run_id in pending_run_ids
+                if run_id not in completed_run_ids
+            ]
+            if not pending_run_ids:
+                return
+
+            logging.info(
+                f'Waiting for {len(pending_run_ids)} runs to complete...')
+            delay = sleep_duration if completed_run_ids else min(
+                delay * 2, max_sleep_duration)
+            # jitter spreads out the requests of many concurrent waiters
+            sleep_time = delay * random.uniform(0.5, 1.0)
+            if deadline is not None:
+                if time.monotonic() + sleep_time > deadline:
+                    raise TimeoutError(
+                        f'Timed out waiting for runs to complete: {pending_run_ids}'
+                    )
+            time.sleep(sleep_time)
+
+    def watch_run(
+        self,
+        run_id: str,
+        timeout: Optional[Union[int, datetime.timedelta]] = None,
+        sleep_duration: float = 1,
+        max_sleep_duration: float = 30,
+    ) -> Iterator[RunWatchEvent]:
+        """Watches a run, and yields the changes of the states of the run and
+        its tasks until the run is complete, canceled or paused.
+
+        The time between checks starts at ``sleep_duration``, doubles, with
+        random jitter, after each check in which no state changed, up to
+        ``max_sleep_duration``, and is reset when a state changes.
+
+        Args:
+            run_id: ID of the run.
+            timeout: Timeout after which the client should stop watching the run (seconds). If not set, watches indefinitely.
+            sleep_duration: Initial time in seconds between checks.
+            max_sleep_duration: Maximum time in seconds between checks.
+
+        Returns:
+            An iterator of ``RunWatchEvent`` objects. The changes observed in a
+            check are yielded for the tasks first, then for the run.
+
+        Example:
+          ::
+
+            for event in client.watch_run(run_id):
+                if event.task is not None:
+                    print(event.task.display_name, event.state)
+        """
+        if isinstance(timeout, datetime.timedelta):
+            timeout = timeout.total_seconds()
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        run_state = None
+        task_states: Dict[str, Optional[str]] = {}
+        delay = sleep_duration
+        is_valid_token = False
+        while True:
+            try:
+                run = self._run_api.get_run(run_id=run_id)
+                is_valid_token = True
+            except kfp_server_api.ApiException as api_ex:
+                if self._maybe_refresh_expired_token(api_ex, is_valid_token):
+                    continue
+                raise
+
+            changed = False
+            task_details = (run.run_details.task_details
+                            if run.run_details is not None else None) or []
+            for task in task_details:
+                previous_state = task_states.get(task.task_id)
+                if task.task_id in task_states and previous_state == task.state:
+                    continue
+                task_states[task.task_id] = task.state
+                changed = True
+                yield RunWatchEvent(
+                    run=run,
+                    task=task,
+                    previous_state=previous_state,
+                    state=task.state)
+            if run.state != run_state:
+                changed = True
+                yield RunWatchEvent(
+                    run=run,
+                    task=None,
+                    previous_state=run_state,
+                    state=run.state)
+                run_state = run.state
+
+            if run_state is not None and run_state.lower(
+            ) in _RUN_TERMINAL_STATES:
+                return
+
+            delay = sleep_duration if changed else min(delay *
+                                                       2, max_sleep_duration)
+            # jitter spreads out the requests of many concurrent watchers
+            sleep_time = delay * random.uniform(0.5, 1.0)
+            if deadline is not None:
+                if time.monotonic() + sleep_time > deadline:
+                    raise TimeoutError(f'Timed out watching run {run_id}.')
+            time.sleep(sleep_time)
+
+    def _list_runs_by_id(
+            self, run_ids: Optional[List[str]],
+            experiment_id: Optional[str]) -> List[kfp_server_api.V2beta1Run]:
+        """Lists all runs with the given IDs, or, if run_ids is None, all
+        runs in an experiment."""
+        if run_ids is None:
+            batches = [None]
+        else:
+            batches = [
+                run_ids[i:i + _MAX_RUN_IDS_PER_LIST_REQUEST]
+                for i in range(0, len(run_ids), _MAX_RUN_IDS_PER_LIST_REQUEST)
+            ]
+        runs = []
+        for batch in batches:
+            run_filter = None
+            if batch is not None:
+                run_filter = json.dumps({
+                    'predicates': [{
+                        'operation': _FILTER_OPERATIONS['IN'],
+                        'key': 'run_id',
+                        'stringValues': {
+                            'values': batch
+                        },
+                    }]
+                })
+            runs.extend(
+                self.iter_runs(
+                    experiment_id=experiment_id,
+                    filter=run_filter,
+                    page_size=_MAX_RUN_IDS_PER_LIST_REQUEST))
+        return runs
+
+    def _maybe_refresh_expired_token(self, api_ex: kfp_server_api.ApiException,
+                                     is_valid_token: bool) -> bool:
+        """Refreshes the access token if a request failed with 401
+        Unauthorized after an earlier request with the token succeeded.
+
+        Returns:
+            Whether the token was refreshed, in which case the request
+            should be retried.
+        """
+        if is_valid_token and api_ex.status == 401:
+            logging.info('Access token has expired !!! Refreshing ...')
+            self._refresh_api_client_token()
+            return True
+        return False
+
     def upload_pipeline(
         self,
         pipeline_package_path: str,
@@ -1418,11 +2148,13 @@ class Client:
             pipeline_doc = _extract_pipeline_yaml(pipeline_package_path)
             pipeline_name = pipeline_doc.pipeline_spec.pipeline_info.name
         validate_pipeline_resource_name(pipeline_name)
-        response = self._upload_api.upload_pipeline(
-            pipeline_package_path,
-            name=pipeline_name,
-            description=description,
-            namespace=namespace)
+        with _uploadable_pipeline_package(
+                pipeline_package_path) as pipeline_package_path:
+            response = self._upload_api.upload_pipeline(
+                pipeline_package_path,
+                name=pipeline_name,
+                description=description,
+                namespace=namespace)
         link = f'{self._get_url_prefix()}/#/pipelines/details/{response.pipeline_id}'
         if self._is_ipython():
             import IPython
@@ -1440,6 +2172,7 @@ class Client:
         pipeline_id: Optional[str] = None,
         pipeline_name: Optional[str] = None,
         description: Optional[str] = None,
+        skip_if_unchanged: bool = False,
     ) -> kfp_server_api.V2beta1PipelineVersion:
         """Uploads a new version of the pipeline.
 
@@ -1450,6 +2183,8 @@ class Client:
             pipeline_id: ID of the pipeline.
             pipeline_name: Name of the pipeline.
             description: Description of the pipeline version to show in the UI.
+            skip_if_unchanged: If ``True``, a hash of the pipeline spec, which ignores the SDK version, is stored in the description of the uploaded version.
+                If a version of the pipeline with the same hash already exists, it is returned and no new version is uploaded.
 
         Returns:
             ``V2beta1PipelineVersion`` object.
@@ -1461,6 +2196,20 @@ class Client:
 
         if pipeline_name:
             pipeline_id = self.get_pipeline_id(pipeline_name)
+
+        if skip_if_unchanged:
+            spec_hash = _compute_pipeline_spec_hash(
+                _extract_pipeline_yaml(pipeline_package_path))
+            existing_version = self._get_pipeline_version_by_spec_hash(
+                pipeline_id=pipeline_id, spec_hash=spec_hash)
+            if existing_version is not None:
+                logging.info(
+                    f'Pipeline version {existing_version.pipeline_version_id} has an identical pipeline spec. Skipping upload.'
+                )
+                return existing_version
+            description = _add_pipeline_spec_hash_to_description(
+                description, spec_hash)
+
         kwargs = dict(
             name=pipeline_version_name,
             pipelineid=pipeline_id,
@@ -1469,8 +2218,10 @@ class Client:
         if description:
             kwargs['description'] = description
 
-        response = self._upload_api.upload_pipeline_version(
-            pipeline_package_path, **kwargs)
+        with _uploadable_pipeline_package(
+                pipeline_package_path) as pipeline_package_path:
+            response = self._upload_api.upload_pipeline_version(
+                pipeline_package_path, **kwargs)
 
         link = f'{self._get_url_prefix()}/#/pipelines/details/{response.pipeline_id}/version/{response.pipeline_version_id}'
         if self._is_ipython():
@@ -1482,6 +2233,95 @@ class Client:
 
         return response
 
+    def _get_pipeline_version_by_spec_hash(
+        self,
+        pipeline_id: str,
+        spec_hash: str,
+    ) -> Optional[kfp_server_api.V2beta1PipelineVersion]:
+        """Gets a version of a pipeline uploaded with skip_if_unchanged by the
+        hash of its pipeline spec.
+
+        Args:
+            pipeline_id: ID of the pipeline.
+            spec_hash: Hash computed by ``_compute_pipeline_spec_hash``.
+
+        Returns:
+            The pipeline version if a version with the hash exists.
+        """
+        version_filter = json.dumps({
+            'predicates': [{
+                'operation': _FILTER_OPERATIONS['IS_SUBSTRING'],
+                'key': 'description',
+                'stringValue': _PIPELINE_SPEC_HASH_MARKER + spec_hash,
+            }]
+        })
+        return next(
+            self.iter_pipeline_versions(
+                pipeline_id=pipeline_id,
+                filter=version_filter,
+                page_size=1,
+                limit=1), None)
+
+    def _get_or_upload_pipeline_version(
+        self,
+        pipeline_package_path: str,
+        pipeline_name: str,
+        enable_caching: Optional[bool],
+    ) -> kfp_server_api.V2beta1PipelineVersion:
+        """Gets the version of a pipeline with the pipeline spec of a package,
+        uploading the pipeline or a new version of it if there is none.
+
+        Args:
+            pipeline_package_path: Local path to the pipeline package.
+            pipeline_name: Name of the pipeline.
+            enable_caching: Overrides the caching options of the pipeline spec, if not ``None``.
+
+        Returns:
+            ``V2beta1PipelineVersion`` object.
+        """
+        pipeline_doc = _extract_pipeline_yaml(pipeline_package_path)
+        if enable_caching is not None:
+            _override_caching_options(pipeline_doc.pipeline_spec,
+                                      enable_caching)
+        spec_hash = _compute_pipeline_spec_hash(pipeline_doc)
+
+        pipeline_id = self.get_pipeline_id(pipeline_name)
+        if pipeline_id is not None:
+            existing_version = self._get_pipeline_version_by_spec_hash(
+                pipeline_id=pipeline_id, spec_hash=spec_hash)
+            if existing_version is not None:
+                return existing_version
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            if enable_caching is not None:
+                pipeline_package_path = os.path.join(tmpdir, 'pipeline.yaml')
+                _write_pipeline_yaml(pipeline_doc, pipeline_package_path)
+
+            description = _add_pipeline_spec_hash_to_description(
+                None, spec_hash)
+            if pipeline_id is None:
+                pipeline = self.upload_pipeline(
+                    pipeline_package_path,
+                    pipeline_name=pipeline_name,
+                    description=description)
+                # The first version of a pipeline may or may not be given the
+                # description of the pipeline, so the hash is looked up on
+                # the version that was created. If it is missing, a version
+                # with the hash is uploaded, so that it is found next time.
+                pipeline_id = pipeline.pipeline_id
+                first_version = next(
+                    self.iter_pipeline_versions(
+                        pipeline_id=pipeline_id, page_size=1, limit=1), None)
+                marker = _PIPELINE_SPEC_HASH_MARKER + spec_hash
+                if first_version is not None and marker in (
+                        first_version.description or ''):
+                    return first_version
+            return self.upload_pipeline_version(
+                pipeline_package_path,
+                pipeline_version_name=f'{pipeline_name}-{spec_hash[:12]}',
+                pipeline_id=pipeline_id,
+                description=description)
+
     def get_pipeline(self, pipeline_id: str) -> kfp_server_api.V2beta1Pipeline:
         """Gets pipeline details.
 
@@ -1543,6 +2383,42 @@ class Client:
             pipeline_id=pipeline_id,
             filter=filter)
 
+    def iter_pipeline_versions(
+        self,
+        pipeline_id: str,
+        sort_by: str = '',
+        filter: Optional[str] = None,
+        page_token: str = '',
+        page_size: int = _DEFAULT_ITER_PAGE_SIZE,
+        limit: Optional[int] = None,
+    ) -> Iterator[kfp_server_api.V2beta1PipelineVersion]:
+        """Iterates over pipeline versions, requesting further pages as needed.
+
+        The next page is requested in the background while the pipeline versions of the
+        current page are being processed.
+
+        Args:
+            pipeline_id: ID of the pipeline for which to list pipeline versions.
+            sort_by: Sort string of format ``'[field_name]', '[field_name] desc'``. For example, ``'display_name desc'``.
+            filter: A url-encoded, JSON-serialized Filter protocol buffer. See ``list_pipeline_versions``.
+            page_token: Page token of the page from which to start.
+            page_size: Number of pipeline versions requested per page.
+            limit: Maximum number of pipeline versions to return. If not set, returns all pipeline versions.
+
+        Returns:
+            An iterator of ``V2beta1PipelineVersion`` objects.
+        """
+        yield from _iter_list_results(
+            self.list_pipeline_versions,
+            'pipeline_versions',
+            page_token=page_token,
+            page_size=page_size,
+            limit=limit,
+            pipeline_id=pipeline_id,
+            sort_by=sort_by,
+            filter=filter,
+        )
+
     def get_pipeline_version(
         self,
         pipeline_id: str,
@@ -1622,6 +2498,57 @@ def _add_generated_apis(
     target_struct.api_models = models_struct
 
 
+def _iter_list_results(
+    list_method: Callable[..., Any],
+    field_name: str,
+    page_token: str,
+    page_size: int,
+    limit: Optional[int],
+    **kwargs,
+) -> Iterator[Any]:
+    """Yields the results of all pages of a paginated list method.
+
+    While the results of a page are being consumed, the next page is
+    requested by a background thread.
+
+    Args:
+        list_method: A Client.list_* method.
+        field_name: The field of the list response that holds the results.
+        page_token: Page token of the first page.
+        page_size: Number of results requested per page.
+        limit: Maximum number of results to yield.
+        **kwargs: Other arguments for list_method.
+    """
+
+    def request_page(page_token: str,
+                     num_results: int) -> Optional[futures.Future]:
+        if limit is not None and num_results >= limit:
+            return None
+        request_size = page_size if limit is None else min(
+            page_size, limit - num_results)
+        return executor.submit(
+            list_method,
+            page_token=page_token,
+            page_size=request_size,
+            **kwargs)
+
+    num_results = 0
+    with futures.ThreadPoolExecutor(max_workers=1) as executor:
+        next_page = request_page(page_token, num_results)
+        while next_page is not None:
+            response = next_page.result()
+            results = getattr(response, field_name) or []
+            if limit is not None:
+                results = results[:limit - num_results]
+            next_page = None
+            if response.next_page_token:
+                next_page = request_page(response.next_page_token,
+                                         num_results + len(results))
+            for result in results:
+                num_results += 1
+                yield result
+
+
 def validate_pipeline_resource_name(name: str) -> None:
     REGEX = r'[a-z0-9]([-a-z0-9]*[a-z0-9])?(\\.[a-z0-9]([-a-z0-9]*[a-z0-9])?)*'
 
@@ -1632,16 +2559,48 @@ def validate_pipeline_resource_name(name: str) -> None:
 
 
 def _extract_pipeline_yaml(package_file: str) -> _PipelineDoc:
+    """Loads the pipeline spec and platform spec of a pipeline package.
+
+    Parsed packages are cached in memory by path, modification time and
+    size, so loading an unchanged package again does not parse it. The
+    returned document is a copy, which callers may modify.
+    """
+    try:
+        stat = os.stat(package_file)
+    except OSError:
+        return _load_pipeline_package(package_file)
+    pipeline_doc = _load_pipeline_package_cached(
+        os.path.abspath(package_file), stat.st_mtime_ns, stat.st_size)
+    return _PipelineDoc(
+        pipeline_spec=copy.deepcopy(pipeline_doc.pipeline_spec),
+        platform_spec=copy.deepcopy(pipeline_doc.platform_spec))
+
+
+@functools.lru_cache(maxsize=_MAX_CACHED_PIPELINE_PACKAGES)
+def _load_pipeline_package_cached(package_file: str, mtime_ns: int,
+                                  size: int) -> _PipelineDoc:
+    # the modification time and size are part of the cache key only
+    del mtime_ns, size
+    return _load_pipeline_package(package_file)
+
+
+def _load_pipeline_package(package_file: str) -> _PipelineDoc:
+
+    binary_extension = pipeline_spec_builder.BINARY_PACKAGE_EXTENSION
 
     def _choose_pipeline_file(file_list: List[str]) -> str:
-        pipeline_files = [file for file in file_list if file.endswith('.yaml')]
+        pipeline_files = [
+            file for file in file_list
+            if file.endswith(('.yaml', binary_extension))
+        ]
         if not pipeline_files:
             raise ValueError(
                 'Invalid package. Missing pipeline yaml file in the package.')
 
-        if 'pipeline.yaml' in pipeline_files:
-            return 'pipeline.yaml'
-        elif len(pipeline_files) == 1:
+        for default_file in ['pipeline.yaml', f'pipeline{binary_extension}']:
+            if default_file in pipeline_files:
+                return default_file
+        if len(pipeline_files) == 1:
             return pipeline_files[0]
         else:
             raise ValueError(
@@ -1649,7 +2608,7 @@ def _extract_pipeline_yaml(package_file: str) -> _PipelineDoc:
                 'are multiple yaml files.')
 
     def _safe_load_yaml(stream: TextIO) -> _PipelineDoc:
-        docs = yaml.safe_load_all(stream)
+        docs = yaml.load_all(stream, Loader=_YamlLoader)
         pipeline_spec_dict = None
         platform_spec_dict = {}
         for doc in docs:
@@ -1664,25 +2623,89 @@ def _extract_pipeline_yaml(package_file: str) -> _PipelineDoc:
             platform_spec=json_format.ParseDict(
                 platform_spec_dict, pipeline_spec_pb2.PlatformSpec()))
 
+    def _load_pipeline_file(stream: BinaryIO, file_name: str) -> _PipelineDoc:
+        if file_name.endswith(binary_extension):
+            pipeline_spec, platform_spec = (
+                pipeline_spec_builder.read_pipeline_spec_from_binary(stream))
+            return _PipelineDoc(
+                pipeline_spec=pipeline_spec, platform_spec=platform_spec)
+        return _safe_load_yaml(stream)
+
     if package_file.endswith('.tar.gz') or package_file.endswith('.tgz'):
         with tarfile.open(package_file, 'r:gz') as tar:
             file_names = [member.name for member in tar if member.isfile()]
             pipeline_file = _choose_pipeline_file(file_names)
             with tar.extractfile(
                     tar.getmember(pipeline_file)) as f:  # type: ignore
-                return _safe_load_yaml(f)
+                return _load_pipeline_file(f, pipeline_file)
     elif package_file.endswith('.zip'):
         with zipfile.ZipFile(package_file, 'r') as zip:
             pipeline_file = _choose_pipeline_file(zip.namelist())
             with zip.open(pipeline_file) as f:
-                return _safe_load_yaml(f)
+                return _load_pipeline_file(f, pipeline_file)
     elif package_file.endswith('.yaml') or package_file.endswith('.yml'):
         with open(package_file, 'r') as f:
             return _safe_load_yaml(f)
+    elif package_file.endswith(binary_extension):
+        with open(package_file, 'rb') as f:
+            return _load_pipeline_file(f, package_file)
     else:
         raise ValueError(
             f'The package_file {package_file} should end with one of the '
-            'following formats: [.tar.gz, .tgz, .zip, .yaml, .yml].')
+            f'following formats: [.tar.gz, .tgz, .zip, .yaml, .yml, {binary_extension}].'
+        )
+
+
+def _write_pipeline_yaml(pipeline_doc: _PipelineDoc, package_path: str) -> None:
+    pipeline_spec_builder.write_pipeline_spec_to_file(
+        pipeline_spec=pipeline_doc.pipeline_spec,
+        pipeline_description=pipeline_doc.pipeline_spec.pipeline_info
+        .description,
+        platform_spec=pipeline_doc.platform_spec,
+        package_path=package_path)
+
+
+@contextlib.contextmanager
+def _uploadable_pipeline_package(package_file: str) -> Iterator[str]:
+    """Yields the path of a package that the API server accepts.
+
+    The API server does not accept binary packages, so they are converted to
+    a temporary YAML file. Other packages are yielded as they are.
+    """
+    if not package_file.endswith(
+            pipeline_spec_builder.BINARY_PACKAGE_EXTENSION):
+        yield package_file
+        return
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yaml_file = os.path.join(tmpdir, 'pipeline.yaml')
+        _write_pipeline_yaml(_extract_pipeline_yaml(package_file), yaml_file)
+        yield yaml_file
+
+
+def _compute_pipeline_spec_hash(pipeline_doc: _PipelineDoc) -> str:
+    """Computes a hash of a pipeline spec and its platform spec that ignores
+    the SDK version the pipeline was compiled with.
+
+    Args:
+        pipeline_doc: The pipeline document.
+
+    Returns:
+        The hex digest of the hash.
+    """
+    pipeline_spec = copy.deepcopy(pipeline_doc.pipeline_spec)
+    pipeline_spec.ClearField('sdk_version')
+    hasher = hashlib.sha256()
+    for message in [pipeline_spec, pipeline_doc.platform_spec]:
+        serialized = message.SerializeToString(deterministic=True)
+        hasher.update(len(serialized).to_bytes(8, 'big'))
+        hasher.update(serialized)
+    return hasher.hexdigest()
+
+
+def _add_pipeline_spec_hash_to_description(description: Optional[str],
+                                           spec_hash: str) -> str:
+    marker = _PIPELINE_SPEC_HASH_MARKER + spec_hash
+    return f'{description}\n\n{marker}' if description else marker
 
 
 def _override_caching_options(
@@ -16,10 +16,12 @@ import json
 import os
 import tempfile
 import textwrap
+import time
 import unittest
 from unittest.mock import MagicMock
 from unittest.mock import Mock
 from unittest.mock import patch
+import zipfile
 
 from absl.testing import parameterized
 from google.protobuf import json_format
@@ -29,6 +31,7 @@ from kfp.dsl import component
 from kfp.dsl import pipeline
 from kfp.pipeline_spec import pipeline_spec_pb2
 import kfp_server_api
+import urllib3
 import yaml
 
 
@@ -186,6 +189,97 @@ class TestExtractPipelineYAML(parameterized.TestCase):
                 ['kubernetes']['deploymentSpec']['executors']['exec-foo']
                 ['pvcMount'][0]['constant'])
 
+    @parameterized.parameters('pipeline.pb', 'pipeline.zip')
+    def test_extract_pipeline_binary(self, package_name):
+
+        @component
+        def comp():
+            pass
+
+        @pipeline(name='my-pipeline')
+        def my_pipeline():
+            comp()
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            pb_path = os.path.join(tempdir, 'pipeline.pb')
+            Compiler().compile(my_pipeline, pb_path)
+            package_path = os.path.join(tempdir, package_name)
+            if package_name.endswith('.zip'):
+                with zipfile.ZipFile(package_path, 'w') as zip_file:
+                    zip_file.write(pb_path, 'pipeline.pb')
+
+            with patch.object(json_format,
+                              'MessageToDict') as mock_message_to_dict:
+                pipeline_doc = client._extract_pipeline_yaml(package_path)
+            mock_message_to_dict.assert_not_called()
+            self.assertEqual(my_pipeline.pipeline_spec,
+                             pipeline_doc.pipeline_spec)
+            self.assertEqual(pipeline_spec_pb2.PlatformSpec(),
+                             pipeline_doc.platform_spec)
+
+    def test_extract_pipeline_yaml_is_cached(self):
+
+        @component
+        def comp():
+            pass
+
+        @pipeline(name='my-pipeline')
+        def my_pipeline():
+            comp()
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            package_path = os.path.join(tempdir, 'pipeline.yaml')
+            Compiler().compile(my_pipeline, package_path)
+
+            with patch.object(
+                    client,
+                    '_load_pipeline_package',
+                    wraps=client._load_pipeline_package) as mock_load:
+                first_doc = client._extract_pipeline_yaml(package_path)
+                first_doc.pipeline_spec.pipeline_info.name = 'changed'
+                second_doc = client._extract_pipeline_yaml(package_path)
+                self.assertEqual(mock_load.call_count, 1)
+                self.assertEqual(second_doc.pipeline_spec.pipeline_info.name,
+                                 'my-pipeline')
+
+                with open(package_path, 'a') as f:
+                    f.write('\n')
+                client._extract_pipeline_yaml(package_path)
+                self.assertEqual(mock_load.call_count, 2)
+
+
+class TestComputePipelineSpecHash(unittest.TestCase):
+
+    def test_ignores_sdk_version(self):
+        pipeline_spec = pipeline_spec_pb2.PipelineSpec(
+            sdk_version='kfp-2.0.0', schema_version='2.1.0')
+        pipeline_spec.pipeline_info.name = 'my-pipeline'
+        other_pipeline_spec = pipeline_spec_pb2.PipelineSpec()
+        other_pipeline_spec.CopyFrom(pipeline_spec)
+        other_pipeline_spec.sdk_version = 'kfp-2.0.1'
+
+        self.assertEqual(
+            client._compute_pipeline_spec_hash(
+                client._PipelineDoc(pipeline_spec,
+                                    pipeline_spec_pb2.PlatformSpec())),
+            client._compute_pipeline_spec_hash(
+                client._PipelineDoc(other_pipeline_spec,
+                                    pipeline_spec_pb2.PlatformSpec())))
+
+    def test_changes_with_pipeline_spec(self):
+        pipeline_spec = pipeline_spec_pb2.PipelineSpec()
+        pipeline_spec.pipeline_info.name = 'my-pipeline'
+        other_pipeline_spec = pipeline_spec_pb2.PipelineSpec()
+        other_pipeline_spec.pipeline_info.name = 'other-pipeline'
+
+        self.assertNotEqual(
+            client._compute_pipeline_spec_hash(
+                client._PipelineDoc(pipeline_spec,
+                                    pipeline_spec_pb2.PlatformSpec())),
+            client._compute_pipeline_spec_hash(
+                client._PipelineDoc(other_pipeline_spec,
+                                    pipeline_spec_pb2.PlatformSpec())))
+
 
 class TestClient(unittest.TestCase):
 
@@ -252,6 +346,630 @@ class TestClient(unittest.TestCase):
                     run_id='foo', timeout=1, sleep_duration=0)
                 mock_get_run.assert_called_once_with(run_id='foo')
 
+    def test_wait_for_runs_completion_yields_runs_as_they_complete(self):
+        with patch.object(self.client._run_api,
+                          'list_runs') as mock_list_runs, patch.object(
+                              client.time, 'sleep') as mock_sleep:
+            mock_list_runs.side_effect = [
+                Mock(
+                    runs=[
+                        Mock(run_id='a', state='RUNNING'),
+                        Mock(run_id='b', state='SUCCEEDED'),
+                        Mock(run_id='c', state='PENDING'),
+                    ],
+                    next_page_token=''),
+                Mock(
+                    runs=[
+                        Mock(run_id='a', state='RUNNING'),
+                        Mock(run_id='c', state='RUNNING'),
+                    ],
+                    next_page_token=''),
+                Mock(
+                    runs=[
+                        Mock(run_id='a', state='FAILED'),
+                        Mock(run_id='c', state='SUCCEEDED'),
+                    ],
+                    next_page_token=''),
+            ]
+            runs = self.client.wait_for_runs_completion(
+                run_ids=['a', 'b', 'c'], sleep_duration=1, max_sleep_duration=4)
+            self.assertEqual([run.run_id for run in runs], ['b', 'a', 'c'])
+
+        self.assertEqual(mock_list_runs.call_count, 3)
+        self.assertEqual(
+            json.loads(mock_list_runs.call_args_list[1].kwargs['filter']), {
+                'predicates': [{
+                    'operation': client._FILTER_OPERATIONS['IN'],
+                    'key': 'run_id',
+                    'stringValues': {
+                        'values': ['a', 'c']
+                    },
+                }]
+            })
+        # the delay is reset after a run completes, and doubles otherwise
+        first_sleep, second_sleep = [
+            call.args[0] for call in mock_sleep.call_args_list
+        ]
+        self.assertTrue(0.5 <= first_sleep <= 1)
+        self.assertTrue(1 <= second_sleep <= 2)
+
+    def test_wait_for_runs_completion_for_experiment(self):
+        with patch.object(self.client._run_api, 'list_runs') as mock_list_runs:
+            mock_list_runs.side_effect = [
+                Mock(
+                    runs=[Mock(run_id='a', state='SUCCEEDED')],
+                    next_page_token='token'),
+                Mock(
+                    runs=[Mock(run_id='b', state='SUCCEEDED')],
+                    next_page_token=''),
+            ]
+            runs = list(
+                self.client.wait_for_runs_completion(experiment_id='exp'))
+
+        self.assertEqual([run.run_id for run in runs], ['a', 'b'])
+        self.assertEqual(mock_list_runs.call_args.kwargs['experiment_id'],
+                         'exp')
+        self.assertEqual(mock_list_runs.call_args.kwargs['page_token'], 'token')
+
+    def test_wait_for_runs_completion_expired_access_token(self):
+        with patch.object(self.client._run_api,
+                          'list_runs') as mock_list_runs, patch.object(
+                              self.client, '_refresh_api_client_token'
+                          ) as mock_refresh_api_client_token, patch.object(
+                              client.time, 'sleep'):
+            mock_list_runs.side_effect = [
+                Mock(
+                    runs=[Mock(run_id='a', state='RUNNING')],
+                    next_page_token=''),
+                kfp_server_api.ApiException(status=401),
+                Mock(
+                    runs=[Mock(run_id='a', state='SUCCEEDED')],
+                    next_page_token=''),
+            ]
+            runs = list(self.client.wait_for_runs_completion(run_ids=['a']))
+
+        self.assertEqual([run.run_id for run in runs], ['a'])
+        mock_refresh_api_client_token.assert_called_once()
+
+    def test_wait_for_runs_completion_canceled_run(self):
+        with patch.object(self.client._run_api, 'list_runs') as mock_list_runs:
+            mock_list_runs.return_value = Mock(
+                runs=[Mock(run_id='a', state='CANCELED')], next_page_token='')
+            runs = list(self.client.wait_for_runs_completion(run_ids=['a']))
+
+        self.assertEqual([run.run_id for run in runs], ['a'])
+
+    def test_wait_for_run_completion_waits_for_paused_run(self):
+        with patch.object(self.client._run_api, 'get_run') as mock_get_run:
+            mock_get_run.side_effect = [
+                Mock(state='PAUSED'),
+                Mock(state='SUCCEEDED'),
+            ]
+            response = self.client.wait_for_run_completion(
+                run_id='foo', timeout=1, sleep_duration=0)
+
+        self.assertEqual(response.state, 'SUCCEEDED')
+        self.assertEqual(mock_get_run.call_count, 2)
+
+    def test_wait_for_runs_completion_paused_run(self):
+        with patch.object(self.client._run_api, 'list_runs') as mock_list_runs:
+            mock_list_runs.return_value = Mock(
+                runs=[Mock(run_id='a', state='PAUSED')], next_page_token='')
+            runs = list(self.client.wait_for_runs_completion(run_ids=['a']))
+
+        self.assertEqual([run.run_id for run in runs], ['a'])
+
+    def test_wait_for_runs_completion_missing_run(self):
+        with patch.object(self.client._run_api,
+                          'list_runs') as mock_list_runs, patch.object(
+                              client.time, 'sleep') as mock_sleep:
+            mock_list_runs.return_value = Mock(
+                runs=[Mock(run_id='a', state='RUNNING')], next_page_token='')
+            with self.assertRaisesRegex(kfp_server_api.ApiException,
+                                        r"\['b'\]") as cm:
+                list(self.client.wait_for_runs_completion(run_ids=['a', 'b']))
+
+        self.assertEqual(cm.exception.status, 404)
+        mock_sleep.assert_not_called()
+
+    def test_wait_for_runs_completion_timeout(self):
+        with patch.object(self.client._run_api, 'list_runs') as mock_list_runs:
+            mock_list_runs.return_value = Mock(
+                runs=[Mock(run_id='a', state='RUNNING')], next_page_token='')
+            with self.assertRaisesRegex(TimeoutError, r"\['a'\]"):
+                list(
+                    self.client.wait_for_runs_completion(
+                        run_ids=['a'], timeout=0))
+
+    def test_watch_run_yields_state_changes(self):
+
+        def make_run(state, task_states):
+            return Mock(
+                state=state,
+                run_details=Mock(task_details=[
+                    Mock(task_id=task_id, state=task_state)
+                    for task_id, task_state in task_states.items()
+                ]))
+
+        runs = [
+            make_run('RUNNING', {'a': 'RUNNING'}),
+            make_run('RUNNING', {'a': 'RUNNING'}),
+            make_run('RUNNING', {
+                'a': 'SUCCEEDED',
+                'b': 'RUNNING'
+            }),
+            make_run('SUCCEEDED', {
+                'a': 'SUCCEEDED',
+                'b': 'SUCCEEDED'
+            }),
+        ]
+        with patch.object(
+                self.client._run_api, 'get_run',
+                side_effect=runs), patch('time.sleep') as mock_sleep, patch(
+                    'random.uniform', return_value=1.0):
+            events = list(self.client.watch_run('foo', sleep_duration=1))
+
+        self.assertEqual([(event.task and event.task.task_id,
+                           event.previous_state, event.state)
+                          for event in events], [
+                              ('a', None, 'RUNNING'),
+                              (None, None, 'RUNNING'),
+                              ('a', 'RUNNING', 'SUCCEEDED'),
+                              ('b', None, 'RUNNING'),
+                              ('b', 'RUNNING', 'SUCCEEDED'),
+                              (None, 'RUNNING', 'SUCCEEDED'),
+                          ])
+        # backs off after the check in which no state changed
+        self.assertEqual([call.args[0] for call in mock_sleep.call_args_list],
+                         [1, 2, 1])
+
+    def test_watch_run_timeout(self):
+        with patch.object(
+                self.client._run_api,
+                'get_run',
+                return_value=Mock(state='RUNNING', run_details=None)):
+            with self.assertRaises(TimeoutError):
+                list(self.client.watch_run('foo', timeout=0))
+
+    def test_iter_runs_requests_all_pages(self):
+        pages = {
+            '':
+                Mock(
+                    runs=[Mock(run_id='a'), Mock(run_id='b')],
+                    next_page_token='page2'),
+            'page2':
+                Mock(runs=[Mock(run_id='c')], next_page_token='page3'),
+            'page3':
+                Mock(runs=None, next_page_token=''),
+        }
+        with patch.object(
+                self.client._run_api,
+                'list_runs',
+                side_effect=lambda page_token, **kwargs: pages[page_token]
+        ) as mock_list_runs:
+            runs = self.client.iter_runs(experiment_id='exp', page_size=2)
+            self.assertEqual([run.run_id for run in runs], ['a', 'b', 'c'])
+
+        self.assertEqual(mock_list_runs.call_count, 3)
+        for call in mock_list_runs.call_args_list:
+            self.assertEqual(call.kwargs['experiment_id'], 'exp')
+            self.assertEqual(call.kwargs['page_size'], 2)
+
+    def test_iter_runs_prefetches_next_page(self):
+        requested_page_tokens = []
+
+        def list_runs(page_token, **kwargs):
+            requested_page_tokens.append(page_token)
+            if page_token:
+                return Mock(runs=[Mock(run_id='b')], next_page_token='')
+            return Mock(runs=[Mock(run_id='a')], next_page_token='page2')
+
+        with patch.object(
+                self.client._run_api, 'list_runs', side_effect=list_runs):
+            runs = self.client.iter_runs()
+            self.assertEqual(next(runs).run_id, 'a')
+            time.sleep(0.1)
+            self.assertEqual(requested_page_tokens, ['', 'page2'])
+            self.assertEqual(next(runs).run_id, 'b')
+
+    def test_iter_experiments_limit(self):
+        with patch.object(
+                self.client._experiment_api,
+                'list_experiments',
+                return_value=Mock(
+                    experiments=[Mock(), Mock(), Mock()],
+                    next_page_token='next')) as mock_list_experiments:
+            experiments = list(
+                self.client.iter_experiments(page_size=3, limit=5))
+
+        self.assertEqual(len(experiments), 5)
+        self.assertEqual([
+            call.kwargs['page_size']
+            for call in mock_list_experiments.call_args_list
+        ], [3, 2])
+
+    def test_delete_runs_retries_transient_errors(self):
+        attempts = {'a': 0, 'b': 0, 'c': 0}
+
+        def delete_run(run_id):
+            attempts[run_id] += 1
+            if run_id == 'a' and attempts[run_id] < 3:
+                raise kfp_server_api.ApiException(status=503)
+            if run_id == 'b':
+                raise kfp_server_api.ApiException(status=404)
+
+        with patch.object(
+                self.client._run_api, 'delete_run',
+                side_effect=delete_run), patch('time.sleep') as mock_sleep:
+            results = self.client.delete_runs(
+                run_ids=['a', 'b', 'c'], parallelism=2)
+
+        self.assertEqual([result.resource_id for result in results],
+                         ['a', 'b', 'c'])
+        self.assertEqual([result.succeeded for result in results],
+                         [True, False, True])
+        self.assertEqual([result.attempts for result in results], [3, 1, 1])
+        self.assertEqual(results[1].error.status, 404)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_archive_runs_gives_up_after_max_attempts(self):
+        with patch.object(
+                self.client._run_api,
+                'archive_run',
+                side_effect=kfp_server_api.ApiException(status=429)
+        ) as mock_archive_run, patch('time.sleep') as mock_sleep:
+            results = self.client.archive_runs(run_ids=['a'], max_attempts=3)
+
+        self.assertFalse(results[0].succeeded)
+        self.assertEqual(results[0].attempts, 3)
+        self.assertEqual(mock_archive_run.call_count, 3)
+        # no backoff after the last attempt
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_terminate_runs_retries_connection_errors(self):
+        errors = {
+            'a': [
+                urllib3.exceptions.MaxRetryError(None, '/runs/a'),
+                urllib3.exceptions.ProtocolError('Connection aborted.'),
+            ],
+            'b': [
+                urllib3.exceptions.ReadTimeoutError(None, '/runs/b',
+                                                    'Read timed out.')
+            ] * 3,
+        }
+
+        def terminate_run(run_id):
+            if errors[run_id]:
+                raise errors[run_id].pop(0)
+
+        with patch.object(
+                self.client._run_api, 'terminate_run',
+                side_effect=terminate_run), patch('time.sleep'):
+            results = self.client.terminate_runs(
+                run_ids=['a', 'b'], max_attempts=3)
+
+        self.assertTrue(results[0].succeeded)
+        self.assertEqual(results[0].attempts, 3)
+        self.assertFalse(results[1].succeeded)
+        self.assertEqual(results[1].attempts, 3)
+        self.assertIsInstance(results[1].error,
+                              urllib3.exceptions.ReadTimeoutError)
+
+    def test_terminate_runs_with_filter_lists_runs_first(self):
+        with patch.object(
+                self.client._run_api,
+                'list_runs',
+                return_value=Mock(
+                    runs=[Mock(run_id='a'), Mock(run_id='b')],
+                    next_page_token='')) as mock_list_runs, patch.object(
+                        self.client._run_api,
+                        'terminate_run') as mock_terminate_run:
+            results = self.client.terminate_runs(
+                filter='{}', experiment_id='exp')
+
+        self.assertTrue(all(result.succeeded for result in results))
+        self.assertEqual(mock_list_runs.call_args.kwargs['filter'], '{}')
+        self.assertEqual(
+            sorted(call.kwargs['run_id']
+                   for call in mock_terminate_run.call_args_list), ['a', 'b'])
+
+    def test_bulk_run_operation_requires_runs(self):
+        with self.assertRaisesRegex(ValueError, r'run_ids'):
+            self.client.delete_runs()
+
+    def test_bulk_run_operation_grows_connection_pool(self):
+        self.client._existing_config.connection_pool_maxsize = 4
+        pool_manager = self.client._run_api.api_client.rest_client.pool_manager
+        pool_manager.connection_pool_kw['maxsize'] = 4
+
+        with patch.object(self.client._run_api, 'archive_run'):
+            self.client.archive_runs(run_ids=['a'], parallelism=16)
+        self.assertEqual(self.client._existing_config.connection_pool_maxsize,
+                         16)
+        self.assertEqual(pool_manager.connection_pool_kw['maxsize'], 16)
+
+        # a larger pool is not shrunk
+        with patch.object(self.client._run_api, 'archive_run'):
+            self.client.archive_runs(run_ids=['a'], parallelism=2)
+        self.assertEqual(pool_manager.connection_pool_kw['maxsize'], 16)
+
+    def _compile_pipeline(self,
+                          tmpdir: str,
+                          package_name: str = 'pipeline.yaml') -> str:
+
+        @component
+        def comp():
+            pass
+
+        @pipeline(name='my-pipeline')
+        def my_pipeline():
+            comp()
+
+        package_path = os.path.join(tmpdir, package_name)
+        Compiler().compile(my_pipeline, package_path)
+        return package_path
+
+    def test_upload_pipeline_version_skips_unchanged_pipeline(self):
+        existing_version = Mock(pipeline_version_id='v1')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            package_path = self._compile_pipeline(tmpdir)
+            with patch.object(
+                    self.client._pipelines_api,
+                    'list_pipeline_versions',
+                    return_value=Mock(
+                        pipeline_versions=[existing_version],
+                        next_page_token=''
+                    )) as mock_list_versions, patch.object(
+                        self.client._upload_api,
+                        'upload_pipeline_version') as mock_upload:
+                version = self.client.upload_pipeline_version(
+                    package_path,
+                    pipeline_version_name='v2',
+                    pipeline_id='p1',
+                    skip_if_unchanged=True)
+
+        self.assertIs(version, existing_version)
+        mock_upload.assert_not_called()
+        predicate = json.loads(
+            mock_list_versions.call_args.kwargs['filter'])['predicates'][0]
+        self.assertEqual(predicate['key'], 'description')
+        self.assertTrue(predicate['stringValue'].startswith(
+            client._PIPELINE_SPEC_HASH_MARKER))
+
+    @patch('kfp.Client._get_url_prefix', return_value='/pipeline')
+    def test_upload_pipeline_version_stores_spec_hash(self,
+                                                      mock_get_url_prefix):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            package_path = self._compile_pipeline(tmpdir)
+            spec_hash = client._compute_pipeline_spec_hash(
+                client._extract_pipeline_yaml(package_path))
+            with patch.object(
+                    self.client._pipelines_api,
+                    'list_pipeline_versions',
+                    return_value=Mock(
+                        pipeline_versions=None,
+                        next_page_token='')), patch.object(
+                            self.client._upload_api,
+                            'upload_pipeline_version') as mock_upload:
+                self.client.upload_pipeline_version(
+                    package_path,
+                    pipeline_version_name='v2',
+                    pipeline_id='p1',
+                    description='My pipeline.',
+                    skip_if_unchanged=True)
+
+        self.assertEqual(
+            mock_upload.call_args.kwargs['description'],
+            f'My pipeline.\n\n{client._PIPELINE_SPEC_HASH_MARKER}{spec_hash}')
+
+    @patch('kfp.Client._get_url_prefix', return_value='/pipeline')
+    def test_create_run_from_pipeline_package_reuses_pipeline_version(
+            self, mock_get_url_prefix):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            package_path = self._compile_pipeline(tmpdir)
+            with patch.object(
+                    self.client, 'get_pipeline_id',
+                    return_value='p1'), patch.object(
+                        self.client._pipelines_api,
+                        'list_pipeline_versions',
+                        return_value=Mock(
+                            pipeline_versions=[
+                                Mock(
+                                    pipeline_id='p1', pipeline_version_id='v1')
+                            ],
+                            next_page_token='')), patch.object(
+                                self.client._upload_api,
+                                'upload_pipeline_version'
+                            ) as mock_upload, patch.object(
+                                self.client._run_api,
+                                'create_run') as mock_create_run:
+                self.client.create_run_from_pipeline_package(
+                    package_path,
+                    experiment_id='exp',
+                    pipeline_name='my-pipeline')
+
+        mock_upload.assert_not_called()
+        run_body = mock_create_run.call_args.kwargs['body']
+        self.assertIsNone(run_body.pipeline_spec)
+        self.assertEqual(run_body.pipeline_version_reference.pipeline_id, 'p1')
+        self.assertEqual(
+            run_body.pipeline_version_reference.pipeline_version_id, 'v1')
+
+    @patch('kfp.Client._get_url_prefix', return_value='/pipeline')
+    def test_create_run_from_pipeline_package_for_new_pipeline(
+            self, mock_get_url_prefix):
+        # the first version of the new pipeline is not given the
+        # description of the pipeline, and so does not carry the hash
+        first_version = Mock(
+            pipeline_id='p1', pipeline_version_id='v1', description='')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            package_path = self._compile_pipeline(tmpdir)
+            spec_hash = client._compute_pipeline_spec_hash(
+                client._extract_pipeline_yaml(package_path))
+            with patch.object(
+                    self.client, 'get_pipeline_id',
+                    return_value=None), patch.object(
+                        self.client._upload_api,
+                        'upload_pipeline',
+                        return_value=Mock(pipeline_id='p1')), patch.object(
+                            self.client._pipelines_api,
+                            'list_pipeline_versions',
+                            return_value=Mock(
+                                pipeline_versions=[first_version],
+                                next_page_token='')), patch.object(
+                                    self.client._upload_api,
+                                    'upload_pipeline_version',
+                                    return_value=Mock(
+                                        pipeline_id='p1',
+                                        pipeline_version_id='v2')
+                                ) as mock_upload_version, patch.object(
+                                    self.client._run_api,
+                                    'create_run') as mock_create_run:
+                self.client.create_run_from_pipeline_package(
+                    package_path,
+                    experiment_id='exp',
+                    pipeline_name='my-pipeline')
+
+        self.assertEqual(mock_upload_version.call_args.kwargs['pipelineid'],
+                         'p1')
+        self.assertEqual(mock_upload_version.call_args.kwargs['description'],
+                         client._PIPELINE_SPEC_HASH_MARKER + spec_hash)
+        run_body = mock_create_run.call_args.kwargs['body']
+        self.assertEqual(
+            run_body.pipeline_version_reference.pipeline_version_id, 'v2')
+
+    @patch('kfp.Client._get_url_prefix', return_value='/pipeline')
+    def test_create_run_from_binary_pipeline_package_uploads_yaml(
+            self, mock_get_url_prefix):
+        uploaded = {}
+
+        def upload_pipeline(package_path, **kwargs):
+            with open(package_path) as f:
+                uploaded[package_path] = yaml.safe_load(f)
+            return Mock(pipeline_id='p1')
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            package_path = self._compile_pipeline(tmpdir, 'pipeline.pb')
+            spec_hash = client._compute_pipeline_spec_hash(
+                client._extract_pipeline_yaml(package_path))
+            with patch.object(
+                    self.client, 'get_pipeline_id',
+                    return_value=None), patch.object(
+                        self.client._upload_api,
+                        'upload_pipeline',
+                        side_effect=upload_pipeline), patch.object(
+                            self.client._pipelines_api,
+                            'list_pipeline_versions',
+                            return_value=Mock(
+                                pipeline_versions=[
+                                    Mock(
+                                        pipeline_id='p1',
+                                        pipeline_version_id='v1',
+                                        description=client
+                                        ._PIPELINE_SPEC_HASH_MARKER + spec_hash)
+                                ],
+                                next_page_token='')), patch.object(
+                                    self.client._run_api, 'create_run'):
+                self.client.create_run_from_pipeline_package(
+                    package_path,
+                    experiment_id='exp',
+                    pipeline_name='my-pipeline')
+
+        (uploaded_path, pipeline_spec_dict), = uploaded.items()
+        self.assertTrue(uploaded_path.endswith('.yaml'))
+        self.assertEqual(pipeline_spec_dict['pipelineInfo']['name'],
+                         'my-pipeline')
+
+    @patch('kfp.Client._get_url_prefix', return_value='/pipeline')
+    def test_upload_binary_pipeline_package_uploads_yaml(
+            self, mock_get_url_prefix):
+        uploaded = []
+
+        def upload(package_path, **kwargs):
+            with open(package_path) as f:
+                uploaded.append(
+                    (package_path, yaml.safe_load(f)['pipelineInfo']['name']))
+            return Mock(pipeline_id='p1', pipeline_version_id='v1')
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            package_path = self._compile_pipeline(tmpdir, 'pipeline.pb')
+            with patch.object(
+                    self.client._upload_api, 'upload_pipeline',
+                    side_effect=upload), patch.object(
+                        self.client._upload_api,
+                        'upload_pipeline_version',
+                        side_effect=upload):
+                self.client.upload_pipeline(package_path)
+                self.client.upload_pipeline_version(
+                    package_path, pipeline_version_name='v1', pipeline_id='p1')
+
+        self.assertEqual(len(uploaded), 2)
+        for uploaded_path, pipeline_name in uploaded:
+            self.assertTrue(uploaded_path.endswith('.yaml'))
+            self.assertEqual(pipeline_name, 'my-pipeline')
+
+    @patch('kfp.Client._get_url_prefix', return_value='/pipeline')
+    def test_create_run_from_pipeline_package_without_pipeline_name(
+            self, mock_get_url_prefix):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            package_path = self._compile_pipeline(tmpdir)
+            with patch.object(
+                    self.client, 'upload_pipeline') as mock_upload_pipeline, \
+                    patch.object(
+                        self.client, 'upload_pipeline_version'
+                    ) as mock_upload_pipeline_version, patch.object(
+                        self.client._run_api,
+                        'create_run') as mock_create_run:
+                self.client.create_run_from_pipeline_package(
+                    package_path, experiment_id='exp')
+
+        mock_upload_pipeline.assert_not_called()
+        mock_upload_pipeline_version.assert_not_called()
+        run_body = mock_create_run.call_args.kwargs['body']
+        self.assertIsNotNone(run_body.pipeline_spec)
+        self.assertIsNone(run_body.pipeline_version_reference)
+
+    @patch('kfp.Client._get_url_prefix', return_value='/pipeline')
+    def test_create_runs_from_pipeline_package(self, mock_get_url_prefix):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            package_path = self._compile_pipeline(tmpdir)
+            with patch.object(
+                    client,
+                    '_extract_pipeline_yaml',
+                    wraps=client._extract_pipeline_yaml
+            ) as mock_extract, patch.object(
+                    self.client,
+                    'create_experiment',
+                    return_value=Mock(experiment_id='exp')
+            ) as mock_create_experiment, patch.object(
+                    self.client._run_api,
+                    'create_run',
+                    side_effect=lambda body: Mock(run_id=body.display_name)
+            ) as mock_create_run:
+                results = self.client.create_runs_from_pipeline_package(
+                    package_path,
+                    arguments_list=[{
+                        'x': i
+                    } for i in range(5)],
+                    run_name='my-run',
+                    experiment_name='my-experiment',
+                    parallelism=2)
+
+        mock_extract.assert_called_once()
+        mock_create_experiment.assert_called_once()
+        self.assertEqual([result.run_id for result in results],
+                         [f'my-run {i}' for i in range(5)])
+        bodies = sorted(
+            (call.kwargs['body'] for call in mock_create_run.call_args_list),
+            key=lambda body: body.display_name)
+        self.assertEqual([body.runtime_config.parameters for body in bodies], [{
+            'x': i
+        } for i in range(5)])
+        for body in bodies:
+            self.assertEqual(body.experiment_id, 'exp')
+            self.assertEqual(body.pipeline_spec['pipelineInfo']['name'],
+                             'my-pipeline')
+
     @patch('kfp.Client.get_experiment', side_effect=ValueError)
     def test_create_experiment_no_experiment_should_raise_error(
             self, mock_get_experiment):
@@ -0,0 +1,256 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""On-disk, content-addressed cache for compiled PipelineSpec fragments."""
+
+import dataclasses
+import enum
+import hashlib
+import os
+import tempfile
+import types
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from google.protobuf import message
+import kfp
+
+# The cache that is consulted by the pipeline spec builder, if any. Set by
+# entering a CompilationCache context.
+_active_cache: Optional['CompilationCache'] = None
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """Hit/miss statistics of a CompilationCache.
+
+    Attributes:
+        hits: Number of lookups served from the cache.
+        misses: Number of lookups that required a rebuild.
+    """
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __str__(self) -> str:
+        return f'{self.hits} hit(s), {self.misses} miss(es)'
+
+
+class CompilationCache:
+    """Content-addressed store of PipelineSpec fragments.
+
+    Entries are keyed on a fingerprint of the inputs used to build them
+    (the task graph for pipelines), so a stale entry can never be
+    returned for changed inputs. Pipelines are stored on disk. Component
+    fragments are only memoized in memory, for the lifetime of the cache
+    object. Fragments are built when pipelines are
+    defined, so the cache must be active when the pipeline module is
+    imported, not only when ``Compiler.compile`` is called.
+
+    Example:
+      ::
+
+        with compilation_cache.CompilationCache('~/.cache/kfp') as cache:
+            from my_pipelines import my_pipeline
+            compiler.Compiler().compile(my_pipeline, 'pipeline.yaml')
+        print(cache.stats)
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        """CompilationCache constructor.
+
+        Args:
+            cache_dir: Directory in which to store cache entries. Created if it does not exist.
+        """
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.stats = CacheStats()
+        self._memoized: Dict[str, message.Message] = {}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def __enter__(self) -> 'CompilationCache':
+        global _active_cache
+        self._prev = _active_cache
+        _active_cache = self
+        return self
+
+    def __exit__(self, *unused_args) -> None:
+        global _active_cache
+        _active_cache = self._prev
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(
+        self, key: str, *message_types: Type[message.Message]
+    ) -> Optional[Tuple[message.Message, ...]]:
+        """Gets cached proto messages.
+
+        Args:
+            key: The fingerprint of the entry.
+            *message_types: The proto message classes stored in the entry, in the order they were stored.
+
+        Returns:
+            A tuple of the cached messages, or None on a cache miss.
+        """
+        try:
+            with open(self._entry_path(key), 'rb') as f:
+                data = f.read()
+            cached = []
+            offset = 0
+            for message_type in message_types:
+                size = int.from_bytes(data[offset:offset + 8], 'big')
+                offset += 8
+                msg = message_type()
+                msg.ParseFromString(data[offset:offset + size])
+                offset += size
+                cached.append(msg)
+            if offset != len(data):
+                raise message.DecodeError(
+                    f'Unexpected trailing data in cache entry {key}.')
+        except (OSError, message.DecodeError):
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return tuple(cached)
+
+    def put(self, key: str, *msgs: message.Message) -> None:
+        """Stores proto messages in the cache under a single key.
+
+        The entry is written to a temporary file first and moved into
+        place, so concurrent compilations never observe a partial entry.
+
+        Args:
+            key: The fingerprint of the entry.
+            *msgs: The proto messages to store.
+        """
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for msg in msgs:
+                    data = msg.SerializeToString()
+                    f.write(len(data).to_bytes(8, 'big'))
+                    f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def memoize(self, key: str,
+                build: Callable[[], message.Message]) -> message.Message:
+        """Gets a proto message from memory, building it on first use.
+
+        Memoized messages are neither stored on disk nor counted in
+        ``stats``, since small fragments are cheaper to build than to read
+        from disk.
+
+        Args:
+            key: The fingerprint of the message.
+            build: Builds the message.
+
+        Returns:
+            A copy of the memoized message.
+        """
+        memoized = self._memoized.get(key)
+        if memoized is None:
+            memoized = self._memoized[key] = build()
+        msg = type(memoized)()
+        msg.CopyFrom(memoized)
+        return msg
+
+
+def get_active_cache() -> Optional[CompilationCache]:
+    """Returns the CompilationCache of the innermost active cache context,
+    if any."""
+    return _active_cache
+
+
+def fingerprint(*objs: Any) -> str:
+    """Computes a stable content hash of in-memory DSL objects.
+
+    Objects are walked structurally: primitives by value, protos by their
+    deterministic serialization, and other objects by their type and
+    attributes. Back references are recorded by position so that cyclic
+    graphs (e.g., task -> parent group -> task) hash deterministically.
+    The random name of a root group is ignored.
+
+    Args:
+        *objs: The objects to hash.
+
+    Returns:
+        The hex digest.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(f'kfp-{kfp.__version__};type_check={kfp.TYPE_CHECK}'.encode())
+    seen = {}
+    tokens: List[str] = []
+    for obj in objs:
+        _collect_tokens(obj, seen, tokens)
+    for token in tokens:
+        hasher.update(token.encode())
+        hasher.update(b'\0')
+    return hasher.hexdigest()
+
+
+def _collect_tokens(obj: Any, seen: dict, tokens: List[str]) -> None:
+    # The object graph is walked depth first with an explicit stack, so that
+    # deep graphs (e.g., long chains of tasks) cannot exceed the recursion
+    # limit. Items of the stack are objects to walk, or tokens to append as
+    # they are.
+    stack: List[Tuple[bool, Any]] = [(False, obj)]
+    while stack:
+        is_token, obj = stack.pop()
+        if is_token:
+            tokens.append(obj)
+        elif obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+            tokens.append(f'{type(obj).__name__}:{obj!r}')
+        elif isinstance(obj, enum.Enum):
+            tokens.append(f'enum:{type(obj).__qualname__}.{obj.name}')
+        elif isinstance(obj, (type, types.FunctionType, types.MethodType,
+                              types.BuiltinFunctionType)):
+            tokens.append(f'ref:{obj.__module__}.{obj.__qualname__}')
+        elif id(obj) in seen:
+            tokens.append(f'backref:{seen[id(obj)]}')
+        else:
+            seen[id(obj)] = len(seen)
+            children: List[Tuple[bool, Any]] = []
+            if isinstance(obj, message.Message):
+                tokens.append(
+                    f'proto:{obj.DESCRIPTOR.full_name}:'
+                    f'{obj.SerializeToString(deterministic=True).hex()}')
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                items = sorted(
+                    obj, key=repr) if isinstance(obj, (set, frozenset)) else obj
+                tokens.append(f'{type(obj).__name__}[{len(items)}]')
+                children.extend((False, item) for item in items)
+            elif isinstance(obj, dict):
+                tokens.append(f'dict[{len(obj)}]')
+                for key, value in obj.items():
+                    children.extend([(False, key), (False, value)])
+            elif hasattr(obj, '__dict__'):
+                tokens.append(
+                    f'object:{type(obj).__module__}.{type(obj).__qualname__}')
+                attributes = vars(obj)
+                for attr_name in sorted(attributes):
+                    if attr_name == 'name' and getattr(obj, 'is_root', False):
+                        continue
+                    children.extend([(True, f'.{attr_name}'),
+                                     (False, attributes[attr_name])])
+            else:
+                tokens.append(f'{type(obj).__qualname__}:{obj!r}')
+            stack.extend(reversed(children))
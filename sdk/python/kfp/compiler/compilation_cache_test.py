@@ -0,0 +1,182 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import sys
+import tempfile
+import unittest
+
+from kfp import compiler
+from kfp import dsl
+from kfp.compiler import compilation_cache
+from kfp.pipeline_spec import pipeline_spec_pb2
+
+
+def define_pipeline(b: int = 1):
+
+    @dsl.component
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    @dsl.pipeline
+    def inner(x: int) -> int:
+        return add(a=x, b=b).output
+
+    @dsl.pipeline(name='my-pipeline')
+    def my_pipeline(x: int = 1):
+        t = add(a=x, b=b)
+        with dsl.ParallelFor([1, 2]) as item:
+            inner(x=item)
+        with dsl.Condition(t.output > 1):
+            add(a=t.output, b=b)
+
+    return my_pipeline
+
+
+class TestCompilationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_put_and_get(self):
+        cache = compilation_cache.CompilationCache(self.cache_dir)
+        spec = pipeline_spec_pb2.PipelineSpec()
+        spec.pipeline_info.name = 'my-pipeline'
+        platform_spec = pipeline_spec_pb2.PlatformSpec()
+
+        self.assertIsNone(
+            cache.get('abc', pipeline_spec_pb2.PipelineSpec,
+                      pipeline_spec_pb2.PlatformSpec))
+        cache.put('abc', spec, platform_spec)
+        self.assertEqual(
+            cache.get('abc', pipeline_spec_pb2.PipelineSpec,
+                      pipeline_spec_pb2.PlatformSpec), (spec, platform_spec))
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(cache.stats.misses, 1)
+        self.assertEqual(cache.stats.hit_rate, 0.5)
+
+    def test_corrupted_entry_is_a_miss(self):
+        cache = compilation_cache.CompilationCache(self.cache_dir)
+        cache.put('abc', pipeline_spec_pb2.PipelineSpec())
+        with open(cache._entry_path('abc'), 'ab') as f:
+            f.write(b'garbage')
+        self.assertIsNone(cache.get('abc', pipeline_spec_pb2.PipelineSpec))
+        self.assertEqual(cache.stats.misses, 1)
+
+    def test_memoize(self):
+        cache = compilation_cache.CompilationCache(self.cache_dir)
+        built = []
+
+        def build():
+            spec = pipeline_spec_pb2.ComponentSpec(executor_label='exec')
+            built.append(spec)
+            return spec
+
+        first = cache.memoize('abc', build)
+        first.executor_label = 'changed'
+        second = cache.memoize('abc', build)
+
+        self.assertEqual(len(built), 1)
+        self.assertEqual(second.executor_label, 'exec')
+        self.assertEqual(os.listdir(self.cache_dir), [])
+        self.assertEqual(cache.stats.hits + cache.stats.misses, 0)
+
+    def test_context_activates_cache(self):
+        self.assertIsNone(compilation_cache.get_active_cache())
+        with compilation_cache.CompilationCache(self.cache_dir) as cache:
+            self.assertIs(compilation_cache.get_active_cache(), cache)
+        self.assertIsNone(compilation_cache.get_active_cache())
+
+    def test_unchanged_pipeline_is_served_from_cache(self):
+        with compilation_cache.CompilationCache(self.cache_dir) as cache:
+            define_pipeline()
+        self.assertGreater(cache.stats.misses, 0)
+
+        with compilation_cache.CompilationCache(self.cache_dir) as cache:
+            cached_pipeline = define_pipeline()
+        self.assertEqual(cache.stats.misses, 0)
+        self.assertGreater(cache.stats.hits, 0)
+
+        self.assertEqual(cached_pipeline.pipeline_spec,
+                         define_pipeline().pipeline_spec)
+
+    def test_changed_pipeline_is_rebuilt(self):
+        with compilation_cache.CompilationCache(self.cache_dir):
+            define_pipeline(b=1)
+        with compilation_cache.CompilationCache(self.cache_dir) as cache:
+            changed_pipeline = define_pipeline(b=2)
+        self.assertGreater(cache.stats.misses, 0)
+        self.assertEqual(changed_pipeline.pipeline_spec,
+                         define_pipeline(b=2).pipeline_spec)
+
+    def test_compiled_output_is_identical(self):
+        uncached_path = os.path.join(self.tmp_dir.name, 'uncached.yaml')
+        cached_path = os.path.join(self.tmp_dir.name, 'cached.yaml')
+        compiler.Compiler().compile(define_pipeline(), uncached_path)
+        for _ in range(2):
+            with compilation_cache.CompilationCache(self.cache_dir):
+                compiler.Compiler().compile(define_pipeline(), cached_path)
+
+        with open(uncached_path) as f1, open(cached_path) as f2:
+            self.assertEqual(f1.read(), f2.read())
+
+
+class TestFingerprint(unittest.TestCase):
+
+    def test_equal_structures(self):
+        self.assertEqual(
+            compilation_cache.fingerprint({'a': [1, 2.0, 'b']}),
+            compilation_cache.fingerprint({'a': [1, 2.0, 'b']}))
+
+    def test_different_structures(self):
+        self.assertNotEqual(
+            compilation_cache.fingerprint({'a': [1, 2]}),
+            compilation_cache.fingerprint({'a': [1, '2']}))
+
+    def test_cyclic_structure(self):
+        a = []
+        a.append(a)
+        b = []
+        b.append(b)
+        self.assertEqual(
+            compilation_cache.fingerprint(a), compilation_cache.fingerprint(b))
+
+    def test_deep_structure(self):
+        deep = []
+        for i in range(sys.getrecursionlimit() * 2):
+            deep = [deep, i]
+        other = [deep, -1]
+        self.assertNotEqual(
+            compilation_cache.fingerprint(deep),
+            compilation_cache.fingerprint(other))
+
+    def test_order_of_nested_objects(self):
+        self.assertNotEqual(
+            compilation_cache.fingerprint([[1, 2], 3]),
+            compilation_cache.fingerprint([[1], 2, 3]))
+        self.assertNotEqual(
+            compilation_cache.fingerprint({
+                'a': [1],
+                'b': 2
+            }), compilation_cache.fingerprint({
+                'a': [1, 2],
+                'b': None
+            }))
+
+
+if __name__ == '__main__':
+    unittest.main()
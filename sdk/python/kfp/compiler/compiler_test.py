@@ -31,6 +31,7 @@ from kfp import dsl
 from kfp.cli import cli
 from kfp.compiler import compiler
 from kfp.compiler import compiler_utils
+from kfp.compiler import pipeline_spec_builder
 from kfp.components import graph_component
 from kfp.components import pipeline_task
 from kfp.components import yaml_component
@@ -922,6 +923,22 @@ class TestWriteToFileTypes(parameterized.TestCase):
             self.assertEqual(self.pipeline_name,
                              pipeline_spec['pipelineInfo']['name'])
 
+    def test_can_write_to_binary(self):
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pipeline = self.make_pipeline_spec()
+
+            target_file = os.path.join(tmpdir, 'result.pb')
+            compiler.Compiler().compile(
+                pipeline_func=pipeline, package_path=target_file)
+
+            with open(target_file, 'rb') as f:
+                pipeline_spec, platform_spec = (
+                    pipeline_spec_builder.read_pipeline_spec_from_binary(f))
+
+            self.assertEqual(pipeline.pipeline_spec, pipeline_spec)
+            self.assertEqual(pipeline_spec_pb2.PlatformSpec(), platform_spec)
+
     def test_can_write_to_json(self):
 
         with tempfile.TemporaryDirectory() as tmpdir:
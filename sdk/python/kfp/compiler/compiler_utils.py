@@ -14,8 +14,8 @@
 """Utility methods for compiler implementation that is IR-agnostic."""
 
 import collections
-from copy import deepcopy
-from typing import DefaultDict, Dict, List, Mapping, Set, Tuple, Union
+from typing import (Collection, DefaultDict, Dict, List, Mapping, Optional, Set,
+                    Tuple, Union)
 
 from kfp.components import for_loop
 from kfp.components import pipeline_channel
@@ -119,6 +119,101 @@ def get_parent_groups(
     return (tasks_to_groups, groups_to_groups)
 
 
+class GroupTreeIndex:
+    """Index over the tree of groups and tasks of a pipeline that answers
+    ancestor queries without walking ancestor chains.
+
+    The parent group lists produced by get_parent_groups are used as
+    materialized ancestor tables: the ancestor of a node at depth k is
+    its list's k-th element. Because two nodes share their ancestor at
+    depth k if and only if they share every shallower one, the depth of
+    their lowest common ancestor is found by binary search in O(log
+    depth), rather than by comparing the chains element by element for
+    every edge of the pipeline.
+    """
+
+    def __init__(
+            self,
+            task_name_to_parent_groups: Mapping[str, List[str]],
+            group_name_to_parent_groups: Mapping[str, List[str]],
+            for_loop_group_names: Collection[str] = (),
+    ) -> None:
+        """GroupTreeIndex constructor.
+
+        Args:
+            task_name_to_parent_groups: The dict of task name to list of
+                parent groups.
+            group_name_to_parent_groups: The dict of group name to list of
+                parent groups.
+            for_loop_group_names: The names of the dsl.ParallelFor groups.
+        """
+        self._task_name_to_parent_groups = task_name_to_parent_groups
+        self._group_name_to_parent_groups = group_name_to_parent_groups
+        for_loop_group_names = set(for_loop_group_names)
+
+        # Depth of the deepest dsl.ParallelFor in the chain of each group,
+        # computed from the parent's value (parents first), or -1.
+        self._group_for_loop_depth: Dict[str, int] = {}
+        for group_name, parent_groups in sorted(
+                group_name_to_parent_groups.items(),
+                key=lambda item: len(item[1])):
+            self._group_for_loop_depth[group_name] = (
+                len(parent_groups) - 1 if group_name in for_loop_group_names
+                else self._group_for_loop_depth.get(parent_groups[-2], -1))
+        self._task_for_loop_depth: Dict[str, int] = {
+            task_name: self._group_for_loop_depth.get(parent_groups[-2], -1)
+            for task_name, parent_groups in task_name_to_parent_groups.items()
+        }
+
+    def parent_groups(self, name: str) -> List[str]:
+        """Gets the ancestors of a task or group, from the root group to the
+        task or group itself."""
+        if name in self._task_name_to_parent_groups:
+            return self._task_name_to_parent_groups[name]
+        elif name in self._group_name_to_parent_groups:
+            return self._group_name_to_parent_groups[name]
+        raise ValueError(name + ' does not exist.')
+
+    def num_common_ancestors(self, name1: str, name2: str) -> int:
+        """Gets the number of ancestors (the depth of the lowest common
+        ancestor plus one) shared by two tasks or groups."""
+        groups1 = self.parent_groups(name1)
+        groups2 = self.parent_groups(name2)
+        low, high = 0, min(len(groups1), len(groups2))
+        while low < high:
+            mid = (low + high) // 2
+            if groups1[mid] == groups2[mid]:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def uncommon_ancestors(self, name1: str,
+                           name2: str) -> Tuple[List[str], List[str]]:
+        """Gets the unique ancestors between two tasks or groups.
+
+        For example, task1's ancestor groups are [root, G1, G2, G3, task1],
+        task2's ancestor groups are [root, G1, G4, task2], then it returns a
+        tuple ([G2, G3, task1], [G4, task2]).
+
+        Returns:
+            A tuple of new lists of uncommon ancestors for each task or group.
+        """
+        num_common = self.num_common_ancestors(name1, name2)
+        return (self.parent_groups(name1)[num_common:],
+                self.parent_groups(name2)[num_common:])
+
+    def for_loop_depth(self, name: str) -> int:
+        """Gets the depth of the innermost dsl.ParallelFor group that
+        contains a task or group (or is the group itself), or -1 if there is
+        none."""
+        if name in self._task_name_to_parent_groups:
+            return self._task_for_loop_depth[name]
+        elif name in self._group_name_to_parent_groups:
+            return self._group_for_loop_depth[name]
+        raise ValueError(name + ' does not exist.')
+
+
 # TODO: do we really need this?
 def get_condition_channels_for_tasks(
     root_group: tasks_group.TasksGroup,
@@ -167,6 +262,7 @@ def get_inputs_for_all_groups(
     condition_channels: Mapping[str,
                                 Set[pipeline_channel.PipelineParameterChannel]],
     name_to_for_loop_group: Mapping[str, tasks_group.ParallelFor],
+    group_tree_index: Optional[GroupTreeIndex] = None,
 ) -> Mapping[str, List[Tuple[pipeline_channel.PipelineChannel, str]]]:
     """Get inputs and outputs of each group and op.
 
@@ -180,6 +276,8 @@ def get_inputs_for_all_groups(
             channels referenced by its parent condition groups.
         name_to_for_loop_group: The dict of for loop group name to loop
             group.
+        group_tree_index: The GroupTreeIndex of the pipeline. Built from the
+            parent groups if not provided.
 
     Returns:
         A mapping  with key being the group/task names and values being list
@@ -188,6 +286,10 @@ def get_inputs_for_all_groups(
         channel. If the channel is a pipeline argument (no producer task),
         then producing_task_name is None.
     """
+    if group_tree_index is None:
+        group_tree_index = GroupTreeIndex(task_name_to_parent_groups,
+                                          group_name_to_parent_groups,
+                                          name_to_for_loop_group.keys())
     inputs = collections.defaultdict(set)
 
     for task in pipeline.tasks.values():
@@ -255,12 +357,8 @@ def get_inputs_for_all_groups(
 
                 upstream_task = pipeline.tasks[channel.task_name]
                 upstream_groups, downstream_groups = (
-                    _get_uncommon_ancestors(
-                        task_name_to_parent_groups=task_name_to_parent_groups,
-                        group_name_to_parent_groups=group_name_to_parent_groups,
-                        task1=upstream_task,
-                        task2=task,
-                    ))
+                    group_tree_index.uncommon_ancestors(upstream_task.name,
+                                                        task.name))
 
                 for i, group_name in enumerate(downstream_groups):
                     if i == 0:
@@ -352,7 +450,7 @@ def validate_parallel_for_fan_in_consumption_legal(
 
     Args:
         consumer_task_name: The name of the consumer task.
-        upstream_groups: The names of the producer task's upstream groups, ordered from outermost group at beginning to producer task at end. This is produced by produced by _get_uncommon_ancestors.
+        upstream_groups: The names of the producer task's upstream groups, ordered from outermost group at beginning to producer task at end. This is produced by GroupTreeIndex.uncommon_ancestors.
         group_name_to_group: Map of group name to TasksGroup, for fast lookups.
     """
     # handles cases like this:
@@ -427,7 +525,8 @@ def get_outputs_for_all_groups(
     task_name_to_parent_groups: Mapping[str, List[str]],
     group_name_to_parent_groups: Mapping[str, List[str]],
     all_groups: List[tasks_group.TasksGroup],
-    pipeline_outputs_dict: Dict[str, pipeline_channel.PipelineChannel]
+    pipeline_outputs_dict: Dict[str, pipeline_channel.PipelineChannel],
+    group_tree_index: Optional[GroupTreeIndex] = None,
 ) -> Tuple[DefaultDict[str, Dict[str, pipeline_channel.PipelineChannel]], Dict[
         str, pipeline_channel.PipelineChannel]]:
     """Gets a dictionary of all TasksGroup names to an inner dictionary. The
@@ -449,9 +548,16 @@ def get_outputs_for_all_groups(
 
     group_name_to_group = {group.name: group for group in all_groups}
     group_name_to_children = {
-        group.name: [group.name for group in group.groups] +
-        [task.name for task in group.tasks] for group in all_groups
+        group.name: {group.name for group in group.groups}
+        | {task.name for task in group.tasks} for group in all_groups
     }
+    if group_tree_index is None:
+        group_tree_index = GroupTreeIndex(
+            task_name_to_parent_groups, group_name_to_parent_groups, [
+                group.name
+                for group in all_groups
+                if isinstance(group, tasks_group.ParallelFor)
+            ])
 
     outputs = collections.defaultdict(dict)
 
@@ -464,12 +570,8 @@ def get_outputs_for_all_groups(
             consumer_task = task
 
             upstream_groups, downstream_groups = (
-                _get_uncommon_ancestors(
-                    task_name_to_parent_groups=task_name_to_parent_groups,
-                    group_name_to_parent_groups=group_name_to_parent_groups,
-                    task1=producer_task,
-                    task2=consumer_task,
-                ))
+                group_tree_index.uncommon_ancestors(producer_task.name,
+                                                    consumer_task.name))
             validate_parallel_for_fan_in_consumption_legal(
                 consumer_task_name=consumer_task.name,
                 upstream_groups=upstream_groups,
@@ -546,57 +648,13 @@ def get_outputs_for_all_groups(
     return outputs, pipeline_outputs_dict
 
 
-def _get_uncommon_ancestors(
-    task_name_to_parent_groups: Mapping[str, List[str]],
-    group_name_to_parent_groups: Mapping[str, List[str]],
-    task1: GroupOrTaskType,
-    task2: GroupOrTaskType,
-) -> Tuple[List[GroupOrTaskType], List[GroupOrTaskType]]:
-    """Gets the unique ancestors between two tasks.
-
-    For example, task1's ancestor groups are [root, G1, G2, G3, task1],
-    task2's ancestor groups are [root, G1, G4, task2], then it returns a
-    tuple ([G2, G3, task1], [G4, task2]).
-
-    Args:
-        task_name_to_parent_groups: The dict of task name to list of parent
-            groups.
-        group_name_tor_parent_groups: The dict of group name to list of
-            parent groups.
-        task1: One of the two tasks.
-        task2: The other task.
-
-    Returns:
-        A tuple which are lists of uncommon ancestors for each task.
-    """
-    if task1.name in task_name_to_parent_groups:
-        task1_groups = task_name_to_parent_groups[task1.name]
-    elif task1.name in group_name_to_parent_groups:
-        task1_groups = group_name_to_parent_groups[task1.name]
-    else:
-        raise ValueError(task1.name + ' does not exist.')
-
-    if task2.name in task_name_to_parent_groups:
-        task2_groups = task_name_to_parent_groups[task2.name]
-    elif task2.name in group_name_to_parent_groups:
-        task2_groups = group_name_to_parent_groups[task2.name]
-    else:
-        raise ValueError(task2.name + ' does not exist.')
-
-    both_groups = [task1_groups, task2_groups]
-    common_groups_len = sum(
-        1 for x in zip(*both_groups) if x == (x[0],) * len(x))
-    group1 = task1_groups[common_groups_len:]
-    group2 = task2_groups[common_groups_len:]
-    return (group1, group2)
-
-
 def get_dependencies(
     pipeline: pipeline_context.Pipeline,
     task_name_to_parent_groups: Mapping[str, List[str]],
     group_name_to_parent_groups: Mapping[str, List[str]],
     group_name_to_group: Mapping[str, tasks_group.TasksGroup],
     condition_channels: Dict[str, pipeline_channel.PipelineChannel],
+    group_tree_index: Optional[GroupTreeIndex] = None,
 ) -> Mapping[str, List[GroupOrTaskType]]:
     """Gets dependent groups and tasks for all tasks and groups.
 
@@ -609,6 +667,8 @@ def get_dependencies(
         group_name_to_group: The dict of group name to group.
         condition_channels: The dict of task name to a set of pipeline
             channels referenced by its parent condition groups.
+        group_tree_index: The GroupTreeIndex of the pipeline. Built from the
+            parent groups if not provided.
 
     Returns:
         A Mapping where key is group/task name, value is a list of dependent
@@ -623,6 +683,12 @@ def get_dependencies(
         RuntimeError: if a task depends on a task inside a condition or loop
             group.
     """
+    if group_tree_index is None:
+        group_tree_index = GroupTreeIndex(
+            task_name_to_parent_groups, group_name_to_parent_groups, [
+                group_name for group_name, group in group_name_to_group.items()
+                if isinstance(group, tasks_group.ParallelFor)
+            ])
     dependencies = collections.defaultdict(set)
     for task in pipeline.tasks.values():
         upstream_task_names = set()
@@ -642,21 +708,17 @@ def get_dependencies(
                 raise ValueError(
                     f'Compiler cannot find task: {upstream_task_name}.')
 
-            upstream_groups, downstream_groups = _get_uncommon_ancestors(
-                task_name_to_parent_groups=task_name_to_parent_groups,
-                group_name_to_parent_groups=group_name_to_parent_groups,
-                task1=upstream_task,
-                task2=task,
-            )
+            upstream_parent_groups = group_tree_index.parent_groups(
+                upstream_task.name)
+            downstream_parent_groups = group_tree_index.parent_groups(task.name)
+            num_common_ancestors = group_tree_index.num_common_ancestors(
+                upstream_task.name, task.name)
 
             # uncommon upstream ancestor check
-            uncommon_upstream_groups = deepcopy(upstream_groups)
-            uncommon_upstream_groups.remove(
-                upstream_task.name
-            )  # because a task's `upstream_groups` contains the task's name
-            if uncommon_upstream_groups:
+            # (a task's uncommon upstream groups end with the task itself)
+            if len(upstream_parent_groups) - num_common_ancestors > 1:
                 dependent_group = group_name_to_group.get(
-                    uncommon_upstream_groups[0], None)
+                    upstream_parent_groups[num_common_ancestors], None)
 
                 if isinstance(dependent_group,
                               (tasks_group.Condition, tasks_group.ExitHandler)):
@@ -672,23 +734,27 @@ def get_dependencies(
             # if there is a parrallelFor group type in the upstream parents tasks and there also exists a parallelFor in the uncommon_ancestors of downstream: this means a nested for loop exists in the DAG
             # only check when upstream_task is a PipelineTask, since checking
             # for TasksGroup results in catching dsl.Collected cases.
-            if isinstance(upstream_task, pipeline_task.PipelineTask):
-                upstream_parent_tasks = task_name_to_parent_groups[
-                    upstream_task.name]
-
-                for group in downstream_groups:
+            if isinstance(upstream_task, pipeline_task.PipelineTask
+                         ) and group_tree_index.for_loop_depth(
+                             task.name) >= num_common_ancestors and (
+                                 group_tree_index.for_loop_depth(
+                                     upstream_task.name) >= 0):
+                group = next(
+                    group
+                    for group in downstream_parent_groups[num_common_ancestors:]
+                    if isinstance(
+                        group_name_to_group.get(group, None),
+                        tasks_group.ParallelFor))
+                parent_task = next(
+                    parent_task for parent_task in upstream_parent_groups
                     if isinstance(
-                            group_name_to_group.get(group, None),
-                            tasks_group.ParallelFor):
-                        for parent_task in upstream_parent_tasks:
-                            if isinstance(
-                                    group_name_to_group.get(parent_task, None),
-                                    tasks_group.ParallelFor):
-
-                                raise InvalidTopologyException(
-                                    f'{ILLEGAL_CROSS_DAG_ERROR_PREFIX} Downstream tasks in a nested {tasks_group.ParallelFor.__name__} group cannot depend on an upstream task in a shallower {tasks_group.ParallelFor.__name__} group. Task {task.name} depends on upstream task {upstream_task.name}, while {group} is nested in {parent_task}.'
-                                )
-
-            dependencies[downstream_groups[0]].add(upstream_groups[0])
+                        group_name_to_group.get(parent_task, None),
+                        tasks_group.ParallelFor))
+                raise InvalidTopologyException(
+                    f'{ILLEGAL_CROSS_DAG_ERROR_PREFIX} Downstream tasks in a nested {tasks_group.ParallelFor.__name__} group cannot depend on an upstream task in a shallower {tasks_group.ParallelFor.__name__} group. Task {task.name} depends on upstream task {upstream_task.name}, while {group} is nested in {parent_task}.'
+                )
+
+            dependencies[downstream_parent_groups[num_common_ancestors]].add(
+                upstream_parent_groups[num_common_ancestors])
 
     return dependencies
@@ -54,5 +54,68 @@ class TestAdditionalInputNameForPipelineChannel(parameterized.TestCase):
             compiler_utils.additional_input_name_for_pipeline_channel(channel))
 
 
+class TestGroupTreeIndex(parameterized.TestCase):
+
+    def setUp(self):
+        # root
+        # ├── for-loop-1
+        # │   ├── condition-2
+        # │   │   └── task-a
+        # │   └── task-b
+        # ├── condition-3
+        # │   └── for-loop-4
+        # │       └── task-c
+        # └── task-d
+        self.task_name_to_parent_groups = {
+            'task-a': ['root', 'for-loop-1', 'condition-2', 'task-a'],
+            'task-b': ['root', 'for-loop-1', 'task-b'],
+            'task-c': ['root', 'condition-3', 'for-loop-4', 'task-c'],
+            'task-d': ['root', 'task-d'],
+        }
+        self.group_name_to_parent_groups = {
+            'for-loop-1': ['root', 'for-loop-1'],
+            'condition-2': ['root', 'for-loop-1', 'condition-2'],
+            'condition-3': ['root', 'condition-3'],
+            'for-loop-4': ['root', 'condition-3', 'for-loop-4'],
+        }
+        self.index = compiler_utils.GroupTreeIndex(
+            task_name_to_parent_groups=self.task_name_to_parent_groups,
+            group_name_to_parent_groups=self.group_name_to_parent_groups,
+            for_loop_group_names=['for-loop-1', 'for-loop-4'],
+        )
+
+    @parameterized.parameters(
+        ('task-a', 'task-b', (['condition-2', 'task-a'], ['task-b'])),
+        ('task-a', 'task-c', (['for-loop-1', 'condition-2', 'task-a'
+                              ], ['condition-3', 'for-loop-4', 'task-c'])),
+        ('task-d', 'task-b', (['task-d'], ['for-loop-1', 'task-b'])),
+        ('for-loop-1', 'task-a', ([], ['condition-2', 'task-a'])),
+        ('task-a', 'task-a', ([], [])),
+    )
+    def test_uncommon_ancestors(self, name1, name2, expected):
+        self.assertEqual(self.index.uncommon_ancestors(name1, name2), expected)
+
+    def test_uncommon_ancestors_returns_new_lists(self):
+        upstream_groups, _ = self.index.uncommon_ancestors('task-a', 'task-b')
+        upstream_groups.pop()
+        self.assertEqual(self.task_name_to_parent_groups['task-a'],
+                         ['root', 'for-loop-1', 'condition-2', 'task-a'])
+
+    @parameterized.parameters(
+        ('task-a', 1),
+        ('task-b', 1),
+        ('task-c', 2),
+        ('task-d', -1),
+        ('for-loop-1', 1),
+        ('condition-3', -1),
+    )
+    def test_for_loop_depth(self, name, expected):
+        self.assertEqual(self.index.for_loop_depth(name), expected)
+
+    def test_unknown_name(self):
+        with self.assertRaisesRegex(ValueError, r'task-x does not exist\.'):
+            self.index.parent_groups('task-x')
+
+
 if __name__ == '__main__':
     unittest.main()
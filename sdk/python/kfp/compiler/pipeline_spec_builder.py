@@ -16,13 +16,14 @@
 import copy
 import json
 import typing
-from typing import (Any, DefaultDict, Dict, List, Mapping, Optional, Tuple,
-                    Union)
+from typing import (Any, BinaryIO, DefaultDict, Dict, List, Mapping, Optional,
+                    Tuple, Union)
 import warnings
 
 from google.protobuf import json_format
 from google.protobuf import struct_pb2
 import kfp
+from kfp.compiler import compilation_cache
 from kfp.compiler import compiler_utils
 from kfp.components import for_loop
 from kfp.components import pipeline_channel
@@ -47,6 +48,13 @@ group_type_to_dsl_class = {
 
 _SINGLE_OUTPUT_NAME = 'Output'
 
+# File extension of the binary proto package format.
+BINARY_PACKAGE_EXTENSION = '.pb'
+
+# libyaml's emitter is several times faster than the pure-Python one. Its
+# output differs only in how long strings are wrapped.
+_YamlDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 
 def to_protobuf_value(value: type_utils.PARAMETER_TYPES) -> struct_pb2.Value:
     """Creates a google.protobuf.struct_pb2.Value message out of a provide
@@ -355,6 +363,21 @@ def _build_component_spec_from_component_spec_structure(
     component_spec_struct: structures.ComponentSpec
 ) -> pipeline_spec_pb2.ComponentSpec:
     """Builds ComponentSpec proto from ComponentSpec structure."""
+    cache = compilation_cache.get_active_cache()
+    if cache is None:
+        return _build_component_spec_proto(component_spec_struct)
+
+    # The proto only depends on the input and output definitions.
+    cache_key = compilation_cache.fingerprint('component',
+                                              component_spec_struct.inputs,
+                                              component_spec_struct.outputs)
+    return cache.memoize(
+        cache_key, lambda: _build_component_spec_proto(component_spec_struct))
+
+
+def _build_component_spec_proto(
+    component_spec_struct: structures.ComponentSpec
+) -> pipeline_spec_pb2.ComponentSpec:
     component_spec = pipeline_spec_pb2.ComponentSpec()
 
     for input_name, input_spec in (component_spec_struct.inputs or {}).items():
@@ -1086,7 +1109,8 @@ def build_spec_by_group(
     Args:
         pipeline_spec: The pipeline_spec to update in place.
         deployment_config: The deployment_config to hold all executors. The
-            spec is updated in place.
+            spec is updated in place. Callers copy it into
+            pipeline_spec.deployment_spec once all groups are built.
         group: The TasksGroup to generate spec for.
         inputs: The inputs dictionary. The keys are group/task names and the
             values are lists of tuples (channel, producing_task_name).
@@ -1303,9 +1327,6 @@ def build_spec_by_group(
         group_component_spec.dag.tasks[subgroup.name].CopyFrom(
             subgroup_task_spec)
 
-    pipeline_spec.deployment_spec.update(
-        json_format.MessageToDict(deployment_config))
-
     # Surface metrics outputs to the top.
     populate_metrics_in_dag_outputs(
         tasks=group.tasks,
@@ -1650,6 +1671,29 @@ def create_pipeline_spec(
     """
     utils.validate_pipeline_name(pipeline.name)
 
+    cache = compilation_cache.get_active_cache()
+    if cache is None:
+        return _create_pipeline_spec(pipeline, component_spec, pipeline_outputs)
+
+    # Key on the task graph before building, since building may mutate it.
+    cache_key = compilation_cache.fingerprint('pipeline', pipeline.name,
+                                              pipeline.groups[0],
+                                              component_spec, pipeline_outputs)
+    cached = cache.get(cache_key, pipeline_spec_pb2.PipelineSpec,
+                       pipeline_spec_pb2.PlatformSpec)
+    if cached is not None:
+        return cached
+    pipeline_spec, platform_spec = _create_pipeline_spec(
+        pipeline, component_spec, pipeline_outputs)
+    cache.put(cache_key, pipeline_spec, platform_spec)
+    return pipeline_spec, platform_spec
+
+
+def _create_pipeline_spec(
+    pipeline: pipeline_context.Pipeline,
+    component_spec: structures.ComponentSpec,
+    pipeline_outputs: Optional[Any],
+) -> Tuple[pipeline_spec_pb2.PipelineSpec, pipeline_spec_pb2.PlatformSpec]:
     deployment_config = pipeline_spec_pb2.PipelineDeploymentConfig()
     pipeline_spec = pipeline_spec_pb2.PipelineSpec()
 
@@ -1678,25 +1722,33 @@ def create_pipeline_spec(
         for group_name, group in group_name_to_group.items()
         if isinstance(group, tasks_group.ParallelFor)
     }
+    group_tree_index = compiler_utils.GroupTreeIndex(
+        task_name_to_parent_groups=task_name_to_parent_groups,
+        group_name_to_parent_groups=group_name_to_parent_groups,
+        for_loop_group_names=name_to_for_loop_group.keys(),
+    )
     inputs = compiler_utils.get_inputs_for_all_groups(
         pipeline=pipeline,
         task_name_to_parent_groups=task_name_to_parent_groups,
         group_name_to_parent_groups=group_name_to_parent_groups,
         condition_channels=condition_channels,
         name_to_for_loop_group=name_to_for_loop_group,
+        group_tree_index=group_tree_index,
     )
     outputs, modified_pipeline_outputs_dict = compiler_utils.get_outputs_for_all_groups(
         pipeline=pipeline,
         task_name_to_parent_groups=task_name_to_parent_groups,
         group_name_to_parent_groups=group_name_to_parent_groups,
         all_groups=all_groups,
-        pipeline_outputs_dict=pipeline_outputs_dict)
+        pipeline_outputs_dict=pipeline_outputs_dict,
+        group_tree_index=group_tree_index)
     dependencies = compiler_utils.get_dependencies(
         pipeline=pipeline,
         task_name_to_parent_groups=task_name_to_parent_groups,
         group_name_to_parent_groups=group_name_to_parent_groups,
         group_name_to_group=group_name_to_group,
         condition_channels=condition_channels,
+        group_tree_index=group_tree_index,
     )
 
     platform_spec = pipeline_spec_pb2.PlatformSpec()
@@ -1715,6 +1767,8 @@ def create_pipeline_spec(
             platform_spec=platform_spec,
             is_compiled_component=False,
         )
+    pipeline_spec.deployment_spec.update(
+        json_format.MessageToDict(deployment_config))
 
     build_exit_handler_groups_recursively(
         parent_group=root_group,
@@ -1774,7 +1828,8 @@ def write_pipeline_spec_to_file(
     platform_spec: pipeline_spec_pb2.PlatformSpec,
     package_path: str,
 ) -> None:
-    """Writes PipelineSpec into a YAML or JSON (deprecated) file.
+    """Writes PipelineSpec into a YAML, binary proto, or JSON (deprecated)
+    file.
 
     Args:
         pipeline_spec: The PipelineSpec.
@@ -1782,12 +1837,13 @@ def write_pipeline_spec_to_file(
         package_path: The path to which to write the PipelineSpec.
         platform_spec: The PlatformSpec.
     """
-    pipeline_spec_dict = json_format.MessageToDict(pipeline_spec)
-    yaml_comments = extract_comments_from_pipeline_spec(pipeline_spec_dict,
-                                                        pipeline_description)
     has_platform_specific_features = len(platform_spec.platforms) > 0
 
-    if package_path.endswith('.json'):
+    if package_path.endswith(BINARY_PACKAGE_EXTENSION):
+        with open(package_path, 'wb') as pb_file:
+            write_pipeline_spec_to_binary(pipeline_spec, platform_spec, pb_file)
+
+    elif package_path.endswith('.json'):
         warnings.warn(
             ('Compiling to JSON is deprecated and will be '
              'removed in a future version. Please compile to a YAML file by '
@@ -1800,19 +1856,92 @@ def write_pipeline_spec_to_file(
                 raise ValueError(
                     f'Platform-specific features are only supported when serializing to YAML. Argument for {"package_path"!r} has file extension {".json"!r}.'
                 )
-            json.dump(pipeline_spec_dict, json_file, indent=2, sort_keys=True)
+            json.dump(
+                json_format.MessageToDict(pipeline_spec),
+                json_file,
+                indent=2,
+                sort_keys=True)
 
     elif package_path.endswith(('.yaml', '.yml')):
+        pipeline_spec_dict = json_format.MessageToDict(pipeline_spec)
         with open(package_path, 'w') as yaml_file:
-            yaml_file.write(yaml_comments)
-            documents = [pipeline_spec_dict]
+            yaml_file.write(
+                extract_comments_from_pipeline_spec(pipeline_spec_dict,
+                                                    pipeline_description))
+            # Documents are emitted to the file one at a time, so the
+            # platform spec dict is only created once the pipeline spec has
+            # been written.
+            yaml.dump(
+                pipeline_spec_dict,
+                yaml_file,
+                Dumper=_YamlDumper,
+                sort_keys=True)
             if has_platform_specific_features:
-                documents.append(json_format.MessageToDict(platform_spec))
-            yaml.dump_all(documents, yaml_file, sort_keys=True)
+                yaml_file.write('---\n')
+                yaml.dump(
+                    json_format.MessageToDict(platform_spec),
+                    yaml_file,
+                    Dumper=_YamlDumper,
+                    sort_keys=True)
 
     else:
         raise ValueError(
-            f'The output path {package_path} should end with ".yaml".')
+            f'The output path {package_path} should end with ".yaml" or "{BINARY_PACKAGE_EXTENSION}".'
+        )
+
+
+def write_pipeline_spec_to_binary(
+    pipeline_spec: pipeline_spec_pb2.PipelineSpec,
+    platform_spec: pipeline_spec_pb2.PlatformSpec,
+    stream: BinaryIO,
+) -> None:
+    """Writes PipelineSpec and PlatformSpec to a stream as length-prefixed
+    binary protos.
+
+    Each message is preceded by its size as an 8-byte big-endian integer.
+    The pipeline description is not written, as it is only stored in the
+    comments of the YAML format.
+
+    Args:
+        pipeline_spec: The PipelineSpec.
+        platform_spec: The PlatformSpec.
+        stream: The binary stream to write to.
+    """
+    for spec in [pipeline_spec, platform_spec]:
+        data = spec.SerializeToString(deterministic=True)
+        stream.write(len(data).to_bytes(8, 'big'))
+        stream.write(data)
+
+
+def read_pipeline_spec_from_binary(
+    stream: BinaryIO
+) -> Tuple[pipeline_spec_pb2.PipelineSpec, pipeline_spec_pb2.PlatformSpec]:
+    """Reads PipelineSpec and PlatformSpec from a stream written by
+    write_pipeline_spec_to_binary.
+
+    Args:
+        stream: The binary stream to read from.
+
+    Returns:
+        The PipelineSpec and the PlatformSpec.
+    """
+    specs = []
+    for spec in [
+            pipeline_spec_pb2.PipelineSpec(),
+            pipeline_spec_pb2.PlatformSpec()
+    ]:
+        size = int.from_bytes(stream.read(8), 'big')
+        data = stream.read(size)
+        if len(data) != size:
+            raise ValueError(
+                f'Invalid binary pipeline package. Expected {size} bytes for {spec.DESCRIPTOR.name}, got {len(data)}.'
+            )
+        spec.ParseFromString(data)
+        specs.append(spec)
+    if stream.read(1):
+        raise ValueError(
+            'Invalid binary pipeline package. Found unexpected trailing data.')
+    return specs[0], specs[1]
 
 
 def extract_comments_from_pipeline_spec(pipeline_spec: dict,
@@ -24,10 +24,42 @@ __all__ = [
     'YamlComponent',
 ]
 
-from kfp.components.base_component import BaseComponent
-from kfp.components.container_component import ContainerComponent
-from kfp.components.python_component import PythonComponent
-from kfp.components.yaml_component import load_component_from_file
-from kfp.components.yaml_component import load_component_from_text
-from kfp.components.yaml_component import load_component_from_url
-from kfp.components.yaml_component import YamlComponent
+import importlib
+import importlib.util
+
+# Attributes are imported on first access, so that importing a submodule,
+# such as kfp.components.executor_main, does not import the dependencies of
+# unused component types, such as requests for YamlComponent.
+_LAZY_ATTRIBUTES = {
+    'BaseComponent': 'kfp.components.base_component',
+    'ContainerComponent': 'kfp.components.container_component',
+    'PythonComponent': 'kfp.components.python_component',
+    'load_component_from_file': 'kfp.components.yaml_component',
+    'load_component_from_text': 'kfp.components.yaml_component',
+    'load_component_from_url': 'kfp.components.yaml_component',
+    'YamlComponent': 'kfp.components.yaml_component',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    elif not name.startswith('__') and importlib.util.find_spec(
+            f'{__name__}.{name}') is not None:
+        # Submodules were accessible as attributes when `import kfp`
+        # imported kfp.dsl, which imports most of them.
+        value = importlib.import_module(f'{__name__}.{name}')
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
+
+
+# The pipeline authoring modules import each other circularly and only load
+# when component_factory is imported first, as kfp.dsl does. This must come
+# after __getattr__, which they use to access the attributes above.
+from kfp.components import component_factory
@@ -27,7 +27,10 @@ def component(func: Optional[Callable] = None,
               pip_index_urls: Optional[List[str]] = None,
               output_component_file: Optional[str] = None,
               install_kfp_package: bool = True,
-              kfp_package_path: Optional[str] = None):
+              kfp_package_path: Optional[str] = None,
+              skip_installed_packages: bool = False,
+              pip_find_links: Optional[List[str]] = None,
+              pip_constraints_file: Optional[str] = None):
     """Decorator for Python-function based components.
 
     A KFP component can either be a lightweight component or a containerized
@@ -74,6 +77,20 @@ def component(func: Optional[Callable] = None,
             as that used when this component was created. Component authors can
             choose to override this to point to a GitHub pull request or
             other pip-compatible package server.
+        skip_installed_packages: If ``True``, ``packages_to_install`` are checked
+            against the distributions installed in ``base_image`` at component
+            runtime, and only the packages whose requirement specifiers are
+            not satisfied are installed. Use this with a ``base_image`` that
+            already contains most dependencies to avoid running pip on every
+            execution.
+        pip_find_links: Locations of wheel caches, such as a directory in
+            ``base_image`` or a mounted volume, that pip searches for
+            ``packages_to_install`` in addition to the package index. For more
+            information, see `pip install docs <https://pip.pypa.io/en/stable/cli/pip_install/#cmdoption-f>`_.
+        pip_constraints_file: Path to a pip constraints file. The file is read
+            when the component is created and its content is embedded in the
+            component, so that the same constraints are applied when
+            ``packages_to_install`` are installed at component runtime.
 
     Returns:
         A component task factory that can be used in pipeline definitions.
@@ -114,7 +131,10 @@ def component(func: Optional[Callable] = None,
             pip_index_urls=pip_index_urls,
             output_component_file=output_component_file,
             install_kfp_package=install_kfp_package,
-            kfp_package_path=kfp_package_path)
+            kfp_package_path=kfp_package_path,
+            skip_installed_packages=skip_installed_packages,
+            pip_find_links=pip_find_links,
+            pip_constraints_file=pip_constraints_file)
 
     return component_factory.create_component_from_func(
         func,
@@ -124,4 +144,7 @@ def component(func: Optional[Callable] = None,
         pip_index_urls=pip_index_urls,
         output_component_file=output_component_file,
         install_kfp_package=install_kfp_package,
-        kfp_package_path=kfp_package_path)
+        kfp_package_path=kfp_package_path,
+        skip_installed_packages=skip_installed_packages,
+        pip_find_links=pip_find_links,
+        pip_constraints_file=pip_constraints_file)
@@ -87,6 +87,26 @@ class TestComponentDecorator(unittest.TestCase):
                         'tensorflow' in concat_command)
         self.assertTrue('https://pypi.org/simple' in concat_command)
 
+    def test_skip_installed_packages_with_pip_constraints_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            constraints_file = os.path.join(tmpdir, 'constraints.txt')
+            with open(constraints_file, 'w') as f:
+                f.write('numpy==1.24.2\n')
+
+            @component(
+                packages_to_install=['numpy'],
+                skip_installed_packages=True,
+                pip_find_links=['/wheels'],
+                pip_constraints_file=constraints_file)
+            def comp(text: str) -> str:
+                return text
+
+        concat_command = ' '.join(
+            comp.component_spec.implementation.container.command)
+        self.assertIn('numpy==1.24.2', concat_command)
+        self.assertIn('--find-links /wheels', concat_command)
+        self.assertIn('def is_installed(requirement):', concat_command)
+
     def test_output_component_file_parameter(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             filepath = os.path.join(tmpdir, 'my_component.yaml')
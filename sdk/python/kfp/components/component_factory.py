@@ -16,6 +16,7 @@ import inspect
 import itertools
 import pathlib
 import re
+import shlex
 import textwrap
 from typing import Callable, List, Mapping, Optional, Tuple, Type, Union
 import warnings
@@ -107,10 +108,88 @@ PIP_DISABLE_PIP_VERSION_CHECK=1 python3 -m pip install --quiet \
     --no-warn-script-location {index_url_options}{concat_package_list} && "$0" "$@"
 '''
 
+# Written to a temporary file by the install script, so that the constraints
+# the component was compiled with are applied by pip at runtime.
+_pip_constraints_script_template = '''
+pip_constraints_path=$(mktemp)
+cat > "$pip_constraints_path" <<'KFP_PIP_CONSTRAINTS'
+{pip_constraints}
+KFP_PIP_CONSTRAINTS
+'''
+
+# Installs only the requirements that are not already satisfied by a
+# distribution installed in the image, whose version also satisfies the
+# constraints files in the pip options. Requirements that cannot be checked
+# (URLs, extras, unparsable constraints, or a missing
+# importlib.metadata/packaging) are installed.
+_install_missing_python_packages_script_template = '''
+if ! [ -x "$(command -v pip)" ]; then
+    python3 -m ensurepip || python3 -m ensurepip --user || apt-get install python3-pip
+fi
+{pip_constraints_script}
+PIP_DISABLE_PIP_VERSION_CHECK=1 python3 - {pip_options}-- {concat_package_list} <<'KFP_INSTALL_MISSING_PACKAGES' && "$0" "$@"
+import re
+import subprocess
+import sys
+
+separator = sys.argv.index('--')
+pip_options = sys.argv[1:separator]
+requirements = sys.argv[separator + 1:]
+constraints = []
+for option, value in zip(pip_options, pip_options[1:]):
+    if option == '--constraint':
+        with open(value) as f:
+            constraints.extend(line.split('#')[0].strip() for line in f)
+constraints = [constraint for constraint in constraints if constraint]
+
+
+def canonicalize_name(name):
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def is_installed(requirement):
+    try:
+        from importlib import metadata
+        try:
+            from packaging.requirements import Requirement
+        except ImportError:
+            from pip._vendor.packaging.requirements import Requirement
+        requirement = Requirement(requirement)
+        if requirement.marker is not None and not requirement.marker.evaluate():
+            return True
+        if requirement.url or requirement.extras:
+            return False
+        version = metadata.version(requirement.name)
+        for constraint in map(Requirement, constraints):
+            if canonicalize_name(constraint.name) != canonicalize_name(
+                    requirement.name):
+                continue
+            if constraint.marker is not None and not constraint.marker.evaluate():
+                continue
+            if constraint.url or not constraint.specifier.contains(
+                    version, prereleases=True):
+                return False
+        return requirement.specifier.contains(version, prereleases=True)
+    except Exception:
+        return False
+
+
+missing_requirements = [r for r in requirements if not is_installed(r)]
+if missing_requirements:
+    subprocess.check_call([
+        sys.executable, '-m', 'pip', 'install', '--quiet',
+        '--no-warn-script-location'
+    ] + pip_options + missing_requirements)
+KFP_INSTALL_MISSING_PACKAGES
+'''
+
 
 def _get_packages_to_install_command(
         package_list: Optional[List[str]] = None,
-        pip_index_urls: Optional[List[str]] = None) -> List[str]:
+        pip_index_urls: Optional[List[str]] = None,
+        skip_installed_packages: bool = False,
+        pip_find_links: Optional[List[str]] = None,
+        pip_constraints: Optional[str] = None) -> List[str]:
 
     if not package_list:
         return []
@@ -118,9 +197,30 @@ def _get_packages_to_install_command(
     concat_package_list = ' '.join(
         [repr(str(package)) for package in package_list])
     index_url_options = make_index_url_options(pip_index_urls)
-    install_python_packages_script = _install_python_packages_script_template.format(
-        index_url_options=index_url_options,
-        concat_package_list=concat_package_list)
+    index_url_options += ''.join(f'--find-links {shlex.quote(find_links)} '
+                                 for find_links in pip_find_links or [])
+
+    if not skip_installed_packages and pip_constraints is None:
+        install_python_packages_script = _install_python_packages_script_template.format(
+            index_url_options=index_url_options,
+            concat_package_list=concat_package_list)
+        return ['sh', '-c', install_python_packages_script]
+
+    pip_constraints_script = ''
+    if pip_constraints is not None:
+        pip_constraints_script = _pip_constraints_script_template.format(
+            pip_constraints=pip_constraints.rstrip('\n'))
+        index_url_options += '--constraint "$pip_constraints_path" '
+
+    if skip_installed_packages:
+        install_python_packages_script = _install_missing_python_packages_script_template.format(
+            pip_constraints_script=pip_constraints_script,
+            pip_options=index_url_options,
+            concat_package_list=concat_package_list)
+    else:
+        install_python_packages_script = pip_constraints_script + _install_python_packages_script_template.format(
+            index_url_options=index_url_options,
+            concat_package_list=concat_package_list)
     return ['sh', '-c', install_python_packages_script]
 
 
@@ -465,6 +565,9 @@ def create_component_from_func(
     output_component_file: Optional[str] = None,
     install_kfp_package: bool = True,
     kfp_package_path: Optional[str] = None,
+    skip_installed_packages: bool = False,
+    pip_find_links: Optional[List[str]] = None,
+    pip_constraints_file: Optional[str] = None,
 ) -> python_component.PythonComponent:
     """Implementation for the @component decorator.
 
@@ -478,8 +581,17 @@ def create_component_from_func(
             kfp_package_path = _get_default_kfp_package_path()
         packages_to_install.append(kfp_package_path)
 
+    pip_constraints = None
+    if pip_constraints_file is not None:
+        with open(pip_constraints_file) as f:
+            pip_constraints = f.read()
+
     packages_to_install_command = _get_packages_to_install_command(
-        package_list=packages_to_install, pip_index_urls=pip_index_urls)
+        package_list=packages_to_install,
+        pip_index_urls=pip_index_urls,
+        skip_installed_packages=skip_installed_packages,
+        pip_find_links=pip_find_links,
+        pip_constraints=pip_constraints)
 
     command = []
     args = []
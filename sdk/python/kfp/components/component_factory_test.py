@@ -12,6 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import subprocess
+import tempfile
 from typing import List
 import unittest
 
@@ -54,6 +57,81 @@ class TestGetPackagesToInstallCommand(unittest.TestCase):
         for package in packages_to_install + pip_index_urls:
             self.assertTrue(package in concat_command)
 
+    def test_with_pip_find_links_and_constraints(self):
+        command = component_factory._get_packages_to_install_command(
+            ['package1'],
+            pip_find_links=['/wheels'],
+            pip_constraints='package1==1.0\npackage2<2\n')
+        script = command[2]
+        self.assertIn('--find-links /wheels ', script)
+        self.assertIn('--constraint "$pip_constraints_path" ', script)
+        self.assertIn('package1==1.0\npackage2<2\nKFP_PIP_CONSTRAINTS\n',
+                      script)
+
+    def test_pip_find_links_are_quoted(self):
+        command = component_factory._get_packages_to_install_command(
+            ['package1'], pip_find_links=['/my wheels; rm -rf /'])
+        self.assertIn("--find-links '/my wheels; rm -rf /' ", command[2])
+
+    def test_skip_installed_packages(self):
+        # pip would fail to install the package that does not exist, so
+        # the command only succeeds if installed packages are skipped.
+        command = component_factory._get_packages_to_install_command(
+            [
+                'PyYAML>=1',
+                'kfp-package-that-does-not-exist; python_version<"3"'
+            ],
+            pip_index_urls=['https://localhost/simple'],
+            skip_installed_packages=True)
+        result = subprocess.run(
+            command + ['echo', 'executed'],
+            capture_output=True,
+            text=True,
+            check=True)
+        self.assertEqual(result.stdout, 'executed\n')
+
+    def test_skip_installed_packages_installs_missing_packages(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            command = component_factory._get_packages_to_install_command(
+                ['PyYAML>=1', 'kfp-package-that-does-not-exist'],
+                pip_find_links=[tmp_dir],
+                skip_installed_packages=True)
+            script = command[2].replace(
+                '-m\', \'pip\'', '-c\', \'import sys; print(sys.argv[1:])\'')
+            self.assertNotEqual(script, command[2])
+            result = subprocess.run(['sh', '-c', script, 'true'],
+                                    capture_output=True,
+                                    text=True,
+                                    check=True)
+        self.assertEqual(
+            result.stdout,
+            f"['install', '--quiet', '--no-warn-script-location', '--find-links', '{tmp_dir}', 'kfp-package-that-does-not-exist']\n"
+        )
+
+    def test_skip_installed_packages_checks_constraints(self):
+
+        def get_installed_packages(pip_constraints: str) -> List[str]:
+            command = component_factory._get_packages_to_install_command(
+                ['PyYAML>=1', 'absl-py'],
+                skip_installed_packages=True,
+                pip_constraints=pip_constraints)
+            script = command[2].replace(
+                '-m\', \'pip\'', '-c\', \'import sys; print(sys.argv[6:])\'')
+            self.assertNotEqual(script, command[2])
+            result = subprocess.run(['sh', '-c', script, 'true'],
+                                    capture_output=True,
+                                    text=True,
+                                    check=True)
+            return result.stdout
+
+        self.assertEqual(
+            get_installed_packages('# comment\npyyaml>=1 # inline\n'), '')
+        self.assertEqual(
+            get_installed_packages('PyYAML<1\nABSL_py>=1\n'), "['PyYAML>=1']\n")
+        self.assertEqual(
+            get_installed_packages('-r other-constraints.txt\n'),
+            "['PyYAML>=1', 'absl-py']\n")
+
 
 class TestInvalidParameterName(unittest.TestCase):
 
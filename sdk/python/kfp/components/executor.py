@@ -14,20 +14,40 @@
 import inspect
 import json
 import os
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, TextIO, Union
 
 from kfp.components import python_component
 from kfp.components import task_final_status
 from kfp.components.types import artifact_types
 from kfp.components.types import type_annotations
 
+# Environment variable that sets the serialized length of an output parameter
+# value above which the value is written to the parameter's output file
+# instead of being inlined in the executor output.
+KFP_OUTPUT_PARAMETER_OFFLOAD_THRESHOLD_ENV = 'KFP_OUTPUT_PARAMETER_OFFLOAD_THRESHOLD'
+
 
 class Executor():
     """Executor executes v2-based Python function components."""
 
-    def __init__(self, executor_input: Dict,
+    def __init__(self,
+                 executor_input: Dict,
                  function_to_execute: Union[Callable,
-                                            python_component.PythonComponent]):
+                                            python_component.PythonComponent],
+                 output_parameter_offload_threshold: Optional[int] = None):
+        """Executor constructor.
+
+        Args:
+            executor_input: The ExecutorInput from the orchestrator.
+            function_to_execute: The component function to execute.
+            output_parameter_offload_threshold: Serialized length above which
+                output parameter values returned by the function are written
+                to the parameter's output file, from which the orchestrator
+                reads them, instead of to the executor output. Defaults to
+                the value of the KFP_OUTPUT_PARAMETER_OFFLOAD_THRESHOLD
+                environment variable, if set, and otherwise no values are
+                offloaded.
+        """
         if hasattr(function_to_execute, 'python_func'):
             self._func = function_to_execute.python_func
         else:
@@ -78,6 +98,12 @@ class Executor():
             self._func).return_annotation
         self._executor_output = {}
 
+        if output_parameter_offload_threshold is None and os.environ.get(
+                KFP_OUTPUT_PARAMETER_OFFLOAD_THRESHOLD_ENV):
+            output_parameter_offload_threshold = int(
+                os.environ[KFP_OUTPUT_PARAMETER_OFFLOAD_THRESHOLD_ENV])
+        self._output_parameter_offload_threshold = output_parameter_offload_threshold
+
     def make_artifact(
         self,
         runtime_artifact: Dict,
@@ -149,18 +175,28 @@ class Executor():
     def _write_output_parameter_value(self, name: str,
                                       value: Union[str, int, float, bool, dict,
                                                    list, Dict, List]):
-        if isinstance(value, (float, int)):
+        if isinstance(value, bool):
+            output = json.dumps(value)
+        elif isinstance(value, (float, int)):
             output = str(value)
         elif isinstance(value, str):
             # value is already a string.
             output = value
-        elif isinstance(value, (bool, list, dict)):
+        elif isinstance(value, (list, dict)):
             output = json.dumps(value)
         else:
             raise ValueError(
                 f'Unable to serialize unknown type `{value}` for parameter input with value `{type(value)}`'
             )
 
+        if self._output_parameter_offload_threshold is not None and len(
+                output) > self._output_parameter_offload_threshold:
+            path = self._get_output_parameter_path(name)
+            if path:
+                with open(path, 'w') as f:
+                    f.write(output)
+                return
+
         if not self._executor_output.get('parameterValues'):
             self._executor_output['parameterValues'] = {}
 
@@ -289,7 +325,7 @@ class Executor():
             executor_output_path = self._input['outputs']['outputFile']
             os.makedirs(os.path.dirname(executor_output_path), exist_ok=True)
             with open(executor_output_path, 'w') as f:
-                f.write(json.dumps(self._executor_output))
+                _dump_executor_output(self._executor_output, f)
 
     def execute(self):
         annotations = inspect.getfullargspec(self._func).annotations
@@ -341,6 +377,25 @@ class Executor():
         self._write_executor_output(result)
 
 
+def _dump_executor_output(executor_output: Dict[str, Dict[str, Any]],
+                          f: TextIO) -> None:
+    """Writes the executor output to a file as JSON.
+
+    Equivalent to ``f.write(json.dumps(executor_output))``, but
+    serializes and writes one output at a time, so that only the largest
+    output, rather than the whole executor output, is held in memory as
+    a string.
+    """
+    f.write('{')
+    for i, (section, outputs) in enumerate(executor_output.items()):
+        f.write(f'{", " if i else ""}{json.dumps(section)}: {{')
+        for j, (name, value) in enumerate(outputs.items()):
+            f.write(f'{", " if j else ""}{json.dumps(name)}: ')
+            f.write(json.dumps(value))
+        f.write('}')
+    f.write('}')
+
+
 def create_artifact_instance(
     runtime_artifact: Dict,
     artifact_cls=artifact_types.Artifact,
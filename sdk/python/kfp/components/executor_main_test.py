@@ -0,0 +1,134 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for kfp.components.executor_main."""
+
+import os
+import subprocess
+import sys
+from typing import Dict, Optional
+import unittest
+
+import kfp
+
+# Modules that are not needed to execute a component, and that would add to
+# the startup time of every component container.
+_MODULES_NOT_IMPORTED_BY_EXECUTOR = [
+    'kfp.client',
+    'kfp_server_api',
+    'kubernetes',
+    'google.auth',
+    'requests',
+    'distutils',
+]
+
+
+def get_imported_modules(statement: str) -> Dict[str, Optional[int]]:
+    """Runs a statement in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        A mapping of every module imported by the statement to its
+        cumulative import time in microseconds, as reported by
+        ``-X importtime``. Modules imported by ``importlib.import_module``
+        are not reported by ``-X importtime`` and are mapped to None.
+    """
+    sdk_root = os.path.dirname(os.path.dirname(kfp.__file__))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([sdk_root,
+                                         env.get('PYTHONPATH',
+                                                 '')]).rstrip(os.pathsep)
+    result = subprocess.run(
+        [
+            sys.executable, '-X', 'importtime', '-c',
+            f'{statement}; import sys; print(*sys.modules, sep="\\n")'
+        ],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    imported_modules = dict.fromkeys(result.stdout.split())
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        imported_modules[module.strip()] = int(cumulative)
+    return imported_modules
+
+
+class TestExecutorMainImportTime(unittest.TestCase):
+
+    def test_executor_main_does_not_import_unneeded_modules(self):
+        imported_modules = get_imported_modules(
+            'import kfp.components.executor_main')
+
+        self.assertIsNotNone(imported_modules['kfp.components.executor_main'])
+        for module in _MODULES_NOT_IMPORTED_BY_EXECUTOR:
+            self.assertNotIn(module, imported_modules)
+
+    def test_kfp_dsl_and_client_are_imported_on_first_access(self):
+        self.assertNotIn('kfp.client', get_imported_modules('import kfp'))
+
+        imported_modules = get_imported_modules(
+            'import kfp; kfp.dsl.component; kfp.Client')
+        self.assertIn('kfp.dsl', imported_modules)
+        self.assertIn('kfp.client', imported_modules)
+
+    def test_public_attributes_are_still_accessible(self):
+        # The public attributes of these modules after importing them, as
+        # of when `import kfp` imported kfp.dsl and kfp.client eagerly.
+        public_attributes = {
+            'kfp': [
+                'Client', 'TYPE_CHECK', 'client', 'compiler', 'components',
+                'dsl', 'pipeline_spec'
+            ],
+            'kfp.components': [
+                'BaseComponent', 'ContainerComponent', 'PythonComponent',
+                'YamlComponent', 'base_component', 'component_decorator',
+                'component_factory', 'constants', 'container_component',
+                'container_component_artifact_channel',
+                'container_component_decorator', 'for_loop', 'graph_component',
+                'importer_component', 'importer_node',
+                'load_component_from_file', 'load_component_from_text',
+                'load_component_from_url', 'pipeline_channel',
+                'pipeline_context', 'pipeline_task', 'placeholders',
+                'python_component', 'structures', 'task_final_status',
+                'tasks_group', 'types', 'utils', 'v1_components',
+                'v1_modelbase', 'v1_structures', 'yaml_component'
+            ],
+            'kfp.dsl': [
+                'Annotated', 'Artifact', 'ClassificationMetrics', 'Collected',
+                'ConcatPlaceholder', 'Condition', 'ContainerSpec', 'Dataset',
+                'ExitHandler', 'HTML', 'IfPresentPlaceholder', 'Input',
+                'InputAnnotation', 'InputPath', 'Markdown', 'Metrics', 'Model',
+                'Output', 'OutputAnnotation', 'OutputPath', 'ParallelFor',
+                'PipelineTask', 'PipelineTaskFinalStatus',
+                'SlicedClassificationMetrics', 'component',
+                'container_component', 'importer', 'pipeline'
+            ],
+        }
+        for module, attributes in public_attributes.items():
+            # each module is imported in a fresh interpreter, since
+            # importing kfp.dsl makes most attributes accessible
+            get_imported_modules(f'import {module}; ' + '; '.join(
+                f'{module}.{attribute}' for attribute in attributes))
+        self.assertIn('kfp.compiler',
+                      get_imported_modules('import kfp; kfp.compiler'))
+        with self.assertRaises(subprocess.CalledProcessError):
+            get_imported_modules('import kfp; kfp.does_not_exist')
+        with self.assertRaises(subprocess.CalledProcessError):
+            get_imported_modules('import kfp.components as c; c.not_a_module')
+
+
+if __name__ == '__main__':
+    unittest.main()
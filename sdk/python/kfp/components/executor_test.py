@@ -13,6 +13,7 @@
 # limitations under the License.
 """Tests for kfp.components.executor."""
 
+import io
 import json
 import os
 import tempfile
@@ -1183,6 +1184,89 @@ class ExecutorTest(unittest.TestCase):
 
         self.assertDictEqual(output_metadata, {})
 
+    @mock.patch.dict(
+        os.environ, {executor.KFP_OUTPUT_PARAMETER_OFFLOAD_THRESHOLD_ENV: '10'})
+    def test_large_output_parameters_are_written_to_output_files(self):
+        executor_input = """\
+    {
+      "outputs": {
+        "parameters": {
+          "small": {
+            "outputFile": "%(test_dir)s/small"
+          },
+          "large": {
+            "outputFile": "%(test_dir)s/large"
+          },
+          "flag": {
+            "outputFile": "%(test_dir)s/flag"
+          }
+        },
+        "outputFile": "%(test_dir)s/output_metadata.json"
+      }
+    }
+    """
+
+        def test_func() -> NamedTuple('Outputs', [
+            ('small', List[int]),
+            ('large', List[int]),
+            ('flag', bool),
+        ]):
+            output = NamedTuple('Outputs', [
+                ('small', List[int]),
+                ('large', List[int]),
+                ('flag', bool),
+            ])
+            return output([1, 2], list(range(10)), True)
+
+        output_metadata = self.execute_and_load_output_metadata(
+            test_func, executor_input)
+
+        self.assertDictEqual(output_metadata, {
+            'parameterValues': {
+                'small': [1, 2],
+                'flag': True,
+            },
+        })
+        with open(os.path.join(self._test_dir, 'large')) as f:
+            self.assertEqual(json.load(f), list(range(10)))
+        self.assertFalse(os.path.exists(os.path.join(self._test_dir, 'small')))
+
+
+class TestDumpExecutorOutput(parameterized.TestCase):
+
+    @parameterized.parameters(
+        ({},),
+        ({
+            'parameterValues': {
+                'a': 'text',
+                'b': [1, {
+                    'c': None
+                }]
+            }
+        },),
+        ({
+            'artifacts': {
+                'model': {
+                    'artifacts': [{
+                        'name': 'model',
+                        'uri': 'gs://model',
+                        'metadata': {
+                            'accuracy': 0.9
+                        }
+                    }]
+                },
+                'empty': {}
+            },
+            'parameterValues': {
+                'Output': 'ü'
+            }
+        },),
+    )
+    def test_same_as_json_dumps(self, executor_output):
+        f = io.StringIO()
+        executor._dump_executor_output(executor_output, f)
+        self.assertEqual(f.getvalue(), json.dumps(executor_output))
+
 
 class VertexDataset:
     schema_title = 'google.VertexDataset'
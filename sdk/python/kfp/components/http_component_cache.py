@@ -0,0 +1,251 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Persistent on-disk cache for components loaded from URLs."""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+import warnings
+
+import requests
+
+# Environment variables used to configure the cache when no HttpComponentCache
+# context is active.
+KFP_COMPONENT_CACHE_DIR_ENV = 'KFP_COMPONENT_CACHE_DIR'
+KFP_COMPONENT_CACHE_MAX_BYTES_ENV = 'KFP_COMPONENT_CACHE_MAX_BYTES'
+KFP_COMPONENT_CACHE_OFFLINE_ENV = 'KFP_COMPONENT_CACHE_OFFLINE'
+
+_DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+_DATA_FILE_SUFFIX = '.data'
+_INFO_FILE_SUFFIX = '.info'
+
+# The cache that is consulted by load_component_from_url, if any. Set by
+# entering an HttpComponentCache context.
+_active_cache: Optional['HttpComponentCache'] = None
+
+
+class HttpComponentCache:
+    """Size-bounded, on-disk cache of component files downloaded over HTTP.
+
+    Cached entries are revalidated with the server using the ETag and
+    Last-Modified headers of the response they were created from, so
+    unchanged components are not downloaded again. In offline mode, or
+    when the server cannot be reached or fails with a server error,
+    entries are served without revalidation. Entries are separate for
+    each set of authentication credentials. Least recently used entries
+    are evicted once the cache grows beyond ``max_bytes``.
+
+    The cache is used by ``load_component_from_url`` while the context is
+    active, or, outside of any context, if the ``KFP_COMPONENT_CACHE_DIR``
+    environment variable is set.
+
+    Example:
+      ::
+
+        with http_component_cache.HttpComponentCache('~/.cache/kfp/components'):
+            component = components.load_component_from_url(url)
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = _DEFAULT_MAX_BYTES,
+        offline: bool = False,
+    ) -> None:
+        """HttpComponentCache constructor.
+
+        Args:
+            cache_dir: Directory in which to store cache entries. Created if it does not exist.
+            max_bytes: Maximum total size of the cached component files.
+            offline: Whether to serve components only from the cache, without any network access.
+        """
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_bytes = max_bytes
+        self.offline = offline
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def __enter__(self) -> 'HttpComponentCache':
+        global _active_cache
+        self._prev = _active_cache
+        _active_cache = self
+        return self
+
+    def __exit__(self, *unused_args) -> None:
+        global _active_cache
+        _active_cache = self._prev
+
+    def _entry_path(self,
+                    url: str,
+                    auth: Optional[Tuple[str, str]] = None) -> str:
+        return os.path.join(
+            self.cache_dir,
+            hashlib.sha256(_cache_key(url, auth).encode('utf-8')).hexdigest())
+
+    def _read_entry(
+        self,
+        url: str,
+        auth: Optional[Tuple[str, str]] = None,
+    ) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        path = self._entry_path(url, auth)
+        try:
+            with open(path + _INFO_FILE_SUFFIX) as f:
+                info = json.load(f)
+            with open(path + _DATA_FILE_SUFFIX, 'rb') as f:
+                data = f.read()
+        except (OSError, ValueError):
+            return None
+        if info.get('url') != url or info.get(
+                'git_blob_hash') != _calculate_git_blob_hash(data):
+            return None
+        # the modification time of the data file is used for LRU eviction
+        try:
+            os.utime(path + _DATA_FILE_SUFFIX)
+        except FileNotFoundError:
+            # evicted by another process since it was read
+            return None
+        return info, data
+
+    def _write_entry(self, url: str, auth: Optional[Tuple[str, str]],
+                     response: requests.Response) -> None:
+        path = self._entry_path(url, auth)
+        info = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'git_blob_hash': _calculate_git_blob_hash(response.content),
+        }
+        _atomic_write(path + _DATA_FILE_SUFFIX, response.content)
+        _atomic_write(path + _INFO_FILE_SUFFIX, json.dumps(info).encode())
+        self._evict()
+
+    def _evict(self) -> None:
+        data_files = []
+        for file_name in os.listdir(self.cache_dir):
+            if not file_name.endswith(_DATA_FILE_SUFFIX):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, file_name))
+            except OSError:
+                continue
+            data_files.append((stat.st_mtime, stat.st_size, file_name))
+
+        total_bytes = sum(size for _, size, _ in data_files)
+        for _, size, file_name in sorted(data_files):
+            if total_bytes <= self.max_bytes:
+                break
+            path = os.path.join(self.cache_dir,
+                                file_name[:-len(_DATA_FILE_SUFFIX)])
+            for suffix in [_INFO_FILE_SUFFIX, _DATA_FILE_SUFFIX]:
+                try:
+                    os.remove(path + suffix)
+                except OSError:
+                    pass
+            total_bytes -= size
+
+    def get(self, url: str, auth: Optional[Tuple[str, str]] = None) -> bytes:
+        """Gets the content at a URL, from the cache if it is still valid.
+
+        Args:
+            url: The URL to fetch.
+            auth: A ``('<username>', '<password>')`` tuple of authentication credentials.
+
+        Returns:
+            The content of the response.
+        """
+        entry = self._read_entry(url, auth)
+        if self.offline:
+            if entry is None:
+                raise RuntimeError(
+                    f'Component {url!r} is not in the component cache at {self.cache_dir!r} and the cache is offline.'
+                )
+            return entry[1]
+
+        headers = {}
+        if entry is not None:
+            info, _ = entry
+            if info.get('etag'):
+                headers['If-None-Match'] = info['etag']
+            if info.get('last_modified'):
+                headers['If-Modified-Since'] = info['last_modified']
+        try:
+            response = requests.get(url, auth=auth, headers=headers)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if entry is None:
+                raise
+            warnings.warn(
+                f'Could not revalidate component {url!r}: {e}. Using the cached copy.'
+            )
+            return entry[1]
+
+        if response.status_code == requests.codes.not_modified and entry is not None:
+            return entry[1]
+        if _is_transient_error(response) and entry is not None:
+            warnings.warn(
+                f'Could not revalidate component {url!r}: HTTP {response.status_code}. Using the cached copy.'
+            )
+            return entry[1]
+        response.raise_for_status()
+        self._write_entry(url, auth, response)
+        return response.content
+
+
+def get_active_cache() -> Optional[HttpComponentCache]:
+    """Returns the HttpComponentCache of the innermost active cache context,
+    or, if there is none, the cache configured by the environment, if any."""
+    if _active_cache is not None:
+        return _active_cache
+    cache_dir = os.environ.get(KFP_COMPONENT_CACHE_DIR_ENV)
+    if not cache_dir:
+        return None
+    return HttpComponentCache(
+        cache_dir,
+        max_bytes=int(
+            os.environ.get(KFP_COMPONENT_CACHE_MAX_BYTES_ENV,
+                           _DEFAULT_MAX_BYTES)),
+        offline=os.environ.get(KFP_COMPONENT_CACHE_OFFLINE_ENV, '').lower()
+        in ('1', 'true'),
+    )
+
+
+def _cache_key(url: str, auth: Optional[Tuple[str, str]]) -> str:
+    # Components fetched with different credentials may differ, e.g. when
+    # they are private. The key is hashed, so credentials are not stored.
+    if auth is None:
+        return url
+    return f'{url}\n{auth!r}'
+
+
+def _is_transient_error(response: requests.Response) -> bool:
+    return (response.status_code >= 500 or
+            response.status_code == requests.codes.too_many_requests)
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _calculate_git_blob_hash(data: bytes) -> str:
+    return hashlib.sha1(b'blob ' + str(len(data)).encode('utf-8') + b'\x00' +
+                        data).hexdigest()
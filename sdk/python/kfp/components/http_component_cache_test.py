@@ -0,0 +1,215 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from kfp.components import http_component_cache
+from kfp.components import yaml_component
+import requests
+
+COMPONENT_YAML = """\
+name: component-from-cache
+implementation:
+  container:
+    image: alpine
+"""
+
+URL = 'https://example.com/component.yaml'
+
+
+def make_response(status_code: int,
+                  content: bytes = b'',
+                  headers: dict = None) -> mock.Mock:
+    response = mock.Mock(
+        status_code=status_code, content=content, headers=headers or {})
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(
+            str(status_code))
+    return response
+
+
+class TestHttpComponentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = http_component_cache.HttpComponentCache(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_revalidates_with_etag_and_last_modified(self):
+        with mock.patch.object(
+                requests,
+                'get',
+                side_effect=[
+                    make_response(
+                        200, b'data', {
+                            'ETag': '"abc"',
+                            'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'
+                        }),
+                    make_response(304),
+                ]) as mock_get:
+            self.assertEqual(self.cache.get(URL), b'data')
+            self.assertEqual(self.cache.get(URL), b'data')
+
+        self.assertEqual(mock_get.call_args_list[0].kwargs['headers'], {})
+        self.assertEqual(
+            mock_get.call_args_list[1].kwargs['headers'], {
+                'If-None-Match': '"abc"',
+                'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT'
+            })
+
+    def test_changed_content_is_stored(self):
+        with mock.patch.object(
+                requests,
+                'get',
+                side_effect=[
+                    make_response(200, b'old', {'ETag': '"1"'}),
+                    make_response(200, b'new', {'ETag': '"2"'}),
+                    make_response(304),
+                ]):
+            self.assertEqual(self.cache.get(URL), b'old')
+            self.assertEqual(self.cache.get(URL), b'new')
+            self.assertEqual(self.cache.get(URL), b'new')
+
+    def test_offline(self):
+        with mock.patch.object(
+                requests, 'get', return_value=make_response(200, b'data')):
+            self.cache.get(URL)
+
+        offline_cache = http_component_cache.HttpComponentCache(
+            self.tmp_dir.name, offline=True)
+        with mock.patch.object(requests, 'get') as mock_get:
+            self.assertEqual(offline_cache.get(URL), b'data')
+            with self.assertRaisesRegex(RuntimeError,
+                                        r'is not in the component cache'):
+                offline_cache.get('https://example.com/other.yaml')
+        mock_get.assert_not_called()
+
+    def test_unreachable_server_serves_cached_copy(self):
+        with mock.patch.object(
+                requests, 'get', return_value=make_response(200, b'data')):
+            self.cache.get(URL)
+
+        with mock.patch.object(
+                requests, 'get', side_effect=requests.ConnectionError('down')):
+            with self.assertWarnsRegex(UserWarning, r'Using the cached copy'):
+                self.assertEqual(self.cache.get(URL), b'data')
+            with self.assertRaises(requests.ConnectionError):
+                self.cache.get('https://example.com/other.yaml')
+
+    def test_server_error_serves_cached_copy(self):
+        with mock.patch.object(
+                requests, 'get', return_value=make_response(200, b'data')):
+            self.cache.get(URL)
+
+        with mock.patch.object(
+                requests, 'get', return_value=make_response(503)):
+            with self.assertWarnsRegex(UserWarning, r'HTTP 503'):
+                self.assertEqual(self.cache.get(URL), b'data')
+            with self.assertRaises(requests.HTTPError):
+                self.cache.get('https://example.com/other.yaml')
+        with mock.patch.object(
+                requests, 'get', return_value=make_response(404)):
+            with self.assertRaises(requests.HTTPError):
+                self.cache.get(URL)
+
+    def test_entries_are_separate_per_credentials(self):
+        with mock.patch.object(
+                requests, 'get', return_value=make_response(200, b'public')):
+            self.cache.get(URL)
+        with mock.patch.object(
+                requests, 'get', return_value=make_response(200, b'private')):
+            self.cache.get(URL, auth=('user', 'password'))
+
+        self.assertEqual(self.cache._read_entry(URL)[1], b'public')
+        self.assertEqual(
+            self.cache._read_entry(URL, auth=('user', 'password'))[1],
+            b'private')
+        self.assertIsNone(
+            self.cache._read_entry(URL, auth=('other-user', 'password')))
+        with mock.patch.object(
+                requests, 'get',
+                return_value=make_response(200, b'other')) as mock_get:
+            self.assertEqual(
+                self.cache.get(URL, auth=('other-user', 'password')), b'other')
+        self.assertEqual(mock_get.call_args.kwargs['headers'], {})
+
+    def test_corrupted_entry_is_refetched(self):
+        with mock.patch.object(
+                requests, 'get', return_value=make_response(200, b'data')):
+            self.cache.get(URL)
+        with open(self.cache._entry_path(URL) + '.data', 'wb') as f:
+            f.write(b'corrupted')
+
+        with mock.patch.object(
+                requests, 'get',
+                return_value=make_response(200, b'data')) as mock_get:
+            self.assertEqual(self.cache.get(URL), b'data')
+        self.assertEqual(mock_get.call_args.kwargs['headers'], {})
+
+    def test_entry_evicted_while_read_is_refetched(self):
+        with mock.patch.object(
+                requests, 'get', return_value=make_response(200, b'data')):
+            self.cache.get(URL)
+
+        with mock.patch.object(
+                http_component_cache.os, 'utime',
+                side_effect=FileNotFoundError), mock.patch.object(
+                    requests, 'get',
+                    return_value=make_response(200, b'data')) as mock_get:
+            self.assertEqual(self.cache.get(URL), b'data')
+        self.assertEqual(mock_get.call_args.kwargs['headers'], {})
+
+    def test_evicts_least_recently_used(self):
+        cache = http_component_cache.HttpComponentCache(
+            self.tmp_dir.name, max_bytes=10)
+        urls = [f'https://example.com/{i}.yaml' for i in range(3)]
+        for i, url in enumerate(urls):
+            with mock.patch.object(
+                    requests, 'get', return_value=make_response(200, b'12345')):
+                cache.get(url)
+            # make the order of modification times deterministic
+            os.utime(
+                cache._entry_path(url) + '.data', times=(1000 + i, 1000 + i))
+
+        self.assertIsNone(cache._read_entry(urls[0]))
+        self.assertIsNotNone(cache._read_entry(urls[1]))
+        self.assertIsNotNone(cache._read_entry(urls[2]))
+
+    def test_load_component_from_url_uses_active_cache(self):
+        url = 'https://example.com/component_from_cache.yaml'
+        with mock.patch.object(
+                requests,
+                'get',
+                return_value=make_response(200, COMPONENT_YAML.encode())):
+            with self.cache:
+                yaml_component.load_component_from_url(url)
+
+        with mock.patch.dict(
+                os.environ, {
+                    http_component_cache.KFP_COMPONENT_CACHE_DIR_ENV:
+                        self.tmp_dir.name,
+                    http_component_cache.KFP_COMPONENT_CACHE_OFFLINE_ENV:
+                        'true',
+                }), mock.patch.object(requests, 'get') as mock_get:
+            component = yaml_component.load_component_from_url(url)
+        mock_get.assert_not_called()
+        self.assertEqual(component.name, 'component-from-cache')
+
+
+if __name__ == '__main__':
+    unittest.main()
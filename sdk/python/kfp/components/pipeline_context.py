@@ -14,7 +14,7 @@
 """Definition for Pipeline."""
 
 import functools
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional
 
 from kfp.components import component_factory
 from kfp.components import pipeline_task
@@ -109,6 +109,9 @@ class Pipeline:
         """
         self.name = name
         self.tasks = {}
+        # Maps task names to the next index to try when making the name of a
+        # new task with that name unique.
+        self._task_name_indices: Dict[str, int] = {}
         # Add the root group.
         self.groups = [
             tasks_group.TasksGroup(
@@ -142,6 +145,23 @@ class Pipeline:
         pipeline_task.PipelineTask._register_task_handler = (
             self._old_register_task_handler)
 
+    def _make_task_name_unique(self, name: str) -> str:
+        """Makes a task name unique by adding the smallest index, starting
+        from 2, that makes it unique.
+
+        Same as ``utils.make_name_unique_by_adding_index``, but tasks are
+        never removed, so the search resumes from the index after the last
+        one used for the name, which keeps adding many tasks with the same
+        name linear.
+        """
+        if name not in self.tasks:
+            return name
+        index = self._task_name_indices.get(name, 2)
+        while f'{name}-{index}' in self.tasks:
+            index += 1
+        self._task_name_indices[name] = index + 1
+        return f'{name}-{index}'
+
     def add_task(
         self,
         task: pipeline_task.PipelineTask,
@@ -162,11 +182,9 @@ class Pipeline:
         # serialization of PipelineChannels make unsanitized names problematic.
         task_name = utils.maybe_rename_for_k8s(task.component_spec.name)
         #If there is an existing task with this name then generate a new name.
-        task_name = utils.make_name_unique_by_adding_index(
-            task_name, list(self.tasks.keys()), '-')
+        task_name = self._make_task_name_unique(task_name)
         if task_name == '':
-            task_name = utils.make_name_unique_by_adding_index(
-                'task', list(self.tasks.keys()), '-')
+            task_name = self._make_task_name_unique('task')
 
         self.tasks[task_name] = task
         if add_to_group:
@@ -13,7 +13,7 @@
 # limitations under the License.
 """Python function-based component."""
 
-from typing import Callable
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 from kfp import components
 from kfp.components import structures
@@ -42,3 +42,54 @@ class PythonComponent(components.BaseComponent):
     def execute(self, **kwargs):
         """Executes the Python function that defines the component."""
         return self.python_func(**kwargs)
+
+    def execute_in_process(self,
+                           *,
+                           _artifact_root: Optional[str] = None,
+                           **kwargs) -> Dict[str, Any]:
+        """Executes the component in the current process, through the same
+        ExecutorInput and ExecutorOutput contract as in a container.
+
+        Args:
+            _artifact_root: Local directory in which to store the outputs of the component. Defaults to a directory in the temporary directory of the system, which the caller must clean up if the component has output artifacts; otherwise the outputs are stored in a temporary directory that is removed before returning. The leading underscore keeps the name from clashing with inputs of the component.
+            **kwargs: Arguments to the component. Input artifacts are passed as ``Artifact`` objects.
+
+        Returns:
+            Output parameter values and output artifacts by output name. The return value of the function is the output named ``Output``.
+
+        Example:
+          ::
+
+            @dsl.component
+            def add(a: int, b: int) -> int:
+                return a + b
+
+            assert add.execute_in_process(a=1, b=2) == {'Output': 3}
+        """
+        from kfp.local import component_executor
+        return component_executor.execute_component(
+            self, kwargs, artifact_root=_artifact_root)
+
+    def execute_in_process_many(
+        self,
+        arguments_list: Sequence[Dict[str, Any]],
+        artifact_root: Optional[str] = None,
+        processes: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Executes the component with many sets of arguments, in parallel in
+        a pool of processes.
+
+        Args:
+            arguments_list: Arguments of each execution.
+            artifact_root: Local directory in which to store the outputs of the component. Defaults to a directory in the temporary directory of the system, as for ``execute_in_process``.
+            processes: Number of worker processes. Defaults to the number of CPUs.
+
+        Returns:
+            The outputs of each execution, as returned by ``execute_in_process``, in the order of ``arguments_list``.
+        """
+        from kfp.local import component_executor
+        return component_executor.execute_component_many(
+            self,
+            arguments_list,
+            artifact_root=artifact_root,
+            processes=processes)
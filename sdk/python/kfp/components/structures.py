@@ -17,6 +17,7 @@ import ast
 import collections
 import dataclasses
 import itertools
+import json
 import re
 from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 import uuid
@@ -35,6 +36,9 @@ from kfp.components.types import type_utils
 from kfp.pipeline_spec import pipeline_spec_pb2
 import yaml
 
+# libyaml's parser is several times faster than the pure-Python one.
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 @dataclasses.dataclass
 class InputSpec:
@@ -836,6 +840,57 @@ class ComponentSpec:
             platform_spec=platform_spec,
         )
 
+    @classmethod
+    def from_ir_protos(
+        cls,
+        pipeline_spec: pipeline_spec_pb2.PipelineSpec,
+        platform_spec: pipeline_spec_pb2.PlatformSpec,
+    ) -> 'ComponentSpec':
+        """Creates a ComponentSpec from the PipelineSpec and PlatformSpec
+        messages.
+
+        Only the inputs, outputs and executor of the component are
+        converted to dicts. If the component is a pipeline, pipeline_spec
+        itself becomes its graph implementation.
+        """
+        raw_name = pipeline_spec.pipeline_info.name
+        component_key = utils.sanitize_component_name(raw_name)
+        if component_key in pipeline_spec.components:
+            component_spec = pipeline_spec.components[component_key]
+        else:
+            component_spec = pipeline_spec.root
+
+        executors = {}
+        executor_key = utils.sanitize_executor_label(raw_name)
+        deployment_spec = pipeline_spec.deployment_spec
+        if ('executors' in deployment_spec and
+                executor_key in deployment_spec['executors']):
+            executors[executor_key] = json_format.MessageToDict(
+                deployment_spec['executors'][executor_key])
+
+        inputs_dict = json_format.MessageToDict(
+            component_spec.input_definitions)
+        outputs_dict = json_format.MessageToDict(
+            component_spec.output_definitions)
+        interface_dict = {
+            'pipelineInfo': {
+                'name': raw_name
+            },
+            'components': {},
+            'root': {
+                'inputDefinitions': inputs_dict,
+                'outputDefinitions': outputs_dict,
+            },
+            'deploymentSpec': {
+                'executors': executors
+            },
+        }
+        component = cls.from_ir_dicts(interface_dict, {})
+        if component.implementation.graph is not None:
+            component.implementation.graph = pipeline_spec
+        component.platform_spec = platform_spec
+        return component
+
     @classmethod
     def from_yaml_documents(cls, component_yaml: str) -> 'ComponentSpec':
         """Loads V1 or V2 component YAML into a ComponentSpec.
@@ -1002,6 +1057,8 @@ class ComponentSpec:
             ),  # no PlatformSpec single-component pipeline
             is_compiled_component=True,
         )
+        pipeline_spec.deployment_spec.update(
+            json_format.MessageToDict(deployment_config))
 
         return pipeline_spec
 
@@ -1058,9 +1115,19 @@ def load_documents_from_yaml(component_yaml: str) -> Tuple[dict, dict]:
     """Loads up to two YAML documents from a YAML string.
 
     First document must always be present. If second document is
-    present, it is returned as a dict, else an empty dict.
+    present, it is returned as a dict, else an empty dict. JSON, such as
+    the output of compiling to a .json file, is parsed with the json
+    module, which is much faster than the YAML parser.
     """
-    documents = list(yaml.safe_load_all(component_yaml))
+    documents = None
+    if component_yaml.lstrip().startswith('{'):
+        try:
+            documents = [json.loads(component_yaml)]
+        except json.JSONDecodeError:
+            # a YAML flow mapping that is not valid JSON
+            pass
+    if documents is None:
+        documents = list(yaml.load_all(component_yaml, Loader=_YamlLoader))
     num_docs = len(documents)
     if num_docs == 1:
         pipeline_spec_dict = documents[0]
@@ -1140,6 +1140,17 @@ class TestLoadDocumentsFromYAML(unittest.TestCase):
         self.assertEqual(doc1, {'key1': 'value1'})
         self.assertEqual(doc2, {'key2': 'value2'})
 
+    def test_json_document(self):
+        doc1, doc2 = structures.load_documents_from_yaml(
+            '{"key1": {"key2": [1, 2.5, "value"]}}')
+        self.assertEqual(doc1, {'key1': {'key2': [1, 2.5, 'value']}})
+        self.assertEqual(doc2, {})
+
+    def test_yaml_flow_mapping(self):
+        doc1, doc2 = structures.load_documents_from_yaml('{key1: value1}')
+        self.assertEqual(doc1, {'key1': 'value1'})
+        self.assertEqual(doc2, {})
+
     def test_three_documents(self):
         with self.assertRaisesRegex(
                 ValueError,
@@ -16,6 +16,7 @@
 These are only compatible with v2 Pipelines.
 """
 
+import os
 from typing import Dict, List, Optional, Type
 
 _GCS_LOCAL_MOUNT_PREFIX = '/gcs/'
@@ -90,6 +91,9 @@ class Artifact:
             return _MINIO_LOCAL_MOUNT_PREFIX + self.uri[len('minio://'):]
         elif self.uri.startswith('s3://'):
             return _S3_LOCAL_MOUNT_PREFIX + self.uri[len('s3://'):]
+        # artifacts of local pipeline runs are stored on the local filesystem
+        elif os.path.isabs(self.uri):
+            return self.uri
         return None
 
     def _set_path(self, path: str) -> None:
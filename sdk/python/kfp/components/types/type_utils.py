@@ -13,7 +13,6 @@
 # limitations under the License.
 """Utilities for component I/O type mapping."""
 
-from distutils import util
 import inspect
 import json
 from typing import Any, Callable, Dict, Optional, Type, Union
@@ -67,10 +66,22 @@ _PARAMETER_TYPES_MAPPING = {
 
 def bool_cast_fn(default: Union[str, bool]) -> bool:
     if isinstance(default, str):
-        default = util.strtobool(default) == 1
+        default = _strtobool(default)
     return default
 
 
+def _strtobool(value: str) -> bool:
+    # Same as distutils.util.strtobool. Importing distutils takes longer than
+    # the rest of this module, as it is provided by setuptools.
+    value = value.lower()
+    if value in ('y', 'yes', 't', 'true', 'on', '1'):
+        return True
+    elif value in ('n', 'no', 'f', 'false', 'off', '0'):
+        return False
+    else:
+        raise ValueError(f'invalid truth value {value!r}')
+
+
 def try_loading_json(default: str) -> Union[dict, list, str]:
     try:
         return json.loads(default)
@@ -13,14 +13,30 @@
 # limitations under the License.
 """Functions for loading components from compiled YAML."""
 
-from typing import Optional, Tuple
+import collections
+import copy
+import functools
+import os
+import threading
+from typing import Any, Optional, Tuple
 
 from google.protobuf import json_format
 from kfp import components
+from kfp.components import http_component_cache
 from kfp.components import structures
 from kfp.pipeline_spec import pipeline_spec_pb2
 import requests
 
+# Maximum number of distinct component texts and URLs for which parsed
+# component specs are kept in memory.
+_MAX_CACHED_COMPONENTS = 256
+
+# Maps (URL, auth) to the (ETag, text) of the last response for that URL
+# and credentials.
+_url_cache: 'collections.OrderedDict[Tuple[str, Any], Tuple[str, str]]' = (
+    collections.OrderedDict())
+_url_cache_lock = threading.Lock()
+
 
 class YamlComponent(components.BaseComponent):
     """A component loaded from a YAML file.
@@ -29,28 +45,36 @@ class YamlComponent(components.BaseComponent):
 
     Attribute:
         component_spec: Component definition.
-        component_yaml: The yaml string that this component is loaded from.
+        component_yaml: The yaml string that this component is loaded from,
+            or ``None`` if it is loaded from a binary package.
     """
 
     def __init__(
         self,
         component_spec: structures.ComponentSpec,
-        component_yaml: str,
+        component_yaml: Optional[str],
+        pipeline_spec: Optional[pipeline_spec_pb2.PipelineSpec] = None,
     ):
         super().__init__(component_spec=component_spec)
         self.component_yaml = component_yaml
+        self._pipeline_spec = pipeline_spec
 
     @property
     def pipeline_spec(self) -> pipeline_spec_pb2.PipelineSpec:
-        """Returns the pipeline spec of the component."""
-        component_dict = structures.load_documents_from_yaml(
-            self.component_yaml)[0]
-        is_v1 = 'implementation' in set(component_dict.keys())
-        if is_v1:
-            return self.component_spec.to_pipeline_spec()
-        else:
-            return json_format.ParseDict(component_dict,
-                                         pipeline_spec_pb2.PipelineSpec())
+        """Returns the pipeline spec of the component.
+
+        The pipeline spec is built the first time it is read.
+        """
+        if self._pipeline_spec is None:
+            component_dict = structures.load_documents_from_yaml(
+                self.component_yaml)[0]
+            is_v1 = 'implementation' in set(component_dict.keys())
+            if is_v1:
+                self._pipeline_spec = self.component_spec.to_pipeline_spec()
+            else:
+                self._pipeline_spec = json_format.ParseDict(
+                    component_dict, pipeline_spec_pb2.PipelineSpec())
+        return self._pipeline_spec
 
     def execute(self, *args, **kwargs):
         """Not implemented."""
@@ -60,6 +84,10 @@ class YamlComponent(components.BaseComponent):
 def load_component_from_text(text: str) -> YamlComponent:
     """Loads a component from text.
 
+    Parsed component specs are cached in memory by content, so loading
+    the same text again does not parse it again. Each call returns a new
+    component with its own copy of the spec.
+
     Args:
         text (str): Component YAML text.
 
@@ -67,13 +95,21 @@ def load_component_from_text(text: str) -> YamlComponent:
         Component loaded from YAML.
     """
     return YamlComponent(
-        component_spec=structures.ComponentSpec.from_yaml_documents(text),
+        component_spec=copy.deepcopy(_parse_component_spec(text)),
         component_yaml=text)
 
 
+@functools.lru_cache(maxsize=_MAX_CACHED_COMPONENTS)
+def _parse_component_spec(text: str) -> structures.ComponentSpec:
+    # The cached spec is shared, and must not be modified.
+    return structures.ComponentSpec.from_yaml_documents(text)
+
+
 def load_component_from_file(file_path: str) -> YamlComponent:
     """Loads a component from a file.
 
+    Files ending with ``.pb`` are read as binary pipeline packages.
+
     Args:
         file_path (str): Filepath to a YAML component.
 
@@ -87,6 +123,20 @@ def load_component_from_file(file_path: str) -> YamlComponent:
 
         components.load_component_from_file('~/path/to/pipeline.yaml')
     """
+    from kfp.compiler import pipeline_spec_builder
+
+    if os.fspath(file_path).endswith(
+            pipeline_spec_builder.BINARY_PACKAGE_EXTENSION):
+        with open(file_path, 'rb') as component_stream:
+            pipeline_spec, platform_spec = (
+                pipeline_spec_builder.read_pipeline_spec_from_binary(
+                    component_stream))
+        return YamlComponent(
+            component_spec=structures.ComponentSpec.from_ir_protos(
+                copy.deepcopy(pipeline_spec), platform_spec),
+            component_yaml=None,
+            pipeline_spec=pipeline_spec)
+
     with open(file_path, 'r') as component_stream:
         return load_component_from_text(component_stream.read())
 
@@ -96,6 +146,8 @@ def load_component_from_url(url: str,
                                                  str]] = None) -> YamlComponent:
     """Loads a component from a URL.
 
+    If the ``KFP_COMPONENT_CACHE_DIR`` environment variable is set, or an ``http_component_cache.HttpComponentCache`` context is active, downloaded components are cached on disk and revalidated with the server on later loads. Set ``KFP_COMPONENT_CACHE_OFFLINE=1`` to load components only from the cache.
+
     Args:
         url (str): URL to a YAML component.
         auth (Tuple[str, str], optional): A ``('<username>', '<password>')`` tuple of authentication credentials necessary for URL access. See `Requests Authorization <https://requests.readthedocs.io/en/latest/user/authentication/#authentication>`_ for more information.
@@ -119,7 +171,32 @@ def load_component_from_url(url: str,
         #Replacing the gs:// URI with https:// URI (works for public objects)
         url = 'https://storage.googleapis.com/' + url[len('gs://'):]
 
-    resp = requests.get(url, auth=auth)
+    disk_cache = http_component_cache.get_active_cache()
+    if disk_cache is not None:
+        return load_component_from_text(
+            disk_cache.get(url, auth=auth).decode('utf-8'))
+
+    # Revalidate the last response for this URL and credentials, if it had
+    # an ETag, so that an unchanged component is neither downloaded nor
+    # parsed again.
+    cache_key = (url, auth)
+    with _url_cache_lock:
+        etag, text = _url_cache.get(cache_key, (None, None))
+    headers = {'If-None-Match': etag} if etag else None
+    resp = requests.get(url, auth=auth, headers=headers)
     resp.raise_for_status()
 
-    return load_component_from_text(resp.content.decode('utf-8'))
+    if resp.status_code == requests.codes.not_modified and text is not None:
+        return load_component_from_text(text)
+
+    text = resp.content.decode('utf-8')
+    etag = resp.headers.get('ETag')
+    with _url_cache_lock:
+        if etag:
+            _url_cache[cache_key] = (etag, text)
+            _url_cache.move_to_end(cache_key)
+            if len(_url_cache) > _MAX_CACHED_COMPONENTS:
+                _url_cache.popitem(last=False)
+        else:
+            _url_cache.pop(cache_key, None)
+    return load_component_from_text(text)
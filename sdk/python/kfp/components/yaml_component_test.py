@@ -17,9 +17,14 @@ import os
 import tempfile
 import textwrap
 import unittest
+from unittest import mock
 
+from google.protobuf import json_format
+from kfp.compiler import pipeline_spec_builder
 from kfp.components import structures
 from kfp.components import yaml_component
+from kfp.pipeline_spec import pipeline_spec_pb2
+import requests
 
 SAMPLE_YAML = textwrap.dedent("""\
 components:
@@ -110,6 +115,48 @@ class YamlComponentTest(unittest.TestCase):
         self.assertEqual(
             component.component_spec.implementation.container.image, 'alpine')
 
+    def test_load_component_from_binary_file(self):
+        yaml_loaded = yaml_component.load_component_from_text(SAMPLE_YAML)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'component.pb')
+            pipeline_spec_builder.write_pipeline_spec_to_file(
+                pipeline_spec=yaml_loaded.pipeline_spec,
+                pipeline_description=None,
+                platform_spec=pipeline_spec_pb2.PlatformSpec(),
+                package_path=path)
+            with mock.patch.object(
+                    json_format, 'MessageToDict',
+                    wraps=json_format.MessageToDict) as mock_message_to_dict:
+                component = yaml_component.load_component_from_file(path)
+
+        self.assertIsNone(component.component_yaml)
+        self.assertEqual(component.component_spec, yaml_loaded.component_spec)
+        self.assertEqual(component.pipeline_spec, yaml_loaded.pipeline_spec)
+        for call in mock_message_to_dict.call_args_list:
+            self.assertNotIsInstance(call.args[0],
+                                     pipeline_spec_pb2.PipelineSpec)
+
+    def test_load_pipeline_from_binary_file(self):
+        yaml_loaded = yaml_component.load_component_from_text(SAMPLE_YAML)
+        pipeline_spec = yaml_loaded.pipeline_spec
+        pipeline_spec.pipeline_info.name = 'my-pipeline'
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'pipeline.pb')
+            pipeline_spec_builder.write_pipeline_spec_to_file(
+                pipeline_spec=pipeline_spec,
+                pipeline_description=None,
+                platform_spec=pipeline_spec_pb2.PlatformSpec(),
+                package_path=path)
+            component = yaml_component.load_component_from_file(path)
+
+        self.assertEqual(component.name, 'my-pipeline')
+        self.assertEqual(component._component_inputs, {'input1'})
+        self.assertIsNone(component.component_spec.implementation.container)
+        self.assertEqual(component.component_spec.implementation.graph,
+                         pipeline_spec)
+        self.assertIsNot(component.component_spec.implementation.graph,
+                         component.pipeline_spec)
+
     def test_load_component_from_url(self):
         component_url = 'https://raw.githubusercontent.com/kubeflow/pipelines/7b49eadf621a9054e1f1315c86f95fb8cf8c17c3/sdk/python/kfp/compiler/test_data/components/identity.yaml'
         component = yaml_component.load_component_from_url(component_url)
@@ -123,6 +170,78 @@ class YamlComponentTest(unittest.TestCase):
             component.component_spec.implementation.container.image,
             'python:3.7')
 
+    def test_load_component_from_text_is_cached(self):
+        text = SAMPLE_YAML + '\n# test_load_component_from_text_is_cached\n'
+        with mock.patch.object(
+                structures.ComponentSpec,
+                'from_yaml_documents',
+                wraps=structures.ComponentSpec.from_yaml_documents
+        ) as mock_from_yaml_documents:
+            component = yaml_component.load_component_from_text(text)
+            other_component = yaml_component.load_component_from_text(text)
+
+        mock_from_yaml_documents.assert_called_once()
+        self.assertEqual(component.component_spec,
+                         other_component.component_spec)
+
+    def test_loaded_components_do_not_share_spec(self):
+        component = yaml_component.load_component_from_text(SAMPLE_YAML)
+        component.component_spec.name = 'changed'
+        component.component_spec.implementation.container.image = 'python:3.11'
+
+        other_component = yaml_component.load_component_from_text(SAMPLE_YAML)
+        self.assertIsNot(component, other_component)
+        self.assertEqual(other_component.component_spec.name, 'component-1')
+        self.assertEqual(
+            other_component.component_spec.implementation.container.image,
+            'alpine')
+
+    def test_pipeline_spec_is_built_once(self):
+        component = yaml_component.load_component_from_text(SAMPLE_YAML)
+        with mock.patch.object(
+                structures,
+                'load_documents_from_yaml',
+                wraps=structures.load_documents_from_yaml) as mock_load:
+            pipeline_spec = component.pipeline_spec
+            self.assertIs(pipeline_spec, component.pipeline_spec)
+        self.assertLessEqual(mock_load.call_count, 1)
+        self.assertEqual(pipeline_spec.pipeline_info.name, 'component-1')
+
+    def test_load_component_from_url_revalidates_etag(self):
+        component_url = 'https://example.com/component_with_etag.yaml'
+        ok_response = mock.Mock(
+            status_code=200,
+            content=SAMPLE_YAML.encode('utf-8'),
+            headers={'ETag': '"abc"'})
+        not_modified_response = mock.Mock(
+            status_code=304, content=b'', headers={'ETag': '"abc"'})
+        with mock.patch.object(
+                requests, 'get',
+                side_effect=[ok_response, not_modified_response]) as mock_get:
+            component = yaml_component.load_component_from_url(component_url)
+            cached_component = yaml_component.load_component_from_url(
+                component_url)
+
+        self.assertEqual(component.component_spec,
+                         cached_component.component_spec)
+        self.assertIsNone(mock_get.call_args_list[0].kwargs['headers'])
+        self.assertEqual(mock_get.call_args_list[1].kwargs['headers'],
+                         {'If-None-Match': '"abc"'})
+
+    def test_load_component_from_url_does_not_revalidate_for_other_auth(self):
+        component_url = 'https://example.com/component_with_auth.yaml'
+        ok_response = mock.Mock(
+            status_code=200,
+            content=SAMPLE_YAML.encode('utf-8'),
+            headers={'ETag': '"abc"'})
+        with mock.patch.object(
+                requests, 'get', return_value=ok_response) as mock_get:
+            yaml_component.load_component_from_url(
+                component_url, auth=('user', 'password'))
+            yaml_component.load_component_from_url(component_url)
+
+        self.assertIsNone(mock_get.call_args_list[1].kwargs['headers'])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,290 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""On-disk cache of the outputs of tasks of local pipeline runs."""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import uuid
+
+from kfp.pipeline_spec import pipeline_spec_pb2
+
+# Version of the format of fingerprints and cache entries. Entries of other
+# versions are never hit.
+_CACHE_VERSION = 1
+_ENTRY_FILE = 'entry.json'
+_ENTRY_OUTPUTS_DIR = 'outputs'
+_TEMP_ENTRY_PREFIX = '.tmp-'
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+class ExecutionCache:
+    """Cache of the outputs of tasks, stored in a local directory.
+
+    Tasks are looked up by their fingerprint, which is computed from the
+    component, the container image, command and arguments, and the
+    values of the input parameters and the contents of the input
+    artifacts of the task. The output artifacts of a task are copied
+    into the cache, and copied back to the output directory of a task
+    with the same fingerprint.
+
+    Entries are evicted, least recently used first, when the cache
+    exceeds ``max_size_bytes`` or an entry has not been used for
+    ``max_age_seconds``.
+
+    Args:
+        cache_dir: Directory in which to store the cache.
+        max_size_bytes: Maximum total size of the cache. Defaults to no limit.
+        max_age_seconds: Maximum time since an entry was last used. Defaults to no limit.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_size_bytes: Optional[int] = None,
+        max_age_seconds: Optional[float] = None,
+    ) -> None:
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_size_bytes = max_size_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        fingerprint: str,
+        output_dir: str,
+    ) -> Optional[Tuple[Dict[str, Any], Dict[str, List[Dict[str, Any]]]]]:
+        """Gets the outputs of a task from the cache.
+
+        Args:
+            fingerprint: Fingerprint of the task.
+            output_dir: Output directory of the task, to which the cached output artifacts are copied.
+
+        Returns:
+            A tuple of the values of the output parameters and the lists of RuntimeArtifacts of the output artifacts, or None if the task is not cached.
+        """
+        entry_dir = os.path.join(self.cache_dir, fingerprint)
+        with self._lock:
+            try:
+                with open(os.path.join(entry_dir, _ENTRY_FILE)) as f:
+                    entry = json.load(f)
+            except FileNotFoundError:
+                return None
+            if self._is_expired(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                return None
+            # the modification time of the entry file is the last use time
+            os.utime(os.path.join(entry_dir, _ENTRY_FILE))
+
+        artifacts = {}
+        for name, artifact_list in entry['artifacts'].items():
+            artifacts[name] = []
+            for artifact in artifact_list:
+                relative_path = artifact.pop('relative_path', None)
+                if relative_path is not None:
+                    artifact['uri'] = os.path.join(output_dir, relative_path)
+                    try:
+                        _copy(
+                            os.path.join(entry_dir, _ENTRY_OUTPUTS_DIR,
+                                         relative_path), artifact['uri'])
+                    except FileNotFoundError:
+                        # the entry was evicted concurrently
+                        return None
+                artifacts[name].append(artifact)
+        return entry['parameters'], artifacts
+
+    def put(
+        self,
+        fingerprint: str,
+        output_dir: str,
+        parameters: Dict[str, Any],
+        artifacts: Dict[str, List[Dict[str, Any]]],
+    ) -> None:
+        """Adds the outputs of a task to the cache, and evicts entries if the
+        cache exceeds its limits.
+
+        Args:
+            fingerprint: Fingerprint of the task.
+            output_dir: Output directory of the task. Output artifacts stored in this directory are copied into the cache.
+            parameters: Values of the output parameters of the task.
+            artifacts: Lists of RuntimeArtifacts of the output artifacts of the task.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_dir = os.path.join(self.cache_dir,
+                                f'{_TEMP_ENTRY_PREFIX}{uuid.uuid4().hex}')
+        cached_artifacts = {}
+        for name, artifact_list in artifacts.items():
+            cached_artifacts[name] = []
+            for artifact in artifact_list:
+                artifact = dict(artifact)
+                relative_path = os.path.relpath(artifact['uri'], output_dir)
+                if (os.path.isabs(artifact['uri']) and
+                        not relative_path.startswith(os.pardir) and
+                        os.path.exists(artifact['uri'])):
+                    _copy(
+                        artifact['uri'],
+                        os.path.join(temp_dir, _ENTRY_OUTPUTS_DIR,
+                                     relative_path))
+                    artifact['relative_path'] = relative_path
+                cached_artifacts[name].append(artifact)
+        os.makedirs(temp_dir, exist_ok=True)
+        with open(os.path.join(temp_dir, _ENTRY_FILE), 'w') as f:
+            json.dump({
+                'parameters': parameters,
+                'artifacts': cached_artifacts
+            }, f)
+
+        with self._lock:
+            try:
+                os.rename(temp_dir, os.path.join(self.cache_dir, fingerprint))
+            except OSError:
+                # the task was cached by a concurrent run
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            self._evict()
+
+    def evict(self) -> None:
+        """Evicts the entries that exceed the limits of the cache."""
+        with self._lock:
+            self._evict()
+
+    def clear(self) -> None:
+        """Removes all entries from the cache."""
+        with self._lock:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def _evict(self) -> None:
+        if not os.path.isdir(self.cache_dir):
+            return
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            if name.startswith(
+                    _TEMP_ENTRY_PREFIX) or not os.path.isdir(entry_dir):
+                continue
+            if self._is_expired(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                continue
+            entries.append((_get_last_use_time(entry_dir), _get_size(entry_dir),
+                            entry_dir))
+        if self.max_size_bytes is None:
+            return
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_dir in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+
+    def _is_expired(self, entry_dir: str) -> bool:
+        return (
+            self.max_age_seconds is not None and
+            time.time() - _get_last_use_time(entry_dir) > self.max_age_seconds)
+
+
+def compute_fingerprint(
+    component_spec: pipeline_spec_pb2.ComponentSpec,
+    container_spec: pipeline_spec_pb2.PipelineDeploymentConfig
+    .PipelineContainerSpec,
+    executor_input: Dict[str, Any],
+) -> str:
+    """Computes the fingerprint of a task for looking it up in the cache.
+
+    Args:
+        component_spec: The ComponentSpec of the task.
+        container_spec: The container of the task, with its image, command and arguments.
+        executor_input: The ExecutorInput of the task, as a dictionary.
+
+    Returns:
+        The fingerprint, as a hex string.
+    """
+    inputs = executor_input.get('inputs', {})
+    input_artifacts = {
+        name: [{
+            'type': artifact.get('type', {}),
+            'metadata': artifact.get('metadata', {}),
+            'content': _hash_artifact(artifact['uri']),
+        } for artifact in artifact_list['artifacts']
+              ] for name, artifact_list in inputs.get('artifacts', {}).items()
+    }
+    fingerprint = hashlib.sha256()
+    for data in [
+            str(_CACHE_VERSION).encode(),
+            component_spec.SerializeToString(deterministic=True),
+            container_spec.SerializeToString(deterministic=True),
+            json.dumps(inputs.get('parameterValues', {}),
+                       sort_keys=True).encode(),
+            json.dumps(input_artifacts, sort_keys=True).encode(),
+    ]:
+        # prefix each part with its length, so that parts cannot be confused
+        fingerprint.update(len(data).to_bytes(8, 'big'))
+        fingerprint.update(data)
+    return fingerprint.hexdigest()
+
+
+def _hash_artifact(uri: str) -> str:
+    """Hashes the contents of an artifact on the local filesystem, or its URI
+    if it is not stored locally."""
+    if not os.path.isabs(uri) or not os.path.exists(uri):
+        return f'uri:{uri}'
+    content_hash = hashlib.sha256()
+    if os.path.isfile(uri):
+        _hash_file(uri, content_hash)
+        return content_hash.hexdigest()
+    for root, dirs, files in os.walk(uri):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            content_hash.update(os.path.relpath(path, uri).encode() + b'\0')
+            _hash_file(path, content_hash)
+    return content_hash.hexdigest()
+
+
+def _hash_file(path: str, content_hash: 'hashlib._Hash') -> None:
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            content_hash.update(chunk)
+
+
+def _copy(source: str, destination: str) -> None:
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    if not os.path.isdir(source):
+        shutil.copy2(source, destination)
+        return
+    # The destination directory may exist, which shutil.copytree only
+    # supports from Python 3.8.
+    for root, _, files in os.walk(source, followlinks=True):
+        destination_root = os.path.normpath(
+            os.path.join(destination, os.path.relpath(root, source)))
+        os.makedirs(destination_root, exist_ok=True)
+        for name in files:
+            shutil.copy2(
+                os.path.join(root, name), os.path.join(destination_root, name))
+
+
+def _get_last_use_time(entry_dir: str) -> float:
+    try:
+        return os.path.getmtime(os.path.join(entry_dir, _ENTRY_FILE))
+    except FileNotFoundError:
+        return 0.0
+
+
+def _get_size(entry_dir: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(entry_dir)
+        for name in files)
@@ -0,0 +1,219 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import time
+import unittest
+
+from kfp.local import cache
+from kfp.pipeline_spec import pipeline_spec_pb2
+
+
+def _make_executor_input(parameter_values, artifact_uri=None):
+    inputs = {'parameterValues': parameter_values}
+    if artifact_uri is not None:
+        inputs['artifacts'] = {
+            'data': {
+                'artifacts': [{
+                    'name': 'data',
+                    'uri': artifact_uri,
+                    'metadata': {},
+                }]
+            }
+        }
+    return {'inputs': inputs, 'outputs': {}}
+
+
+class TestComputeFingerprint(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.component_spec = pipeline_spec_pb2.ComponentSpec(
+            executor_label='exec-a')
+        self.container_spec = pipeline_spec_pb2.PipelineDeploymentConfig.PipelineContainerSpec(
+            image='alpine', command=['echo'])
+
+    def _fingerprint(self, executor_input, container_spec=None):
+        return cache.compute_fingerprint(self.component_spec, container_spec or
+                                         self.container_spec, executor_input)
+
+    def test_same_inputs(self):
+        self.assertEqual(
+            self._fingerprint(_make_executor_input({
+                'a': 1,
+                'b': 'x'
+            })), self._fingerprint(_make_executor_input({
+                'b': 'x',
+                'a': 1
+            })))
+
+    def test_different_parameter_values(self):
+        self.assertNotEqual(
+            self._fingerprint(_make_executor_input({'a': 1})),
+            self._fingerprint(_make_executor_input({'a': 2})))
+
+    def test_different_image(self):
+        other_container_spec = pipeline_spec_pb2.PipelineDeploymentConfig.PipelineContainerSpec(
+            image='busybox', command=['echo'])
+        self.assertNotEqual(
+            self._fingerprint(_make_executor_input({})),
+            self._fingerprint(
+                _make_executor_input({}), container_spec=other_container_spec))
+
+    def test_artifact_contents(self):
+        path = os.path.join(self.tmpdir.name, 'data')
+        with open(path, 'w') as f:
+            f.write('a')
+        fingerprint = self._fingerprint(_make_executor_input({}, path))
+        with open(path, 'w') as f:
+            f.write('b')
+
+        self.assertNotEqual(fingerprint,
+                            self._fingerprint(_make_executor_input({}, path)))
+
+    def test_artifact_directory_at_other_path(self):
+        for name in ['dir1', 'dir2']:
+            os.makedirs(os.path.join(self.tmpdir.name, name, 'sub'))
+            with open(os.path.join(self.tmpdir.name, name, 'sub', 'f'),
+                      'w') as f:
+                f.write('a')
+
+        self.assertEqual(
+            self._fingerprint(
+                _make_executor_input({}, os.path.join(self.tmpdir.name,
+                                                      'dir1'))),
+            self._fingerprint(
+                _make_executor_input({}, os.path.join(self.tmpdir.name,
+                                                      'dir2'))))
+
+
+class TestCopy(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def _write(self, path, content):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+
+    def _read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def test_copy_file(self):
+        source = os.path.join(self.tmpdir.name, 'source')
+        destination = os.path.join(self.tmpdir.name, 'out', 'destination')
+        self._write(source, 'a')
+
+        cache._copy(source, destination)
+
+        self.assertEqual(self._read(destination), 'a')
+
+    def test_copy_directory_into_existing_directory(self):
+        source = os.path.join(self.tmpdir.name, 'source')
+        destination = os.path.join(self.tmpdir.name, 'destination')
+        self._write(os.path.join(source, 'f'), 'a')
+        self._write(os.path.join(source, 'sub', 'g'), 'b')
+        os.makedirs(os.path.join(source, 'empty'))
+        self._write(os.path.join(destination, 'f'), 'old')
+        self._write(os.path.join(destination, 'other'), 'c')
+
+        cache._copy(source, destination)
+
+        self.assertEqual(self._read(os.path.join(destination, 'f')), 'a')
+        self.assertEqual(self._read(os.path.join(destination, 'sub', 'g')), 'b')
+        self.assertTrue(os.path.isdir(os.path.join(destination, 'empty')))
+        self.assertEqual(self._read(os.path.join(destination, 'other')), 'c')
+
+
+class TestExecutionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cache_dir = os.path.join(self.tmpdir.name, 'cache')
+
+    def _put(self, execution_cache, fingerprint, content='hello'):
+        output_dir = os.path.join(self.tmpdir.name, fingerprint)
+        os.makedirs(output_dir)
+        uri = os.path.join(output_dir, 'model')
+        with open(uri, 'w') as f:
+            f.write(content)
+        execution_cache.put(fingerprint, output_dir, {'accuracy': 0.9}, {
+            'model': [{
+                'name': 'model',
+                'uri': uri,
+                'metadata': {}
+            }],
+            'remote': [{
+                'name': 'remote',
+                'uri': 'gs://bucket/remote',
+                'metadata': {}
+            }],
+        })
+
+    def test_get_copies_artifacts(self):
+        execution_cache = cache.ExecutionCache(self.cache_dir)
+        self._put(execution_cache, 'fp')
+        output_dir = os.path.join(self.tmpdir.name, 'new')
+
+        parameters, artifacts = execution_cache.get('fp', output_dir)
+
+        self.assertEqual(parameters, {'accuracy': 0.9})
+        self.assertEqual(artifacts['model'][0]['uri'],
+                         os.path.join(output_dir, 'model'))
+        with open(os.path.join(output_dir, 'model')) as f:
+            self.assertEqual(f.read(), 'hello')
+        self.assertEqual(artifacts['remote'][0]['uri'], 'gs://bucket/remote')
+
+    def test_miss(self):
+        execution_cache = cache.ExecutionCache(self.cache_dir)
+        self.assertIsNone(execution_cache.get('fp', self.tmpdir.name))
+
+    def test_evict_by_size(self):
+        execution_cache = cache.ExecutionCache(
+            self.cache_dir, max_size_bytes=1500)
+        self._put(execution_cache, 'fp1', content='a' * 1000)
+        past = time.time() - 10
+        os.utime(
+            os.path.join(self.cache_dir, 'fp1', 'entry.json'), (past, past))
+        self._put(execution_cache, 'fp2', content='b' * 1000)
+
+        self.assertIsNone(execution_cache.get('fp1', self.tmpdir.name))
+        self.assertIsNotNone(
+            execution_cache.get('fp2', os.path.join(self.tmpdir.name, 'new')))
+
+    def test_evict_by_age(self):
+        execution_cache = cache.ExecutionCache(
+            self.cache_dir, max_age_seconds=60)
+        self._put(execution_cache, 'fp')
+        past = time.time() - 120
+        os.utime(os.path.join(self.cache_dir, 'fp', 'entry.json'), (past, past))
+
+        self.assertIsNone(execution_cache.get('fp', self.tmpdir.name))
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, 'fp')))
+
+    def test_clear(self):
+        execution_cache = cache.ExecutionCache(self.cache_dir)
+        self._put(execution_cache, 'fp')
+        execution_cache.clear()
+        self.assertIsNone(execution_cache.get('fp', self.tmpdir.name))
+
+
+if __name__ == '__main__':
+    unittest.main()
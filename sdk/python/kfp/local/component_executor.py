@@ -0,0 +1,187 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""In-process execution of lightweight Python components."""
+
+from concurrent import futures
+import multiprocessing
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence
+import uuid
+
+from kfp.components import executor as component_executor
+from kfp.components import python_component
+from kfp.components.types import artifact_types
+from kfp.local import executor_input_utils
+from kfp.pipeline_spec import pipeline_spec_pb2
+
+# Default directory, in the temporary directory of the system, in which the
+# outputs of components executed in process are stored.
+_DEFAULT_ARTIFACT_ROOT_DIR = 'kfp-local-outputs'
+
+# The component and artifact root of the worker processes of
+# execute_component_many.
+_worker_component: Optional[python_component.PythonComponent] = None
+_worker_artifact_root: Optional[str] = None
+
+
+def execute_component(
+    component: python_component.PythonComponent,
+    arguments: Dict[str, Any],
+    artifact_root: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Executes a Python component in the current process.
+
+    Unlike calling the Python function of the component, the component
+    is executed by the ``Executor``, as in a container: the arguments are
+    passed in an ExecutorInput, and the outputs are read from the
+    ExecutorOutput that the executor writes, so they are serialized and
+    cast to the types of the outputs.
+
+    Args:
+        component: The component.
+        arguments: Arguments to the component, by input name. Input artifacts are passed as ``Artifact`` objects, or lists of them.
+        artifact_root: Local directory in which to store the outputs of the component, in a new directory for each execution. Defaults to a directory in the temporary directory of the system, which is not cleaned up if the component has output artifacts, since the returned artifacts refer to it; the caller is responsible for removing it. Components without output artifacts use a temporary directory that is removed before returning.
+
+    Returns:
+        Output parameter values and output artifacts, as ``Artifact`` objects, or lists of them for outputs that are lists of artifacts, by output name. The return value of the function is the output named ``Output``.
+    """
+    component_spec = _get_component_spec(component)
+    if artifact_root is None and not component_spec.output_definitions.artifacts:
+        # Nothing returned refers to the outputs directory, so it is removed
+        # once the outputs are read.
+        with tempfile.TemporaryDirectory() as tmpdir:
+            return execute_component(component, arguments, tmpdir)
+    artifact_root = os.path.abspath(
+        artifact_root or
+        os.path.join(tempfile.gettempdir(), _DEFAULT_ARTIFACT_ROOT_DIR))
+    input_artifacts = component_spec.input_definitions.artifacts
+
+    parameter_values = {}
+    artifacts = {}
+    for name, value in arguments.items():
+        if name not in input_artifacts:
+            parameter_values[name] = value
+            continue
+        artifact_list = value if isinstance(value, list) else [value]
+        for artifact in artifact_list:
+            if not isinstance(artifact, artifact_types.Artifact):
+                raise TypeError(
+                    f'Argument for input artifact {name!r} must be an Artifact, got {type(artifact).__name__}.'
+                )
+        artifacts[name] = [
+            executor_input_utils.make_runtime_artifact(
+                name=artifact.name or name,
+                artifact_type=pipeline_spec_pb2.ArtifactTypeSchema(
+                    schema_title=artifact.schema_title,
+                    schema_version=artifact.schema_version),
+                uri=artifact.uri,
+                metadata=artifact.metadata) for artifact in artifact_list
+        ]
+    for name, artifact_spec in input_artifacts.items():
+        if name not in artifacts and not artifact_spec.is_optional:
+            raise ValueError(f'Missing required input artifact {name!r}.')
+
+    output_dir = os.path.join(artifact_root,
+                              f'{component.name}-{uuid.uuid4().hex}')
+    executor_input = executor_input_utils.construct_executor_input(
+        component_spec,
+        executor_input_utils.resolve_input_parameter_values(
+            component_spec, parameter_values),
+        artifacts,
+        output_dir,
+    )
+    component_executor.Executor(executor_input, component).execute()
+
+    parameters, output_artifacts = executor_input_utils.read_executor_output(
+        component_spec, executor_input)
+    return _make_outputs(component_spec, parameters, output_artifacts)
+
+
+def execute_component_many(
+    component: python_component.PythonComponent,
+    arguments_list: Sequence[Dict[str, Any]],
+    artifact_root: Optional[str] = None,
+    processes: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Executes a Python component with many sets of arguments, in parallel
+    in a pool of processes.
+
+    Where the platform supports it, the worker processes are forked, so
+    the component may be defined anywhere; otherwise the component must
+    be picklable.
+
+    Args:
+        component: The component.
+        arguments_list: Arguments of each execution.
+        artifact_root: Local directory in which to store the outputs of the component. Defaults to a directory in the temporary directory of the system, as for ``execute_component``.
+        processes: Number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        The outputs of each execution, in the order of ``arguments_list``.
+    """
+    processes = processes or os.cpu_count()
+    mp_context = multiprocessing.get_context(
+        'fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+    # send the arguments in chunks, so that many short executions are not
+    # dominated by inter-process communication
+    chunksize = max(1, len(arguments_list) // (processes * 4))
+    with futures.ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(component, artifact_root)) as executor:
+        return list(
+            executor.map(
+                _execute_in_worker, arguments_list, chunksize=chunksize))
+
+
+def _init_worker(
+    component: python_component.PythonComponent,
+    artifact_root: Optional[str],
+) -> None:
+    global _worker_component, _worker_artifact_root
+    _worker_component = component
+    _worker_artifact_root = artifact_root
+
+
+def _execute_in_worker(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    return execute_component(_worker_component, arguments,
+                             _worker_artifact_root)
+
+
+def _make_outputs(
+    component_spec: pipeline_spec_pb2.ComponentSpec,
+    parameters: Dict[str, Any],
+    artifacts: Dict[str, List[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    outputs = dict(parameters)
+    output_artifacts = component_spec.output_definitions.artifacts
+    for name, artifact_list in artifacts.items():
+        artifact_list = [
+            component_executor.create_artifact_instance(artifact)
+            for artifact in artifact_list
+        ]
+        outputs[name] = (
+            artifact_list
+            if output_artifacts[name].is_artifact_list else artifact_list[0])
+    return outputs
+
+
+def _get_component_spec(
+    component: python_component.PythonComponent
+) -> pipeline_spec_pb2.ComponentSpec:
+    pipeline_spec = component.pipeline_spec
+    task_spec = next(iter(pipeline_spec.root.dag.tasks.values()))
+    return pipeline_spec.components[task_spec.component_ref.name]
@@ -0,0 +1,179 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+from typing import Dict, List, NamedTuple
+import unittest
+from unittest import mock
+
+from kfp import dsl
+from kfp.local import component_executor
+from kfp.pipeline_spec import pipeline_spec_pb2
+
+
+@dsl.component
+def add(a: int, b: int = 2) -> int:
+    return a + b
+
+
+@dsl.component
+def split(
+        text: str) -> NamedTuple(
+            'Outputs', words=List[str], counts=Dict[str, int]):
+    from collections import namedtuple
+    words = text.split()
+    outputs = namedtuple('Outputs', ['words', 'counts'])
+    return outputs(words, {word: words.count(word) for word in words})
+
+
+@dsl.component
+def scale(artifact_root: str, factor: int) -> str:
+    return artifact_root * factor
+
+
+@dsl.component
+def train(dataset: dsl.Input[dsl.Dataset], model: dsl.Output[dsl.Model],
+          epochs: int) -> float:
+    with open(dataset.path) as f:
+        rows = f.read().splitlines()
+    with open(model.path, 'w') as f:
+        f.write(f'{len(rows)} rows, {epochs} epochs')
+    model.metadata['epochs'] = epochs
+    return 0.5
+
+
+class TestExecuteInProcess(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_parameters(self):
+        self.assertEqual(
+            add.execute_in_process(a=1, _artifact_root=self.tmpdir.name),
+            {'Output': 3})
+
+    def test_input_named_artifact_root(self):
+        self.assertEqual(
+            scale.execute_in_process(
+                artifact_root='ab', factor=2, _artifact_root=self.tmpdir.name),
+            {'Output': 'abab'})
+
+    def test_named_tuple_outputs(self):
+        self.assertEqual(
+            split.execute_in_process(
+                text='a b a', _artifact_root=self.tmpdir.name), {
+                    'words': ['a', 'b', 'a'],
+                    'counts': {
+                        'a': 2,
+                        'b': 1
+                    }
+                })
+
+    def test_artifacts(self):
+        dataset_path = os.path.join(self.tmpdir.name, 'dataset.csv')
+        with open(dataset_path, 'w') as f:
+            f.write('1\n2\n3\n')
+
+        outputs = train.execute_in_process(
+            dataset=dsl.Dataset(uri=dataset_path),
+            epochs=2,
+            _artifact_root=self.tmpdir.name)
+
+        self.assertEqual(outputs['Output'], 0.5)
+        model = outputs['model']
+        self.assertIsInstance(model, dsl.Model)
+        self.assertTrue(model.uri.startswith(self.tmpdir.name))
+        self.assertEqual(model.metadata, {'epochs': 2})
+        with open(model.path) as f:
+            self.assertEqual(f.read(), '3 rows, 2 epochs')
+
+    def test_default_artifact_root(self):
+        dataset_path = os.path.join(self.tmpdir.name, 'dataset.csv')
+        with open(dataset_path, 'w') as f:
+            f.write('1\n')
+        with mock.patch.object(tempfile, 'tempdir', self.tmpdir.name):
+            self.assertEqual(add.execute_in_process(a=1), {'Output': 3})
+            # nothing is left behind by components without output artifacts
+            self.assertEqual(os.listdir(self.tmpdir.name), ['dataset.csv'])
+
+            model = train.execute_in_process(
+                dataset=dsl.Dataset(uri=dataset_path), epochs=1)['model']
+
+        self.assertTrue(
+            model.uri.startswith(
+                os.path.join(self.tmpdir.name, 'kfp-local-outputs')))
+        self.assertTrue(os.path.exists(model.path))
+
+    def test_missing_input_artifact(self):
+        with self.assertRaisesRegex(ValueError, 'Missing required input'):
+            train.execute_in_process(epochs=1, _artifact_root=self.tmpdir.name)
+
+    def test_invalid_input_artifact(self):
+        with self.assertRaisesRegex(TypeError, 'must be an Artifact'):
+            train.execute_in_process(
+                dataset='data.csv', epochs=1, _artifact_root=self.tmpdir.name)
+
+    def test_function_errors_are_raised(self):
+        with self.assertRaises(ValueError):
+            add.execute_in_process(a='x', _artifact_root=self.tmpdir.name)
+
+    def test_execute_in_process_many(self):
+        outputs = add.execute_in_process_many([{
+            'a': i
+        } for i in range(10)],
+                                              artifact_root=self.tmpdir.name,
+                                              processes=2)
+
+        self.assertEqual(outputs, [{'Output': i + 2} for i in range(10)])
+
+
+class TestMakeOutputs(unittest.TestCase):
+
+    def test_artifact_list_outputs(self):
+        component_spec = pipeline_spec_pb2.ComponentSpec()
+        component_spec.output_definitions.artifacts[
+            'models'].is_artifact_list = True
+        component_spec.output_definitions.artifacts['metrics']
+        artifacts = {
+            'models': [{
+                'name': f'model-{i}',
+                'type': {
+                    'schemaTitle': 'system.Model'
+                },
+                'uri': f'/tmp/model-{i}',
+            } for i in range(3)],
+            'metrics': [{
+                'name': 'metrics',
+                'type': {
+                    'schemaTitle': 'system.Metrics'
+                },
+                'uri': '/tmp/metrics',
+            }],
+        }
+
+        outputs = component_executor._make_outputs(component_spec, {'x': 1},
+                                                   artifacts)
+
+        self.assertEqual(outputs['x'], 1)
+        self.assertEqual([model.uri for model in outputs['models']],
+                         ['/tmp/model-0', '/tmp/model-1', '/tmp/model-2'])
+        self.assertTrue(
+            all(isinstance(model, dsl.Model) for model in outputs['models']))
+        self.assertIsInstance(outputs['metrics'], dsl.Metrics)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Construction of the ExecutorInput of a task and collection of its outputs
+for local execution.
+
+Executor inputs and outputs are handled as dictionaries in the JSON
+format of the ExecutorInput and ExecutorOutput messages, which is the
+format exchanged with the executor.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.protobuf import json_format
+from kfp.pipeline_spec import pipeline_spec_pb2
+
+# Name of the file, in the output directory of a task, to which the
+# executor writes its ExecutorOutput.
+EXECUTOR_OUTPUT_FILE = 'executor_output.json'
+
+_ParameterType = pipeline_spec_pb2.ParameterType
+
+
+def make_runtime_artifact(
+    name: str,
+    artifact_type: pipeline_spec_pb2.ArtifactTypeSchema,
+    uri: str,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Makes a RuntimeArtifact in JSON format.
+
+    Args:
+        name: Name of the artifact.
+        artifact_type: Type of the artifact.
+        uri: URI of the artifact. For local execution, the path of the
+            artifact on the local filesystem.
+        metadata: Metadata of the artifact.
+
+    Returns:
+        The RuntimeArtifact, as a dictionary.
+    """
+    return {
+        'name': name,
+        'type': json_format.MessageToDict(artifact_type),
+        'uri': uri,
+        'metadata': metadata or {},
+    }
+
+
+def cast_parameter_value(
+    value: Any,
+    parameter_type: pipeline_spec_pb2.ParameterType.ParameterTypeEnum,
+) -> Any:
+    """Casts a parameter value to the Python type of its parameter type.
+
+    Args:
+        value: The value, which may be serialized as a string.
+        parameter_type: The parameter type.
+
+    Returns:
+        The value as a Python object of the type.
+    """
+    if parameter_type == _ParameterType.STRING:
+        return value if isinstance(value, str) else json.dumps(value)
+    if parameter_type == _ParameterType.NUMBER_INTEGER:
+        return int(float(value)) if isinstance(value, str) else int(value)
+    if parameter_type == _ParameterType.NUMBER_DOUBLE:
+        return float(value)
+    if parameter_type == _ParameterType.BOOLEAN:
+        if isinstance(value, str):
+            return value.strip().lower() in ('true', '1')
+        return bool(value)
+    if parameter_type in (_ParameterType.LIST, _ParameterType.STRUCT):
+        return json.loads(value) if isinstance(value, str) else value
+    return value
+
+
+def resolve_input_parameter_values(
+    component_spec: pipeline_spec_pb2.ComponentSpec,
+    parameter_values: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Adds default values and casts values to the types of the input
+    parameters of a component.
+
+    Args:
+        component_spec: The ComponentSpec.
+        parameter_values: Values of the input parameters that are set.
+
+    Returns:
+        The values of all input parameters that are set or have a default.
+
+    Raises:
+        ValueError: If an input parameter is unknown, or is required but not set.
+    """
+    input_parameters = component_spec.input_definitions.parameters
+    for name in parameter_values:
+        if name not in input_parameters:
+            raise ValueError(f'Unknown input parameter {name!r}.')
+
+    resolved = {}
+    for name, parameter_spec in input_parameters.items():
+        if name in parameter_values:
+            value = parameter_values[name]
+        elif parameter_spec.HasField('default_value'):
+            value = json_format.MessageToDict(parameter_spec.default_value)
+        elif parameter_spec.is_optional:
+            continue
+        else:
+            raise ValueError(f'Missing required input parameter {name!r}.')
+        resolved[name] = cast_parameter_value(value,
+                                              parameter_spec.parameter_type)
+    return resolved
+
+
+def construct_executor_input(
+    component_spec: pipeline_spec_pb2.ComponentSpec,
+    parameter_values: Dict[str, Any],
+    artifacts: Dict[str, List[Dict[str, Any]]],
+    output_dir: str,
+) -> Dict[str, Any]:
+    """Constructs the ExecutorInput of a task.
+
+    The outputs of the task are stored in ``output_dir``: each output
+    parameter and output artifact in a file or directory named after it,
+    and the ExecutorOutput in ``EXECUTOR_OUTPUT_FILE``.
+
+    Args:
+        component_spec: The ComponentSpec of the task.
+        parameter_values: Values of the input parameters of the task.
+        artifacts: Lists of RuntimeArtifacts of the input artifacts of the task.
+        output_dir: Directory for the outputs of the task.
+
+    Returns:
+        The ExecutorInput, as a dictionary.
+    """
+    inputs = {}
+    if parameter_values:
+        inputs['parameterValues'] = parameter_values
+    if artifacts:
+        inputs['artifacts'] = {
+            name: {
+                'artifacts': artifact_list
+            } for name, artifact_list in artifacts.items()
+        }
+
+    output_definitions = component_spec.output_definitions
+    outputs = {'outputFile': os.path.join(output_dir, EXECUTOR_OUTPUT_FILE)}
+    if output_definitions.parameters:
+        outputs['parameters'] = {
+            name: {
+                'outputFile': os.path.join(output_dir, name)
+            } for name in output_definitions.parameters
+        }
+    if output_definitions.artifacts:
+        outputs['artifacts'] = {
+            name: {
+                'artifacts': [
+                    make_runtime_artifact(
+                        name=name,
+                        artifact_type=artifact_spec.artifact_type,
+                        uri=os.path.join(output_dir, name))
+                ]
+            } for name, artifact_spec in output_definitions.artifacts.items()
+        }
+    return {'inputs': inputs, 'outputs': outputs}
+
+
+def read_executor_output(
+    component_spec: pipeline_spec_pb2.ComponentSpec,
+    executor_input: Dict[str, Any],
+) -> Tuple[Dict[str, Any], Dict[str, List[Dict[str, Any]]]]:
+    """Collects the outputs of an executed task.
+
+    Like the launcher in a cluster, reads the output parameters from the
+    ExecutorOutput, if the executor wrote one, and otherwise from the
+    output files of the parameters.
+
+    Args:
+        component_spec: The ComponentSpec of the task.
+        executor_input: The ExecutorInput of the task.
+
+    Returns:
+        A tuple of the values of the output parameters, and the lists of
+        RuntimeArtifacts of the output artifacts.
+
+    Raises:
+        ValueError: If the task did not write an output parameter.
+    """
+    outputs = executor_input['outputs']
+    executor_output = {}
+    if os.path.exists(outputs['outputFile']):
+        with open(outputs['outputFile']) as f:
+            executor_output = json.load(f)
+
+    parameter_values = {}
+    written_values = executor_output.get('parameterValues', {})
+    for name, parameter_spec in component_spec.output_definitions.parameters.items(
+    ):
+        if name in written_values:
+            value = written_values[name]
+        else:
+            output_file = outputs['parameters'][name]['outputFile']
+            if not os.path.exists(output_file):
+                raise ValueError(f'Output parameter {name!r} was not written.')
+            with open(output_file) as f:
+                value = f.read()
+        parameter_values[name] = cast_parameter_value(
+            value, parameter_spec.parameter_type)
+
+    artifacts = {}
+    written_artifacts = executor_output.get('artifacts', {})
+    for name, artifact_list in outputs.get('artifacts', {}).items():
+        declared_artifact = artifact_list['artifacts'][0]
+        written_list = written_artifacts.get(name, {}).get('artifacts')
+        if not written_list:
+            artifacts[name] = [declared_artifact]
+            continue
+        artifacts[name] = [{
+            **declared_artifact,
+            **written_artifact,
+            'type': declared_artifact['type'],
+        } for written_artifact in written_list]
+    return parameter_values, artifacts
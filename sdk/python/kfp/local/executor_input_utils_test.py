@@ -0,0 +1,175 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import tempfile
+import unittest
+
+from absl.testing import parameterized
+from kfp import dsl
+from kfp.local import executor_input_utils
+from kfp.pipeline_spec import pipeline_spec_pb2
+
+_ParameterType = pipeline_spec_pb2.ParameterType
+
+
+@dsl.container_component
+def my_component(
+        text: str,
+        dataset: dsl.Input[dsl.Dataset],
+        model: dsl.Output[dsl.Model],
+        result: dsl.OutputPath(int),
+        number: int = 3,
+):
+    return dsl.ContainerSpec(image='alpine', command=['true'])
+
+
+def _get_component_spec() -> pipeline_spec_pb2.ComponentSpec:
+    pipeline_spec = my_component.pipeline_spec
+    return pipeline_spec.components[
+        pipeline_spec.root.dag.tasks['my-component'].component_ref.name]
+
+
+class TestCastParameterValue(parameterized.TestCase):
+
+    @parameterized.parameters(
+        ('1', _ParameterType.NUMBER_INTEGER, 1),
+        ('1.0', _ParameterType.NUMBER_INTEGER, 1),
+        ('1.5', _ParameterType.NUMBER_DOUBLE, 1.5),
+        ('True', _ParameterType.BOOLEAN, True),
+        ('false', _ParameterType.BOOLEAN, False),
+        ('[1, 2]', _ParameterType.LIST, [1, 2]),
+        ('{"a": 1}', _ParameterType.STRUCT, {
+            'a': 1
+        }),
+        ({
+            'a': 1
+        }, _ParameterType.STRING, '{"a": 1}'),
+        ('text', _ParameterType.STRING, 'text'),
+    )
+    def test_cast_parameter_value(self, value, parameter_type, expected):
+        self.assertEqual(
+            executor_input_utils.cast_parameter_value(value, parameter_type),
+            expected)
+
+
+class TestResolveInputParameterValues(unittest.TestCase):
+
+    def test_default_values(self):
+        self.assertEqual(
+            executor_input_utils.resolve_input_parameter_values(
+                _get_component_spec(), {'text': 'hello'}), {
+                    'text': 'hello',
+                    'number': 3
+                })
+
+    def test_missing_input(self):
+        with self.assertRaisesRegex(ValueError, 'Missing required input'):
+            executor_input_utils.resolve_input_parameter_values(
+                _get_component_spec(), {})
+
+    def test_unknown_input(self):
+        with self.assertRaisesRegex(ValueError, 'Unknown input'):
+            executor_input_utils.resolve_input_parameter_values(
+                _get_component_spec(), {
+                    'text': 'hello',
+                    'other': 1
+                })
+
+
+class TestExecutorInputAndOutput(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.dataset = executor_input_utils.make_runtime_artifact(
+            name='dataset',
+            artifact_type=pipeline_spec_pb2.ArtifactTypeSchema(
+                schema_title='system.Dataset'),
+            uri='/tmp/dataset')
+        self.executor_input = executor_input_utils.construct_executor_input(
+            _get_component_spec(), {'text': 'hello'},
+            {'dataset': [self.dataset]}, self.tmpdir.name)
+
+    def test_construct_executor_input(self):
+        self.assertEqual(
+            self.executor_input['inputs'], {
+                'parameterValues': {
+                    'text': 'hello'
+                },
+                'artifacts': {
+                    'dataset': {
+                        'artifacts': [self.dataset]
+                    }
+                },
+            })
+        outputs = self.executor_input['outputs']
+        self.assertEqual(outputs['outputFile'],
+                         os.path.join(self.tmpdir.name, 'executor_output.json'))
+        self.assertEqual(outputs['parameters']['result']['outputFile'],
+                         os.path.join(self.tmpdir.name, 'result'))
+        self.assertEqual(outputs['artifacts']['model']['artifacts'][0]['uri'],
+                         os.path.join(self.tmpdir.name, 'model'))
+
+    def test_read_output_files(self):
+        with open(os.path.join(self.tmpdir.name, 'result'), 'w') as f:
+            f.write('7')
+
+        parameters, artifacts = executor_input_utils.read_executor_output(
+            _get_component_spec(), self.executor_input)
+
+        self.assertEqual(parameters, {'result': 7})
+        self.assertEqual(artifacts['model'][0]['uri'],
+                         os.path.join(self.tmpdir.name, 'model'))
+
+    def test_read_executor_output(self):
+        with open(
+                os.path.join(self.tmpdir.name,
+                             executor_input_utils.EXECUTOR_OUTPUT_FILE),
+                'w') as f:
+            json.dump(
+                {
+                    'parameterValues': {
+                        'result': 8
+                    },
+                    'artifacts': {
+                        'model': {
+                            'artifacts': [{
+                                'uri': '/tmp/model',
+                                'metadata': {
+                                    'accuracy': 0.9
+                                }
+                            }]
+                        }
+                    },
+                }, f)
+
+        parameters, artifacts = executor_input_utils.read_executor_output(
+            _get_component_spec(), self.executor_input)
+
+        self.assertEqual(parameters, {'result': 8})
+        self.assertEqual(artifacts['model'][0]['uri'], '/tmp/model')
+        self.assertEqual(artifacts['model'][0]['metadata'], {'accuracy': 0.9})
+        self.assertEqual(artifacts['model'][0]['type']['schemaTitle'],
+                         'system.Model')
+
+    def test_output_parameter_not_written(self):
+        with self.assertRaisesRegex(ValueError, 'was not written'):
+            executor_input_utils.read_executor_output(_get_component_spec(),
+                                                      self.executor_input)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,814 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Local execution of compiled pipelines."""
+
+import ast
+import collections
+from concurrent import futures
+import dataclasses
+import datetime
+import json
+import logging
+import operator
+import os
+import re
+import sys
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Union
+import uuid
+
+from google.protobuf import json_format
+from kfp.components import base_component
+from kfp.components import executor as component_executor
+from kfp.components import yaml_component
+from kfp.local import cache
+from kfp.local import executor_input_utils
+from kfp.local import placeholder_utils
+from kfp.local import task_runners
+from kfp.pipeline_spec import pipeline_spec_pb2
+
+SUCCEEDED = 'SUCCEEDED'
+FAILED = 'FAILED'
+SKIPPED = 'SKIPPED'
+# State of tasks that are not run because an upstream task failed. Such
+# tasks are not reported in the results of a run.
+_NOT_TRIGGERED = 'NOT_TRIGGERED'
+
+_DEFAULT_PIPELINE_ROOT = 'local_outputs'
+# Name of the directory, in the pipeline root, of the default execution cache.
+_DEFAULT_CACHE_DIR = '.cache'
+# Name of the file, in the output directory of a task, with the logs of its
+# container.
+_TASK_LOG_FILE = 'task.log'
+
+_PARAMETER_EXPRESSION_SELECTOR_PATTERN = re.compile(
+    r'^parseJson\(string_value\)\["([^"]*)"\]$')
+
+_COMPARISON_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+
+_TriggerStrategy = pipeline_spec_pb2.PipelineTaskSpec.TriggerPolicy.TriggerStrategy
+
+
+@dataclasses.dataclass
+class TaskResult:
+    """The result of a task of a local pipeline run.
+
+    Attributes:
+        name: Name of the task. Tasks in sub-DAGs are named by the path of DAG tasks, joined by ``.``, with the index of the iteration of ``ParallelFor`` loops in brackets, for example ``for-loop-2[0].train``.
+        state: One of ``SUCCEEDED``, ``FAILED`` or ``SKIPPED``.
+        outputs: Output parameter values and artifacts, by output name. Outputs collected from ``ParallelFor`` loops are lists.
+        error: The error, if the task failed.
+        cached: Whether the outputs of the task were taken from the execution cache.
+    """
+    name: str
+    state: str
+    outputs: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    error: Optional[Exception] = None
+    cached: bool = False
+
+
+@dataclasses.dataclass
+class LocalRunResult:
+    """The result of a local pipeline run.
+
+    Attributes:
+        run_name: Name of the run. The outputs of the run are stored in the directory of this name in the pipeline root.
+        state: One of ``SUCCEEDED`` or ``FAILED``.
+        outputs: Output parameter values and artifacts of the pipeline, by output name.
+        tasks: Results of the tasks that were run or skipped, by task name.
+    """
+    run_name: str
+    state: str
+    outputs: Dict[str, Any]
+    tasks: Dict[str, TaskResult]
+
+
+class LocalRunner:
+    """Runs pipelines on the local machine, without a cluster.
+
+    Tasks whose upstream tasks have completed are run concurrently,
+    including the iterations of ``ParallelFor`` loops, up to their
+    ``parallelism``. Inputs and outputs are passed to and from the
+    containers of tasks through the same ExecutorInput and
+    ExecutorOutput contract as in a cluster, and artifacts are stored on
+    the local filesystem.
+
+    The outputs of tasks are cached: a task with the same component,
+    container and inputs as a task that succeeded before reuses its
+    outputs instead of running again, unless caching is disabled for the
+    task with ``set_caching_options``, for the run, or for the runner.
+
+    Args:
+        pipeline_root: Local directory in which to store the outputs of pipeline runs. Defaults to ``local_outputs`` in the working directory.
+        task_runner: Runs the containers of tasks. Defaults to a ``SubprocessRunner``.
+        max_workers: Maximum number of containers run concurrently. Defaults to the number of CPUs.
+        execution_cache: Cache of the outputs of tasks. Defaults to an ``ExecutionCache`` in the ``.cache`` directory of the pipeline root, without limits.
+        enable_caching: Whether or not to enable caching for the runs of this runner. If ``False``, no execution cache is used, and outputs of tasks are neither read from nor written to the cache.
+
+    Example:
+      ::
+
+        runner = LocalRunner(task_runner=DockerRunner())
+        result = runner.run(my_pipeline, arguments={'lr': 0.1})
+        print(result.state, result.outputs)
+    """
+
+    def __init__(
+        self,
+        pipeline_root: str = _DEFAULT_PIPELINE_ROOT,
+        task_runner: Optional[task_runners.TaskRunner] = None,
+        max_workers: Optional[int] = None,
+        execution_cache: Optional[cache.ExecutionCache] = None,
+        enable_caching: bool = True,
+    ) -> None:
+        if execution_cache is not None and not enable_caching:
+            raise ValueError(
+                'An execution_cache cannot be used with enable_caching=False.')
+        self._pipeline_root = os.path.abspath(pipeline_root)
+        self._task_runner = task_runner or task_runners.SubprocessRunner()
+        self._max_workers = max_workers or os.cpu_count()
+        self._execution_cache = None
+        if enable_caching:
+            self._execution_cache = execution_cache or cache.ExecutionCache(
+                os.path.join(self._pipeline_root, _DEFAULT_CACHE_DIR))
+
+    def run(
+        self,
+        pipeline: Union[base_component.BaseComponent,
+                        pipeline_spec_pb2.PipelineSpec, str],
+        arguments: Optional[Dict[str, Any]] = None,
+        enable_caching: Optional[bool] = None,
+    ) -> LocalRunResult:
+        """Runs a pipeline to completion.
+
+        Args:
+            pipeline: The pipeline, as a pipeline function, a component, which is run as a single-task pipeline, a ``PipelineSpec``, or the path of a compiled pipeline.
+            arguments: Arguments to the pipeline, by input name.
+            enable_caching: Whether or not to enable caching for the
+                run. If not set, defaults to the compile-time settings, which
+                is ``True`` for all tasks by default. If set, the
+                setting applies to all tasks in the pipeline (overrides the
+                compile time settings). Cannot be ``True`` if caching is
+                disabled for the runner.
+
+        Returns:
+            ``LocalRunResult`` object.
+        """
+        if self._execution_cache is None:
+            if enable_caching:
+                raise ValueError(
+                    'Caching cannot be enabled for a run of a LocalRunner created with enable_caching=False.'
+                )
+            enable_caching = False
+        if isinstance(pipeline, str):
+            pipeline = yaml_component.load_component_from_file(pipeline)
+        if isinstance(pipeline, base_component.BaseComponent):
+            pipeline = pipeline.pipeline_spec
+
+        create_time = datetime.datetime.now(datetime.timezone.utc)
+        run_name = f'{pipeline.pipeline_info.name}-{create_time.strftime("%Y%m%d%H%M%S%f")}'
+        with futures.ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix='kfp-local') as executor:
+            pipeline_run = _PipelineRun(
+                pipeline_spec=pipeline,
+                run_name=run_name,
+                create_time=create_time,
+                pipeline_root=self._pipeline_root,
+                task_runner=self._task_runner,
+                executor=executor,
+                execution_cache=self._execution_cache,
+                enable_caching=enable_caching,
+            )
+            return pipeline_run.execute(arguments or {})
+
+
+@dataclasses.dataclass
+class _TaskOutputs:
+    parameters: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    artifacts: Dict[str,
+                    List[Dict[str,
+                              Any]]] = dataclasses.field(default_factory=dict)
+    cached: bool = False
+
+
+class _DagExecution:
+    """The state of the execution of a DAG component.
+
+    Args:
+        component_spec: The ComponentSpec of the DAG.
+        parameter_values: Values of the input parameters of the DAG.
+        artifacts: Input artifacts of the DAG.
+        name_prefix: Prefix of the names of the tasks of the DAG.
+        output_dir: Directory for the outputs of the tasks of the DAG.
+        on_complete: Called with the DAG execution when all its tasks have completed.
+    """
+
+    def __init__(
+        self,
+        component_spec: pipeline_spec_pb2.ComponentSpec,
+        parameter_values: Dict[str, Any],
+        artifacts: Dict[str, List[Dict[str, Any]]],
+        name_prefix: str,
+        output_dir: str,
+        on_complete: Callable[['_DagExecution'], None],
+    ) -> None:
+        self.component_spec = component_spec
+        self.parameter_values = parameter_values
+        self.artifacts = artifacts
+        self.name_prefix = name_prefix
+        self.output_dir = output_dir
+        self.on_complete = on_complete
+        self.task_states: Dict[str, str] = {}
+        self.task_outputs: Dict[str, _TaskOutputs] = {}
+        self.task_errors: Dict[str, Exception] = {}
+        self.running_tasks: Set[str] = set()
+        self.state: Optional[str] = None
+        self.outputs = _TaskOutputs()
+
+    @property
+    def tasks(self) -> Dict[str, pipeline_spec_pb2.PipelineTaskSpec]:
+        return self.component_spec.dag.tasks
+
+
+class _PipelineRun:
+    """Executes the DAGs of a pipeline run.
+
+    All state is updated by the thread that calls ``execute``; only the
+    containers of tasks are run by the worker threads of ``executor``.
+    """
+
+    def __init__(
+        self,
+        pipeline_spec: pipeline_spec_pb2.PipelineSpec,
+        run_name: str,
+        create_time: datetime.datetime,
+        pipeline_root: str,
+        task_runner: task_runners.TaskRunner,
+        executor: futures.Executor,
+        execution_cache: cache.ExecutionCache,
+        enable_caching: Optional[bool],
+    ) -> None:
+        self._pipeline_spec = pipeline_spec
+        self._deployment_config = json_format.ParseDict(
+            json_format.MessageToDict(pipeline_spec.deployment_spec),
+            pipeline_spec_pb2.PipelineDeploymentConfig())
+        self._run_name = run_name
+        self._run_id = str(uuid.uuid4())
+        self._create_time = create_time.isoformat()
+        self._pipeline_root = pipeline_root
+        self._task_runner = task_runner
+        self._executor = executor
+        self._execution_cache = execution_cache
+        self._enable_caching = enable_caching
+        self._task_results: Dict[str, TaskResult] = {}
+        self._futures: Dict[futures.Future, Callable[[futures.Future],
+                                                     None]] = {}
+        self._dags_to_schedule: Deque[_DagExecution] = collections.deque()
+
+    def execute(self, arguments: Dict[str, Any]) -> LocalRunResult:
+        root = _DagExecution(
+            component_spec=self._pipeline_spec.root,
+            parameter_values=executor_input_utils
+            .resolve_input_parameter_values(self._pipeline_spec.root,
+                                            arguments),
+            artifacts={},
+            name_prefix='',
+            output_dir=os.path.join(self._pipeline_root, self._run_name),
+            on_complete=lambda dag: None,
+        )
+        logging.info(f'Starting local run {self._run_name}.')
+        self._dags_to_schedule.append(root)
+        while True:
+            while self._dags_to_schedule:
+                self._schedule(self._dags_to_schedule.popleft())
+            if not self._futures:
+                break
+            done, _ = futures.wait(
+                list(self._futures), return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                self._futures.pop(future)(future)
+
+        logging.info(f'Local run {self._run_name} {root.state.lower()}.')
+        return LocalRunResult(
+            run_name=self._run_name,
+            state=root.state,
+            outputs=_to_public_outputs(root.outputs, self._pipeline_spec.root),
+            tasks=self._task_results,
+        )
+
+    def _schedule(self, dag: _DagExecution) -> None:
+        """Starts the tasks of a DAG that are ready, and completes the DAG if
+        no task is running."""
+        if dag.state is not None:
+            return
+        changed = True
+        while changed:
+            changed = False
+            for task_name, task_spec in dag.tasks.items():
+                if (task_name in dag.task_states or
+                        task_name in dag.running_tasks):
+                    continue
+                upstream_states = [
+                    dag.task_states.get(upstream_task)
+                    for upstream_task in task_spec.dependent_tasks
+                ]
+                if None in upstream_states:
+                    continue
+                changed = True
+                if (task_spec.trigger_policy.strategy
+                        == _TriggerStrategy.ALL_UPSTREAM_TASKS_COMPLETED or all(
+                            state in (SUCCEEDED, SKIPPED)
+                            for state in upstream_states)):
+                    self._start_task(dag, task_name, task_spec)
+                else:
+                    dag.task_states[task_name] = _NOT_TRIGGERED
+
+        if dag.running_tasks:
+            return
+        dag.state = FAILED if FAILED in dag.task_states.values() else SUCCEEDED
+        if dag.state == SUCCEEDED:
+            dag.outputs = _collect_dag_outputs(dag)
+        dag.on_complete(dag)
+
+    def _start_task(
+        self,
+        dag: _DagExecution,
+        task_name: str,
+        task_spec: pipeline_spec_pb2.PipelineTaskSpec,
+    ) -> None:
+        dag.running_tasks.add(task_name)
+        full_task_name = dag.name_prefix + task_name
+        output_dir = os.path.join(dag.output_dir, task_name)
+        component_spec = self._pipeline_spec.components[
+            task_spec.component_ref.name]
+        try:
+            parameter_values = self._resolve_task_parameters(
+                dag, task_spec, full_task_name)
+            artifacts = _resolve_task_artifacts(dag, task_spec)
+            if task_spec.trigger_policy.condition and not _evaluate_condition(
+                    task_spec.trigger_policy.condition, parameter_values):
+                self._complete_task(dag, task_name, SKIPPED)
+                return
+
+            if task_spec.HasField('parameter_iterator'):
+                self._start_loop(dag, task_name, task_spec, component_spec,
+                                 parameter_values, artifacts, output_dir)
+                return
+            if task_spec.HasField('artifact_iterator'):
+                raise NotImplementedError(
+                    'Iterating over artifacts is not supported in local execution.'
+                )
+            parameter_values = executor_input_utils.resolve_input_parameter_values(
+                component_spec, parameter_values)
+
+            if component_spec.HasField('dag'):
+                self._start_dag(
+                    component_spec=component_spec,
+                    parameter_values=parameter_values,
+                    artifacts=artifacts,
+                    name_prefix=f'{full_task_name}.',
+                    output_dir=output_dir,
+                    on_complete=lambda child: self._complete_task(
+                        dag, task_name, child.state, child.outputs))
+                return
+
+            executor_spec = self._deployment_config.executors[
+                component_spec.executor_label]
+            if executor_spec.HasField('importer'):
+                outputs = self._run_importer(full_task_name, component_spec,
+                                             executor_spec.importer,
+                                             parameter_values, output_dir)
+                self._complete_task(dag, task_name, SUCCEEDED, outputs)
+            elif executor_spec.HasField('container'):
+                logging.info(f'Task {full_task_name} started.')
+                future = self._executor.submit(
+                    self._run_container_task,
+                    full_task_name=full_task_name,
+                    component_spec=component_spec,
+                    container_spec=executor_spec.container,
+                    parameter_values=parameter_values,
+                    artifacts=artifacts,
+                    output_dir=output_dir,
+                    max_retry_count=task_spec.retry_policy.max_retry_count,
+                    enable_cache=task_spec.caching_options.enable_cache
+                    if self._enable_caching is None else self._enable_caching,
+                )
+                self._futures[future] = lambda future: self._complete_task(
+                    dag, task_name, *_get_future_outcome(future))
+            else:
+                raise NotImplementedError(
+                    f'The executor of task {full_task_name} is not supported in local execution.'
+                )
+        except Exception as e:
+            self._complete_task(dag, task_name, FAILED, error=e)
+
+    def _complete_task(
+        self,
+        dag: _DagExecution,
+        task_name: str,
+        state: str,
+        outputs: Optional[_TaskOutputs] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        full_task_name = dag.name_prefix + task_name
+        dag.running_tasks.discard(task_name)
+        dag.task_states[task_name] = state
+        dag.task_outputs[task_name] = outputs or _TaskOutputs()
+        if error is not None:
+            dag.task_errors[task_name] = error
+            logging.error(f'Task {full_task_name} failed: {error}')
+        else:
+            cached = ' (cached)' if dag.task_outputs[task_name].cached else ''
+            logging.info(f'Task {full_task_name} {state.lower()}{cached}.')
+
+        component_spec = self._pipeline_spec.components[
+            dag.tasks[task_name].component_ref.name]
+        self._task_results[full_task_name] = TaskResult(
+            name=full_task_name,
+            state=state,
+            outputs=_to_public_outputs(dag.task_outputs[task_name],
+                                       component_spec),
+            error=error,
+            cached=dag.task_outputs[task_name].cached,
+        )
+        self._dags_to_schedule.append(dag)
+
+    def _start_dag(self, **kwargs) -> _DagExecution:
+        dag = _DagExecution(**kwargs)
+        self._dags_to_schedule.append(dag)
+        return dag
+
+    def _start_loop(
+        self,
+        dag: _DagExecution,
+        task_name: str,
+        task_spec: pipeline_spec_pb2.PipelineTaskSpec,
+        component_spec: pipeline_spec_pb2.ComponentSpec,
+        parameter_values: Dict[str, Any],
+        artifacts: Dict[str, List[Dict[str, Any]]],
+        output_dir: str,
+    ) -> None:
+        """Starts the iterations of a ParallelFor loop, at most
+        ``parallelism`` at a time, and completes the loop task with the
+        outputs of all iterations collected into lists."""
+        iterator = task_spec.parameter_iterator
+        if iterator.items.HasField('raw'):
+            items = json.loads(iterator.items.raw)
+        else:
+            items = parameter_values[iterator.items.input_parameter]
+            if isinstance(items, str):
+                items = json.loads(items)
+        parallelism = task_spec.iterator_policy.parallelism_limit or len(items)
+        full_task_name = dag.name_prefix + task_name
+        iterations: List[Optional[_DagExecution]] = [None] * len(items)
+
+        def start_iteration(index: int) -> None:
+            iterations[index] = self._start_dag(
+                component_spec=component_spec,
+                parameter_values=executor_input_utils
+                .resolve_input_parameter_values(component_spec, {
+                    **parameter_values, iterator.item_input: items[index]
+                }),
+                artifacts=artifacts,
+                name_prefix=f'{full_task_name}[{index}].',
+                output_dir=os.path.join(output_dir, str(index)),
+                on_complete=on_iteration_complete)
+
+        def on_iteration_complete(iteration: _DagExecution) -> None:
+            num_started = sum(iteration is not None for iteration in iterations)
+            if num_started < len(items):
+                start_iteration(num_started)
+            elif all(iteration.state is not None for iteration in iterations):
+                complete_loop()
+
+        def complete_loop() -> None:
+            if any(iteration.state == FAILED for iteration in iterations):
+                self._complete_task(dag, task_name, FAILED)
+                return
+            outputs = _TaskOutputs()
+            for name in component_spec.output_definitions.parameters:
+                outputs.parameters[name] = [
+                    iteration.outputs.parameters.get(name)
+                    for iteration in iterations
+                ]
+            for name in component_spec.output_definitions.artifacts:
+                outputs.artifacts[name] = [
+                    artifact for iteration in iterations
+                    for artifact in iteration.outputs.artifacts.get(name, [])
+                ]
+            self._complete_task(dag, task_name, SUCCEEDED, outputs)
+
+        if not items:
+            complete_loop()
+            return
+        for index in range(min(parallelism, len(items))):
+            start_iteration(index)
+
+    def _resolve_task_parameters(
+        self,
+        dag: _DagExecution,
+        task_spec: pipeline_spec_pb2.PipelineTaskSpec,
+        full_task_name: str,
+    ) -> Dict[str, Any]:
+        parameter_values = {}
+        for name, input_spec in task_spec.inputs.parameters.items():
+            kind = input_spec.WhichOneof('kind')
+            if kind == 'component_input_parameter':
+                if input_spec.component_input_parameter not in dag.parameter_values:
+                    continue
+                value = dag.parameter_values[
+                    input_spec.component_input_parameter]
+            elif kind == 'task_output_parameter':
+                producer = input_spec.task_output_parameter
+                value = dag.task_outputs[producer.producer_task].parameters[
+                    producer.output_parameter_key]
+            elif kind == 'runtime_value':
+                value = json_format.MessageToDict(
+                    input_spec.runtime_value.constant)
+                if isinstance(value, str):
+                    value = placeholder_utils.resolve_string(
+                        value, {}, self._make_pipeline_context(full_task_name))
+            elif kind == 'task_final_status':
+                producer_task = input_spec.task_final_status.producer_task
+                error = dag.task_errors.get(producer_task)
+                value = {
+                    'state': dag.task_states[producer_task],
+                    'pipelineJobResourceName': self._run_name,
+                    'pipelineTaskName': dag.name_prefix + producer_task,
+                    'error': {
+                        'message': str(error)
+                    } if error is not None else {},
+                }
+            else:
+                raise ValueError(
+                    f'Unknown input {name!r} of task {full_task_name}.')
+
+            if input_spec.parameter_expression_selector:
+                value = _select_parameter_value(
+                    value, input_spec.parameter_expression_selector)
+            parameter_values[name] = value
+        return parameter_values
+
+    def _make_pipeline_context(
+            self, full_task_name: str) -> placeholder_utils.PipelineContext:
+        return placeholder_utils.PipelineContext(
+            pipeline_job_name=self._run_name,
+            pipeline_job_uuid=self._run_id,
+            pipeline_task_name=full_task_name,
+            pipeline_task_uuid=str(uuid.uuid4()),
+            pipeline_root=self._pipeline_root,
+            create_time_utc=self._create_time,
+        )
+
+    def _run_importer(
+        self,
+        full_task_name: str,
+        component_spec: pipeline_spec_pb2.ComponentSpec,
+        importer_spec: pipeline_spec_pb2.PipelineDeploymentConfig.ImporterSpec,
+        parameter_values: Dict[str, Any],
+        output_dir: str,
+    ) -> _TaskOutputs:
+        if importer_spec.artifact_uri.HasField('runtime_parameter'):
+            uri = parameter_values[importer_spec.artifact_uri.runtime_parameter]
+        else:
+            uri = json_format.MessageToDict(importer_spec.artifact_uri.constant)
+        executor_input = executor_input_utils.construct_executor_input(
+            component_spec, parameter_values, {}, output_dir)
+        pipeline_context = self._make_pipeline_context(full_task_name)
+        metadata = json.loads(
+            placeholder_utils.resolve_string(
+                json.dumps(json_format.MessageToDict(importer_spec.metadata)),
+                executor_input, pipeline_context))
+        output_name = next(iter(component_spec.output_definitions.artifacts))
+        return _TaskOutputs(
+            artifacts={
+                output_name: [
+                    executor_input_utils.make_runtime_artifact(
+                        name=output_name,
+                        artifact_type=importer_spec.type_schema,
+                        uri=uri,
+                        metadata=metadata)
+                ]
+            })
+
+    def _run_container_task(
+        self,
+        full_task_name: str,
+        component_spec: pipeline_spec_pb2.ComponentSpec,
+        container_spec: pipeline_spec_pb2.PipelineDeploymentConfig
+        .PipelineContainerSpec,
+        parameter_values: Dict[str, Any],
+        artifacts: Dict[str, List[Dict[str, Any]]],
+        output_dir: str,
+        max_retry_count: int,
+        enable_cache: bool,
+    ) -> _TaskOutputs:
+        """Runs the container of a task, in a worker thread, or takes its
+        outputs from the execution cache."""
+        os.makedirs(output_dir, exist_ok=True)
+        executor_input = executor_input_utils.construct_executor_input(
+            component_spec, parameter_values, artifacts, output_dir)
+        pipeline_context = self._make_pipeline_context(full_task_name)
+        command = placeholder_utils.resolve_command_line(
+            list(container_spec.command), executor_input, pipeline_context)
+        args = placeholder_utils.resolve_command_line(
+            list(container_spec.args), executor_input, pipeline_context)
+        env = {
+            env_var.name:
+            placeholder_utils.resolve_string(env_var.value, executor_input,
+                                             pipeline_context)
+            for env_var in container_spec.env
+        }
+        if enable_cache:
+            fingerprint = cache.compute_fingerprint(component_spec,
+                                                    container_spec,
+                                                    executor_input)
+            cached_outputs = self._execution_cache.get(fingerprint, output_dir)
+            if cached_outputs is not None:
+                parameters, artifacts = cached_outputs
+                return _TaskOutputs(
+                    parameters=parameters, artifacts=artifacts, cached=True)
+        for attempt in range(max_retry_count + 1):
+            try:
+                self._task_runner.run(
+                    image=container_spec.image,
+                    command=command,
+                    args=args,
+                    env=env,
+                    mount_dir=self._pipeline_root,
+                    log_file=os.path.join(output_dir, _TASK_LOG_FILE),
+                )
+                break
+            except RuntimeError as e:
+                if attempt == max_retry_count:
+                    raise
+                logging.warning(f'Task {full_task_name} failed, retrying: {e}')
+        parameters, artifacts = executor_input_utils.read_executor_output(
+            component_spec, executor_input)
+        if enable_cache:
+            self._execution_cache.put(fingerprint, output_dir, parameters,
+                                      artifacts)
+        return _TaskOutputs(parameters=parameters, artifacts=artifacts)
+
+
+def _get_future_outcome(future: futures.Future) -> tuple:
+    try:
+        return SUCCEEDED, future.result()
+    except Exception as e:
+        return FAILED, None, e
+
+
+def _resolve_task_artifacts(
+    dag: _DagExecution,
+    task_spec: pipeline_spec_pb2.PipelineTaskSpec,
+) -> Dict[str, List[Dict[str, Any]]]:
+    artifacts = {}
+    for name, input_spec in task_spec.inputs.artifacts.items():
+        if input_spec.HasField('component_input_artifact'):
+            if input_spec.component_input_artifact not in dag.artifacts:
+                continue
+            artifacts[name] = dag.artifacts[input_spec.component_input_artifact]
+        else:
+            producer = input_spec.task_output_artifact
+            artifacts[name] = dag.task_outputs[
+                producer.producer_task].artifacts[producer.output_artifact_key]
+    return artifacts
+
+
+def _collect_dag_outputs(dag: _DagExecution) -> _TaskOutputs:
+    outputs = _TaskOutputs()
+    dag_outputs = dag.component_spec.dag.outputs
+    for name, output_spec in dag_outputs.parameters.items():
+        if not output_spec.HasField('value_from_parameter'):
+            raise NotImplementedError(
+                f'Output {name!r} of DAG {dag.name_prefix} is not supported in local execution.'
+            )
+        selector = output_spec.value_from_parameter
+        producer_outputs = dag.task_outputs.get(selector.producer_subtask)
+        if (producer_outputs is not None and
+                selector.output_parameter_key in producer_outputs.parameters):
+            outputs.parameters[name] = producer_outputs.parameters[
+                selector.output_parameter_key]
+    for name, output_spec in dag_outputs.artifacts.items():
+        outputs.artifacts[name] = [
+            artifact for selector in output_spec.artifact_selectors
+            for artifact in dag.task_outputs.get(
+                selector.producer_subtask, _TaskOutputs()).artifacts.get(
+                    selector.output_artifact_key, [])
+        ]
+    return outputs
+
+
+def _to_public_outputs(
+    outputs: _TaskOutputs,
+    component_spec: pipeline_spec_pb2.ComponentSpec,
+) -> Dict[str, Any]:
+    public_outputs = dict(outputs.parameters)
+    for name, artifact_list in outputs.artifacts.items():
+        artifact_objects = [
+            component_executor.create_artifact_instance(artifact)
+            for artifact in artifact_list
+        ]
+        artifact_spec = component_spec.output_definitions.artifacts.get(name)
+        if artifact_spec is not None and not artifact_spec.is_artifact_list and len(
+                artifact_objects) == 1:
+            public_outputs[name] = artifact_objects[0]
+        else:
+            public_outputs[name] = artifact_objects
+    return public_outputs
+
+
+def _select_parameter_value(value: Any, selector: str) -> Any:
+    match = _PARAMETER_EXPRESSION_SELECTOR_PATTERN.match(selector)
+    if match is None:
+        raise NotImplementedError(
+            f'Parameter expression selector {selector!r} is not supported in local execution.'
+        )
+    if isinstance(value, str):
+        value = json.loads(value)
+    return value[match.group(1)]
+
+
+def _evaluate_condition(condition: str, parameter_values: Dict[str,
+                                                               Any]) -> bool:
+    """Evaluates the condition of the trigger policy of a task.
+
+    Supports the subset of CEL produced by the compiler: a comparison of
+    two operands, each of which is an input parameter value, optionally
+    converted with ``int()`` or ``double()``, or a literal.
+    """
+    try:
+        expression = ast.parse(condition, mode='eval').body
+    except SyntaxError:
+        raise NotImplementedError(
+            f'Condition {condition!r} is not supported in local execution.')
+    if not (isinstance(expression, ast.Compare) and len(expression.ops) == 1 and
+            type(expression.ops[0]) in _COMPARISON_OPERATORS):
+        raise NotImplementedError(
+            f'Condition {condition!r} is not supported in local execution.')
+    left = _evaluate_operand(expression.left, condition, parameter_values)
+    right = _evaluate_operand(expression.comparators[0], condition,
+                              parameter_values)
+    return _COMPARISON_OPERATORS[type(expression.ops[0])](left, right)
+
+
+def _get_literal_field(node: ast.AST) -> Optional[str]:
+    """Returns the field that holds the value of a literal node, or None if
+    the node is not a literal."""
+    if isinstance(node, ast.Constant):
+        return 'value'
+    # before Python 3.8, literals are parsed as ast.Num, ast.Str and
+    # ast.NameConstant rather than ast.Constant
+    if sys.version_info < (3, 8):
+        for node_type, field in [('Num', 'n'), ('Str', 's'),
+                                 ('NameConstant', 'value')]:
+            if isinstance(node, getattr(ast, node_type)):
+                return field
+    return None
+
+
+def _evaluate_operand(node: ast.AST, condition: str,
+                      parameter_values: Dict[str, Any]) -> Any:
+    literal_field = _get_literal_field(node)
+    if literal_field is not None:
+        return getattr(node, literal_field)
+    if isinstance(node, ast.Name) and node.id in ('true', 'false'):
+        return node.id == 'true'
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return -_evaluate_operand(node.operand, condition, parameter_values)
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and
+            node.func.id in ('int', 'double') and len(node.args) == 1):
+        value = _evaluate_operand(node.args[0], condition, parameter_values)
+        return int(value) if node.func.id == 'int' else float(value)
+    if (isinstance(node, ast.Subscript) and
+            isinstance(node.value, ast.Attribute) and
+            isinstance(node.value.value, ast.Name) and
+            node.value.value.id == 'inputs' and
+            node.value.attr == 'parameter_values'):
+        key = node.slice
+        # before Python 3.9, subscripts are wrapped in ast.Index
+        if isinstance(key, getattr(ast, 'Index', ())):
+            key = key.value
+        literal_field = _get_literal_field(key)
+        if literal_field is not None:
+            return parameter_values[getattr(key, literal_field)]
+    raise NotImplementedError(
+        f'Condition {condition!r} is not supported in local execution.')
@@ -0,0 +1,232 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+from typing import List
+import unittest
+
+from absl.testing import parameterized
+from kfp import compiler
+from kfp import dsl
+from kfp.local import cache
+from kfp.local import pipeline_runner
+
+
+@dsl.container_component
+def double(x: int, output: dsl.OutputPath(int)):
+    return dsl.ContainerSpec(
+        image='alpine',
+        command=['sh', '-c', 'echo -n $(($0 * 2)) > $1'],
+        args=[x, output])
+
+
+@dsl.container_component
+def fail():
+    return dsl.ContainerSpec(image='alpine', command=['sh', '-c', 'exit 1'])
+
+
+@dsl.container_component
+def write_text(text: str, artifact: dsl.Output[dsl.Artifact]):
+    return dsl.ContainerSpec(
+        image='alpine',
+        command=['sh', '-c', 'mkdir -p $(dirname $1) && echo -n $0 > $1'],
+        args=[text, artifact.path])
+
+
+@dsl.component(install_kfp_package=False)
+def total(numbers: List[int]) -> int:
+    return sum(numbers)
+
+
+@dsl.component(install_kfp_package=False)
+def read_text(artifact: dsl.Input[dsl.Artifact]) -> str:
+    with open(artifact.path) as f:
+        return f.read()
+
+
+@dsl.component(install_kfp_package=False)
+def report_state(status: dsl.PipelineTaskFinalStatus) -> str:
+    return status.state
+
+
+class TestEvaluateCondition(parameterized.TestCase):
+
+    @parameterized.parameters(
+        ("int(inputs.parameter_values['x']) > 3", True),
+        ("int(inputs.parameter_values['x']) <= 3", False),
+        ("inputs.parameter_values['s'] == 'a'", True),
+        ("inputs.parameter_values['b'] == true", False),
+        ("double(inputs.parameter_values['x']) != -1.5", True),
+    )
+    def test_evaluate_condition(self, condition, expected):
+        self.assertEqual(
+            pipeline_runner._evaluate_condition(condition, {
+                'x': 4,
+                's': 'a',
+                'b': False
+            }), expected)
+
+    def test_unsupported_condition(self):
+        with self.assertRaises(NotImplementedError):
+            pipeline_runner._evaluate_condition('__import__("os")', {})
+
+
+class TestLocalRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.runner = pipeline_runner.LocalRunner(
+            pipeline_root=self.tmpdir.name)
+
+    def test_parallel_for_and_collected(self):
+
+        @dsl.pipeline(name='fan-out-fan-in')
+        def my_pipeline(numbers: List[int]) -> int:
+            with dsl.ParallelFor(numbers, parallelism=2) as number:
+                double_task = double(x=number)
+            return total(numbers=dsl.Collected(double_task.output)).output
+
+        result = self.runner.run(my_pipeline, arguments={'numbers': [1, 2, 3]})
+
+        self.assertEqual(result.state, pipeline_runner.SUCCEEDED)
+        self.assertEqual(result.outputs, {'Output': 12})
+        self.assertEqual(
+            [result.tasks[f'for-loop-1[{i}].double'].outputs for i in range(3)],
+            [{
+                'output': 2
+            }, {
+                'output': 4
+            }, {
+                'output': 6
+            }])
+        self.assertEqual(result.tasks['total'].outputs, {'Output': 12})
+
+    def test_artifacts_and_condition(self):
+
+        @dsl.pipeline(name='artifacts')
+        def my_pipeline(text: str):
+            write_task = write_text(text=text)
+            read_task = read_text(artifact=write_task.outputs['artifact'])
+            with dsl.Condition(read_task.output == 'skip'):
+                fail()
+
+        result = self.runner.run(my_pipeline, arguments={'text': 'hello'})
+
+        self.assertEqual(result.state, pipeline_runner.SUCCEEDED)
+        artifact = result.tasks['write-text'].outputs['artifact']
+        self.assertTrue(artifact.uri.startswith(self.tmpdir.name))
+        with open(artifact.path) as f:
+            self.assertEqual(f.read(), 'hello')
+        self.assertEqual(result.tasks['read-text'].outputs, {'Output': 'hello'})
+        self.assertEqual(result.tasks['condition-1'].state,
+                         pipeline_runner.SKIPPED)
+        self.assertNotIn('condition-1.fail', result.tasks)
+
+    def test_failed_task_and_exit_handler(self):
+
+        @dsl.pipeline(name='failure')
+        def my_pipeline():
+            exit_task = report_state()
+            with dsl.ExitHandler(exit_task):
+                fail_task = fail()
+                double(x=1).after(fail_task)
+
+        result = self.runner.run(my_pipeline)
+
+        self.assertEqual(result.state, pipeline_runner.FAILED)
+        fail_result = result.tasks['exit-handler-1.fail']
+        self.assertEqual(fail_result.state, pipeline_runner.FAILED)
+        self.assertIn('exited with code 1', str(fail_result.error))
+        self.assertNotIn('exit-handler-1.double', result.tasks)
+        self.assertEqual(result.tasks['report-state'].outputs,
+                         {'Output': 'FAILED'})
+
+    def test_cached_tasks(self):
+
+        @dsl.pipeline(name='cached')
+        def my_pipeline(text: str):
+            write_task = write_text(text=text)
+            read_text(artifact=write_task.outputs['artifact'])
+            double(x=1).set_caching_options(False)
+
+        first_result = self.runner.run(my_pipeline, arguments={'text': 'a'})
+        second_result = self.runner.run(my_pipeline, arguments={'text': 'a'})
+        third_result = self.runner.run(my_pipeline, arguments={'text': 'b'})
+
+        self.assertFalse(
+            any(task.cached for task in first_result.tasks.values()))
+        self.assertTrue(second_result.tasks['write-text'].cached)
+        self.assertTrue(second_result.tasks['read-text'].cached)
+        self.assertFalse(second_result.tasks['double'].cached)
+        self.assertEqual(second_result.tasks['read-text'].outputs,
+                         {'Output': 'a'})
+        artifact = second_result.tasks['write-text'].outputs['artifact']
+        self.assertIn(second_result.run_name, artifact.uri)
+        with open(artifact.path) as f:
+            self.assertEqual(f.read(), 'a')
+        self.assertFalse(
+            any(task.cached for task in third_result.tasks.values()))
+
+        uncached_result = self.runner.run(
+            my_pipeline, arguments={'text': 'a'}, enable_caching=False)
+        self.assertFalse(
+            any(task.cached for task in uncached_result.tasks.values()))
+
+    def test_caching_disabled_for_runner(self):
+
+        @dsl.pipeline(name='uncached')
+        def my_pipeline(text: str):
+            write_text(text=text)
+
+        runner = pipeline_runner.LocalRunner(
+            pipeline_root=self.tmpdir.name, enable_caching=False)
+        first_result = runner.run(my_pipeline, arguments={'text': 'a'})
+        second_result = runner.run(my_pipeline, arguments={'text': 'a'})
+
+        self.assertEqual(second_result.state, pipeline_runner.SUCCEEDED)
+        self.assertFalse(first_result.tasks['write-text'].cached)
+        self.assertFalse(second_result.tasks['write-text'].cached)
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(self.tmpdir.name,
+                             pipeline_runner._DEFAULT_CACHE_DIR)))
+        with self.assertRaisesRegex(ValueError, r'enable_caching=False'):
+            runner.run(
+                my_pipeline, arguments={'text': 'a'}, enable_caching=True)
+        with self.assertRaisesRegex(ValueError, r'enable_caching=False'):
+            pipeline_runner.LocalRunner(
+                execution_cache=cache.ExecutionCache(self.tmpdir.name),
+                enable_caching=False)
+
+    def test_run_compiled_pipeline(self):
+
+        @dsl.pipeline(name='compiled')
+        def my_pipeline(x: int = 2) -> int:
+            return double(x=x).output
+
+        package_path = os.path.join(self.tmpdir.name, 'pipeline.yaml')
+        compiler.Compiler().compile(my_pipeline, package_path)
+
+        result = self.runner.run(package_path)
+
+        self.assertEqual(result.state, pipeline_runner.SUCCEEDED)
+        self.assertEqual(result.outputs, {'Output': 4})
+        self.assertTrue(
+            os.path.isdir(os.path.join(self.tmpdir.name, result.run_name)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Resolution of the placeholders in container commands and arguments for
+local execution."""
+
+import dataclasses
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+_PLACEHOLDER_PATTERN = re.compile(r'\{\{\$(.*?)\}\}')
+_INPUT_OUTPUT_PLACEHOLDER_PATTERN = re.compile(
+    r"^\.(inputs|outputs)\.(parameters|artifacts)\['([^']*)'\]"
+    r"(?:\.(uri|path|output_file|metadata)(?:\['([^']*)'\])?)?$")
+
+
+@dataclasses.dataclass
+class PipelineContext:
+    """Values of the pipeline and task level placeholders.
+
+    Attributes:
+        pipeline_job_name: Name of the pipeline run.
+        pipeline_job_uuid: ID of the pipeline run.
+        pipeline_task_name: Name of the task.
+        pipeline_task_uuid: ID of the task.
+        pipeline_root: Root directory of the outputs of the pipeline.
+        create_time_utc: Time the pipeline run was created, in ISO 8601 format.
+    """
+    pipeline_job_name: str
+    pipeline_job_uuid: str
+    pipeline_task_name: str
+    pipeline_task_uuid: str
+    pipeline_root: str
+    create_time_utc: str
+
+    def get_value(self, name: str) -> Optional[str]:
+        return {
+            'pipeline_job_name': self.pipeline_job_name,
+            'pipeline_job_resource_name': self.pipeline_job_name,
+            'pipeline_job_uuid': self.pipeline_job_uuid,
+            'pipeline_task_name': self.pipeline_task_name,
+            'pipeline_task_uuid': self.pipeline_task_uuid,
+            'pipeline_root': self.pipeline_root,
+            'pipeline_job_create_time_utc': self.create_time_utc,
+            'pipeline_job_schedule_time_utc': self.create_time_utc,
+        }.get(name)
+
+
+def resolve_command_line(
+    elements: List[str],
+    executor_input: Dict[str, Any],
+    pipeline_context: PipelineContext,
+) -> List[str]:
+    """Resolves the placeholders in a container command or its arguments.
+
+    Args:
+        elements: The elements of the command or arguments, as in the
+            PipelineContainerSpec. Elements may be JSON-serialized
+            ``Concat`` or ``IfPresent`` placeholders.
+        executor_input: The ExecutorInput of the task, as a dictionary.
+        pipeline_context: The values of the pipeline and task level
+            placeholders.
+
+    Returns:
+        The resolved elements. An ``IfPresent`` placeholder may resolve to
+        any number of elements.
+    """
+    resolved = []
+    for element in elements:
+        struct = _maybe_load_struct_placeholder(element)
+        if struct is None:
+            resolved.append(
+                resolve_string(element, executor_input, pipeline_context))
+        else:
+            resolved.extend(
+                _resolve_struct_placeholder(struct, executor_input,
+                                            pipeline_context))
+    return resolved
+
+
+def resolve_string(
+    string: str,
+    executor_input: Dict[str, Any],
+    pipeline_context: PipelineContext,
+) -> str:
+    """Resolves the placeholders in a string.
+
+    Args:
+        string: The string.
+        executor_input: The ExecutorInput of the task, as a dictionary.
+        pipeline_context: The values of the pipeline and task level
+            placeholders.
+
+    Returns:
+        The string, with the placeholders replaced by their values.
+    """
+
+    def replace(match: re.Match) -> str:
+        value = _resolve_placeholder(
+            match.group(1), executor_input, pipeline_context)
+        if value is None:
+            raise ValueError(
+                f'Unable to resolve placeholder {match.group(0)!r}.')
+        return value
+
+    return _PLACEHOLDER_PATTERN.sub(replace, string)
+
+
+def _maybe_load_struct_placeholder(element: str) -> Optional[Dict[str, Any]]:
+    if not element.startswith(('{"Concat"', '{"IfPresent"')):
+        return None
+    try:
+        return json.loads(element)
+    except json.JSONDecodeError:
+        return None
+
+
+def _resolve_struct_placeholder(
+    element: Any,
+    executor_input: Dict[str, Any],
+    pipeline_context: PipelineContext,
+) -> List[str]:
+    if isinstance(element, str):
+        return resolve_command_line([element], executor_input, pipeline_context)
+    if isinstance(element, list):
+        return [
+            resolved for item in element for resolved in
+            _resolve_struct_placeholder(item, executor_input, pipeline_context)
+        ]
+    if 'Concat' in element:
+        return [
+            ''.join(
+                _resolve_struct_placeholder(element['Concat'], executor_input,
+                                            pipeline_context))
+        ]
+    if 'IfPresent' in element:
+        if_present = element['IfPresent']
+        input_name = if_present['InputName']
+        inputs = executor_input.get('inputs', {})
+        is_present = (
+            input_name in inputs.get('parameterValues', {}) or
+            input_name in inputs.get('artifacts', {}))
+        branch = if_present.get('Then') if is_present else if_present.get(
+            'Else')
+        if branch is None:
+            return []
+        return _resolve_struct_placeholder(branch, executor_input,
+                                           pipeline_context)
+    raise ValueError(f'Unknown placeholder: {element}.')
+
+
+def _resolve_placeholder(
+    expression: str,
+    executor_input: Dict[str, Any],
+    pipeline_context: PipelineContext,
+) -> Optional[str]:
+    if not expression:
+        return json.dumps(executor_input)
+    if expression.startswith('.'):
+        context_value = pipeline_context.get_value(expression[1:])
+        if context_value is not None:
+            return context_value
+
+    match = _INPUT_OUTPUT_PLACEHOLDER_PATTERN.match(expression)
+    if match is None:
+        return None
+    io_type, kind, name, attribute, key = match.groups()
+    io_spec = executor_input.get(io_type, {})
+
+    if kind == 'parameters':
+        if io_type == 'inputs':
+            values = io_spec.get('parameterValues', {})
+            if name not in values:
+                return None
+            return _parameter_value_to_string(values[name])
+        parameter = io_spec.get('parameters', {}).get(name)
+        if parameter is None or attribute != 'output_file':
+            return None
+        return parameter['outputFile']
+
+    artifacts = io_spec.get('artifacts', {}).get(name, {}).get('artifacts')
+    if not artifacts:
+        return None
+    if attribute is None:
+        return json.dumps(artifacts)
+    artifact = artifacts[0]
+    # artifacts are stored on the local filesystem, so their URIs are paths
+    if attribute in ('uri', 'path'):
+        return artifact['uri']
+    if attribute == 'metadata':
+        metadata = artifact.get('metadata', {})
+        if key is None:
+            return json.dumps(metadata)
+        return _parameter_value_to_string(metadata.get(key))
+    return None
+
+
+def _parameter_value_to_string(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value)
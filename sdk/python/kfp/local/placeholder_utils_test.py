@@ -0,0 +1,119 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+
+from absl.testing import parameterized
+from kfp.local import placeholder_utils
+
+_EXECUTOR_INPUT = {
+    'inputs': {
+        'parameterValues': {
+            'text': 'hello',
+            'number': 3,
+        },
+        'artifacts': {
+            'dataset': {
+                'artifacts': [{
+                    'name': 'dataset',
+                    'uri': '/tmp/outputs/dataset',
+                    'metadata': {
+                        'rows': 10
+                    },
+                }]
+            }
+        },
+    },
+    'outputs': {
+        'parameters': {
+            'result': {
+                'outputFile': '/tmp/outputs/result'
+            }
+        },
+        'outputFile': '/tmp/outputs/executor_output.json',
+    },
+}
+
+_PIPELINE_CONTEXT = placeholder_utils.PipelineContext(
+    pipeline_job_name='my-run',
+    pipeline_job_uuid='run-id',
+    pipeline_task_name='my-task',
+    pipeline_task_uuid='task-id',
+    pipeline_root='/tmp/outputs',
+    create_time_utc='2023-01-01T00:00:00+00:00',
+)
+
+
+class TestResolveString(parameterized.TestCase):
+
+    @parameterized.parameters(
+        ("{{$.inputs.parameters['text']}}", 'hello'),
+        ("n={{$.inputs.parameters['number']}}", 'n=3'),
+        ("{{$.inputs.artifacts['dataset'].path}}", '/tmp/outputs/dataset'),
+        ("{{$.inputs.artifacts['dataset'].uri}}", '/tmp/outputs/dataset'),
+        ("{{$.inputs.artifacts['dataset'].metadata['rows']}}", '10'),
+        ("{{$.outputs.parameters['result'].output_file}}",
+         '/tmp/outputs/result'),
+        ('{{$.pipeline_job_name}}/{{$.pipeline_task_name}}', 'my-run/my-task'),
+        ('no placeholders', 'no placeholders'),
+    )
+    def test_resolve_string(self, string, expected):
+        self.assertEqual(
+            placeholder_utils.resolve_string(string, _EXECUTOR_INPUT,
+                                             _PIPELINE_CONTEXT), expected)
+
+    def test_executor_input(self):
+        self.assertEqual(
+            json.loads(
+                placeholder_utils.resolve_string('{{$}}', _EXECUTOR_INPUT,
+                                                 _PIPELINE_CONTEXT)),
+            _EXECUTOR_INPUT)
+
+    def test_unresolvable_placeholder(self):
+        with self.assertRaisesRegex(ValueError, 'Unable to resolve'):
+            placeholder_utils.resolve_string(
+                "{{$.inputs.parameters['missing']}}", _EXECUTOR_INPUT,
+                _PIPELINE_CONTEXT)
+
+
+class TestResolveCommandLine(unittest.TestCase):
+
+    def test_concat_and_if_present(self):
+        elements = [
+            'echo',
+            json.dumps(
+                {'Concat': ['--text=', "{{$.inputs.parameters['text']}}"]}),
+            json.dumps({
+                'IfPresent': {
+                    'InputName': 'number',
+                    'Then': ['--number', "{{$.inputs.parameters['number']}}"]
+                }
+            }),
+            json.dumps({
+                'IfPresent': {
+                    'InputName': 'missing',
+                    'Then': ['--missing'],
+                    'Else': '--no-missing',
+                }
+            }),
+        ]
+        self.assertEqual(
+            placeholder_utils.resolve_command_line(elements, _EXECUTOR_INPUT,
+                                                   _PIPELINE_CONTEXT),
+            ['echo', '--text=hello', '--number', '3', '--no-missing'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,247 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Runners of the containers of tasks on the local machine."""
+
+import abc
+import hashlib
+import json
+import os
+import shutil
+import site
+import subprocess
+import threading
+from typing import Dict, List, Set
+import uuid
+import venv
+
+_DOCKER_IS_PRESENT = True
+try:
+    import docker
+except ImportError:
+    _DOCKER_IS_PRESENT = False
+
+# Number of lines at the end of the logs of a failed task that are included
+# in the error.
+_NUM_LOG_LINES_IN_ERROR = 20
+
+# Directory, in the pipeline root, of the virtual environments in which
+# SubprocessRunner runs tasks.
+_VIRTUAL_ENVS_DIR = '.venvs'
+_PARENT_SITE_PTH_FILE = '_kfp_local_parent_site.pth'
+
+
+class TaskRunner(abc.ABC):
+    """Runs the container of a task on the local machine."""
+
+    @abc.abstractmethod
+    def run(
+        self,
+        image: str,
+        command: List[str],
+        args: List[str],
+        env: Dict[str, str],
+        mount_dir: str,
+        log_file: str,
+    ) -> None:
+        """Runs a container to completion.
+
+        Args:
+            image: The container image.
+            command: The resolved container command.
+            args: The resolved container arguments.
+            env: Environment variables of the container.
+            mount_dir: Local directory with the inputs and outputs of the
+                task, which must be available to the container at the same
+                path.
+            log_file: File to write the output of the container to.
+
+        Raises:
+            RuntimeError: If the container exits with a non-zero code.
+        """
+
+
+class SubprocessRunner(TaskRunner):
+    """Runs tasks as subprocesses on the local machine, ignoring their
+    images.
+
+    Tasks run in virtual environments, one per distinct container
+    command, in the ``.venvs`` directory of the pipeline root, so the
+    packages that lightweight Python components install are installed
+    into these environments rather than into the current Python
+    environment. The environments can import the packages of the current
+    environment, so requirements that it already satisfies, such as
+    ``kfp``, are not installed again.
+
+    The first task with a command runs alone, so tasks with the same
+    command that run concurrently, such as the iterations of a
+    ``ParallelFor`` loop, do not run pip in the same environment at the
+    same time.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._environment_locks: Dict[str, threading.Lock] = {}
+        self._prepared_environments: Set[str] = set()
+
+    def run(
+        self,
+        image: str,
+        command: List[str],
+        args: List[str],
+        env: Dict[str, str],
+        mount_dir: str,
+        log_file: str,
+    ) -> None:
+        del image
+        command_hash = hashlib.sha256(json.dumps(command).encode()).hexdigest()
+        env_dir = os.path.join(mount_dir, _VIRTUAL_ENVS_DIR, command_hash[:16])
+        with self._lock:
+            environment_lock = self._environment_locks.setdefault(
+                env_dir, threading.Lock())
+
+        with environment_lock:
+            is_first_run = env_dir not in self._prepared_environments
+            if is_first_run:
+                _create_virtual_environment(env_dir)
+                exit_code = _run_in_virtual_environment(command + args, env,
+                                                        env_dir, log_file)
+                if exit_code == 0:
+                    self._prepared_environments.add(env_dir)
+        if not is_first_run:
+            exit_code = _run_in_virtual_environment(command + args, env,
+                                                    env_dir, log_file)
+        _raise_for_exit_code(exit_code, log_file)
+
+
+def _create_virtual_environment(env_dir: str) -> None:
+    """Creates a virtual environment that can import the packages of the
+    current environment, unless it exists."""
+    if os.path.exists(env_dir):
+        return
+    temp_dir = f'{env_dir}.tmp-{uuid.uuid4().hex}'
+    venv.create(temp_dir, with_pip=False, symlinks=os.name != 'nt')
+    site_dirs = site.getsitepackages()
+    if site.ENABLE_USER_SITE:
+        site_dirs.append(site.getusersitepackages())
+    # site.addsitedir processes the .pth files of the directories, which
+    # editable installs rely on. The directories come after the site
+    # directory of the environment, so packages installed into the
+    # environment take precedence.
+    add_site_dirs = '; '.join(
+        f'site.addsitedir({site_dir!r})' for site_dir in site_dirs)
+    purelib = _get_purelib(temp_dir)
+    with open(os.path.join(purelib, _PARENT_SITE_PTH_FILE), 'w') as f:
+        f.write(f'import site; {add_site_dirs}\n')
+    try:
+        os.rename(temp_dir, env_dir)
+    except OSError:
+        # the environment was created concurrently by another process
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _get_purelib(env_dir: str) -> str:
+    python = _get_python_executable(env_dir)
+    return subprocess.check_output([
+        python, '-c', 'import sysconfig; print(sysconfig.get_path("purelib"))'
+    ],
+                                   text=True).strip()
+
+
+def _get_bin_dir(env_dir: str) -> str:
+    return os.path.join(env_dir, 'Scripts' if os.name == 'nt' else 'bin')
+
+
+def _get_python_executable(env_dir: str) -> str:
+    return os.path.join(
+        _get_bin_dir(env_dir), 'python.exe' if os.name == 'nt' else 'python')
+
+
+def _run_in_virtual_environment(
+    command: List[str],
+    env: Dict[str, str],
+    env_dir: str,
+    log_file: str,
+) -> int:
+    env = {**os.environ, **env}
+    env['VIRTUAL_ENV'] = env_dir
+    env['PATH'] = os.pathsep.join([_get_bin_dir(env_dir), env.get('PATH', '')])
+    env.pop('PYTHONHOME', None)
+    with open(log_file, 'w') as log:
+        return subprocess.run(
+            command,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        ).returncode
+
+
+class DockerRunner(TaskRunner):
+    """Runs tasks in containers on the local Docker daemon.
+
+    The directory with the inputs and outputs of the pipeline is mounted
+    into the containers at the same path.
+    """
+
+    def __init__(self) -> None:
+        if not _DOCKER_IS_PRESENT:
+            raise ImportError(
+                'The `docker` Python package was not found in the current'
+                ' environment. Please run `pip install docker` to install it.')
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    def _get_client(self) -> 'docker.DockerClient':
+        with self._client_lock:
+            if self._client is None:
+                self._client = docker.from_env()
+            return self._client
+
+    def run(
+        self,
+        image: str,
+        command: List[str],
+        args: List[str],
+        env: Dict[str, str],
+        mount_dir: str,
+        log_file: str,
+    ) -> None:
+        container = self._get_client().containers.run(
+            image,
+            entrypoint=command,
+            command=args,
+            environment=env,
+            volumes={mount_dir: {
+                'bind': mount_dir,
+                'mode': 'rw'
+            }},
+            detach=True,
+        )
+        try:
+            with open(log_file, 'wb') as log:
+                for chunk in container.logs(stream=True, follow=True):
+                    log.write(chunk)
+            exit_code = container.wait()['StatusCode']
+        finally:
+            container.remove(force=True)
+        _raise_for_exit_code(exit_code, log_file)
+
+
+def _raise_for_exit_code(exit_code: int, log_file: str) -> None:
+    if exit_code == 0:
+        return
+    with open(log_file, errors='replace') as f:
+        last_lines = f.readlines()[-_NUM_LOG_LINES_IN_ERROR:]
+    raise RuntimeError(
+        f'Task exited with code {exit_code}. Logs are in {log_file}. Last lines of the logs:\n{"".join(last_lines)}'
+    )
@@ -0,0 +1,94 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for kfp.local.task_runners."""
+
+from concurrent import futures
+import os
+import sys
+import tempfile
+import unittest
+
+from kfp.local import task_runners
+
+
+class SubprocessRunnerTest(unittest.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        self.mount_dir = self._temp_dir.name
+        self.runner = task_runners.SubprocessRunner()
+
+    def _run(self, script: str, args=(), log_name: str = 'task.log') -> str:
+        log_file = os.path.join(self.mount_dir, log_name)
+        self.runner.run(
+            image='python:3.7',
+            command=['python3', '-c', script],
+            args=list(args),
+            env={},
+            mount_dir=self.mount_dir,
+            log_file=log_file,
+        )
+        with open(log_file) as f:
+            return f.read()
+
+    def test_runs_in_virtual_environment(self):
+        output = self._run(
+            'import sys, yaml; print(sys.prefix); print(yaml.__file__)')
+
+        prefix, yaml_file = output.splitlines()
+        self.assertTrue(
+            prefix.startswith(
+                os.path.join(self.mount_dir, task_runners._VIRTUAL_ENVS_DIR)))
+        self.assertNotEqual(prefix, sys.prefix)
+        # packages of the current environment can be imported
+        self.assertFalse(yaml_file.startswith(prefix))
+
+    def test_same_command_reuses_environment(self):
+        script = 'import sys; print(sys.prefix)'
+        first_prefix = self._run(script, args=['a'])
+        second_prefix = self._run(script, args=['b'])
+        other_prefix = self._run(script + '; print()')
+
+        self.assertEqual(first_prefix, second_prefix)
+        self.assertNotEqual(first_prefix.strip(), other_prefix.strip())
+
+    def test_first_run_of_command_runs_alone(self):
+        events_file = os.path.join(self.mount_dir, 'events.txt')
+        script = ('import sys, time\n'
+                  f'f = open({events_file!r}, "a")\n'
+                  'f.write("start " + sys.argv[1] + "\\n"); f.flush()\n'
+                  'time.sleep(0.5)\n'
+                  'f.write("end " + sys.argv[1] + "\\n")\n')
+        with futures.ThreadPoolExecutor(max_workers=3) as executor:
+            list(
+                executor.map(
+                    lambda i: self._run(
+                        script, args=[str(i)], log_name=f'{i}.log'), range(3)))
+
+        with open(events_file) as f:
+            events = f.read().splitlines()
+        self.assertEqual(len(events), 6)
+        first_task = events[0].split()[1]
+        self.assertEqual(events[1], f'end {first_task}')
+
+    def test_failed_task(self):
+        with self.assertRaisesRegex(RuntimeError,
+                                    r'exited with code 3(.|\n)*bad input'):
+            self._run('import sys; print("bad input"); sys.exit(3)')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+# Copyright 2023 The Kubeflow Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measures how the KFP compiler's dependency resolution scales with the size
+and nesting depth of a pipeline.
+
+Builds synthetic pipelines of N tasks spread across dsl.ParallelFor and
+dsl.Condition groups nested D levels deep, where every task consumes the
+output of the previous task in its group and of a task outside of the
+nesting, and times building the pipeline and
+compiler_utils.get_inputs_for_all_groups, get_outputs_for_all_groups and
+get_dependencies.
+
+Usage:
+    python compiler_dependency_resolution.py [--sizes 500 1000 2000 4000] [--depth 8]
+"""
+
+import argparse
+import time
+from typing import List
+
+from kfp import dsl
+from kfp.compiler import compiler_utils
+from kfp.components import pipeline_context
+from kfp.components import tasks_group
+
+
+@dsl.container_component
+def add(a: int, b: int, out: dsl.OutputPath(int)):
+    return dsl.ContainerSpec(
+        image='alpine', command=['sh', '-c', f'echo {a} {b} > {out}'])
+
+
+def build_pipeline(num_tasks: int, depth: int) -> pipeline_context.Pipeline:
+    with pipeline_context.Pipeline('synthetic') as pipeline:
+        source = add(a=1, b=1)
+        tasks_per_branch = max(1, num_tasks // depth)
+        num_built = 1
+        while num_built < num_tasks:
+            groups = []
+            for level in range(depth):
+                group = dsl.ParallelFor([1, 2]) if level % 2 == 0 else \
+                    dsl.Condition(source.outputs['out'] > level)
+                groups.append(group)
+                group.__enter__()
+            previous = source
+            for _ in range(min(tasks_per_branch, num_tasks - num_built)):
+                previous = add(
+                    a=previous.outputs['out'], b=source.outputs['out'])
+                num_built += 1
+            for group in reversed(groups):
+                group.__exit__()
+    # named by GraphComponent when compiling a @dsl.pipeline
+    pipeline.groups[0].name = 'root'
+    return pipeline
+
+
+def time_dependency_resolution(pipeline: pipeline_context.Pipeline) -> float:
+    start = time.perf_counter()
+    root_group = pipeline.groups[0]
+    all_groups = compiler_utils.get_all_groups(root_group)
+    group_name_to_group = {group.name: group for group in all_groups}
+    task_name_to_parent_groups, group_name_to_parent_groups = (
+        compiler_utils.get_parent_groups(root_group))
+    condition_channels = compiler_utils.get_condition_channels_for_tasks(
+        root_group)
+    name_to_for_loop_group = {
+        group_name: group
+        for group_name, group in group_name_to_group.items()
+        if isinstance(group, tasks_group.ParallelFor)
+    }
+    compiler_utils.get_inputs_for_all_groups(
+        pipeline=pipeline,
+        task_name_to_parent_groups=task_name_to_parent_groups,
+        group_name_to_parent_groups=group_name_to_parent_groups,
+        condition_channels=condition_channels,
+        name_to_for_loop_group=name_to_for_loop_group,
+    )
+    compiler_utils.get_outputs_for_all_groups(
+        pipeline=pipeline,
+        task_name_to_parent_groups=task_name_to_parent_groups,
+        group_name_to_parent_groups=group_name_to_parent_groups,
+        all_groups=all_groups,
+        pipeline_outputs_dict={},
+    )
+    compiler_utils.get_dependencies(
+        pipeline=pipeline,
+        task_name_to_parent_groups=task_name_to_parent_groups,
+        group_name_to_parent_groups=group_name_to_parent_groups,
+        group_name_to_group=group_name_to_group,
+        condition_channels=condition_channels,
+    )
+    return time.perf_counter() - start
+
+
+def main(sizes: List[int], depth: int, repeats: int) -> None:
+    print(f'{"tasks":>8} {"depth":>6} {"build s":>10} {"resolve s":>10} '
+          f'{"us/task":>10}')
+    for num_tasks in sizes:
+        start = time.perf_counter()
+        pipeline = build_pipeline(num_tasks, depth)
+        build_seconds = time.perf_counter() - start
+        seconds = min(
+            time_dependency_resolution(pipeline) for _ in range(repeats))
+        print(f'{num_tasks:>8} {depth:>6} {build_seconds:>10.3f} '
+              f'{seconds:>10.3f} {seconds / num_tasks * 1e6:>10.1f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[500, 1000, 2000, 4000, 8000])
+    parser.add_argument('--depth', type=int, default=8)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    main(args.sizes, args.depth, args.repeats)